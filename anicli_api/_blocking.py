@@ -0,0 +1,200 @@
+"""Debug detector of event loop blocking calls inside async (`a_*`) methods
+
+Reports:
+
+- `sync_http` - sync httpx client request (`httpx.Client.send`) from the event loop thread
+- `loop_lag` - synchronous section longer than `lag_threshold` (CPU heavy parsing, `time.sleep`, blocking IO).
+  Watchdog thread takes the event loop thread stack while loop is stalled
+
+Every report contains the offending extractor method (nearest `a_*` method frame of anicli_api) and
+the innermost anicli_api code location. Reports are logged and stored in `BlockingDetector.reports`.
+
+Detector patches `httpx.Client.send` while active: use it in tests and debug sessions only.
+
+Usage:
+
+    >>> from anicli_api._blocking import BlockingDetector
+    >>> from anicli_api.source.animego import Extractor
+    >>>
+    >>> async def main():
+    ...     async with BlockingDetector(lag_threshold=0.05) as detector:
+    ...         await (await Extractor().a_search("lain"))[0].a_get_anime()
+    ...     for report in detector.reports:
+    ...         print(report.kind, report.method, report.location, report.duration)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+from types import FrameType
+from typing import Literal, Optional
+
+import httpx
+
+from anicli_api._logger import logger
+from anicli_api.typing import NamedTuple
+
+__all__ = ["BlockingReport", "BlockingCallError", "BlockingDetector"]
+
+_PACKAGE_DIR = str(Path(__file__).parent)
+# frames of these modules are not reported as offending code location
+_SKIP_FILES = (__file__, str(Path(__file__).with_name("_http.py")))
+
+_ACTIVE: tuple[BlockingDetector, ...] = ()
+_ACTIVE_LOCK = threading.Lock()
+_ORIGINAL_SEND = httpx.Client.send
+
+
+class BlockingReport(NamedTuple):
+    kind: Literal["sync_http", "loop_lag"]
+    duration: float
+    """seconds of blocked event loop"""
+    method: Optional[str]
+    """offending async method, eg: `anicli_api.player.cdnvideohub.CdnVideoHub.a_parse`"""
+    location: Optional[str]
+    """innermost anicli_api code location, eg: `.../cdnvideohub.py:170 in a_parse`"""
+    detail: str = ""
+    """request url (sync_http)"""
+
+
+class BlockingCallError(RuntimeError):
+    """raised by sync http request in the event loop thread, if `BlockingDetector(raise_on_sync_http=True)`"""
+
+
+def _describe_stack(frame: Optional[FrameType]) -> tuple[Optional[str], Optional[str]]:
+    """(offending a_* method, innermost anicli_api location) of frames stack"""
+    method = location = None
+    while frame is not None and method is None:
+        code = frame.f_code
+        if code.co_filename.startswith(_PACKAGE_DIR) and code.co_filename not in _SKIP_FILES:
+            if location is None:
+                location = f"{code.co_filename}:{frame.f_lineno} in {code.co_name}"
+            if code.co_name.startswith("a_"):
+                owner = frame.f_locals.get("self")
+                cls_name = f"{type(owner).__name__}." if owner is not None else ""
+                method = f"{frame.f_globals.get('__name__')}.{cls_name}{code.co_name}"
+        frame = frame.f_back
+    return method, location
+
+
+def _checked_send(client: httpx.Client, request: httpx.Request, **kwargs):
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    detectors = [d for d in _ACTIVE if d._loop is loop] if loop is not None else []
+    if not detectors:
+        return _ORIGINAL_SEND(client, request, **kwargs)
+
+    method, location = _describe_stack(sys._getframe(1))
+    if any(d.raise_on_sync_http for d in detectors):
+        msg = f"sync http request {request.method} {request.url} in event loop: {method or location}"
+        raise BlockingCallError(msg)
+    started = time.perf_counter()
+    try:
+        return _ORIGINAL_SEND(client, request, **kwargs)
+    finally:
+        report = BlockingReport("sync_http", time.perf_counter() - started, method, location, str(request.url))
+        for detector in detectors:
+            detector._add_report(report)
+
+
+class BlockingDetector:
+    """event loop blocking calls detector (async context manager)
+
+    :param lag_threshold: min reported synchronous section time (seconds)
+    :param interval: event loop heartbeat interval (seconds)
+    :param raise_on_sync_http: raise `BlockingCallError` instead of sync http request in the event loop
+    """
+
+    def __init__(self, lag_threshold: float = 0.1, interval: float = 0.01, raise_on_sync_http: bool = False):
+        self.lag_threshold = lag_threshold
+        self.interval = interval
+        self.raise_on_sync_http = raise_on_sync_http
+        self.reports: list[BlockingReport] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id = 0
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        # heartbeat number: stack of the stalled loop thread
+        self._beat = (0, 0.0)
+        self._snapshot: Optional[tuple[int, tuple[Optional[str], Optional[str]]]] = None
+
+    def _add_report(self, report: BlockingReport) -> None:
+        self.reports.append(report)
+        logger.warning(
+            "[blocking] %s %.3fs in %s (%s) %s",
+            report.kind,
+            report.duration,
+            report.method or "<unknown>",
+            report.location or "<unknown>",
+            report.detail,
+        )
+
+    async def _heartbeat(self) -> None:
+        number = 0
+        while True:
+            expected = time.perf_counter() + self.interval
+            number += 1
+            self._beat = (number, expected)
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - expected
+            if lag >= self.lag_threshold:
+                snapshot = self._snapshot
+                method, location = snapshot[1] if snapshot and snapshot[0] == number else (None, None)
+                self._add_report(BlockingReport("loop_lag", lag, method, location))
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.interval):
+            number, expected = self._beat
+            if time.perf_counter() - expected < self.lag_threshold:
+                continue
+            if self._snapshot is None or self._snapshot[0] != number:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                self._snapshot = (number, _describe_stack(frame))
+
+    def start(self) -> None:
+        """start detector. Should be called in the event loop"""
+        global _ACTIVE
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stopped.clear()
+        self._heartbeat_task = self._loop.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="anicli-blocking-watchdog", daemon=True)
+        self._watchdog.start()
+        with _ACTIVE_LOCK:
+            if not _ACTIVE:
+                httpx.Client.send = _checked_send  # type: ignore[assignment]
+            _ACTIVE = (*_ACTIVE, self)
+
+    async def stop(self) -> None:
+        """stop detector. Collected reports are kept"""
+        global _ACTIVE
+        with _ACTIVE_LOCK:
+            _ACTIVE = tuple(d for d in _ACTIVE if d is not self)
+            if not _ACTIVE:
+                httpx.Client.send = _ORIGINAL_SEND  # type: ignore[method-assign]
+        self._stopped.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            try:
+                await self._heartbeat_task
+            except asyncio.CancelledError:
+                pass
+        if self._watchdog is not None:
+            self._watchdog.join()
+        self._heartbeat_task = self._watchdog = None
+
+    async def __aenter__(self) -> "BlockingDetector":
+        self.start()
+        # first heartbeat
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
@@ -0,0 +1,293 @@
+"""Record/replay HTTP transport for deterministic offline runs
+
+Cassette transports wrap `HTTPRetryConnectSyncTransport`/`HTTPRetryConnectAsyncTransport` (or any other httpx
+transport): real request/response pairs are recorded once to JSON file and replayed later without network with
+configurable injected latency. Used for offline end-to-end runs and benchmarks of full Search -> Video chains.
+
+- cassette transport is the innermost wrapper: cache hits and rate limit delays are measured as in real run
+- requests matched by method, url and body. Repeated requests replayed in recorded order, last one - repeated
+- response `Set-Cookie` headers are not recorded
+- modes: `replay` - network is not used, unknown request raises `CassetteMissError`;
+  `record` - all requests sent and recorded; `auto` - replay known requests, record unknown
+
+Usage:
+
+    >>> from anicli_api._http import HTTPSession
+    >>> from anicli_api._cassette import Cassette, install_cassette
+    >>> from anicli_api.player import resolve_extractor
+    >>> from anicli_api.source.animego import Extractor
+    >>>
+    >>> with Cassette("animego.json", mode="auto", latency=0.05) as cassette:
+    ...     ex = Extractor(session=HTTPSession(cassette=cassette))
+    ...     source = ex.search("lain")[0].get_anime().get_episodes()[0].get_sources()[0]
+    ...     # player extractors have own clients: create it with the same cassette
+    ...     videos = resolve_extractor(source.url)(cassette=cassette).parse(source.url)
+    >>> # or wrap already created client (httpx client or generated API client)
+    >>> install_cassette(api_client, cassette)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import json
+import random
+import threading
+from collections import defaultdict
+from pathlib import Path
+from time import monotonic, sleep
+from typing import Any, Optional, Union
+
+from httpx import AsyncBaseTransport, AsyncClient, BaseTransport, Client, Request, Response, TransportError
+
+from anicli_api._http import HTTPRetryConnectAsyncTransport, HTTPRetryConnectSyncTransport
+from anicli_api._logger import logger
+from anicli_api.typing import NamedTuple
+
+__all__ = [
+    "Interaction",
+    "Cassette",
+    "CassetteMissError",
+    "CassetteSyncTransport",
+    "CassetteAsyncTransport",
+    "install_cassette",
+]
+
+CASSETTE_VERSION = 1
+_SKIP_HEADERS = ("transfer-encoding", "content-length", "set-cookie")
+
+
+class CassetteMissError(TransportError):
+    """request is not recorded in cassette (replay mode)"""
+
+
+class Interaction(NamedTuple):
+    method: str
+    url: str
+    body_hash: str
+    """sha1 of request body"""
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    """raw (not decoded) response body"""
+    elapsed: float
+    """recorded response time in seconds"""
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.url} {self.body_hash}"
+
+    def to_response(self, request: Request) -> Response:
+        return Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+            extensions={"from_cassette": True},
+        )
+
+    def to_json(self) -> dict[str, Any]:
+        data = self._asdict()
+        data["content"] = base64.b64encode(self.content).decode()
+        return data
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Interaction:
+        data = dict(data, content=base64.b64decode(data["content"]))
+        data["headers"] = [tuple(h) for h in data["headers"]]
+        return cls(**data)
+
+
+class Cassette:
+    """thread-safe recorded interactions storage, shared between sync and async transports
+
+    :param path: cassette JSON file. None - in-memory cassette
+    :param mode: `replay`, `record` or `auto`
+    :param latency: injected delay of replayed response in seconds. None - recorded response time
+    :param jitter: max random delay, added to latency
+    """
+
+    MODES = ("replay", "record", "auto")
+
+    def __init__(
+        self,
+        path: Union[str, Path, None] = None,
+        mode: str = "auto",
+        latency: Optional[float] = 0.0,
+        jitter: float = 0.0,
+    ):
+        if mode not in self.MODES:
+            raise ValueError(f"mode should be one of {self.MODES}, got {mode!r}")
+        self.path = Path(path).expanduser() if path else None
+        self.mode = mode
+        self.latency = latency
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._interactions: defaultdict[str, list[Interaction]] = defaultdict(list)
+        # key: replayed interactions count
+        self._played: defaultdict[str, int] = defaultdict(int)
+        self._dirty = False
+        self.hits = 0
+        self.misses = 0
+        if self.path and self.path.exists() and mode != "record":
+            self.load()
+
+    @staticmethod
+    def key(request: Request) -> str:
+        return f"{request.method} {request.url} {hashlib.sha1(request.content).hexdigest()}"
+
+    def load(self) -> None:
+        data = json.loads(self.path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+        with self._lock:
+            self._interactions.clear()
+            for item in data["interactions"]:
+                interaction = Interaction.from_json(item)
+                self._interactions[interaction.key].append(interaction)
+
+    def save(self) -> None:
+        """write recorded interactions to file. In-memory or not changed cassette is not saved"""
+        with self._lock:
+            if not self.path or not self._dirty:
+                return
+            interactions = [i.to_json() for items in self._interactions.values() for i in items]
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(
+            json.dumps({"version": CASSETTE_VERSION, "interactions": interactions}, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        logger.debug("[cassette] saved %s interactions to %s", len(interactions), self.path)
+
+    def play(self, request: Request) -> Optional[Interaction]:
+        """returns recorded interaction for request. None - request should be sent and recorded"""
+        if self.mode == "record":
+            return None
+        key = self.key(request)
+        with self._lock:
+            items = self._interactions.get(key)
+            if not items:
+                self.misses += 1
+                if self.mode == "replay":
+                    raise CassetteMissError(f"request is not recorded: {request.method} {request.url}", request=request)
+                return None
+            self.hits += 1
+            index = self._played[key]
+            self._played[key] += 1
+        return items[min(index, len(items) - 1)]
+
+    def record(self, request: Request, response: Response, content: bytes, elapsed: float) -> Interaction:
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in _SKIP_HEADERS]
+        interaction = Interaction(
+            request.method,
+            str(request.url),
+            hashlib.sha1(request.content).hexdigest(),
+            response.status_code,
+            headers,
+            content,
+            round(elapsed, 4),
+        )
+        with self._lock:
+            self._interactions[interaction.key].append(interaction)
+            self._dirty = True
+        logger.debug("[cassette] recorded %s %s", request.method, request.url)
+        return interaction
+
+    def delay(self, interaction: Interaction) -> float:
+        """injected latency of replayed interaction"""
+        latency = interaction.elapsed if self.latency is None else self.latency
+        return latency + random.uniform(0, self.jitter) if self.jitter else latency
+
+    def rewind(self) -> None:
+        """replay repeated requests from the first recorded response"""
+        with self._lock:
+            self._played.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(len(items) for items in self._interactions.values())
+
+    def __enter__(self) -> Cassette:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.save()
+
+
+class CassetteSyncTransport(BaseTransport):
+    """record/replay transport wrapper
+
+    :param cassette: recorded interactions storage
+    :param transport: wrapped transport, used for record. Default - HTTPRetryConnectSyncTransport
+    """
+
+    def __init__(self, cassette: Cassette, transport: Optional[BaseTransport] = None):
+        self.cassette = cassette
+        self.transport = transport or HTTPRetryConnectSyncTransport()
+
+    def handle_request(self, request: Request) -> Response:
+        request.read()
+        if interaction := self.cassette.play(request):
+            if delay := self.cassette.delay(interaction):
+                sleep(delay)
+            return interaction.to_response(request)
+
+        started = monotonic()
+        response = self.transport.handle_request(request)
+        try:
+            # raw stream: body is decoded by client
+            content = b"".join(response.stream)  # type: ignore[arg-type]
+        finally:
+            response.close()
+        return self.cassette.record(request, response, content, monotonic() - started).to_response(request)
+
+    def close(self) -> None:
+        self.cassette.save()
+        self.transport.close()
+
+
+class CassetteAsyncTransport(AsyncBaseTransport):
+    """record/replay async transport wrapper
+
+    :param cassette: recorded interactions storage
+    :param transport: wrapped transport, used for record. Default - HTTPRetryConnectAsyncTransport
+    """
+
+    def __init__(self, cassette: Cassette, transport: Optional[AsyncBaseTransport] = None):
+        self.cassette = cassette
+        self.transport = transport or HTTPRetryConnectAsyncTransport()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        await request.aread()
+        if interaction := self.cassette.play(request):
+            if delay := self.cassette.delay(interaction):
+                await asyncio.sleep(delay)
+            return interaction.to_response(request)
+
+        started = monotonic()
+        response = await self.transport.handle_async_request(request)
+        try:
+            content = b"".join([chunk async for chunk in response.stream])  # type: ignore[union-attr]
+        finally:
+            await response.aclose()
+        return self.cassette.record(request, response, content, monotonic() - started).to_response(request)
+
+    async def aclose(self) -> None:
+        await asyncio.to_thread(self.cassette.save)
+        await self.transport.aclose()
+
+
+def install_cassette(client: Union[Client, AsyncClient, Any], cassette: Cassette) -> None:
+    """wrap the innermost transport of already created client: rate limit and cache wrappers are kept outside
+
+    :param client: httpx.Client, httpx.AsyncClient or generated API client (AniLibertySync, CdnVideoHubAsync...)
+    :param cassette: recorded interactions storage
+    """
+    # generated API clients keep httpx client in `_client` attribute
+    http = client if isinstance(client, (Client, AsyncClient)) else client._client
+    wrapper_cls = CassetteAsyncTransport if isinstance(http, AsyncClient) else CassetteSyncTransport
+    # rate limit, cache transports keep wrapped transport in `transport` attribute
+    parent, attr = http, "_transport"
+    while isinstance(getattr(getattr(parent, attr), "transport", None), (BaseTransport, AsyncBaseTransport)):
+        parent, attr = getattr(parent, attr), "transport"
+    setattr(parent, attr, wrapper_cls(cassette, getattr(parent, attr)))  # type: ignore[arg-type]
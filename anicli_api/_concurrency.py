@@ -0,0 +1,76 @@
+"""Bounded concurrency helpers shared by batch tools (`anicli_api.tools.batch`, `anicli_api.tools.m3u`)
+
+- `host_key` - host of source/episode object for per-host limits
+- `AsyncHostLimiter` - total and per-host in-flight limits for asyncio tasks
+- `SyncHostLimiter` - per-host in-flight limit for threads (total limit - thread pool size)
+
+Usage:
+
+    >>> from anicli_api._concurrency import AsyncHostLimiter, host_key
+    >>>
+    >>> limiter = AsyncHostLimiter(concurrency=8, per_host_limit=4)
+    >>> async with limiter.acquire(host_key(source)):
+    ...     videos = await source.a_get_videos()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, TypeVar
+from urllib.parse import urlsplit
+
+__all__ = ["host_key", "AsyncHostLimiter", "SyncHostLimiter", "call_limited"]
+
+T = TypeVar("T")
+
+
+def host_key(obj: Any) -> str:
+    """host key for concurrency limits. Some sources contains stub urls - use module name instead"""
+    url = getattr(obj, "url", "")
+    return urlsplit(url).netloc or type(obj).__module__
+
+
+class AsyncHostLimiter:
+    """max in-flight calls in total and per host in async mode
+
+    :param concurrency: max in-flight calls in total
+    :param per_host_limit: max in-flight calls to one host
+    """
+
+    def __init__(self, concurrency: int, per_host_limit: int):
+        self._total = asyncio.Semaphore(concurrency)
+        self._per_host_limit = per_host_limit
+        self._hosts: dict[str, asyncio.Semaphore] = {}
+
+    @asynccontextmanager
+    async def acquire(self, host: str):
+        host_sem = self._hosts.setdefault(host, asyncio.Semaphore(self._per_host_limit))
+        async with host_sem, self._total:
+            yield
+
+
+class SyncHostLimiter:
+    """thread-safe max in-flight calls per host
+
+    :param per_host_limit: max in-flight calls to one host
+    """
+
+    def __init__(self, per_host_limit: int):
+        self._lock = threading.Lock()
+        self._per_host_limit = per_host_limit
+        self._hosts: dict[str, threading.BoundedSemaphore] = {}
+
+    @contextmanager
+    def acquire(self, host: str):
+        with self._lock:
+            sem = self._hosts.setdefault(host, threading.BoundedSemaphore(self._per_host_limit))
+        with sem:
+            yield
+
+
+def call_limited(limiter: SyncHostLimiter, obj: Any, func: Callable[[], T]) -> T:
+    """call `func` holding host slot of `obj`"""
+    with limiter.acquire(host_key(obj)):
+        return func()
@@ -0,0 +1,130 @@
+"""Parse-once html document for generated (ssc-gen) page parsers
+
+Generated parser classes accept raw string or `lxml.html.HtmlElement`. Passing a string to every parser
+calls `html.fromstring` again, so source modules wrap the response once and share the tree:
+
+    >>> doc = HTMLDocument(resp.text)
+    >>> url = doc.parse(PageUtils)["url_canonical"]
+    >>> items = doc.parse(PageSearch)
+
+Async extractor methods parse big documents in the parse executor (`anicli_api._executor`):
+
+    >>> utils, items = await a_parse_html(resp.text, PageUtils, PageSearch)
+    >>> anime = await a_parse_html(resp.text, PageAnime)
+"""
+
+from __future__ import annotations
+
+from time import thread_time
+from typing import Any, Callable, Protocol, TypeVar, Union, overload
+
+from lxml import html
+from lxml.html import HtmlElement
+
+from anicli_api._executor import PARSE_EXECUTOR
+from anicli_api._metrics import PARSE_CPU
+
+__all__ = ["HTMLDocument", "parse_html", "a_parse_html"]
+
+# same fallback value as in generated parsers
+FALLBACK_HTML_STR = "<html><body></body></html>"
+
+T = TypeVar("T", covariant=True)
+R = TypeVar("R")
+
+
+class _SupportsParse(Protocol[T]):
+    def parse(self) -> T: ...
+
+
+class HTMLDocument:
+    """lxml tree with cached raw text. Both values are created lazily on first access"""
+
+    __slots__ = ("_text", "_tree")
+
+    def __init__(self, document: Union[str, HtmlElement]):
+        if isinstance(document, HtmlElement):
+            self._tree = document
+            self._text = None
+        else:
+            self._tree = None
+            self._text = document
+
+    @property
+    def text(self) -> str:
+        """raw html text. If document created from tree - serialized once"""
+        if self._text is None:
+            self._text = html.tostring(self._tree, encoding="unicode")  # type: ignore[arg-type]
+        return self._text
+
+    @property
+    def tree(self) -> HtmlElement:
+        """parsed lxml tree"""
+        if self._tree is None:
+            self._tree = html.fromstring(self._text.strip() or FALLBACK_HTML_STR)  # type: ignore[union-attr]
+        return self._tree
+
+    def parse(self, parser: Callable[[HtmlElement], _SupportsParse[T]]) -> T:
+        """run generated parser class on the shared tree
+
+        :param parser: generated page parser class (eg: PageSearch, PageAnime)
+        """
+        started = thread_time()
+        result = parser(self.tree).parse()
+        # animego_parser.PageSearch
+        PARSE_CPU.observe(thread_time() - started, f"{parser.__module__.rpartition('.')[-1]}.{parser.__qualname__}")
+        return result
+
+    def __repr__(self) -> str:
+        state = "parsed" if self._tree is not None else "raw"
+        return f"<{type(self).__name__} [{state}]>"
+
+
+@overload
+def parse_html(document: str, parser: Callable[[HtmlElement], _SupportsParse[R]], /) -> R: ...
+
+
+@overload
+def parse_html(
+    document: str,
+    parser: Callable[[HtmlElement], _SupportsParse[Any]],
+    /,
+    *parsers: Callable[[HtmlElement], _SupportsParse[Any]],
+) -> tuple[Any, ...]: ...
+
+
+def parse_html(document: str, /, *parsers: Callable[[HtmlElement], _SupportsParse[Any]]) -> Any:
+    """parse raw document once by several generated parsers. Results are returned in parsers order,
+    one parser - its result as is
+
+    Module level function with picklable arguments: used as process pool task
+
+    :param document: raw html
+    :param parsers: generated page parser classes
+    """
+    doc = HTMLDocument(document)
+    if len(parsers) == 1:
+        return doc.parse(parsers[0])
+    return tuple(doc.parse(parser) for parser in parsers)
+
+
+@overload
+async def a_parse_html(document: str, parser: Callable[[HtmlElement], _SupportsParse[R]], /) -> R: ...
+
+
+@overload
+async def a_parse_html(
+    document: str,
+    parser: Callable[[HtmlElement], _SupportsParse[Any]],
+    /,
+    *parsers: Callable[[HtmlElement], _SupportsParse[Any]],
+) -> tuple[Any, ...]: ...
+
+
+async def a_parse_html(document: str, /, *parsers: Callable[[HtmlElement], _SupportsParse[Any]]) -> Any:
+    """`parse_html` in the parse executor. Documents smaller than executor threshold are parsed inline
+
+    :param document: raw html
+    :param parsers: generated page parser classes
+    """
+    return await PARSE_EXECUTOR.run(len(document), parse_html, document, *parsers)
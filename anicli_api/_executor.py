@@ -0,0 +1,106 @@
+"""Parse executor: CPU-bound parsing of async extractor methods out of the event loop
+
+Async methods (`a_search`, `a_get_anime`...) parse big html pages (animego, hdrezka) and unpack dreamerscast
+playerjs script. Inline parsing stalls every concurrent request of the event loop, so documents larger than
+`threshold` are parsed in the executor:
+
+- thread pool (default): lxml releases GIL while parsing, tracing spans nesting is kept
+- process pool (`processes=True`): scales across cores. Tasks are module level functions with picklable
+  arguments (raw text, generated parser classes). Parser metrics (`anicli_parse_cpu_seconds`) of worker
+  processes are not collected
+
+Usage:
+
+    >>> from anicli_api._executor import PARSE_EXECUTOR
+    >>> PARSE_EXECUTOR.configure(processes=True, max_workers=4, threshold=32 * 1024)
+    >>> # disable offload: parse all documents inline
+    >>> PARSE_EXECUTOR.configure(threshold=None)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+__all__ = ["ParseExecutor", "PARSE_EXECUTOR", "DEFAULT_THRESHOLD"]
+
+T = TypeVar("T")
+
+DEFAULT_THRESHOLD = 64 * 1024
+"""min document size (chars) for offload. Smaller documents are parsed faster than executor roundtrip"""
+
+
+class ParseExecutor:
+    """lazy thread or process pool for parse tasks
+
+    :param threshold: min input size for offload. None - parse inline always
+    :param max_workers: pool size. Default - `concurrent.futures` default
+    :param processes: use process pool instead of thread pool
+    """
+
+    def __init__(
+        self, threshold: Optional[int] = DEFAULT_THRESHOLD, max_workers: Optional[int] = None, processes: bool = False
+    ):
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.processes = processes
+        self._lock = threading.Lock()
+        self._executor: Optional[Executor] = None
+        self.offloaded = 0
+        """tasks counter, executed in pool"""
+        self.inline = 0
+        """tasks counter, executed in the event loop (input smaller than threshold)"""
+
+    @property
+    def executor(self) -> Executor:
+        """pool, created on first offload"""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.processes:
+                        self._executor = ProcessPoolExecutor(self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="anicli-parse")
+        return self._executor
+
+    def configure(
+        self, threshold: Optional[int] = DEFAULT_THRESHOLD, max_workers: Optional[int] = None, processes: bool = False
+    ) -> None:
+        """replace settings and reset counters. Created pool shuts down without waiting for running tasks"""
+        self.shutdown(wait=False)
+        self.threshold = threshold
+        self.max_workers = max_workers
+        self.processes = processes
+        self.offloaded = self.inline = 0
+
+    async def run(self, size: int, func: Callable[..., T], *args: Any) -> T:
+        """call `func(*args)` in the pool if input size reaches threshold, else inline
+
+        :param size: input size (eg: document length)
+        :param func: task. For process pool - picklable (module level) function with picklable arguments
+        """
+        if self.threshold is None or size < self.threshold:
+            self.inline += 1
+            return func(*args)
+        self.offloaded += 1
+        loop = asyncio.get_running_loop()
+        if self.processes:
+            return await loop.run_in_executor(self.executor, func, *args)
+        # keep tracing spans nesting in worker thread
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self.executor, functools.partial(context.run, func, *args))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """shutdown created pool. Executor is reusable: next offload creates new pool"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+PARSE_EXECUTOR = ParseExecutor()
+"""process wide parse executor, used by async extractor methods"""
@@ -9,7 +9,14 @@ AppleWebKit/537.36 (KHTML, like Gecko) Chrome/94.0.4606.114
 """
 
 import asyncio
-from time import sleep
+import random
+import ssl
+import threading
+from collections import defaultdict, deque
+from email.utils import parsedate_to_datetime
+from time import monotonic, sleep, time
+from functools import lru_cache
+from typing import Optional, Union
 
 from httpx import (
     AsyncClient,
@@ -17,14 +24,16 @@ from httpx import (
     Client,
     HTTPTransport,
     NetworkError,
-    ReadTimeout,
     Request,
     Response,
     TimeoutException,
-    ConnectTimeout,
+    create_ssl_context,
 )
 
 from anicli_api._logger import logger
+from anicli_api._metrics import DDOS_DETECTED, HTTP_BYTES, HTTP_DURATION, HTTP_REQUESTS, HTTP_RETRIES
+from anicli_api._tracing import Span, start_span
+from anicli_api.typing import NamedTuple
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Linux; Android 10.0; Nexus 5 Build/MRA58N) "
@@ -44,9 +53,15 @@ __all__ = (
     "BaseHTTPAsync",
     "HTTPSync",
     "HTTPAsync",
+    "HTTPSession",
+    "DEFAULT_SESSION",
     "HTTPRetryConnectSyncTransport",
     "HTTPRetryConnectAsyncTransport",
     "DDOSServerDetectError",
+    "RetryPolicy",
+    "RetryPolicies",
+    "RetryBudget",
+    "RETRY_BUDGET",
 )
 
 # DDoS protection check by "Server" key header
@@ -73,86 +88,323 @@ class DDOSServerDetectError(NetworkError):
     pass
 
 
+class RetryPolicy(NamedTuple):
+    """exponential backoff with full jitter: `delay = random(0, min(max_delay, base_delay * 2 ** retry))`"""
+
+    attempts: int = 5
+    """max attempts, include first request. 1 - do not retry"""
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    max_elapsed: float = 15.0
+    """max seconds from the first attempt. Retries, that exceed this value, are not performed"""
+    jitter: bool = True
+
+    def backoff(self, retry: int) -> float:
+        cap = min(self.max_delay, self.base_delay * 2**retry)
+        return random.uniform(0, cap) if self.jitter else cap
+
+
+class RetryPolicies(NamedTuple):
+    """retry policies for different failure kinds"""
+
+    connect: RetryPolicy = RetryPolicy()
+    """network errors and timeouts"""
+    ddos: RetryPolicy = RetryPolicy(attempts=2, base_delay=1.0, max_delay=2.0, max_elapsed=5.0)
+    """403 or DDoS protection detect. It's rarely passed quickly"""
+    status: RetryPolicy = RetryPolicy(attempts=3, base_delay=0.5, max_delay=5.0, max_elapsed=15.0)
+    """retryable status codes. `Retry-After` header is honored"""
+    retry_statuses: tuple[int, ...] = (429, 502, 503, 504)
+
+
+class RetryBudget:
+    """per-host retries limit: `min_retries + ratio * requests` retries in sliding `window` seconds.
+
+    Shared between transports: a dead mirror exhausts its budget and next requests to it fail fast
+    """
+
+    def __init__(self, ratio: float = 0.2, min_retries: int = 10, window: float = 30.0):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._lock = threading.Lock()
+        self._requests: dict[str, deque[float]] = defaultdict(deque)
+        self._retries: dict[str, deque[float]] = defaultdict(deque)
+
+    def _expire(self, host: str, now: float) -> None:
+        for timestamps in (self._requests[host], self._retries[host]):
+            while timestamps and now - timestamps[0] > self.window:
+                timestamps.popleft()
+
+    def record_request(self, host: str) -> None:
+        now = monotonic()
+        with self._lock:
+            self._expire(host, now)
+            self._requests[host].append(now)
+
+    def acquire(self, host: str) -> bool:
+        """withdraw one retry from host budget. Returns False if budget exhausted"""
+        now = monotonic()
+        with self._lock:
+            self._expire(host, now)
+            if len(self._retries[host]) >= self.min_retries + self.ratio * len(self._requests[host]):
+                return False
+            self._retries[host].append(now)
+            return True
+
+
+DEFAULT_RETRY_POLICIES = RetryPolicies()
+RETRY_BUDGET = RetryBudget()
+"""default retry budget, shared between all retry transports"""
+
+
+def _parse_retry_after(response: Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+class _RetryState:
+    """retry attempts of one request"""
+
+    def __init__(
+        self, request: Request, policies: RetryPolicies, budget: Optional[RetryBudget], span: Optional[Span] = None
+    ):
+        self.host = request.url.host
+        self.policies = policies
+        self.budget = budget
+        self.span = span
+        self.started_at = monotonic()
+        self.retries = {"connect": 0, "ddos": 0, "status": 0}
+        if budget:
+            budget.record_request(self.host)
+
+    def next_delay(self, kind: str, response: Optional[Response] = None) -> Optional[float]:
+        """delay before next attempt. None - stop retrying"""
+        policy: RetryPolicy = getattr(self.policies, kind)
+        retry = self.retries[kind]
+        if retry + 1 >= policy.attempts:
+            return None
+        delay = policy.backoff(retry)
+        if response is not None and (retry_after := _parse_retry_after(response)) is not None:
+            delay = max(delay, retry_after)
+        if monotonic() - self.started_at + delay > policy.max_elapsed:
+            return None
+        if self.budget and not self.budget.acquire(self.host):
+            logger.warning("[retry] %s retry budget exhausted, stop retrying", self.host)
+            return None
+        self.retries[kind] += 1
+        HTTP_RETRIES.inc(self.host, kind)
+        if self.span:
+            self.span.retries += 1
+        return delay
+
+    def classify(self, response: Response) -> Optional[str]:
+        if have_ddos_protect(response):
+            return "ddos"
+        if response.status_code in self.policies.retry_statuses:
+            return "status"
+        return None
+
+
 class HTTPRetryConnectSyncTransport(HTTPTransport):
-    """Handle attempts connects with delay"""
+    """Handle attempts connects with exponential backoff delays
 
-    ATTEMPTS_CONNECT = 10
-    RETRY_CONNECT_DELAY = 1.2
-    DELAY_INCREASE_STEP = 0.3  # linear increase connect delay
+    :param retry_policies: retry policies for network errors, DDoS detects and status codes
+    :param retry_budget: per-host retries budget. Default - process wide `RETRY_BUDGET`, None - unlimited
+    """
+
+    RETRY_POLICIES: RetryPolicies = DEFAULT_RETRY_POLICIES
+
+    def __init__(
+        self,
+        *args,
+        retry_policies: Optional[RetryPolicies] = None,
+        retry_budget: Optional[RetryBudget] = RETRY_BUDGET,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.retry_policies = retry_policies or self.RETRY_POLICIES
+        self.retry_budget = retry_budget
 
     def handle_request(self, request: Request) -> Response:
-        delay = self.RETRY_CONNECT_DELAY
-        for i in range(self.ATTEMPTS_CONNECT):
+        with start_span("http", request.url.host, str(request.url)) as span:
+            state = _RetryState(request, self.retry_policies, self.retry_budget, span)
+            try:
+                resp = self._handle_request(request, state)
+            except Exception as exc:
+                _observe_error(state, exc)
+                raise
+            _observe_response(state, resp)
+            return resp
+
+    def _handle_request(self, request: Request, state: _RetryState) -> Response:
+        while True:
             try:
                 resp = super().handle_request(request)
-                if have_ddos_protect(resp):
-                    msg = f"'{resp.headers.get('Server')}': {request.url} returns code {resp.status_code}"
-                    raise DDOSServerDetectError(msg)
+            except (NetworkError, TimeoutException) as exc:
+                delay = state.next_delay("connect")
+                if delay is None:
+                    raise
+                _log_retry(state, "connect", request, exc, delay)
+                sleep(delay)
+                continue
+
+            kind = state.classify(resp)
+            if not kind:
                 logger.debug("%s -> %s", repr(request), repr(resp))
                 return resp
 
-            except (NetworkError, TimeoutException, ReadTimeout) as exc:
-                # HACK: stub response to avoid UnboundLocalError
-                resp = locals().get("resp", "")
-
-                exc_name = exc.__class__.__name__
-                exc_msg = getattr(exc, "message", exc.args[0])
-                sleep(delay)
-                logger.warning("[%s] %s: %s, %s -> %s try again", i + 1, exc_name, exc_msg, repr(request), repr(resp))  # type: ignore
-                if isinstance(exc, DDOSServerDetectError) and i == self.ATTEMPTS_CONNECT - 1:
-                    raise exc
-                delay += self.DELAY_INCREASE_STEP
-        return super().handle_request(request)
+            delay = state.next_delay(kind, resp)
+            if delay is None:
+                if kind == "ddos":
+                    resp.close()
+                    raise DDOSServerDetectError(_ddos_message(request, resp))
+                return resp
+            resp.close()
+            _log_retry(state, kind, request, resp, delay)
+            sleep(delay)
 
 
 class HTTPRetryConnectAsyncTransport(AsyncHTTPTransport):
-    """Handle attempts connects with delay"""
+    """Handle attempts connects with exponential backoff delays
+
+    :param retry_policies: retry policies for network errors, DDoS detects and status codes
+    :param retry_budget: per-host retries budget. Default - process wide `RETRY_BUDGET`, None - unlimited
+    """
+
+    RETRY_POLICIES: RetryPolicies = DEFAULT_RETRY_POLICIES
 
-    ATTEMPTS_CONNECT = 10
-    RETRY_CONNECT_DELAY = 1.2
-    DELAY_INCREASE_STEP = 0.3  # linear increase connect delay
+    def __init__(
+        self,
+        *args,
+        retry_policies: Optional[RetryPolicies] = None,
+        retry_budget: Optional[RetryBudget] = RETRY_BUDGET,
+        **kwargs,
+    ):
+        super().__init__(*args, **kwargs)
+        self.retry_policies = retry_policies or self.RETRY_POLICIES
+        self.retry_budget = retry_budget
 
     async def handle_async_request(
         self,
         request: Request,
     ) -> Response:
-        delay = self.RETRY_CONNECT_DELAY
-        for i in range(self.ATTEMPTS_CONNECT):
+        with start_span("http", request.url.host, str(request.url)) as span:
+            state = _RetryState(request, self.retry_policies, self.retry_budget, span)
+            try:
+                resp = await self._handle_async_request(request, state)
+            except Exception as exc:
+                _observe_error(state, exc)
+                raise
+            _observe_response(state, resp)
+            return resp
+
+    async def _handle_async_request(self, request: Request, state: _RetryState) -> Response:
+        while True:
             try:
                 resp = await super().handle_async_request(request)
-                if have_ddos_protect(resp):
-                    msg = f"'{resp.headers.get('Server')}': {request.url} returns code {resp.status_code}"
-                    raise DDOSServerDetectError(msg)
-                logger.debug(
-                    "%s -> %s",
-                    repr(request),
-                    repr(resp),
-                )
+            except (NetworkError, TimeoutException) as exc:
+                delay = state.next_delay("connect")
+                if delay is None:
+                    raise
+                _log_retry(state, "connect", request, exc, delay)
+                await asyncio.sleep(delay)
+                continue
 
+            kind = state.classify(resp)
+            if not kind:
+                logger.debug("%s -> %s", repr(request), repr(resp))
                 return resp
 
-            except (ConnectTimeout, NetworkError, TimeoutException) as exc:
-                # HACK: stub response to avoid UnboundLocalError
-                resp = locals().get("resp", "")
+            delay = state.next_delay(kind, resp)
+            if delay is None:
+                if kind == "ddos":
+                    await resp.aclose()
+                    raise DDOSServerDetectError(_ddos_message(request, resp))
+                return resp
+            await resp.aclose()
+            _log_retry(state, kind, request, resp, delay)
+            await asyncio.sleep(delay)
 
-                exc_name = exc.__class__.__name__
-                exc_msg = getattr(exc, "message", exc.args[0])
 
-                if isinstance(exc, DDOSServerDetectError) and i == self.ATTEMPTS_CONNECT - 1:
-                    raise exc
+def _observe_response(state: _RetryState, resp: Response) -> None:
+    # body is not read by transport: size from header
+    size = int(resp.headers.get("Content-Length") or 0)
+    HTTP_REQUESTS.inc(state.host, str(resp.status_code))
+    HTTP_DURATION.observe(monotonic() - state.started_at, state.host)
+    if size:
+        HTTP_BYTES.inc(state.host, amount=size)
+    if state.span:
+        state.span.status = resp.status_code
+        state.span.bytes = size
 
-                logger.warning("[%s] %s: %s, %s -> %s", i + 1, exc_name, exc_msg, repr(request), repr(resp))  # type: ignore
-                await asyncio.sleep(delay)
-                delay += self.DELAY_INCREASE_STEP
-        return await super().handle_async_request(request)
+
+def _observe_error(state: _RetryState, exc: Exception) -> None:
+    HTTP_REQUESTS.inc(state.host, "error")
+    HTTP_DURATION.observe(monotonic() - state.started_at, state.host)
+    if isinstance(exc, DDOSServerDetectError):
+        DDOS_DETECTED.inc(state.host)
+
+
+def _ddos_message(request: Request, resp: Response) -> str:
+    return f"'{resp.headers.get('Server')}': {request.url} returns code {resp.status_code}"
+
+
+def _log_retry(state: _RetryState, kind: str, request: Request, reason: Union[Exception, Response], delay: float):
+    if isinstance(reason, Exception):
+        reason_msg = f"{reason.__class__.__name__}: {getattr(reason, 'message', reason.args[0] if reason.args else '')}"
+    else:
+        reason_msg = repr(reason)
+    logger.warning("[%s %s] %s, %s try again after %.2fs", kind, state.retries[kind], reason_msg, repr(request), delay)
+
+
+@lru_cache(maxsize=None)
+def _default_ssl_context() -> ssl.SSLContext:
+    """SSL context shared between default transports: load CA certificates once per process"""
+    return create_ssl_context()
 
 
 class BaseHTTPSync(Client):
-    """httpx.Client class with configured user agent and enabled redirects"""
+    """httpx.Client class with configured user agent and enabled redirects
+
+    Optional arguments wrap transport:
+
+    - `cassette` (`anicli_api._cassette.Cassette`) - record/replay transport (offline runs)
+    - `rate_limiter` (`anicli_api._rate_limit.HostRateLimiter`) - per-host rate limit transport
+    - `mirrors` (`anicli_api._mirrors.MirrorPool`) - mirror failover transport (rate limits are per mirror)
+    - `cache` (`anicli_api._http_cache.HTTPCache`) - caching transport (cache hits are not rate limited)
+    """
 
     def __init__(self, **kwargs):
         http2 = kwargs.pop("http2", True)
-        transport = kwargs.pop("transport", HTTPRetryConnectSyncTransport())
+        if "transport" in kwargs:
+            # transport=None - default httpx transport
+            transport = kwargs.pop("transport")
+        else:
+            transport = HTTPRetryConnectSyncTransport(verify=_default_ssl_context())
+        # empty cassette is falsy (__len__)
+        if (cassette := kwargs.pop("cassette", None)) is not None:
+            from anicli_api._cassette import CassetteSyncTransport
+
+            transport = CassetteSyncTransport(cassette, transport)
+        if rate_limiter := kwargs.pop("rate_limiter", None):
+            from anicli_api._rate_limit import RateLimitSyncTransport
+
+            transport = RateLimitSyncTransport(rate_limiter, transport)
+        if mirrors := kwargs.pop("mirrors", None):
+            from anicli_api._mirrors import MirrorSyncTransport
+
+            transport = MirrorSyncTransport(mirrors, transport)
+        if cache := kwargs.pop("cache", None):
+            from anicli_api._http_cache import CacheSyncTransport
+
+            transport = CacheSyncTransport(cache, transport)
         headers = kwargs.pop("headers", HEADERS.copy())
         follow_redirects = kwargs.pop("follow_redirects", True)
 
@@ -160,11 +412,40 @@ class BaseHTTPSync(Client):
 
 
 class BaseHTTPAsync(AsyncClient):
-    """httpx.AsyncClient class with configured user agent and enabled redirects"""
+    """httpx.AsyncClient class with configured user agent and enabled redirects
+
+    Optional arguments wrap transport:
+
+    - `cassette` (`anicli_api._cassette.Cassette`) - record/replay transport (offline runs)
+    - `rate_limiter` (`anicli_api._rate_limit.HostRateLimiter`) - per-host rate limit transport
+    - `mirrors` (`anicli_api._mirrors.MirrorPool`) - mirror failover transport (rate limits are per mirror)
+    - `cache` (`anicli_api._http_cache.HTTPCache`) - caching transport (cache hits are not rate limited)
+    """
 
     def __init__(self, **kwargs):
         http2 = kwargs.pop("http2", True)
-        transport = kwargs.pop("transport", HTTPRetryConnectAsyncTransport())
+        if "transport" in kwargs:
+            # transport=None - default httpx transport
+            transport = kwargs.pop("transport")
+        else:
+            transport = HTTPRetryConnectAsyncTransport(verify=_default_ssl_context())
+        # empty cassette is falsy (__len__)
+        if (cassette := kwargs.pop("cassette", None)) is not None:
+            from anicli_api._cassette import CassetteAsyncTransport
+
+            transport = CassetteAsyncTransport(cassette, transport)
+        if rate_limiter := kwargs.pop("rate_limiter", None):
+            from anicli_api._rate_limit import RateLimitAsyncTransport
+
+            transport = RateLimitAsyncTransport(rate_limiter, transport)
+        if mirrors := kwargs.pop("mirrors", None):
+            from anicli_api._mirrors import MirrorAsyncTransport
+
+            transport = MirrorAsyncTransport(mirrors, transport)
+        if cache := kwargs.pop("cache", None):
+            from anicli_api._http_cache import CacheAsyncTransport
+
+            transport = CacheAsyncTransport(cache, transport)
         headers = kwargs.pop("headers", HEADERS.copy())
         follow_redirects = kwargs.pop("follow_redirects", True)
 
@@ -173,3 +454,60 @@ class BaseHTTPAsync(AsyncClient):
 
 HTTPSync = BaseHTTPSync
 HTTPAsync = BaseHTTPAsync
+
+
+class HTTPSession:
+    """lazy pair of http clients: every client created on first access.
+
+    Creating httpx clients is expensive (SSL context setup), short-lived scripts pay only for used clients
+
+    :param httpx_kwargs: BaseHTTPSync and BaseHTTPAsync configuration
+    """
+
+    def __init__(self, **httpx_kwargs):
+        self._httpx_kwargs = httpx_kwargs
+        self._lock = threading.Lock()
+        self._http: Optional[Client] = None
+        self._http_async: Optional[AsyncClient] = None
+
+    @property
+    def http(self) -> Client:
+        if self._http is None:
+            with self._lock:
+                if self._http is None:
+                    self._http = BaseHTTPSync(**self._httpx_kwargs)
+        return self._http
+
+    @http.setter
+    def http(self, http_client: Client):
+        self._http = http_client
+
+    @property
+    def http_async(self) -> AsyncClient:
+        if self._http_async is None:
+            with self._lock:
+                if self._http_async is None:
+                    self._http_async = BaseHTTPAsync(**self._httpx_kwargs)
+        return self._http_async
+
+    @http_async.setter
+    def http_async(self, http_async_client: AsyncClient):
+        self._http_async = http_async_client
+
+    def close(self) -> None:
+        """close sync client, if created"""
+        if self._http is not None:
+            self._http.close()
+
+    async def aclose(self) -> None:
+        """close created clients"""
+        self.close()
+        if self._http_async is not None:
+            await self._http_async.aclose()
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} http={self._http is not None} http_async={self._http_async is not None}>"
+
+
+DEFAULT_SESSION = HTTPSession()
+"""process wide session, used by objects created without session or clients"""
@@ -0,0 +1,355 @@
+"""Opt-in persistent HTTP response cache
+
+Cache transports wrap `HTTPRetryConnectSyncTransport`/`HTTPRetryConnectAsyncTransport` (or any other httpx
+transport) and serve repeated requests (ongoing, search, anime pages, player json...) from local storage:
+
+- TTL configured per host/path regex rules. Requests without matched rule and `default_ttl=0` are not cached
+- expired entries with ETag/Last-Modified are revalidated by conditional request (304 - serve cached body)
+- responses stored in SQLite database (zlib compressed), size bounded with LRU eviction
+- `HTTPCache.bypass = True` disables cache globally, `extensions={"cache_bypass": True}` - for one request
+
+Usage:
+
+    >>> from anicli_api._http import HTTPSync, HTTPAsync
+    >>> from anicli_api._http_cache import HTTPCache, CacheRule, SQLiteCacheStorage
+    >>> from anicli_api.source.animego import Extractor
+    >>>
+    >>> cache = HTTPCache(
+    ...     SQLiteCacheStorage("~/.cache/anicli_api/http.sqlite"),
+    ...     rules=[CacheRule(r"animego\\.me/anime/\\w+$", 60 * 60), CacheRule(r"animego\\.me/", 60 * 5)],
+    ... )
+    >>> ex = Extractor(http_client=HTTPSync(cache=cache), http_async_client=HTTPAsync(cache=cache))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Optional, Pattern, Union
+
+from httpx import AsyncBaseTransport, BaseTransport, Request, Response
+
+from anicli_api._http import HTTPRetryConnectAsyncTransport, HTTPRetryConnectSyncTransport
+from anicli_api._logger import logger
+from anicli_api._metrics import CACHE_REQUESTS
+from anicli_api.typing import NamedTuple, Sequence
+
+__all__ = [
+    "CacheRule",
+    "CacheEntry",
+    "SQLiteCacheStorage",
+    "HTTPCache",
+    "CacheSyncTransport",
+    "CacheAsyncTransport",
+]
+
+_CONDITIONAL_HEADERS = ("if-none-match", "if-modified-since")
+
+
+class CacheRule(NamedTuple):
+    pattern: Union[str, Pattern[str]]
+    """regular expression, searched in `{host}{path}` string. eg: `r"animego\\.me/player/"`"""
+    ttl: float
+    """time to live in seconds. 0 - do not cache matched requests"""
+
+
+class CacheEntry(NamedTuple):
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    """raw (not decoded) response body"""
+    created_at: float
+
+    @property
+    def etag(self) -> Optional[str]:
+        return self._header("etag")
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        return self._header("last-modified")
+
+    def _header(self, name: str) -> Optional[str]:
+        return next((v for k, v in self.headers if k.lower() == name), None)
+
+    def to_response(self, request: Request) -> Response:
+        return Response(
+            self.status_code,
+            headers=self.headers,
+            content=self.content,
+            request=request,
+            extensions={"from_cache": True},
+        )
+
+
+class SQLiteCacheStorage:
+    """thread-safe SQLite responses storage with LRU eviction
+
+    :param path: database path. `:memory:` - in-memory database
+    :param max_size: max total size of stored (compressed) bodies in bytes
+    """
+
+    def __init__(self, path: Union[str, Path] = ":memory:", max_size: int = 64 * 1024 * 1024):
+        self.max_size = max_size
+        if str(path) != ":memory:":
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, status_code INTEGER, headers TEXT, content BLOB, "
+                "size INTEGER, created_at REAL, accessed_at REAL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)")
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            # fetchall: finish the statement, otherwise autocommit of next writes is delayed
+            rows = self._conn.execute(
+                "SELECT status_code, headers, content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchall()
+            if not rows:
+                return None
+            self._conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        status_code, headers, content, created_at = rows[0]
+        return CacheEntry(status_code, [tuple(h) for h in json.loads(headers)], zlib.decompress(content), created_at)  # type: ignore[misc]
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        content = zlib.compress(entry.content)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    entry.status_code,
+                    json.dumps(entry.headers),
+                    content,
+                    len(content),
+                    entry.created_at,
+                    time.time(),
+                ),
+            )
+            self._evict()
+
+    def touch(self, key: str, created_at: float) -> None:
+        """mark entry as fresh (after success revalidation)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET created_at = ?, accessed_at = ? WHERE key = ?", (created_at, time.time(), key)
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def size(self) -> int:
+        """total size of stored bodies in bytes"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchall()[0][0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchall()[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchall()[0][0]
+        if total <= self.max_size:
+            return
+        evicted = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            if total <= self.max_size:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        logger.debug("[http cache] evicted %s entries", len(evicted))
+
+
+class HTTPCache:
+    """cache policy and storage, shared between sync and async transports
+
+    :param storage: responses storage. Default - in-memory SQLite database
+    :param rules: TTL rules. First matched rule is used
+    :param default_ttl: TTL for requests without matched rule. 0 - do not cache
+    :param methods: cacheable request methods
+    """
+
+    def __init__(
+        self,
+        storage: Optional[SQLiteCacheStorage] = None,
+        rules: Sequence[CacheRule] = (),
+        default_ttl: float = 0,
+        methods: Sequence[str] = ("GET",),
+    ):
+        self.storage = storage if storage is not None else SQLiteCacheStorage()
+        self.rules = [CacheRule(re.compile(r.pattern), r.ttl) for r in rules]
+        self.default_ttl = default_ttl
+        self.methods = {m.upper() for m in methods}
+        self.bypass = False
+        """disable cache for all requests"""
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+
+    def ttl_for(self, request: Request) -> float:
+        """TTL of request. 0 - request should not be cached"""
+        if self.bypass or request.method not in self.methods or request.extensions.get("cache_bypass"):
+            return 0
+        if any(h in request.headers for h in _CONDITIONAL_HEADERS):
+            # conditional request created by user: do not interfere
+            return 0
+        target = f"{request.url.host}{request.url.path}"
+        for rule in self.rules:
+            if rule.pattern.search(target):  # type: ignore[union-attr]
+                return rule.ttl
+        return self.default_ttl
+
+    @staticmethod
+    def key(request: Request) -> str:
+        return f"{request.method} {request.url}"
+
+    def is_fresh(self, request: Request, entry: CacheEntry, ttl: float) -> bool:
+        if "no-cache" in request.headers.get("cache-control", ""):
+            return False
+        return time.time() - entry.created_at < ttl
+
+    @staticmethod
+    def add_validators(request: Request, entry: CacheEntry) -> bool:
+        """add conditional headers for revalidate expired entry. Returns False if entry has no validators"""
+        if entry.etag:
+            request.headers["if-none-match"] = entry.etag
+        if entry.last_modified:
+            request.headers["if-modified-since"] = entry.last_modified
+        return bool(entry.etag or entry.last_modified)
+
+    @staticmethod
+    def is_cacheable(response: Response) -> bool:
+        return response.status_code == 200 and "no-store" not in response.headers.get("cache-control", "")
+
+    @staticmethod
+    def to_entry(response: Response, content: bytes) -> CacheEntry:
+        # body stored raw: drop framing headers, httpx recalculates Content-Length
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in ("transfer-encoding", "content-length")
+        ]
+        return CacheEntry(response.status_code, headers, content, time.time())
+
+
+class CacheSyncTransport(BaseTransport):
+    """caching transport wrapper
+
+    :param cache: cache policy and storage
+    :param transport: wrapped transport. Default - HTTPRetryConnectSyncTransport
+    """
+
+    def __init__(self, cache: HTTPCache, transport: Optional[BaseTransport] = None):
+        self.cache = cache
+        self.transport = transport or HTTPRetryConnectSyncTransport()
+
+    def handle_request(self, request: Request) -> Response:
+        cache = self.cache
+        ttl = cache.ttl_for(request)
+        if ttl <= 0:
+            return self.transport.handle_request(request)
+
+        key = cache.key(request)
+        entry = cache.storage.get(key)
+        if entry and cache.is_fresh(request, entry, ttl):
+            cache.hits += 1
+            CACHE_REQUESTS.inc(request.url.host, "hit")
+            logger.debug("[http cache] hit %s", key)
+            return entry.to_response(request)
+
+        revalidate = bool(entry) and cache.add_validators(request, entry)  # type: ignore[arg-type]
+        response = self.transport.handle_request(request)
+        if revalidate and response.status_code == 304:
+            response.close()
+            cache.revalidated += 1
+            CACHE_REQUESTS.inc(request.url.host, "revalidated")
+            cache.storage.touch(key, time.time())
+            logger.debug("[http cache] revalidated %s", key)
+            return entry.to_response(request)  # type: ignore[union-attr]
+
+        cache.misses += 1
+        CACHE_REQUESTS.inc(request.url.host, "miss")
+        if not cache.is_cacheable(response):
+            return response
+        try:
+            # raw stream: body is decoded by client
+            content = b"".join(response.stream)  # type: ignore[arg-type]
+        finally:
+            response.close()
+        entry = cache.to_entry(response, content)
+        cache.storage.set(key, entry)
+        return entry.to_response(request)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class CacheAsyncTransport(AsyncBaseTransport):
+    """caching async transport wrapper. Storage calls are executed in threads
+
+    :param cache: cache policy and storage
+    :param transport: wrapped transport. Default - HTTPRetryConnectAsyncTransport
+    """
+
+    def __init__(self, cache: HTTPCache, transport: Optional[AsyncBaseTransport] = None):
+        self.cache = cache
+        self.transport = transport or HTTPRetryConnectAsyncTransport()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        cache = self.cache
+        ttl = cache.ttl_for(request)
+        if ttl <= 0:
+            return await self.transport.handle_async_request(request)
+
+        key = cache.key(request)
+        entry = await asyncio.to_thread(cache.storage.get, key)
+        if entry and cache.is_fresh(request, entry, ttl):
+            cache.hits += 1
+            CACHE_REQUESTS.inc(request.url.host, "hit")
+            logger.debug("[http cache] hit %s", key)
+            return entry.to_response(request)
+
+        revalidate = bool(entry) and cache.add_validators(request, entry)  # type: ignore[arg-type]
+        response = await self.transport.handle_async_request(request)
+        if revalidate and response.status_code == 304:
+            await response.aclose()
+            cache.revalidated += 1
+            CACHE_REQUESTS.inc(request.url.host, "revalidated")
+            await asyncio.to_thread(cache.storage.touch, key, time.time())
+            logger.debug("[http cache] revalidated %s", key)
+            return entry.to_response(request)  # type: ignore[union-attr]
+
+        cache.misses += 1
+        CACHE_REQUESTS.inc(request.url.host, "miss")
+        if not cache.is_cacheable(response):
+            return response
+        try:
+            content = b"".join([chunk async for chunk in response.stream])  # type: ignore[union-attr]
+        finally:
+            await response.aclose()
+        entry = cache.to_entry(response, content)
+        await asyncio.to_thread(cache.storage.set, key, entry)
+        return entry.to_response(request)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
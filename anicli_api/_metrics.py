@@ -0,0 +1,256 @@
+"""Prometheus-style metrics of HTTP and extractor activity
+
+Counters and histograms are maintained by the library (process wide `METRICS` registry):
+
+- `anicli_http_requests_total{host,status}` - requests by final status code (`error` - network error, DDoS detect)
+- `anicli_http_request_duration_seconds{host}` - request time, include retries
+- `anicli_http_retries_total{host,kind}` - retries by kind: `connect`, `ddos`, `status`
+- `anicli_ddos_detected_total{host}` - `DDOSServerDetectError` raises
+- `anicli_http_response_bytes_total{host}` - response body size (by Content-Length header)
+- `anicli_http_cache_requests_total{host,result}` - http cache `hit`, `miss`, `revalidated`
+- `anicli_parse_cpu_seconds{parser}` - thread CPU time of generated parser (`HTMLDocument.parse`) calls
+- `anicli_videos_total{player}` - videos resolved by player extractor (`Kodik`, `Aniboom`, `CdnVideoHub`...)
+- `anicli_mirror_failovers_total{host}`, `anicli_mirror_hedges_total{host}` - requests moved from failed mirror,
+  hedged requests by slow mirror (see `anicli_api._mirrors`)
+
+Per-stage latency (`anicli_stage_duration_seconds{source,stage}`, `anicli_stage_errors_total{source,stage}`)
+is collected from tracing hooks: add `MetricsTracer` (see `anicli_api._tracing`).
+
+Usage:
+
+    >>> from anicli_api._metrics import METRICS, MetricsTracer
+    >>> from anicli_api._tracing import add_tracer
+    >>> add_tracer(MetricsTracer())
+    >>> # GET /metrics handler of resolver service
+    >>> body = METRICS.expose()
+"""
+
+from __future__ import annotations
+
+import bisect
+import math
+import threading
+from typing import Any, Optional, Union
+
+from anicli_api.typing import NamedTuple, Sequence
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "HistogramValue",
+    "MetricsRegistry",
+    "MetricsTracer",
+    "METRICS",
+    "LATENCY_BUCKETS",
+    "CPU_BUCKETS",
+]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+CPU_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    """monotonic counter with labels
+
+    :param name: metric name
+    :param documentation: HELP text
+    :param labelnames: label names. Values are passed positionally to `inc`
+    """
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0.0)
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}" for k, v in items]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class HistogramValue(NamedTuple):
+    buckets: tuple[int, ...]
+    """observations count by bucket (not cumulative), last - +Inf bucket"""
+    sum: float
+    observations: int
+    """total observations count (exposed as `<name>_count`)"""
+
+
+class Histogram:
+    """histogram with fixed buckets and labels
+
+    :param name: metric name
+    :param documentation: HELP text
+    :param labelnames: label names. Values are passed positionally to `observe`
+    :param buckets: sorted upper bounds. +Inf bucket added automatically
+    """
+
+    TYPE = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        # labels: [bucket counts..., +Inf count, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if (row := self._values.get(labels)) is None:
+                row = self._values[labels] = [0] * (len(self.buckets) + 2)
+            row[index] += 1
+            row[-1] += value
+
+    def value(self, *labels: str) -> HistogramValue:
+        with self._lock:
+            row = list(self._values.get(labels) or [0] * (len(self.buckets) + 2))
+        counts = tuple(int(c) for c in row[:-1])
+        return HistogramValue(counts, row[-1], sum(counts))
+
+    def samples(self) -> list[str]:
+        with self._lock:
+            labels = sorted(self._values)
+        lines = []
+        for key in labels:
+            counts, total, observations = self.value(*key)
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                cumulative += bucket_count
+                le = _format_labels((*self.labelnames, "le"), (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {observations}")
+        return lines
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """named metrics storage with Prometheus text exposition"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: dict[str, Union[Counter, Histogram]] = {}
+
+    def _get_or_create(self, cls: type, name: str, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"metric {name!r} already registered as {metric.TYPE}")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        """get or create counter"""
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """get or create histogram"""
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[Union[Counter, Histogram]]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def expose(self) -> str:
+        """metrics in Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            help_text = metric.documentation.replace("\\", "\\\\").replace("\n", "\\n")
+            lines.append(f"# HELP {metric.name} {help_text}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """reset all values. Metrics stay registered"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+
+METRICS = MetricsRegistry()
+"""process wide metrics registry"""
+
+HTTP_REQUESTS = METRICS.counter("anicli_http_requests_total", "HTTP requests by final status code", ("host", "status"))
+HTTP_DURATION = METRICS.histogram(
+    "anicli_http_request_duration_seconds", "HTTP request time, include retries", ("host",)
+)
+HTTP_RETRIES = METRICS.counter("anicli_http_retries_total", "HTTP retries by kind", ("host", "kind"))
+DDOS_DETECTED = METRICS.counter("anicli_ddos_detected_total", "DDoS protection detects", ("host",))
+HTTP_BYTES = METRICS.counter("anicli_http_response_bytes_total", "HTTP response body bytes", ("host",))
+CACHE_REQUESTS = METRICS.counter("anicli_http_cache_requests_total", "HTTP cache lookups", ("host", "result"))
+PARSE_CPU = METRICS.histogram(
+    "anicli_parse_cpu_seconds", "Generated parser thread CPU time", ("parser",), buckets=CPU_BUCKETS
+)
+VIDEOS = METRICS.counter("anicli_videos_total", "Videos resolved by player extractor", ("player",))
+MIRROR_FAILOVERS = METRICS.counter("anicli_mirror_failovers_total", "Requests failed over to next mirror", ("host",))
+MIRROR_HEDGES = METRICS.counter("anicli_mirror_hedges_total", "Hedged requests by slow mirror", ("host",))
+
+
+class MetricsTracer:
+    """tracing hooks adapter: stage spans latency and errors to registry histograms
+
+    :param registry: metrics registry. Default - process wide `METRICS`
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        registry = registry or METRICS
+        self.duration = registry.histogram("anicli_stage_duration_seconds", "Chain stage latency", ("source", "stage"))
+        self.errors = registry.counter("anicli_stage_errors_total", "Chain stage errors", ("source", "stage"))
+
+    def on_span_start(self, span: Any) -> None:
+        pass
+
+    def on_span_end(self, span: Any) -> None:
+        # http spans are already measured by transport metrics
+        if span.stage == "http":
+            return
+        self.duration.observe(span.duration, span.source, span.stage)
+        if span.error:
+            self.errors.inc(span.source, span.stage)
@@ -0,0 +1,378 @@
+"""Mirror sets of rotating domains with health tracking, failover and hedged requests
+
+Sources and players rotate domains (animego.me/.one/.org, hdrezka, kodik.info/aniqit.com). `MirrorPool` keeps
+a mirror set per source and health score per mirror host, updated by every request:
+
+- latency EWMA and recent latencies (p95), error rate EWMA (connect errors, DDoS detects, 5xx)
+- failed mirror goes down for `cooldown` seconds (doubled on consecutive failures)
+
+Mirror transport sends request of mirror set host to the best mirror (host in request url is replaced).
+On `DDOSServerDetectError` or connect/timeout errors (after retry transport attempts) request fails over
+to the next mirror. Async transport optionally races two best mirrors (`hedge=True`): second request is sent
+if the first is not completed in p95 latency of the best mirror, the first response wins.
+
+Response url and redirects keep original host: parsers and `url_canonical` see the requested url.
+
+Usage:
+
+    >>> from anicli_api._http import HTTPSync, HTTPAsync
+    >>> from anicli_api._mirrors import MIRRORS, MirrorPool, install_mirrors
+    >>> from anicli_api.source.animego import Extractor
+    >>>
+    >>> ex = Extractor(http_client=HTTPSync(mirrors=MIRRORS), http_async_client=HTTPAsync(mirrors=MIRRORS))
+    >>> # or wrap already created client
+    >>> install_mirrors(ex.http_async, MirrorPool(hedge=True))
+    >>> MIRRORS.stats()["animego.me"].score
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from collections import deque
+from time import monotonic
+from typing import Any, Mapping, Optional, Union
+
+from httpx import (
+    AsyncBaseTransport,
+    AsyncClient,
+    BaseTransport,
+    Client,
+    NetworkError,
+    Request,
+    Response,
+    TimeoutException,
+)
+
+from anicli_api._http import DDOSServerDetectError, HTTPRetryConnectAsyncTransport, HTTPRetryConnectSyncTransport
+from anicli_api._logger import logger
+from anicli_api._metrics import MIRROR_FAILOVERS, MIRROR_HEDGES
+from anicli_api.typing import NamedTuple, Sequence
+
+__all__ = [
+    "MirrorHealth",
+    "MirrorPool",
+    "MirrorSyncTransport",
+    "MirrorAsyncTransport",
+    "install_mirrors",
+    "DEFAULT_MIRRORS",
+    "MIRRORS",
+]
+
+FAILOVER_ERRORS = (DDOSServerDetectError, NetworkError, TimeoutException)
+"""errors of mirror, request is sent to the next mirror"""
+
+DEFAULT_MIRRORS: dict[str, tuple[str, ...]] = {
+    "animego": ("animego.me", "animego.one", "animego.org"),
+    "hdrezka": ("hdrezka-home.tv", "rezka.ag", "hdrezka.ag"),
+    "kodik": ("kodik.info", "aniqit.com"),
+}
+"""mirror set name (source, player): mirror hosts in priority order"""
+
+
+class MirrorHealth(NamedTuple):
+    requests: int
+    errors: int
+    ddos: int
+    latency: Optional[float]
+    """latency EWMA (seconds). None - no successful requests"""
+    error_rate: float
+    """errors EWMA (0..1)"""
+    p95: Optional[float]
+    score: float
+    """ranking score (lower is better)"""
+    down_for: float
+    """seconds until mirror is up again. 0 - mirror is up"""
+
+
+class _HostState:
+    def __init__(self, samples: int):
+        self.requests = 0
+        self.errors = 0
+        self.ddos = 0
+        self.failures = 0
+        """consecutive failures"""
+        self.latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.latencies: deque[float] = deque(maxlen=samples)
+        self.down_until = 0.0
+
+
+class MirrorPool:
+    """mirror sets table with per-host health scores
+
+    :param mirrors: mirror set name -> hosts table. Default - `DEFAULT_MIRRORS`
+    :param cooldown: seconds, failed mirror is not used (doubled on consecutive failures, max 10 minutes)
+    :param alpha: EWMA smoothing factor
+    :param unknown_latency: latency score of mirror without successful requests
+    :param hedge: race two best mirrors in async transport
+    :param hedge_min_delay: min delay before hedged request
+    :param hedge_default_delay: hedge delay if best mirror has less than `min_samples` latencies
+    :param min_samples: min latencies count for p95 hedge delay
+    """
+
+    def __init__(
+        self,
+        mirrors: Optional[Mapping[str, Sequence[str]]] = None,
+        *,
+        cooldown: float = 30.0,
+        alpha: float = 0.2,
+        unknown_latency: float = 1.0,
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        hedge_default_delay: float = 1.0,
+        min_samples: int = 5,
+    ):
+        self.mirrors = {name: tuple(hosts) for name, hosts in (DEFAULT_MIRRORS if mirrors is None else mirrors).items()}
+        self.cooldown = cooldown
+        self.alpha = alpha
+        self.unknown_latency = unknown_latency
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.min_samples = min_samples
+        self._lock = threading.Lock()
+        self._groups = {host: hosts for hosts in self.mirrors.values() for host in hosts}
+        self._hosts: dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        if (state := self._hosts.get(host)) is None:
+            state = self._hosts[host] = _HostState(samples=50)
+        return state
+
+    def _score(self, state: Optional[_HostState]) -> float:
+        if state is None or state.latency is None:
+            latency = self.unknown_latency
+        else:
+            latency = state.latency
+        error_rate = state.error_rate if state else 0.0
+        return latency * (1 + 10 * error_rate)
+
+    def group(self, host: str) -> Optional[tuple[str, ...]]:
+        """mirror hosts of host mirror set. None - host is not a mirror"""
+        return self._groups.get(host)
+
+    def ranked(self, host: str) -> list[str]:
+        """mirrors of host mirror set, best first: up mirrors by score, then down mirrors by recovery time.
+        Empty list - host is not a mirror"""
+        hosts = self._groups.get(host)
+        if not hosts:
+            return []
+        now = monotonic()
+        with self._lock:
+            states = {h: self._hosts.get(h) for h in hosts}
+            up = [h for h in hosts if not (s := states[h]) or s.down_until <= now]
+            down = [h for h in hosts if h not in up]
+            up.sort(key=lambda h: self._score(states[h]))
+            down.sort(key=lambda h: states[h].down_until)  # type: ignore[union-attr]
+        return up + down
+
+    def record_response(self, host: str, status_code: int, elapsed: float) -> None:
+        """update mirror health by response. 5xx status is counted as error, mirror stays up"""
+        error = status_code >= 500
+        with self._lock:
+            state = self._state(host)
+            state.requests += 1
+            state.error_rate += self.alpha * (error - state.error_rate)
+            if error:
+                state.errors += 1
+                return
+            state.failures = 0
+            state.down_until = 0.0
+            state.latencies.append(elapsed)
+            state.latency = elapsed if state.latency is None else state.latency + self.alpha * (elapsed - state.latency)
+
+    def record_failure(self, host: str, error: BaseException) -> None:
+        """update mirror health by failover error: mirror goes down for cooldown"""
+        with self._lock:
+            state = self._state(host)
+            state.requests += 1
+            state.errors += 1
+            state.ddos += isinstance(error, DDOSServerDetectError)
+            state.error_rate += self.alpha * (1 - state.error_rate)
+            state.failures += 1
+            cooldown = min(self.cooldown * 2 ** (state.failures - 1), 600.0)
+            state.down_until = monotonic() + cooldown
+        logger.warning("[mirrors] %s is down for %.0fs: %r", host, cooldown, error)
+
+    def _p95(self, state: Optional[_HostState]) -> Optional[float]:
+        if state is None or len(state.latencies) < self.min_samples:
+            return None
+        latencies = sorted(state.latencies)
+        return latencies[min(len(latencies) - 1, math.ceil(0.95 * len(latencies)) - 1)]
+
+    def hedge_delay(self, host: str) -> float:
+        """delay before hedged request: p95 latency of mirror"""
+        with self._lock:
+            p95 = self._p95(self._hosts.get(host))
+        return max(self.hedge_min_delay, self.hedge_default_delay if p95 is None else p95)
+
+    def stats(self) -> dict[str, MirrorHealth]:
+        """health of mirrors with requests"""
+        now = monotonic()
+        with self._lock:
+            return {
+                host: MirrorHealth(
+                    requests=state.requests,
+                    errors=state.errors,
+                    ddos=state.ddos,
+                    latency=state.latency,
+                    error_rate=state.error_rate,
+                    p95=self._p95(state),
+                    score=self._score(state),
+                    down_for=max(0.0, state.down_until - now),
+                )
+                for host, state in self._hosts.items()
+            }
+
+
+def _rewrite(request: Request, host: str) -> Request:
+    if request.url.host == host:
+        return request
+    url = request.url.copy_with(host=host)
+    headers = request.headers.copy()
+    headers["Host"] = url.netloc.decode("ascii")
+    return Request(request.method, url, headers=headers, stream=request.stream, extensions=request.extensions)
+
+
+class MirrorSyncTransport(BaseTransport):
+    """mirror failover transport wrapper. Requests of hosts not in mirror sets are passed as is
+
+    :param pool: mirror pool
+    :param transport: wrapped transport. Default - HTTPRetryConnectSyncTransport
+    """
+
+    def __init__(self, pool: MirrorPool, transport: Optional[BaseTransport] = None):
+        self.pool = pool
+        self.transport = transport or HTTPRetryConnectSyncTransport()
+
+    def _send(self, request: Request, host: str) -> Response:
+        started = monotonic()
+        try:
+            response = self.transport.handle_request(_rewrite(request, host))
+        except FAILOVER_ERRORS as e:
+            self.pool.record_failure(host, e)
+            raise
+        self.pool.record_response(host, response.status_code, monotonic() - started)
+        return response
+
+    def handle_request(self, request: Request) -> Response:
+        hosts = self.pool.ranked(request.url.host)
+        if not hosts:
+            return self.transport.handle_request(request)
+        for i, host in enumerate(hosts):
+            try:
+                return self._send(request, host)
+            except FAILOVER_ERRORS:
+                if i == len(hosts) - 1:
+                    raise
+                MIRROR_FAILOVERS.inc(host)
+                logger.warning("[mirrors] failover %s -> %s", host, hosts[i + 1])
+        raise AssertionError("unreachable")
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class MirrorAsyncTransport(AsyncBaseTransport):
+    """mirror failover async transport wrapper with optional hedged requests (`MirrorPool.hedge`).
+    Requests of hosts not in mirror sets are passed as is
+
+    :param pool: mirror pool
+    :param transport: wrapped transport. Default - HTTPRetryConnectAsyncTransport
+    """
+
+    def __init__(self, pool: MirrorPool, transport: Optional[AsyncBaseTransport] = None):
+        self.pool = pool
+        self.transport = transport or HTTPRetryConnectAsyncTransport()
+
+    async def _send(self, request: Request, host: str) -> Response:
+        started = monotonic()
+        try:
+            response = await self.transport.handle_async_request(_rewrite(request, host))
+        except FAILOVER_ERRORS as e:
+            self.pool.record_failure(host, e)
+            raise
+        self.pool.record_response(host, response.status_code, monotonic() - started)
+        return response
+
+    async def handle_async_request(self, request: Request) -> Response:
+        hosts = self.pool.ranked(request.url.host)
+        if not hosts:
+            return await self.transport.handle_async_request(request)
+        # requests with body are not raced: stream may be consumed once
+        if self.pool.hedge and len(hosts) > 1 and request.method in ("GET", "HEAD"):
+            return await self._hedged(request, hosts)
+        for i, host in enumerate(hosts):
+            try:
+                return await self._send(request, host)
+            except FAILOVER_ERRORS:
+                if i == len(hosts) - 1:
+                    raise
+                MIRROR_FAILOVERS.inc(host)
+                logger.warning("[mirrors] failover %s -> %s", host, hosts[i + 1])
+        raise AssertionError("unreachable")
+
+    async def _hedged(self, request: Request, hosts: list[str]) -> Response:
+        remaining = list(hosts)
+        tasks: dict[asyncio.Future[Response], str] = {}
+
+        def launch() -> None:
+            host = remaining.pop(0)
+            tasks[asyncio.ensure_future(self._send(request, host))] = host
+
+        launch()
+        delay = self.pool.hedge_delay(hosts[0])
+        hedged = False
+        error: Optional[BaseException] = None
+        try:
+            while tasks:
+                timeout = delay if not hedged and remaining else None
+                done, _ = await asyncio.wait(tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    hedged = True
+                    MIRROR_HEDGES.inc(hosts[0])
+                    logger.debug("[mirrors] %s not responded in %.3fs, hedge to %s", hosts[0], delay, remaining[0])
+                    launch()
+                    continue
+                for task in done:
+                    host = tasks.pop(task)
+                    if (exc := task.exception()) is None:
+                        return task.result()
+                    if not isinstance(exc, FAILOVER_ERRORS):
+                        raise exc
+                    error = exc
+                    if remaining:
+                        MIRROR_FAILOVERS.inc(host)
+                        logger.warning("[mirrors] failover %s -> %s", host, remaining[0])
+                        launch()
+            raise error  # type: ignore[misc]
+        finally:
+            # hedge loser: cancel and close response, if completed at the same time
+            for task in tasks:
+                task.cancel()
+            for result in await asyncio.gather(*tasks, return_exceptions=True):
+                if isinstance(result, Response):
+                    await result.aclose()
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def install_mirrors(client: Union[Client, AsyncClient, Any], pool: MirrorPool) -> None:
+    """wrap transport of already created client
+
+    :param client: httpx.Client, httpx.AsyncClient or generated API client
+    :param pool: mirror pool
+    """
+    # generated API clients keep httpx client in `_client` attribute
+    http = client if isinstance(client, (Client, AsyncClient)) else client._client
+    if isinstance(http, AsyncClient):
+        http._transport = MirrorAsyncTransport(pool, http._transport)  # type: ignore[arg-type]
+    else:
+        http._transport = MirrorSyncTransport(pool, http._transport)
+
+
+MIRRORS = MirrorPool()
+"""process wide mirror pool with `DEFAULT_MIRRORS` table"""
@@ -0,0 +1,299 @@
+"""Per-host rate limiter and concurrency governor
+
+Token bucket (requests per second with burst) plus max in-flight requests limit, keyed by netloc.
+Limits are configured by declarative table: host or parent domain -> `HostLimit`. One `HostRateLimiter`
+can be shared between all http clients (sources, players, API clients) to push maximum throughput without
+tripping DDoS protections.
+
+- in-flight limits are counted separately for threads and for every event loop
+- cache hits (`anicli_api._http_cache`) are not rate limited: rate limit transport wraps retry transport
+
+Usage:
+
+    >>> from anicli_api._http import HTTPSync, HTTPAsync
+    >>> from anicli_api._rate_limit import RATE_LIMITER, install_rate_limiter
+    >>> from anicli_api.source.animego import Extractor
+    >>>
+    >>> ex = Extractor(
+    ...     http_client=HTTPSync(rate_limiter=RATE_LIMITER),
+    ...     http_async_client=HTTPAsync(rate_limiter=RATE_LIMITER),
+    ... )
+    >>> # or wrap already created client (httpx client or generated API client)
+    >>> install_rate_limiter(ex.http, RATE_LIMITER)
+    >>> RATE_LIMITER.stats()["animego.me"].queued_max
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from time import monotonic, sleep
+from typing import Any, Mapping, Optional, Union
+from weakref import WeakKeyDictionary
+
+from httpx import AsyncBaseTransport, AsyncClient, BaseTransport, Client, Request, Response
+
+from anicli_api._http import HTTPRetryConnectAsyncTransport, HTTPRetryConnectSyncTransport
+from anicli_api._logger import logger
+from anicli_api.typing import NamedTuple
+
+__all__ = [
+    "HostLimit",
+    "HostStats",
+    "HostRateLimiter",
+    "RateLimitSyncTransport",
+    "RateLimitAsyncTransport",
+    "install_rate_limiter",
+    "DEFAULT_HOST_LIMITS",
+    "RATE_LIMITER",
+]
+
+
+class HostLimit(NamedTuple):
+    rate: float = 5.0
+    """requests per second. 0 - unlimited"""
+    burst: int = 5
+    """token bucket capacity"""
+    max_in_flight: int = 8
+    """max concurrent requests. 0 - unlimited"""
+
+
+class HostStats(NamedTuple):
+    requests: int
+    queued_total: float
+    """total seconds spent in queue (rate limit delay + waiting for in-flight slot)"""
+    queued_max: float
+    in_flight: int
+
+
+DEFAULT_HOST_LIMITS: dict[str, HostLimit] = {
+    # html sources, DDoS-guard/cloudflare protected
+    "animego.me": HostLimit(rate=3, burst=5, max_in_flight=4),
+    "animego.one": HostLimit(rate=3, burst=5, max_in_flight=4),
+    "animego.org": HostLimit(rate=3, burst=5, max_in_flight=4),
+    "hdrezka-home.tv": HostLimit(rate=2, burst=4, max_in_flight=3),
+    "rezka.ag": HostLimit(rate=2, burst=4, max_in_flight=3),
+    "hdrezka.ag": HostLimit(rate=2, burst=4, max_in_flight=3),
+    "yummyanime.in": HostLimit(rate=3, burst=5, max_in_flight=4),
+    "sameband.studio": HostLimit(rate=3, burst=5, max_in_flight=4),
+    "dreamerscast.com": HostLimit(rate=3, burst=5, max_in_flight=4),
+    # API sources
+    "aniliberty.top": HostLimit(rate=8, burst=10, max_in_flight=8),
+    "api.animevost.org": HostLimit(rate=5, burst=8, max_in_flight=6),
+    "api.yani.tv": HostLimit(rate=5, burst=8, max_in_flight=6),
+    "api.cdnlibs.org": HostLimit(rate=4, burst=6, max_in_flight=4),
+    # players
+    "kodik.info": HostLimit(rate=5, burst=10, max_in_flight=6),
+    "aniqit.com": HostLimit(rate=5, burst=10, max_in_flight=6),
+    "aniboom.one": HostLimit(rate=4, burst=8, max_in_flight=4),
+    "plapi.cdnvideohub.com": HostLimit(rate=5, burst=8, max_in_flight=6),
+}
+"""declarative per-source limits. Key matches host and its subdomains"""
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+
+    def reserve(self) -> float:
+        """take one token. Returns delay before request can be sent (tokens may go negative: FIFO reservations)"""
+        if self.rate <= 0:
+            return 0.0
+        now = monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+
+class _HostState:
+    def __init__(self, limit: HostLimit):
+        self.limit = limit
+        self.bucket = _TokenBucket(limit.rate, limit.burst)
+        self.cond = threading.Condition()
+        self.sync_in_flight = 0
+        self.async_sems: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = WeakKeyDictionary()
+        self.requests = 0
+        self.queued_total = 0.0
+        self.queued_max = 0.0
+        self.in_flight = 0
+
+
+class HostRateLimiter:
+    """per-host token bucket and in-flight limiter
+
+    :param limits: host (or parent domain) -> limit table
+    :param default: limit for hosts not in the table. None - hosts not in table are not limited
+    """
+
+    def __init__(self, limits: Optional[Mapping[str, HostLimit]] = None, default: Optional[HostLimit] = HostLimit()):
+        self.limits = dict(DEFAULT_HOST_LIMITS if limits is None else limits)
+        self.default = default
+        self._lock = threading.Lock()
+        self._hosts: dict[str, Optional[_HostState]] = {}
+
+    def limit_for(self, host: str) -> Optional[HostLimit]:
+        parts = host.split(".")
+        for i in range(len(parts) - 1):
+            if limit := self.limits.get(".".join(parts[i:])):
+                return limit
+        return self.default
+
+    def _state(self, host: str) -> Optional[_HostState]:
+        with self._lock:
+            if host not in self._hosts:
+                limit = self.limit_for(host)
+                self._hosts[host] = _HostState(limit) if limit else None
+            return self._hosts[host]
+
+    def _reserve(self, state: _HostState) -> float:
+        with self._lock:
+            return state.bucket.reserve()
+
+    def _record(self, host: str, state: _HostState, queued: float) -> None:
+        with self._lock:
+            state.requests += 1
+            state.in_flight += 1
+            state.queued_total += queued
+            state.queued_max = max(state.queued_max, queued)
+        if queued > 0.01:
+            logger.debug("[rate limit] %s queued %.3fs", host, queued)
+
+    def _release(self, state: _HostState) -> None:
+        with self._lock:
+            state.in_flight -= 1
+
+    def acquire(self, host: str) -> Optional[_HostState]:
+        """block until request to host allowed. Returns state for `release` call"""
+        state = self._state(host)
+        if not state:
+            return None
+        started = monotonic()
+        if state.limit.max_in_flight > 0:
+            with state.cond:
+                state.cond.wait_for(lambda: state.sync_in_flight < state.limit.max_in_flight)
+                state.sync_in_flight += 1
+        try:
+            if delay := self._reserve(state):
+                sleep(delay)
+        except BaseException:
+            # interrupted: free in-flight slot, else host is locked forever
+            if state.limit.max_in_flight > 0:
+                with state.cond:
+                    state.sync_in_flight -= 1
+                    state.cond.notify()
+            raise
+        self._record(host, state, monotonic() - started)
+        return state
+
+    def release(self, state: Optional[_HostState]) -> None:
+        if not state:
+            return
+        self._release(state)
+        if state.limit.max_in_flight > 0:
+            with state.cond:
+                state.sync_in_flight -= 1
+                state.cond.notify()
+
+    async def a_acquire(self, host: str) -> Optional[_HostState]:
+        """wait until request to host allowed in async mode. Returns state for `a_release` call"""
+        state = self._state(host)
+        if not state:
+            return None
+        started = monotonic()
+        if state.limit.max_in_flight > 0:
+            loop = asyncio.get_running_loop()
+            with self._lock:
+                sem = state.async_sems.setdefault(loop, asyncio.Semaphore(state.limit.max_in_flight))
+            await sem.acquire()
+        try:
+            if delay := self._reserve(state):
+                await asyncio.sleep(delay)
+        except BaseException:
+            # cancelled: free in-flight slot, else host is locked forever
+            if state.limit.max_in_flight > 0:
+                sem.release()
+            raise
+        self._record(host, state, monotonic() - started)
+        return state
+
+    def a_release(self, state: Optional[_HostState]) -> None:
+        if not state:
+            return
+        self._release(state)
+        if state.limit.max_in_flight > 0:
+            state.async_sems[asyncio.get_running_loop()].release()
+
+    def stats(self) -> dict[str, HostStats]:
+        """queued time metrics by host"""
+        with self._lock:
+            return {
+                host: HostStats(state.requests, state.queued_total, state.queued_max, state.in_flight)
+                for host, state in self._hosts.items()
+                if state
+            }
+
+
+class RateLimitSyncTransport(BaseTransport):
+    """rate limit transport wrapper
+
+    :param limiter: shared host rate limiter
+    :param transport: wrapped transport. Default - HTTPRetryConnectSyncTransport
+    """
+
+    def __init__(self, limiter: HostRateLimiter, transport: Optional[BaseTransport] = None):
+        self.limiter = limiter
+        self.transport = transport or HTTPRetryConnectSyncTransport()
+
+    def handle_request(self, request: Request) -> Response:
+        state = self.limiter.acquire(request.url.host)
+        try:
+            return self.transport.handle_request(request)
+        finally:
+            self.limiter.release(state)
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class RateLimitAsyncTransport(AsyncBaseTransport):
+    """rate limit async transport wrapper
+
+    :param limiter: shared host rate limiter
+    :param transport: wrapped transport. Default - HTTPRetryConnectAsyncTransport
+    """
+
+    def __init__(self, limiter: HostRateLimiter, transport: Optional[AsyncBaseTransport] = None):
+        self.limiter = limiter
+        self.transport = transport or HTTPRetryConnectAsyncTransport()
+
+    async def handle_async_request(self, request: Request) -> Response:
+        state = await self.limiter.a_acquire(request.url.host)
+        try:
+            return await self.transport.handle_async_request(request)
+        finally:
+            self.limiter.a_release(state)
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def install_rate_limiter(client: Union[Client, AsyncClient, Any], limiter: HostRateLimiter) -> None:
+    """wrap transport of already created client
+
+    :param client: httpx.Client, httpx.AsyncClient or generated API client (AniLibertySync, YummyAnimeAPIAsync...)
+    :param limiter: shared host rate limiter
+    """
+    # generated API clients keep httpx client in `_client` attribute
+    http = client if isinstance(client, (Client, AsyncClient)) else client._client
+    if isinstance(http, AsyncClient):
+        http._transport = RateLimitAsyncTransport(limiter, http._transport)  # type: ignore[arg-type]
+    else:
+        http._transport = RateLimitSyncTransport(limiter, http._transport)
+
+
+RATE_LIMITER = HostRateLimiter()
+"""process wide limiter with `DEFAULT_HOST_LIMITS` table"""
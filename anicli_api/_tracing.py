@@ -0,0 +1,380 @@
+"""Tracing hooks of Search -> Anime -> Episode -> Source -> Video chain
+
+Spans are started by:
+
+- extractor `search`/`ongoing`, objects `get_anime`/`get_episodes`/`get_sources`/`get_videos` (and `a_*` pairs):
+  stage span with source name (module name, eg: `animego`), url, result and result items count
+- retry transports (`HTTPRetryConnectSyncTransport`/`HTTPRetryConnectAsyncTransport`): `http` span with url,
+  status code, body size (Content-Length) and retries count. Nested in the current stage span
+
+Stage span accumulates bytes and network time of nested http spans, `parse_time` - stage time without network
+(html/json parse, decoders). Nesting is tracked by contextvars: works in threads and asyncio tasks.
+
+If no tracers are added, hooks cost one tuple check per call.
+
+Usage:
+
+    >>> from anicli_api._tracing import InMemoryCollector, add_tracer
+    >>> from anicli_api.source.animego import Extractor
+    >>>
+    >>> collector = add_tracer(InMemoryCollector())
+    >>> Extractor().search("lain")[0].get_anime()
+    >>> for (source, stage), stats in collector.stats().items():
+    ...     print(source, stage, stats.total, stats.p50, stats.p99)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import itertools
+import threading
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Any, Callable, Optional, Protocol, TypeVar
+
+from anicli_api._logger import logger
+from anicli_api.typing import NamedTuple
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "StageStats",
+    "InMemoryCollector",
+    "OpenTelemetryTracer",
+    "add_tracer",
+    "remove_tracer",
+    "start_span",
+    "traced",
+    "trace_methods",
+    "STAGES",
+]
+
+T = TypeVar("T", bound=Callable[..., Any])
+
+STAGES = {
+    "search": "search",
+    "a_search": "search",
+    "ongoing": "ongoing",
+    "a_ongoing": "ongoing",
+    "get_anime": "anime",
+    "a_get_anime": "anime",
+    "get_episodes": "episodes",
+    "a_get_episodes": "episodes",
+    "get_sources": "sources",
+    "a_get_sources": "sources",
+    "get_videos": "videos",
+    "a_get_videos": "videos",
+}
+"""traced method name: stage name"""
+
+_CURRENT_SPAN: ContextVar[Optional[Span]] = ContextVar("anicli_api_span", default=None)
+_TRACERS: tuple[Tracer, ...] = ()
+_TRACERS_LOCK = threading.Lock()
+_SPAN_IDS = itertools.count(1)
+
+
+class Span:
+    """one traced operation. Mutable: hooks (eg: retry transport) update fields before span end"""
+
+    __slots__ = (
+        "stage",
+        "source",
+        "url",
+        "parent",
+        "span_id",
+        "start_time_ns",
+        "_started",
+        "duration",
+        "status",
+        "bytes",
+        "retries",
+        "items",
+        "result",
+        "http_time",
+        "error",
+        "owner",
+        "attributes",
+    )
+
+    def __init__(self, stage: str, source: str, url: Optional[str] = None, parent: Optional[Span] = None):
+        self.stage = stage
+        self.source = source
+        self.url = url
+        self.parent = parent
+        self.span_id = next(_SPAN_IDS)
+        self.start_time_ns = time.time_ns()
+        self._started = time.perf_counter()
+        self.duration = 0.0
+        """seconds"""
+        self.status: Optional[int] = None
+        """http status code (http span)"""
+        self.bytes = 0
+        """response body size. Stage span - sum of nested http spans"""
+        self.retries = 0
+        self.items: Optional[int] = None
+        """stage result items count"""
+        self.result: Any = None
+        """stage result (eg: search results list). Available in `on_span_end` only: released after hooks call"""
+        self.http_time = 0.0
+        """network time of nested http spans"""
+        self.error: Optional[str] = None
+        self.owner: Optional[int] = None
+        """id of traced object: nested call of the same stage (eg: `super().get_videos()`) is not traced"""
+        self.attributes: dict[str, Any] = {}
+        """extra data for tracers (eg: OpenTelemetry span)"""
+
+    @property
+    def parse_time(self) -> float:
+        """stage time without network (parsers, decoders)"""
+        return max(0.0, self.duration - self.http_time)
+
+    def __repr__(self) -> str:
+        return f"<Span {self.source}.{self.stage} {self.duration * 1000:.1f}ms url={self.url!r} status={self.status}>"
+
+
+class Tracer(Protocol):
+    def on_span_start(self, span: Span) -> None: ...
+
+    def on_span_end(self, span: Span) -> None: ...
+
+
+def add_tracer(tracer: Any) -> Any:
+    """register tracer for all spans. Returns passed tracer"""
+    global _TRACERS
+    with _TRACERS_LOCK:
+        _TRACERS = (*_TRACERS, tracer)
+    return tracer
+
+
+def remove_tracer(tracer: Any) -> None:
+    global _TRACERS
+    with _TRACERS_LOCK:
+        _TRACERS = tuple(t for t in _TRACERS if t is not tracer)
+
+
+def _notify(method: str, span: Span) -> None:
+    for tracer in _TRACERS:
+        try:
+            getattr(tracer, method)(span)
+        except Exception as e:  # noqa: BLE001 - third-party tracer error should not break extractors
+            logger.warning("[tracing] %s.%s failed: %r", type(tracer).__name__, method, e)
+
+
+class _SpanContext:
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Optional[Span]):
+        self.span = span
+
+    def __enter__(self) -> Optional[Span]:
+        if self.span:
+            self._token = _CURRENT_SPAN.set(self.span)
+            _notify("on_span_start", self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        span = self.span
+        if not span:
+            return
+        _CURRENT_SPAN.reset(self._token)
+        span.duration = time.perf_counter() - span._started
+        if exc is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+        if (parent := span.parent) is not None:
+            parent.bytes += span.bytes
+            parent.http_time += span.duration if span.stage == "http" else span.http_time
+        _notify("on_span_end", span)
+        # finished spans are stored by collectors: do not keep stage results alive
+        span.result = None
+
+
+def start_span(stage: str, source: str, url: Optional[str] = None) -> _SpanContext:
+    """context manager of new span, nested in the current span. Yields None if no tracers added"""
+    if not _TRACERS:
+        return _SpanContext(None)
+    return _SpanContext(Span(stage, source, url, _CURRENT_SPAN.get()))
+
+
+def _source_name(obj: Any) -> str:
+    # anicli_api.source.animego -> animego
+    return type(obj).__module__.rpartition(".")[-1]
+
+
+def _start_stage(obj: Any, stage: str) -> _SpanContext:
+    current = _CURRENT_SPAN.get()
+    if current is not None and current.owner == id(obj) and current.stage == stage:
+        return _SpanContext(None)
+    url = getattr(obj, "url", None) or getattr(obj, "BASE_URL", None)
+    ctx = start_span(stage, _source_name(obj), url if isinstance(url, str) else None)
+    if ctx.span:
+        ctx.span.owner = id(obj)
+    return ctx
+
+
+def _set_result(span: Optional[Span], result: Any) -> None:
+    if span is None:
+        return
+    span.result = result
+    if hasattr(result, "__len__"):
+        span.items = len(result)
+
+
+def traced(stage: str) -> Callable[[T], T]:
+    """decorator of chain stage method (sync or async)"""
+
+    def decorator(func: T) -> T:
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                if not _TRACERS:
+                    return await func(self, *args, **kwargs)
+                with _start_stage(self, stage) as span:
+                    result = await func(self, *args, **kwargs)
+                    _set_result(span, result)
+                    return result
+
+            wrapper = async_wrapper
+        else:
+
+            @functools.wraps(func)
+            def wrapper(self, *args, **kwargs):
+                if not _TRACERS:
+                    return func(self, *args, **kwargs)
+                with _start_stage(self, stage) as span:
+                    result = func(self, *args, **kwargs)
+                    _set_result(span, result)
+                    return result
+
+        wrapper.__traced__ = True  # type: ignore[attr-defined]
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+def trace_methods(cls: type) -> None:
+    """wrap chain stage methods, defined in class body (`STAGES` keys).
+
+    Used in base classes `__init_subclass__` hooks. attrs classes should call it from `__attrs_init_subclass__`:
+    slotted class is a copy of the original class, wrappers must be applied to the final class methods
+    """
+    for name, stage in STAGES.items():
+        func = cls.__dict__.get(name)
+        if func is None or getattr(func, "__isabstractmethod__", False):
+            continue
+        if getattr(func, "__traced__", False):
+            # already wrapped by `traced` decorator
+            continue
+        setattr(cls, name, traced(stage)(func))
+
+
+class StageStats(NamedTuple):
+    total: int
+    """finished spans count"""
+    errors: int
+    p50: float
+    p99: float
+    mean: float
+    """latency in seconds"""
+    parse_time: float
+    """mean stage time without network"""
+    bytes: int
+
+
+def _percentile(values: list[float], q: float) -> float:
+    """nearest-rank percentile of sorted values"""
+    return values[min(len(values) - 1, max(0, round(q * len(values) + 0.5) - 1))]
+
+
+class InMemoryCollector:
+    """thread-safe finished spans collector with per-source per-stage latency stats
+
+    :param maxlen: max stored spans (oldest are dropped)
+    """
+
+    def __init__(self, maxlen: int = 10_000):
+        self._lock = threading.Lock()
+        self.spans: deque[Span] = deque(maxlen=maxlen)
+
+    def on_span_start(self, span: Span) -> None:
+        pass
+
+    def on_span_end(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def stats(self) -> dict[tuple[str, str], StageStats]:
+        """(source, stage): stats. `http` spans source - source of the parent stage span or host"""
+        groups: defaultdict[tuple[str, str], list[Span]] = defaultdict(list)
+        with self._lock:
+            for span in self.spans:
+                source = span.parent.source if span.stage == "http" and span.parent else span.source
+                groups[(source, span.stage)].append(span)
+        result = {}
+        for key, spans in groups.items():
+            durations = sorted(s.duration for s in spans)
+            result[key] = StageStats(
+                total=len(spans),
+                errors=sum(1 for s in spans if s.error),
+                p50=_percentile(durations, 0.5),
+                p99=_percentile(durations, 0.99),
+                mean=sum(durations) / len(durations),
+                parse_time=sum(s.parse_time for s in spans) / len(spans),
+                bytes=sum(s.bytes for s in spans),
+            )
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+
+
+class OpenTelemetryTracer:
+    """OpenTelemetry adapter: converts spans to OpenTelemetry spans. Required `opentelemetry-api` dependency
+
+    :param tracer: OpenTelemetry tracer. Default - `trace.get_tracer("anicli-api")`
+    """
+
+    def __init__(self, tracer: Any = None):
+        try:
+            from opentelemetry import trace
+        except ImportError as e:
+            msg = (
+                "OpenTelemetry adapter required 'opentelemetry-api' dependency. "
+                "For install it use `pip install opentelemetry-api` command."
+            )
+            raise ImportError(msg) from e
+        self._trace = trace
+        self._tracer = tracer or trace.get_tracer("anicli-api")
+
+    def on_span_start(self, span: Span) -> None:
+        parent = span.parent.attributes.get("otel") if span.parent else None
+        context = self._trace.set_span_in_context(parent) if parent is not None else None
+        kind = self._trace.SpanKind.CLIENT if span.stage == "http" else self._trace.SpanKind.INTERNAL
+        span.attributes["otel"] = self._tracer.start_span(
+            f"{span.source}.{span.stage}", context=context, kind=kind, start_time=span.start_time_ns
+        )
+
+    def on_span_end(self, span: Span) -> None:
+        otel_span = span.attributes.pop("otel", None)
+        if otel_span is None:
+            return
+        attributes = {
+            "anicli.source": span.source,
+            "anicli.stage": span.stage,
+            "anicli.bytes": span.bytes,
+            "anicli.retries": span.retries,
+            "anicli.parse_time": span.parse_time,
+        }
+        if span.url:
+            attributes["url.full"] = span.url
+        if span.status is not None:
+            attributes["http.response.status_code"] = span.status
+        if span.items is not None:
+            attributes["anicli.items"] = span.items
+        otel_span.set_attributes(attributes)
+        if span.error:
+            otel_span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, span.error))
+        otel_span.end(end_time=span.start_time_ns + int(span.duration * 1e9))
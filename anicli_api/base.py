@@ -1,6 +1,6 @@
 import warnings
 from abc import abstractmethod
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from urllib.parse import urlsplit
 from anicli_api.typing import MutableSequence, TypedDict
@@ -8,10 +8,15 @@ from anicli_api.typing import MutableSequence, TypedDict
 from attrs import define, field
 
 from anicli_api._http import (  # noqa: F401
+    DEFAULT_SESSION,
     HTTPAsync,
+    HTTPSession,
     HTTPSync,
 )
-from anicli_api.player import ALL_DECODERS
+from anicli_api._metrics import VIDEOS
+from anicli_api._tracing import trace_methods, traced
+from anicli_api.player import PLAYERS, resolve_extractor
+from anicli_api.player.pool import EXTRACTOR_POOL
 
 if TYPE_CHECKING:
     from httpx import AsyncClient, Client
@@ -20,30 +25,52 @@ if TYPE_CHECKING:
 
 
 class T_KW_HTTPS(TypedDict):
-    http: "Client"
-    http_async: "AsyncClient"
+    http: Optional["Client"]
+    http_async: Optional["AsyncClient"]
+    session: HTTPSession
 
 
 class BaseExtractor:
     BASE_URL: str = NotImplemented
     """anime source main page"""
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # tracing hooks of search, ongoing methods
+        trace_methods(cls)
+
     @property
     def source_name(self) -> str:
         """return source name (by url netloc)"""
         return urlsplit(self.BASE_URL).netloc
 
-    def __init__(self, http_client: "Client" = HTTPSync(), http_async_client: "AsyncClient" = HTTPAsync()):
+    def __init__(
+        self,
+        http_client: Optional["Client"] = None,
+        http_async_client: Optional["AsyncClient"] = None,
+        *,
+        session: Optional[HTTPSession] = None,
+    ):
+        """
+        :param http_client: sync http client. If not passed - created lazily by session
+        :param http_async_client: async http client. If not passed - created lazily by session
+        :param session: lazy clients session. If not passed - every extractor creates own session
+        """
         self._http = http_client
         self._http_async = http_async_client
+        self._session = session or HTTPSession()
+
+    @property
+    def session(self) -> HTTPSession:
+        return self._session
 
     @property
     def http(self) -> "Client":
-        return self._http
+        return self._http if self._http is not None else self._session.http
 
     @property
     def http_async(self) -> "AsyncClient":
-        return self._http_async
+        return self._http_async if self._http_async is not None else self._session.http_async
 
     @http.setter
     def http(self, http_client: "Client"):
@@ -55,8 +82,8 @@ class BaseExtractor:
 
     @property
     def _kwargs_http(self) -> T_KW_HTTPS:
-        """shortcut for pass http arguments in kwargs style"""
-        return {"http": self.http, "http_async": self.http_async}
+        """shortcut for pass http arguments in kwargs style. Clients are not created"""
+        return {"http": self._http, "http_async": self._http_async, "session": self._session}
 
     @abstractmethod
     def search(self, query: str) -> MutableSequence["BaseSearch"]:
@@ -87,24 +114,34 @@ class BaseExtractor:
 
 @define(kw_only=True)
 class HttpMixin:
-    """this dataclass provide pre-configured http clients"""
-
-    _http: "Client" = field(default=HTTPSync(), repr=False, kw_only=True, hash=False, alias="http")
-    """pre-configured sync httpx Client"""
-    _http_async: "AsyncClient" = field(default=HTTPAsync(), repr=False, kw_only=True, hash=False, alias="http_async")
-    """pre-configured async httpx Client"""
+    """this dataclass provide pre-configured http clients. Clients are created lazily by session"""
+
+    _http: Optional["Client"] = field(default=None, repr=False, kw_only=True, hash=False, alias="http")
+    """pre-configured sync httpx Client. If not passed - used session client"""
+    _http_async: Optional["AsyncClient"] = field(default=None, repr=False, kw_only=True, hash=False, alias="http_async")
+    """pre-configured async httpx Client. If not passed - used session client"""
+    _session: HTTPSession = field(
+        default=DEFAULT_SESSION, repr=False, kw_only=True, hash=False, eq=False, alias="session"
+    )
+    """lazy clients session (shared with extractor)"""
+
+    @classmethod
+    def __attrs_init_subclass__(cls):
+        # tracing hooks of get_anime, get_episodes, get_sources, get_videos methods.
+        # Called by attrs after the subclass is built: `super()` cells of wrapped methods point to the final class
+        trace_methods(cls)
 
     @property
-    def http(self):
-        return self._http
+    def http(self) -> "Client":
+        return self._http if self._http is not None else self._session.http
 
     @http.setter
     def http(self, http_client: "Client"):
         self._http = http_client
 
     @property
-    def http_async(self):
-        return self._http_async
+    def http_async(self) -> "AsyncClient":
+        return self._http_async if self._http_async is not None else self._session.http_async
 
     @http_async.setter
     def http_async(self, http_async_client: "AsyncClient"):
@@ -112,8 +149,8 @@ class HttpMixin:
 
     @property
     def _kwargs_http(self) -> T_KW_HTTPS:
-        """shortcut for pass http arguments in kwargs style"""
-        return {"http": self.http, "http_async": self.http_async}
+        """shortcut for pass http arguments in kwargs style. Clients are not created"""
+        return {"http": self._http, "http_async": self._http_async, "session": self._session}
 
 
 @define(kw_only=True)
@@ -243,28 +280,38 @@ class BaseSource(HttpMixin):
 
     @property
     def _all_video_extractors(self):
-        """helper property for helps dynamic match decoder parser by player url"""
-        return ALL_DECODERS
+        """video extractors (classes or lazy `PlayerSpec`) for match decoder parser by player url (priority order)"""
+        return PLAYERS
+
+    @property
+    def _extractor_pool(self):
+        """helper property for reuse video extractors (and their http connections) between calls"""
+        return EXTRACTOR_POOL
 
+    @traced("videos")
     def get_videos(self, **httpx_kwargs) -> MutableSequence["Video"]:
         """get direct video information for direct play
 
         :param httpx_kwargs: httpx.Client configuration
         """
-        for extractor in self._all_video_extractors:
-            if self.url == extractor():
-                return extractor(**httpx_kwargs).parse(self.url)
+        if extractor := resolve_extractor(self.url, self._all_video_extractors):
+            videos = self._extractor_pool.get(extractor, **httpx_kwargs).parse(self.url)
+            VIDEOS.inc(extractor.__name__, amount=len(videos))
+            return videos
         warnings.warn(f"Failed extractor videos from {self.url}")
         return []
 
+    @traced("videos")
     async def a_get_videos(self, **httpx_kwargs) -> MutableSequence["Video"]:
         """get direct video information for direct play in async mode
 
         :param httpx_kwargs: httpx.AsyncClient configuration
         """
-        for extractor in self._all_video_extractors:
-            if self.url == extractor():
-                return await extractor(**httpx_kwargs).a_parse(self.url)  # type: ignore
+        if extractor := resolve_extractor(self.url, self._all_video_extractors):
+            player = await self._extractor_pool.a_get(extractor, **httpx_kwargs)
+            videos = await player.a_parse(self.url)  # type: ignore
+            VIDEOS.inc(extractor.__name__, amount=len(videos))
+            return videos
         warnings.warn(f"Failed extractor videos from {self.url}")
         return []
 
@@ -1,10 +1,30 @@
-from anicli_api.player.aniboom import Aniboom
-from anicli_api.player.askor import Askor
-from anicli_api.player.csst import CsstOnline
-from anicli_api.player.kodik import Kodik
-from anicli_api.player.sibnet import SibNet
-from anicli_api.player.sovetromantica import SovietRomanticaPlayer
-from anicli_api.player.sovetromantica_embed import SovietRomanticaEmbed
-from anicli_api.player.cdnvideohub import CdnVideoHub
-
-ALL_DECODERS = (Kodik, Aniboom, Askor, SibNet, CsstOnline, SovietRomanticaPlayer, SovietRomanticaEmbed, CdnVideoHub)
+from typing import Any, Optional, Type, Union
+
+from anicli_api.typing import Sequence
+from anicli_api.player.base import BaseVideoExtractor
+from anicli_api.player.dispatch import get_extractor_index
+from anicli_api.player.registry import PLAYERS, PlayerSpec, get_player_spec
+
+
+def __getattr__(name: str) -> Any:
+    # player modules imported on first access: `from anicli_api.player import Kodik`
+    if name == "ALL_DECODERS":
+        return tuple(spec.load() for spec in PLAYERS)
+    if spec := get_player_spec(name):
+        return spec.load()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__() -> list:
+    return sorted([*globals(), "ALL_DECODERS", *(spec.name for spec in PLAYERS)])
+
+
+def resolve_extractor(
+    url: str, extractors: Optional[Sequence[Union[Type[BaseVideoExtractor], PlayerSpec]]] = None
+) -> Optional[Type[BaseVideoExtractor]]:
+    """get video extractor class by player url. Returns None if extractor not found
+
+    :param url: player url
+    :param extractors: extractor classes or `PlayerSpec` entries in priority order. Default - all registered players
+    """
+    return get_extractor_index(tuple(extractors) if extractors is not None else PLAYERS).resolve(url)
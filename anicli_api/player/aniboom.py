@@ -6,7 +6,9 @@ import warnings
 
 from httpx import Response
 
+from anicli_api._document import HTMLDocument
 from .base import BaseVideoExtractor, Video, url_validator
+from .manifest import a_expand_videos, expand_videos
 from .parsers.aniboom_parser import PageAniboom
 
 __all__ = ["Aniboom"]
@@ -18,6 +20,7 @@ logger = logging.getLogger("anicli-api")  # type: ignore
 
 class Aniboom(BaseVideoExtractor):
     URL_RULE = _URL_EQ
+    URL_HOSTS = ("aniboom.one",)
     DEFAULT_HTTP_CONFIG = {"headers": {"referer": "https://animego.org/"}}
     VIDEO_HEADERS = {
         # KEYS SHOULD BE STARTED IN Title case, else hls/mpd links return 403 error
@@ -26,17 +29,20 @@ class Aniboom(BaseVideoExtractor):
         "Accept-Language": "ru-RU",
         "Origin": "https://aniboom.one",
     }
+    EXPAND_MANIFESTS = True
+    """replace guessed 1080 quality of mpd/m3u8 videos by real qualities from manifests (extra requests)"""
 
     @player_validator
     def parse(self, url: str, **kwargs) -> list[Video]:
         response = self.http.get(url)
-        return self._extract(response)
+        videos = self._extract(response)
+        return expand_videos(videos, self.http) if self.EXPAND_MANIFESTS else videos
 
     @player_validator
     async def a_parse(self, url: str, **kwargs) -> list[Video]:
-        async with self.a_http as client:
-            response = await client.get(url)
-            return self._extract(response)
+        response = await self.a_http.get(url)
+        videos = self._extract(response)
+        return await a_expand_videos(videos, self.a_http) if self.EXPAND_MANIFESTS else videos
 
     @staticmethod
     def _is_not_found(resp: Response):
@@ -70,7 +76,7 @@ class Aniboom(BaseVideoExtractor):
         if self._is_not_found(response):
             return []
 
-        result = PageAniboom(response.text).parse()
+        result = HTMLDocument(response.text).parse(PageAniboom)
         hls, dash = result.get("hls", None), result.get("dash", None)
 
         if not hls:
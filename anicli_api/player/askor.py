@@ -12,6 +12,7 @@ player_validator = url_validator(_URL_EQ)
 
 class Askor(BaseVideoExtractor):
     URL_RULE = _URL_EQ
+    URL_HOSTS = ("aksor.tv", "aksor.yani.tv")
 
     @player_validator
     def parse(self, url: str, **kwargs) -> list[Video]:
@@ -20,9 +21,8 @@ class Askor(BaseVideoExtractor):
 
     @player_validator
     async def a_parse(self, url: str, **kwargs) -> list[Video]:
-        async with self.a_http as client:
-            response = await client.get(url)
-            return self._extract(response.text)
+        response = await self.a_http.get(url)
+        return self._extract(response.text)
 
     def _extract(self, response: str) -> list[Video]:
         if url := re.search(r'var videoUrl = "(.+?)";', response):
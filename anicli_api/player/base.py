@@ -8,7 +8,7 @@ from urllib.parse import urlparse
 
 from attrs import Factory, define
 
-from anicli_api._http import BaseHTTPAsync, BaseHTTPSync
+from anicli_api._http import BaseHTTPAsync, BaseHTTPSync, HTTPSession
 
 __all__ = ["ALL_QUALITIES", "Video", "url_validator", "BaseVideoExtractor", "ABCVideoExtractor"]
 
@@ -95,6 +95,8 @@ class ABCVideoExtractor(ABC):
     # attribute for `==` statement, for auto-detect needed extractor
     URL_RULE: Union[str, re.Pattern] = NotImplemented
     """regular expression for validate urls for `==` (__eq__) stmt"""
+    URL_HOSTS: tuple[str, ...] = ()
+    """fixed player hosts for fast url dispatch (`anicli_api.player.dispatch`). Urls still validated by URL_RULE"""
     # config if needed configurate HTTP classes for requests
     DEFAULT_HTTP_CONFIG: dict[str, Any] = {}
     """minimal httpx.Client, httpx.AsyncClient configuration for correct work player provider"""
@@ -105,8 +107,44 @@ class ABCVideoExtractor(ABC):
         """
         default_kwargs = self.DEFAULT_HTTP_CONFIG.copy()
         default_kwargs.update(httpx_kwargs)
-        self.http = BaseHTTPSync(**default_kwargs)
-        self.a_http = BaseHTTPAsync(**default_kwargs)
+        # clients created on first request
+        self._session = HTTPSession(**default_kwargs)
+
+    @property
+    def http(self) -> BaseHTTPSync:
+        return self._session.http  # type: ignore[return-value]
+
+    @http.setter
+    def http(self, http_client: BaseHTTPSync):
+        self._session.http = http_client
+
+    @property
+    def a_http(self) -> BaseHTTPAsync:
+        return self._session.http_async  # type: ignore[return-value]
+
+    @a_http.setter
+    def a_http(self, http_async_client: BaseHTTPAsync):
+        self._session.http_async = http_async_client
+
+    def close(self) -> None:
+        """close sync http client. Extractor instance is reusable until closed"""
+        self._session.close()
+
+    async def aclose(self) -> None:
+        """close sync and async http clients"""
+        await self._session.aclose()
+
+    def __enter__(self: T) -> T:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    async def __aenter__(self: T) -> T:
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
 
     @abstractmethod
     def parse(self, url: str, **kwargs) -> list[Video]:
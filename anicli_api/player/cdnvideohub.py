@@ -1,8 +1,11 @@
 from __future__ import annotations
 import logging
 import re
+from typing import Optional
 
+from anicli_api._document import HTMLDocument
 from anicli_api.player.base import BaseVideoExtractor, Video, url_validator
+from anicli_api.player.manifest import a_expand_videos, expand_videos
 from anicli_api.player.parsers.cdnvideohub_parser import PageAnimegoIframe
 from anicli_api.player.apis.cdnvideohub import CdnVideoHubSync, CdnVideoHubAsync
 
@@ -26,7 +29,7 @@ _RESOLUTION_MAPPING = {
 }
 
 
-def video_playlist_from_vk_id(vkid: str, user_agent: str) -> list["Video"]:
+def video_playlist_from_vk_id(vkid: str, user_agent: str, expand_manifests: bool = True) -> list["Video"]:
     result = CdnVideoHubSync().get_video_by_id(id=vkid).data["sources"]
     hls_video = result.pop("hlsUrl")
     dash_video = result.pop("dashUrl")
@@ -49,10 +52,10 @@ def video_playlist_from_vk_id(vkid: str, user_agent: str) -> list["Video"]:
         max_quality = sorted(videos, key=lambda i: i.quality, reverse=True)[0].quality
         videos.append(Video(type="m3u8", quality=max_quality, url=hls_video, headers={"User-Agent": user_agent}))  # type: ignore
         videos.append(Video(type="mpd", quality=max_quality, url=dash_video, headers={"User-Agent": user_agent}))  # type: ignore
-    return videos
+    return expand_videos(videos) if expand_manifests else videos
 
 
-async def a_video_playlist_from_vk_id(vkid: str, user_agent: str) -> list["Video"]:
+async def a_video_playlist_from_vk_id(vkid: str, user_agent: str, expand_manifests: bool = True) -> list["Video"]:
     result = (await CdnVideoHubAsync().get_video_by_id(id=vkid)).data["sources"]
     hls_video = result.pop("hlsUrl")
     dash_video = result.pop("dashUrl")
@@ -75,17 +78,31 @@ async def a_video_playlist_from_vk_id(vkid: str, user_agent: str) -> list["Video
         max_quality = sorted(videos, key=lambda i: i.quality, reverse=True)[0].quality
         videos.append(Video(type="m3u8", quality=max_quality, url=hls_video, headers={"User-Agent": user_agent}))  # type: ignore
         videos.append(Video(type="mpd", quality=max_quality, url=dash_video, headers={"User-Agent": user_agent}))  # type: ignore
-    return videos
+    return await a_expand_videos(videos) if expand_manifests else videos
 
 
 class CdnVideoHub(BaseVideoExtractor):
     URL_RULE = _URL_EQ
+    EXPAND_MANIFESTS = True
+    """replace max mp4 quality of mpd/m3u8 videos by real qualities from manifests (extra requests)"""
 
     def __init__(self, **httpx_kwargs):
         super().__init__(**httpx_kwargs)
-
-        self.sync_api = CdnVideoHubSync(headers=dict(self.http.headers), timeout=self.http.timeout)  # type: ignore
-        self.async_api = CdnVideoHubAsync(headers=dict(self.a_http.headers), timeout=self.a_http.timeout)  # type: ignore
+        self._sync_api: Optional[CdnVideoHubSync] = None
+        self._async_api: Optional[CdnVideoHubAsync] = None
+
+    # share extractor clients: keep API connections in the same pool. Created on first usage
+    @property
+    def sync_api(self) -> CdnVideoHubSync:
+        if self._sync_api is None:
+            self._sync_api = CdnVideoHubSync(client=self.http)
+        return self._sync_api
+
+    @property
+    def async_api(self) -> CdnVideoHubAsync:
+        if self._async_api is None:
+            self._async_api = CdnVideoHubAsync(client=self.a_http)
+        return self._async_api
 
     @staticmethod
     def _parse_url_parts(url: str) -> tuple[str, str, str, str]:
@@ -133,7 +150,7 @@ class CdnVideoHub(BaseVideoExtractor):
     def parse(self, url: str, **kwargs) -> list[Video]:
         _id, dubber_name, season, episode_num = self._parse_url_parts(url)
         response = self.http.get(url, headers={"referer": "https://animego.me"})
-        options = PageAnimegoIframe(response.text).parse()
+        options = HTMLDocument(response.text).parse(PageAnimegoIframe)
         resp2 = self.sync_api.get_playlist(
             pub=int(options["data_publisher_id"]), aggr=options["data_aggregator"], id=int(options["data_title_id"])
         )
@@ -145,7 +162,8 @@ class CdnVideoHub(BaseVideoExtractor):
                     and data["voiceStudio"] == dubber_name
                 ):
                     resp3 = self.sync_api.get_video_by_id(id=data["vkId"])
-                    return self._extract_videos_common(resp3, user_agent=self.http.headers["User-Agent"])
+                    videos = self._extract_videos_common(resp3, user_agent=self.http.headers["User-Agent"])
+                    return expand_videos(videos, self.http) if self.EXPAND_MANIFESTS else videos
             else:
                 logger.warning("[cdnvideohub] failed get videos candidates")
         return []
@@ -153,8 +171,8 @@ class CdnVideoHub(BaseVideoExtractor):
     @player_validator
     async def a_parse(self, url: str, **kwargs) -> list[Video]:
         _id, dubber_name, season, episode_num = self._parse_url_parts(url)
-        response = self.http.get(url, headers={"referer": "https://animego.me"})
-        options = PageAnimegoIframe(response.text).parse()
+        response = await self.a_http.get(url, headers={"referer": "https://animego.me"})
+        options = HTMLDocument(response.text).parse(PageAnimegoIframe)
         resp2 = await self.async_api.get_playlist(
             pub=int(options["data_publisher_id"]), aggr=options["data_aggregator"], id=int(options["data_title_id"])
         )
@@ -166,7 +184,8 @@ class CdnVideoHub(BaseVideoExtractor):
                     and data["voiceStudio"] == dubber_name
                 ):
                     resp3 = await self.async_api.get_video_by_id(id=data["vkId"])
-                    return self._extract_videos_common(resp3, user_agent=self.a_http.headers["User-Agent"])
+                    videos = self._extract_videos_common(resp3, user_agent=self.a_http.headers["User-Agent"])
+                    return await a_expand_videos(videos, self.a_http) if self.EXPAND_MANIFESTS else videos
             else:
                 logger.warning("[cdnvideohub] failed get videos candidates")
         return []
@@ -15,6 +15,7 @@ player_validator = url_validator(_URL_EQ)
 
 class CsstOnline(BaseVideoExtractor):
     URL_RULE = _URL_EQ
+    URL_HOSTS = ("csst.online",)
     RE_URLS = re.compile(r"\[(?P<quality>\d{3,4})p\](?P<url>https?://(?:www\.)?.*?\.mp4)")
 
     @player_validator
@@ -24,9 +25,8 @@ class CsstOnline(BaseVideoExtractor):
 
     @player_validator
     async def a_parse(self, url: str, **kwargs) -> list[Video]:
-        async with self.a_http as client:
-            response = (await client.get(url)).text
-            return self._extract(response)
+        response = (await self.a_http.get(url)).text
+        return self._extract(response)
 
     def _extract(self, response: str) -> list[Video]:
         url_data = list(re.finditer(self.RE_URLS, response))
@@ -0,0 +1,86 @@
+"""URL -> video extractor dispatch index
+
+Built once for a sequence of extractor classes or lazy `PlayerSpec` entries (`anicli_api.player.registry`):
+
+- netloc hash map for extractors with fixed hosts (`URL_HOSTS` attribute). Declared hosts are exhaustive:
+  urls of other hosts are never dispatched to this extractor
+- single combined alternation regex of `URL_RULE` expressions of other extractors (Kodik mirrors, cdn-iframe...)
+
+Extractors are never instantiated, fixed hosts lookup cost does not grow with extractors count.
+Modules of `PlayerSpec` entries are imported only for the matched url.
+If several rules matched, wins the leftmost match, then the first extractor in declaration order.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Optional, Type, Union
+from urllib.parse import urlsplit
+
+from anicli_api.typing import Sequence
+
+from .base import BaseVideoExtractor
+from .registry import PlayerSpec
+
+__all__ = ["ExtractorIndex", "get_extractor_index"]
+
+T_Entry = Union[Type[BaseVideoExtractor], PlayerSpec]
+
+
+def _normalize_netloc(netloc: str) -> str:
+    netloc = netloc.lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def _entry_rules(entry: T_Entry) -> tuple[re.Pattern, tuple[str, ...]]:
+    if isinstance(entry, PlayerSpec):
+        return re.compile(entry.url_rule), entry.hosts
+    rule = entry.URL_RULE
+    return (rule if isinstance(rule, re.Pattern) else re.compile(rule)), entry.URL_HOSTS
+
+
+def _load(entry: T_Entry) -> Type[BaseVideoExtractor]:
+    return entry.load() if isinstance(entry, PlayerSpec) else entry
+
+
+class ExtractorIndex:
+    """compiled URL -> extractor class index
+
+    :param extractors: extractor classes or `PlayerSpec` entries in priority order
+    """
+
+    def __init__(self, extractors: Sequence[T_Entry]):
+        self.extractors = tuple(extractors)
+        self._hosts: dict[str, list[tuple[re.Pattern, T_Entry]]] = {}
+        self._groups: dict[str, T_Entry] = {}
+        alternatives = []
+        for i, extractor in enumerate(self.extractors):
+            rule, hosts = _entry_rules(extractor)
+            if hosts:
+                for host in hosts:
+                    self._hosts.setdefault(_normalize_netloc(host), []).append((rule, extractor))
+                continue
+            self._groups[f"_e{i}"] = extractor
+            alternatives.append(f"(?P<_e{i}>{rule.pattern})")
+        # (?!) - never matches: all extractors have fixed hosts
+        self._pattern = re.compile("|".join(alternatives) or "(?!)")
+
+    def resolve(self, url: str) -> Optional[Type[BaseVideoExtractor]]:
+        """get extractor class for url. Returns None if extractor not found"""
+        # fast path: fixed host, verify only candidates rules
+        for rule, extractor in self._hosts.get(_normalize_netloc(urlsplit(url).netloc), ()):
+            if rule.search(url):
+                return _load(extractor)
+        if match := self._pattern.search(url):
+            return _load(self._groups[match.lastgroup])  # type: ignore[index]
+        return None
+
+    def __contains__(self, url: str) -> bool:
+        return self.resolve(url) is not None
+
+
+@lru_cache(maxsize=None)
+def get_extractor_index(extractors: tuple[T_Entry, ...]) -> ExtractorIndex:
+    """cached index for extractors tuple"""
+    return ExtractorIndex(extractors)
@@ -0,0 +1,104 @@
+"""Crypt codes cache of dreamerscast playerjs script
+
+All dreamerscast titles use the same packed playerjs script, but `Anime.get_episodes()` downloaded and unpacked
+it for every title. The cache keeps crypt codes (`get_crypt_codes` result):
+
+- by playerjs url with TTL: fresh codes are returned without script download
+- by script content hash: changed url of the same script (eg: cache buster query) is not unpacked again
+
+If decoding with cached codes failed (script updated before TTL expired) - invalidate url and download script again.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from anicli_api._executor import PARSE_EXECUTOR
+from anicli_api._logger import logger
+
+from .dreamcast_chipers import get_crypt_codes
+
+__all__ = ["CryptCodesCache", "DREAMCAST_CRYPT_CODES_CACHE"]
+
+
+class CryptCodesCache:
+    """thread-safe playerjs crypt codes cache
+
+    :param ttl: time to live of url entry in seconds
+    :param maxsize: max count of stored scripts (by content hash)
+    """
+
+    def __init__(self, ttl: float = 60 * 60 * 6, maxsize: int = 16):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        # url: (content hash, created at)
+        self._urls: dict[str, tuple[str, float]] = {}
+        # content hash: crypt codes
+        self._codes: OrderedDict[str, str] = OrderedDict()
+        self.unpacked = 0
+        """playerjs unpack calls counter"""
+
+    def get(self, url: str) -> Optional[str]:
+        """get crypt codes by playerjs url. Returns None if not exists or expired"""
+        with self._lock:
+            item = self._urls.get(url)
+            if not item or time.time() - item[1] >= self.ttl:
+                return None
+            return self._codes.get(item[0])
+
+    def extract(self, url: str, script: str) -> str:
+        """get crypt codes of downloaded playerjs script. Script unpacked only if content hash is unknown
+
+        :param url: playerjs url
+        :param script: raw (packed) playerjs script
+        """
+        content_hash, codes = self._lookup(script)
+        if codes is None:
+            return self._store(url, content_hash, get_crypt_codes(script))
+        return self._store(url, content_hash, codes, unpacked=False)
+
+    async def a_extract(self, url: str, script: str) -> str:
+        """`extract` with unpacking in the parse executor (`anicli_api._executor.PARSE_EXECUTOR`)
+
+        :param url: playerjs url
+        :param script: raw (packed) playerjs script
+        """
+        content_hash, codes = self._lookup(script)
+        if codes is None:
+            return self._store(url, content_hash, await PARSE_EXECUTOR.run(len(script), get_crypt_codes, script))
+        return self._store(url, content_hash, codes, unpacked=False)
+
+    def _lookup(self, script: str) -> tuple[str, Optional[str]]:
+        content_hash = hashlib.sha1(script.encode()).hexdigest()
+        with self._lock:
+            return content_hash, self._codes.get(content_hash)
+
+    def _store(self, url: str, content_hash: str, codes: str, unpacked: bool = True) -> str:
+        if unpacked:
+            logger.debug("[dreamcast] unpacked playerjs %s", url)
+        with self._lock:
+            self.unpacked += unpacked
+            self._codes[content_hash] = codes
+            self._codes.move_to_end(content_hash)
+            while len(self._codes) > self.maxsize:
+                self._codes.popitem(last=False)
+            self._urls[url] = (content_hash, time.time())
+        return codes
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """remove url entry. If url not passed - clear all cache"""
+        with self._lock:
+            if url:
+                self._urls.pop(url, None)
+            else:
+                self._urls.clear()
+                self._codes.clear()
+
+
+DREAMCAST_CRYPT_CODES_CACHE = CryptCodesCache()
+"""process wide crypt codes cache"""
@@ -5,7 +5,10 @@ from __future__ import annotations
 import base64
 import json
 import re
+import string
 import urllib.parse
+from functools import lru_cache
+from itertools import islice, product
 from typing import Any, TypedDict
 
 
@@ -54,17 +57,22 @@ T_PACKED = tuple[str, int, int, list[str], NoneType, dict[str, str]]
 _O_Y = "xx???x=xx?x??="  # maybe dynamic
 _ABC = "ABCDEFGHIJKLMabcdefghijklmNOPQRSTUVWXYZnopqrstuvwxyz"
 _SALT_ABC_STRING = f"{_ABC}0123456789+/="
+_B64_ABC_STRING = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/="
 
 _RE_O_U1 = re.compile(r"u:\s*\\\s*['\"]([^=]+=[\\]+)\s*['\"]")
 """js script encoded"""
+# \w+ is greedy: same words as \b\w+\b
+_RE_WORD = re.compile(r"(\w+)")
 
 _BASE36_STRING = "0123456789abcdefghijklmnopqrstuvwxyz"
+# packer digits: 0-9a-z, then chr(c + 29) - A-Z
+_PACKER_DIGITS = _BASE36_STRING + string.ascii_uppercase
 
 # search anchors
 _PARAMS_START = "return p}('"
 _PARAMS_PACKED_OFFSET = len(_PARAMS_START) - 1
 
-__all__ = ["extract_playlist"]
+__all__ = ["extract_playlist", "decode_playlist", "get_crypt_codes"]
 
 
 def parse_params_to_unpack(packed: str) -> T_PACKED:
@@ -89,23 +97,33 @@ def parse_params_to_unpack(packed: str) -> T_PACKED:
     return p, a, c, k, _, d
 
 
+def _packer_tokens(a: int, count: int) -> list[str]:
+    """first `count` packer tokens (numbers 0, 1, 2... in base `a`) in ascending order"""
+    digits = _PACKER_DIGITS[:a]
+    tokens = list(digits[:count])
+    width = 2
+    while len(tokens) < count:
+        # numbers of `width` digits: first digit is not zero
+        numbers = product(digits[1:], *[digits] * (width - 1))
+        tokens.extend(map("".join, islice(numbers, count - len(tokens))))
+        width += 1
+    return tokens
+
+
 # '_': NoneType
 # (in 3.9) will be added in types module
 def unpack_playerjs(p: str, a: int, c: int, k: list[str], _: Any, d: dict[str, str]) -> str:
     """Playerjs unpacker"""
+    for token, word in zip(_packer_tokens(a, c), k):
+        d[token] = word or token
+    # split by words: odd items are words, replaced in one pass without python callback per match
+    parts = _RE_WORD.split(p)
+    words = parts[1::2]
+    parts[1::2] = map(d.get, words, words)
+    return "".join(parts)
 
-    def e(c: int):
-        return ("" if c < a else e(c // a)) + (chr(c + 29) if (c := c % a) > 35 else _BASE36_STRING[c])
-
-    while c:
-        c -= 1
-        d[e(c)] = k[c] or e(c)
-    p = re.sub(r"\b\w+\b", lambda e: d.get(e.group(), e.group()), p)
 
-    return p
-
-
-def get_crypt_codes(playerjs_packed_script):
+def get_crypt_codes(playerjs_packed_script: str) -> str:
     packed_params = parse_params_to_unpack(playerjs_packed_script)
     playerjs_script = unpack_playerjs(*packed_params)
 
@@ -125,59 +143,30 @@ def decode(x):
 class Salt:
     def __init__(self, key_str=_SALT_ABC_STRING):
         self._keyStr = key_str
+        # playerjs alphabet -> standard base64 alphabet
+        self._table = str.maketrans(key_str, _B64_ABC_STRING)
 
     def d(self, e):
-        t = ""
-        f = 0
-        e = "".join([c for c in e if c in self._keyStr])
-        while f < len(e):
-            s = self._keyStr.index(e[f])
-            f += 1
-            o = self._keyStr.index(e[f])
-            f += 1
-            u = self._keyStr.index(e[f])
-            f += 1
-            a = self._keyStr.index(e[f])
-            f += 1
-            n = (s << 2) | (o >> 4)
-            r = ((o & 15) << 4) | (u >> 2)
-            i = ((u & 3) << 6) | a
-            t += chr(n)
-            if u != 64:
-                t += chr(r)
-            if a != 64:
-                t += chr(i)
-        return self._ud(t)
+        # chars out of alphabet are discarded by b64decode, same as in playerjs
+        return base64.b64decode(e.translate(self._table)).decode("utf-8", errors="replace")
 
     @staticmethod
     def _ud(e):
-        t = ""
-        n = 0
-        while n < len(e):
-            r = ord(e[n])
-            if r < 128:
-                t += chr(r)
-                n += 1
-            elif 191 < r < 224:
-                c2 = ord(e[n + 1])
-                t += chr(((r & 31) << 6) | (c2 & 63))
-                n += 2
-            else:
-                c2 = ord(e[n + 1])
-                c3 = ord(e[n + 2])
-                t += chr(((r & 15) << 12) | ((c2 & 63) << 6) | (c3 & 63))
-                n += 3
-        return t
+        """decode utf-8 bytes stored as latin-1 chars string"""
+        return e.encode("latin-1").decode("utf-8", errors="replace")
 
 
-def pepper(s, n):
-    s = s.replace("+", "#")
-    s = s.replace("#", "+")
+@lru_cache(maxsize=None)
+def _pepper_table(n: int) -> dict[int, int]:
     a = sugar(_O_Y) * n
     if n < 0:
         a += len(_ABC) / 2
     r = _ABC[int(a * 2) :] + _ABC[: int(a * 2)]
-    return re.sub(r"[A-Za-z]", lambda c: r[_ABC.index(c.group())], s)
+    return str.maketrans(_ABC, r)
+
+
+def pepper(s, n):
+    return s.replace("#", "+").translate(_pepper_table(n))
 
 
 def sugar(x):
@@ -202,15 +191,14 @@ def b64d_url_params(s):
     return urllib.parse.unquote(base64.b64decode(s).decode())
 
 
-def extract_playlist(player_js_packed_response: str, player_encoded: str) -> T_PlayerPlaylist:
-    """extract and decode playlist from dreamcast player
+def decode_playlist(crypt_codes: str, player_encoded: str) -> T_PlayerPlaylist:
+    """decode playlist from dreamcast player by crypt codes of playerjs script
 
-    :param player_js_packed_response: raw dreamcast playerjs response
+    :param crypt_codes: crypt codes, extracted from playerjs script by `get_crypt_codes`
     :param player_encoded: encoded (key? url?) in anime page from $(function() {new Playerjs("(...)")...
     :return: decoded playlist
     """
-    o_u = get_crypt_codes(player_js_packed_response)
-    v = json.loads(decode(o_u))
+    v = json.loads(decode(crypt_codes))
     v["file3_separator"] = "//"
     a = player_encoded[2:]
     # bk0 ... bk4 keys
@@ -221,6 +209,16 @@ def extract_playlist(player_js_packed_response: str, player_encoded: str) -> T_P
     return json.loads(b64d_url_params(a))
 
 
+def extract_playlist(player_js_packed_response: str, player_encoded: str) -> T_PlayerPlaylist:
+    """extract and decode playlist from dreamcast player
+
+    :param player_js_packed_response: raw dreamcast playerjs response
+    :param player_encoded: encoded (key? url?) in anime page from $(function() {new Playerjs("(...)")...
+    :return: decoded playlist
+    """
+    return decode_playlist(get_crypt_codes(player_js_packed_response), player_encoded)
+
+
 if __name__ == "__main__":
     import httpx
 
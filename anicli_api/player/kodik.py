@@ -7,7 +7,9 @@ from urllib.parse import urlsplit
 from httpx import Response
 
 from .base import BaseVideoExtractor, Video, url_validator
-from .parsers.kodik_parser import PageMainKodikMin
+from .kodik_cache import KODIK_API_PATH_CACHE, KodikAPIPathCache
+from .kodik_decoder import decode_links, decode_url, decrypt_url
+from .kodik_page import parse_page_min
 
 __all__ = ["Kodik"]
 _URL_EQ = re.compile(r"https://(www\.)?\w{5,32}\.\w{2,6}/(?:serial?|season|video|film)/\d+/\w+/\d{3,4}p")
@@ -17,8 +19,8 @@ logger = logging.getLogger("anicli-api")  # type: ignore
 
 class Kodik(BaseVideoExtractor):
     URL_RULE = _URL_EQ
-    # cached API path to avoid extra requests
-    _CACHED_API_PATH = None
+    # shared cached API paths (by netloc) to avoid extra requests
+    API_PATH_CACHE: KodikAPIPathCache = KODIK_API_PATH_CACHE
     DEFAULT_HTTP_CONFIG = {"http2": True}
     API_CONSTS_PAYLOAD = {"bad_user": False, "info": {}, "cdn_is_working": True}
 
@@ -32,82 +34,60 @@ class Kodik(BaseVideoExtractor):
 
         page, payload = self._extract_api_payload(response)
         netloc = self._get_netloc(url)
+        url_js_player = f"https://{netloc}{page['player_js_path']}"
 
-        if not self._CACHED_API_PATH:
-            url_js_player = f"https://{netloc}{page['player_js_path']}"
-            response_player = self.http.get(url_js_player)
-            self._update_api_path(response_player)
+        def fetch_api_path() -> str:
+            return self._extract_api_path(self.http.get(url_js_player))
 
-        url_api = self._create_url_api(netloc, path=self._CACHED_API_PATH)  # type: ignore
+        api_path = self.API_PATH_CACHE.refresh(netloc, fetch_api_path)
+        url_api = self._create_url_api(netloc, path=api_path)
         headers = self._create_api_headers(url=url, netloc=netloc)
         response_api = self.http.post(url_api, data=payload, headers=headers)
 
         # expired API entry point, update
         if not response_api.is_success:
-            url_js_player = f"https://{netloc}{page['player_js_path']}"
-            response_player = self.http.get(url_js_player)
-            self._update_api_path(response_player)
-
-            url_api = self._create_url_api(netloc, path=self._CACHED_API_PATH)  # type: ignore
+            api_path = self.API_PATH_CACHE.refresh(netloc, fetch_api_path, stale=api_path)
+            url_api = self._create_url_api(netloc, path=api_path)
             response_api = self.http.post(url_api, data=payload, headers=headers)
 
         return self._extract(response_api.json()["links"])
 
     @kodik_validator
     async def a_parse(self, url: str, **kwargs) -> list[Video]:
-        async with self.a_http as client:
-            response = await client.get(url)
-            if self._is_unhandled_error_response(response):
-                return []
-            if self._is_not_founded_video(response):
-                return []
-            page, payload = self._extract_api_payload(response)
-            netloc = self._get_netloc(url)
-
-            if not self._CACHED_API_PATH:
-                url_js_player = f"https://{netloc}{page['player_js_path']}"
-                response_player = await client.get(url_js_player)
-                self._update_api_path(response_player)
-
-            url_api = self._create_url_api(netloc, path=self._CACHED_API_PATH)  # type: ignore
-            headers = self._create_api_headers(url=url, netloc=netloc)
-            response_api = await client.post(url_api, data=payload, headers=headers)
+        client = self.a_http
+        response = await client.get(url)
+        if self._is_unhandled_error_response(response):
+            return []
+        if self._is_not_founded_video(response):
+            return []
+        page, payload = self._extract_api_payload(response)
+        netloc = self._get_netloc(url)
+        url_js_player = f"https://{netloc}{page['player_js_path']}"
 
-            # expired API entry point, update
-            if not response_api.is_success:
-                url_js_player = f"https://{netloc}{page['player_js_path']}"
-                response_player = await client.get(url_js_player)
-                self._update_api_path(response_player)
+        async def fetch_api_path() -> str:
+            return self._extract_api_path(await client.get(url_js_player))
 
-                url_api = self._create_url_api(netloc, path=self._CACHED_API_PATH)  # type: ignore
-                response_api = await client.post(url_api, data=payload, headers=headers)
+        api_path = await self.API_PATH_CACHE.a_refresh(netloc, fetch_api_path)
+        url_api = self._create_url_api(netloc, path=api_path)
+        headers = self._create_api_headers(url=url, netloc=netloc)
+        response_api = await client.post(url_api, data=payload, headers=headers)
+
+        # expired API entry point, update
+        if not response_api.is_success:
+            api_path = await self.API_PATH_CACHE.a_refresh(netloc, fetch_api_path, stale=api_path)
+            url_api = self._create_url_api(netloc, path=api_path)
+            response_api = await client.post(url_api, data=payload, headers=headers)
 
-            return self._extract(response_api.json()["links"])
+        return self._extract(response_api.json()["links"])
 
     @staticmethod
     def _decrypt_url(encoded_str: str) -> str:
         """Decrypt string with custom ROT cipher"""
-        string = ""
-        for char in encoded_str:
-            if char.isupper():
-                string += chr((ord(char) - 65 + 18) % 26 + 65)
-            elif char.islower():
-                string += chr((ord(char) - 97 + 18) % 26 + 97)
-            else:
-                string += char
-        return string
+        return decrypt_url(encoded_str)
 
     def _decode(self, url_encoded: str) -> str:
         """decode video url (custom ROT cipher + base64)"""
-        # 7.03.25 kodik remove encoding urls
-        if url_encoded.endswith(".m3u8"):
-            return url_encoded if url_encoded.startswith("https") else f"https:{url_encoded}"
-
-        base64_url = self._decrypt_url(url_encoded)
-        if not base64_url.endswith("=="):
-            base64_url += "=="
-        decoded_url = b64decode(base64_url).decode()
-        return decoded_url if decoded_url.startswith("https") else f"https:{b64decode(base64_url).decode()}"
+        return decode_url(url_encoded)
 
     @staticmethod
     def _get_netloc(url: str) -> str:
@@ -155,15 +135,16 @@ class Kodik(BaseVideoExtractor):
             return True
         return False
 
-    def _update_api_path(self, response_player) -> None:
+    @staticmethod
+    def _extract_api_path(response_player: Response) -> str:
         # currently broken translate API path extract, use direct regular expession
         # path = PageMainKodikAPIPath(response_player.text).parse()["api_path"]
-        path = re.search(r"\$\.ajax[^)]+atob\([\"\'](\w+=)[\'\"]\)", response_player.text)[1]
-        self._CACHED_API_PATH = b64decode(path).decode()
+        path = re.search(r"\$\.ajax[^)]+atob\([\"\'](\w+=)[\'\"]\)", response_player.text)[1]  # type: ignore
+        return b64decode(path).decode()
 
     def _extract_api_payload(self, response):
-        response = response.text
-        page = PageMainKodikMin(response).parse()
+        # fast path: scan original response text, without html.tostring round-trip
+        page = parse_page_min(response.text)
         payload = page["api_payload"]
         payload.update(self.API_CONSTS_PAYLOAD)  # type: ignore
         return page, payload
@@ -171,21 +152,15 @@ class Kodik(BaseVideoExtractor):
     def _extract(self, response_api: dict) -> list[Video]:
         # maybe not exists '720' key for VERY old anime titles
         # eg: early 'One peace!', 'Evangelion' series
-        if response_api.get("720"):
-            return [
-                Video(type="m3u8", quality=360, url=self._decode(response_api["360"][0]["src"])),
-                Video(type="m3u8", quality=480, url=self._decode(response_api["480"][0]["src"])),
-                Video(
-                    type="m3u8",
-                    quality=720,
+        videos = []
+        seen = set()
+        for quality, urls in decode_links(response_api).items():
+            # first link is primary, next - alternative links (other cdn nodes)
+            for url in urls:
+                if quality == 720:
                     # this key return 480p link
-                    url=self._decode(response_api["720"][0]["src"]).replace("/480.mp4:", "/720.mp4:"),
-                ),
-            ]
-        elif response_api.get("480"):
-            return [
-                Video(type="m3u8", quality=360, url=self._decode(response_api["360"][0]["src"])),
-                Video(type="m3u8", quality=480, url=self._decode(response_api["480"][0]["src"])),
-            ]
-        # OMG :O
-        return [Video(type="m3u8", quality=360, url=self._decode(response_api["360"][0]["src"]))]
+                    url = url.replace("/480.mp4:", "/720.mp4:")
+                if url not in seen:
+                    seen.add(url)
+                    videos.append(Video(type="m3u8", quality=quality, url=url))
+        return videos
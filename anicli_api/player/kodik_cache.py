@@ -0,0 +1,208 @@
+"""Process-wide cache of decoded Kodik API paths
+
+Kodik dynamically changes API entrypoint path (hidden in the player javascript file). Extract it
+requires download and scan player js, so the decoded path is cached by player netloc
+(kodik.info, aniqit.com, anivod...) and shared between all Kodik extractor instances.
+
+- entries expire after `ttl` seconds
+- refresh is single-flight: concurrent threads (or tasks in one event loop) wait for one download
+- backend is pluggable: use `JSONFileCacheBackend` to keep paths between restarts
+
+Usage:
+
+    >>> from anicli_api.player.kodik_cache import KODIK_API_PATH_CACHE, JSONFileCacheBackend
+    >>> KODIK_API_PATH_CACHE.backend = JSONFileCacheBackend("~/.cache/anicli_api/kodik.json")
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Awaitable, Callable, Optional, Union
+from weakref import WeakKeyDictionary
+
+from anicli_api._logger import logger
+
+__all__ = [
+    "BaseCacheBackend",
+    "MemoryCacheBackend",
+    "JSONFileCacheBackend",
+    "KodikAPIPathCache",
+    "KODIK_API_PATH_CACHE",
+]
+
+# netloc: (api path, created at unix timestamp)
+T_CACHE_ITEMS = dict[str, tuple[str, float]]
+
+
+class BaseCacheBackend(ABC):
+    """persistent storage of cached API paths"""
+
+    @abstractmethod
+    def load(self) -> T_CACHE_ITEMS:
+        pass
+
+    @abstractmethod
+    def save(self, items: T_CACHE_ITEMS) -> None:
+        pass
+
+
+class MemoryCacheBackend(BaseCacheBackend):
+    """default backend: nothing persisted between restarts"""
+
+    def load(self) -> T_CACHE_ITEMS:
+        return {}
+
+    def save(self, items: T_CACHE_ITEMS) -> None:
+        pass
+
+
+class JSONFileCacheBackend(BaseCacheBackend):
+    """store cached API paths in json file"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path).expanduser()
+
+    def load(self) -> T_CACHE_ITEMS:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            return {netloc: (item[0], float(item[1])) for netloc, item in data.items()}
+        except FileNotFoundError:
+            return {}
+        except (ValueError, TypeError, IndexError, AttributeError) as e:
+            logger.warning("[kodik] failed load API path cache from %s: %s", self.path, e)
+            return {}
+
+    def save(self, items: T_CACHE_ITEMS) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(items), encoding="utf-8")
+        # atomic replace: other processes never read partially written file
+        os.replace(tmp_path, self.path)
+
+
+class KodikAPIPathCache:
+    """thread-safe and asyncio-safe Kodik API path cache
+
+    :param ttl: time to live of cached path in seconds
+    :param backend: persistent storage backend
+    """
+
+    def __init__(self, ttl: float = 60 * 60 * 6, backend: Optional[BaseCacheBackend] = None):
+        self.ttl = ttl
+        self._backend = backend or MemoryCacheBackend()
+        self._items: Optional[T_CACHE_ITEMS] = None  # lazy load from backend
+        self._lock = threading.RLock()
+        # netloc: refreshes counter. Waiters compare it to detect refresh by another thread or task
+        self._generations: dict[str, int] = {}
+        self._sync_locks: dict[str, threading.Lock] = {}
+        self._async_locks: WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Lock]] = WeakKeyDictionary()
+
+    @property
+    def backend(self) -> BaseCacheBackend:
+        return self._backend
+
+    @backend.setter
+    def backend(self, backend: BaseCacheBackend) -> None:
+        with self._lock:
+            self._backend = backend
+            self._items = None
+
+    @property
+    def _cache(self) -> T_CACHE_ITEMS:
+        with self._lock:
+            if self._items is None:
+                self._items = self._backend.load()
+            return self._items
+
+    def get(self, netloc: str) -> Optional[str]:
+        """get cached API path. Returns None if path not exists or expired"""
+        with self._lock:
+            item = self._cache.get(netloc)
+        if item and time.time() - item[1] < self.ttl:
+            return item[0]
+        return None
+
+    def set(self, netloc: str, path: str) -> None:
+        with self._lock:
+            self._cache[netloc] = (path, time.time())
+            self._generations[netloc] = self._generations.get(netloc, 0) + 1
+            self._backend.save(self._cache)
+
+    def invalidate(self, netloc: Optional[str] = None) -> None:
+        """remove cached path by netloc. If netloc not passed - clear all cache"""
+        with self._lock:
+            if netloc:
+                self._cache.pop(netloc, None)
+            else:
+                self._cache.clear()
+            self._backend.save(self._cache)
+
+    def _is_fresh(self, netloc: str, stale: Optional[str]) -> Optional[str]:
+        # cached path is not the known expired one
+        path = self.get(netloc)
+        if path and path != stale:
+            return path
+        return None
+
+    def _generation(self, netloc: str) -> int:
+        with self._lock:
+            return self._generations.get(netloc, 0)
+
+    def _refreshed(self, netloc: str, generation: int) -> Optional[str]:
+        # another thread or task refreshed the path while waiting for lock. New path may equal stale value
+        # (request failed not because of rotated path): do not download player js again
+        if self._generation(netloc) != generation:
+            return self.get(netloc)
+        return None
+
+    def refresh(self, netloc: str, fetch: Callable[[], str], stale: Optional[str] = None) -> str:
+        """get cached path or download a new one (single-flight)
+
+        :param netloc: kodik player netloc
+        :param fetch: function for extract API path from player js
+        :param stale: known expired path. If passed, cached path will be updated only if it equals stale value
+        """
+        if path := self._is_fresh(netloc, stale):
+            return path
+
+        generation = self._generation(netloc)
+        with self._lock:
+            lock = self._sync_locks.setdefault(netloc, threading.Lock())
+        with lock:
+            if path := self._refreshed(netloc, generation):
+                return path
+            path = fetch()
+            self.set(netloc, path)
+            return path
+
+    async def a_refresh(self, netloc: str, fetch: Callable[[], Awaitable[str]], stale: Optional[str] = None) -> str:
+        """get cached path or download a new one in async mode (single-flight). Backend is saved in a worker thread
+
+        :param netloc: kodik player netloc
+        :param fetch: coroutine function for extract API path from player js
+        :param stale: known expired path. If passed, cached path will be updated only if it equals stale value
+        """
+        if path := self._is_fresh(netloc, stale):
+            return path
+
+        generation = self._generation(netloc)
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            lock = self._async_locks.setdefault(loop, {}).setdefault(netloc, asyncio.Lock())
+        async with lock:
+            if path := self._refreshed(netloc, generation):
+                return path
+            path = await fetch()
+            # backend may write file
+            await asyncio.to_thread(self.set, netloc, path)
+            return path
+
+
+KODIK_API_PATH_CACHE = KodikAPIPathCache()
+"""default cache, shared between all Kodik extractors"""
@@ -0,0 +1,87 @@
+"""Fast path for the Kodik player page
+
+Generated `PageMainKodikMin` serializes the parsed document back to string (`html.tostring`) twice and runs
+a separate `re.search` over the whole page for every js variable. This module works with the original
+response text:
+
+- all js variables (urlParams, domain, d_sign, pd, pd_sign, ref, ref_sign, vInfo.type/hash/id)
+  extracted in one compiled multi-pattern scan
+- lxml tree created only for the `<head>` fragment (player_js_path selector)
+
+If page layout changed and some variable not found - fallback to the generated parser.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Optional
+
+from lxml import html
+
+from anicli_api._logger import logger
+
+from .parsers.kodik_parser import PageMainKodikMin, PageMainKodikMinType
+
+__all__ = ["parse_page_min"]
+
+# same expressions as in generated KodikAPIPayload and PageMainKodikMin, joined into one alternation
+_RE_PAGE_VARS = re.compile(
+    r"var\s*(?P<var>domain|d_sign|pd_sign|pd|ref_sign|ref)\s+=\s+['\"](?P<var_value>.*?)['\"];"
+    r"|vInfo\.(?P<info>type|hash|id) = ['\"](?P<info_value>.*?)['\"];"
+    r"|var\s*urlParams\s*=\s*['\"](?P<url_params>\{.*\})['\"]"
+)
+# js variable name: api payload key
+_PAYLOAD_KEYS = {
+    "domain": "d",
+    "d_sign": "d_sign",
+    "pd": "pd",
+    "pd_sign": "pd_sign",
+    "ref": "ref",
+    "ref_sign": "ref_sign",
+    "type": "type",
+    "hash": "hash",
+    "id": "id",
+}
+_PLAYER_JS_SELECTOR = 'head > script[type="text/javascript"][src*="assets/js"]'
+
+
+def _scan_vars(text: str) -> tuple[dict[str, str], Optional[str]]:
+    payload: dict[str, str] = {}
+    url_params = None
+    for match in _RE_PAGE_VARS.finditer(text):
+        name = match["var"] or match["info"]
+        if name:
+            # keep first occurrence, same as re.search
+            payload.setdefault(_PAYLOAD_KEYS[name], match["var_value"] if match["var"] else match["info_value"])
+        elif url_params is None:
+            url_params = match["url_params"]
+        if url_params is not None and len(payload) == len(_PAYLOAD_KEYS):
+            break
+    return payload, url_params
+
+
+def _parse_player_js_path(text: str) -> str:
+    end = text.find("</head>")
+    fragment = text[: end + len("</head>")] if end != -1 else text
+    return html.fromstring(fragment.strip()).cssselect(_PLAYER_JS_SELECTOR)[0].get("src", "")
+
+
+def parse_page_min(text: str) -> PageMainKodikMinType:
+    """extract `PageMainKodikMin` compatible data from the Kodik player page text
+
+    :param text: raw player page html
+    """
+    payload, url_params = _scan_vars(text)
+    if url_params is not None and len(payload) == len(_PAYLOAD_KEYS):
+        try:
+            return {
+                "url_params": json.loads(url_params),
+                "api_payload": payload,  # type: ignore[typeddict-item]
+                "player_js_path": _parse_player_js_path(text),
+            }
+        except (ValueError, IndexError) as e:
+            logger.debug("[kodik] fast page parser failed: %r, fallback to PageMainKodikMin", e)
+    else:
+        logger.debug("[kodik] fast page parser: not all variables found, fallback to PageMainKodikMin")
+    return PageMainKodikMin(text).parse()
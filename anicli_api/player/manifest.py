@@ -0,0 +1,305 @@
+"""HLS master playlist and DASH MPD parser: real qualities of m3u8/mpd videos
+
+Players often return stream manifests with guessed quality (Aniboom - 1080, CdnVideoHub - max mp4 quality).
+`expand_videos` fetches manifests concurrently and replaces every m3u8/mpd `Video` by variant videos with
+real quality (by resolution). Aniboom and CdnVideoHub extractors call it in `parse`/`a_parse`
+(opt-out: `EXPAND_MANIFESTS = False`), videos of other players can be passed explicitly:
+
+- HLS master playlist: `#EXT-X-STREAM-INF` variants. Video url - variant playlist. If variant audio is
+  a separate rendition (`#EXT-X-MEDIA:TYPE=AUDIO` with URI), url - master playlist (variant playlist is silent)
+- DASH: video representations. Video url - mpd url (player selects representation)
+- variants sharing one url (DASH, HLS with separate audio) are adaptive streams: one video of max variant quality
+- media playlists, manifests without resolution and failed requests: video is kept as is
+
+Parsed manifests are cached by url (`MANIFEST_CACHE`).
+
+Usage:
+
+    >>> from anicli_api.player.kodik import Kodik
+    >>> from anicli_api.player.manifest import expand_videos, parse_hls
+    >>> from anicli_api.tools.helpers import get_video_by_quality
+    >>>
+    >>> videos = expand_videos(Kodik().parse(url))
+    >>> get_video_by_quality(videos, 720)
+    >>> for variant in parse_hls(text, "https://example.org/master.m3u8"):
+    ...     print(variant.quality, variant.resolution, variant.bandwidth, variant.codecs)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import threading
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urljoin
+
+from httpx import HTTPError
+
+from anicli_api._http import DEFAULT_SESSION
+from anicli_api._logger import logger
+from anicli_api.player.base import Video
+from anicli_api.typing import NamedTuple, Sequence
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient, Client
+
+__all__ = [
+    "Variant",
+    "ManifestCache",
+    "MANIFEST_CACHE",
+    "parse_hls",
+    "parse_dash",
+    "parse_manifest",
+    "expand_videos",
+    "a_expand_videos",
+]
+
+QUALITIES = (144, 240, 360, 480, 720, 1080, 1440, 2160)
+
+_RE_HLS_ATTRIBUTE = re.compile(r'([A-Z0-9-]+)=("[^"]*"|[^,]*)')
+_RE_RESOLUTION = re.compile(r"^(\d+)x(\d+)$")
+
+
+class Variant(NamedTuple):
+    url: str
+    """absolute variant url (HLS) or manifest url (DASH)"""
+    quality: int
+    """nearest standard quality by resolution"""
+    resolution: tuple[int, int]
+    """width, height"""
+    bandwidth: Optional[int] = None
+    """bits per second"""
+    codecs: Optional[str] = None
+
+
+def _quality(width: int, height: int) -> int:
+    # wide screen (1920x800) is 1080p
+    return min(QUALITIES, key=lambda q: abs(q - max(height, width * 9 // 16)))
+
+
+def _hls_attributes(line: str) -> dict[str, str]:
+    return {k: v.strip('"') for k, v in _RE_HLS_ATTRIBUTE.findall(line.partition(":")[2])}
+
+
+def parse_hls(text: str, base_url: str) -> list[Variant]:
+    """variants of HLS master playlist with resolution. Empty list - media playlist or no resolutions
+
+    :param text: playlist content
+    :param base_url: playlist url (resolve relative variant urls)
+    """
+    # audio group id: has separate audio playlist
+    audio_groups = set()
+    for line in text.splitlines():
+        if line.startswith("#EXT-X-MEDIA:"):
+            media = _hls_attributes(line)
+            if media.get("TYPE") == "AUDIO" and media.get("URI"):
+                audio_groups.add(media.get("GROUP-ID"))
+
+    variants = []
+    attrs: Optional[dict[str, str]] = None
+    for line in text.splitlines():
+        line = line.strip()
+        if line.startswith("#EXT-X-STREAM-INF:"):
+            attrs = _hls_attributes(line)
+        elif attrs is not None and line and not line.startswith("#"):
+            if match := _RE_RESOLUTION.match(attrs.get("RESOLUTION", "")):
+                width, height = int(match[1]), int(match[2])
+                url = base_url if attrs.get("AUDIO") in audio_groups else urljoin(base_url, line)
+                bandwidth = attrs.get("BANDWIDTH")
+                variants.append(
+                    Variant(
+                        url=url,
+                        quality=_quality(width, height),
+                        resolution=(width, height),
+                        bandwidth=int(bandwidth) if bandwidth and bandwidth.isdigit() else None,
+                        codecs=attrs.get("CODECS"),
+                    )
+                )
+            attrs = None
+    return variants
+
+
+def parse_dash(text: str, base_url: str) -> list[Variant]:
+    """video representations of DASH MPD with resolution
+
+    :param text: mpd content
+    :param base_url: mpd url
+    """
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as e:
+        logger.warning("[manifest] failed parse mpd %s: %s", base_url, e)
+        return []
+    variants = []
+    for adaptation in root.iter():
+        if not adaptation.tag.endswith("AdaptationSet"):
+            continue
+        for representation in adaptation:
+            if not representation.tag.endswith("Representation"):
+                continue
+            # attributes are inherited from AdaptationSet
+            attrs = {**adaptation.attrib, **representation.attrib}
+            content_type = attrs.get("contentType") or attrs.get("mimeType", "").partition("/")[0]
+            if content_type not in ("video", "") or not attrs.get("width") or not attrs.get("height"):
+                continue
+            width, height = int(attrs["width"]), int(attrs["height"])
+            bandwidth = attrs.get("bandwidth")
+            variants.append(
+                Variant(
+                    url=base_url,
+                    quality=_quality(width, height),
+                    resolution=(width, height),
+                    bandwidth=int(bandwidth) if bandwidth and bandwidth.isdigit() else None,
+                    codecs=attrs.get("codecs"),
+                )
+            )
+    return variants
+
+
+def parse_manifest(video_type: str, text: str, base_url: str) -> list[Variant]:
+    """parse manifest by video type (`m3u8` or `mpd`)"""
+    return parse_dash(text, base_url) if video_type == "mpd" else parse_hls(text, base_url)
+
+
+class ManifestCache:
+    """thread-safe LRU cache of parsed manifests with ttl
+
+    :param maxsize: max cached manifests
+    :param ttl: seconds
+    """
+
+    def __init__(self, maxsize: int = 256, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # url: (variants, created at)
+        self._items: OrderedDict[str, tuple[list[Variant], float]] = OrderedDict()
+
+    def get(self, url: str) -> Optional[list[Variant]]:
+        with self._lock:
+            item = self._items.get(url)
+            if item is None:
+                return None
+            if time.monotonic() - item[1] > self.ttl:
+                del self._items[url]
+                return None
+            self._items.move_to_end(url)
+            return item[0]
+
+    def set(self, url: str, variants: list[Variant]) -> None:
+        with self._lock:
+            self._items[url] = (variants, time.monotonic())
+            self._items.move_to_end(url)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+MANIFEST_CACHE = ManifestCache()
+"""process wide parsed manifests cache"""
+
+
+def _is_manifest(video: Video) -> bool:
+    return video.type in ("m3u8", "mpd")
+
+
+def _variant_videos(video: Video, variants: list[Variant]) -> list[Video]:
+    if not variants:
+        return [video]
+    # variants of one url (mpd, master playlist): adaptive stream, player selects quality. Keep the max quality
+    by_url: dict[str, Variant] = {}
+    for variant in sorted(variants, key=lambda v: (v.quality, v.bandwidth or 0)):
+        by_url[variant.url] = variant
+    videos: dict[int, Video] = {}
+    # several variants of one quality (bitrate ladder, codecs): keep the highest bandwidth
+    for variant in sorted(by_url.values(), key=lambda v: v.bandwidth or 0):
+        videos[variant.quality] = Video(
+            type=video.type, quality=variant.quality, url=variant.url, headers=video.headers.copy()
+        )
+    return sorted(videos.values(), key=lambda v: v.quality)
+
+
+def _merge(expanded: list[list[Video]]) -> list[Video]:
+    result: list[Video] = []
+    seen = set()
+    for video in (v for items in expanded for v in items):
+        if (key := (video.type, video.quality, video.url)) not in seen:
+            seen.add(key)
+            result.append(video)
+    return result
+
+
+def _fetch(http: "Client", video: Video, cache: ManifestCache) -> list[Video]:
+    if not _is_manifest(video):
+        return [video]
+    if (variants := cache.get(video.url)) is None:
+        try:
+            response = http.get(video.url, headers=video.headers)
+            response.raise_for_status()
+        except HTTPError as e:
+            logger.warning("[manifest] failed fetch %s: %r", video.url, e)
+            return [video]
+        variants = parse_manifest(video.type, response.text, str(response.url))
+        cache.set(video.url, variants)
+    return _variant_videos(video, variants)
+
+
+async def _a_fetch(http: "AsyncClient", video: Video, cache: ManifestCache) -> list[Video]:
+    if not _is_manifest(video):
+        return [video]
+    if (variants := cache.get(video.url)) is None:
+        try:
+            response = await http.get(video.url, headers=video.headers)
+            response.raise_for_status()
+        except HTTPError as e:
+            logger.warning("[manifest] failed fetch %s: %r", video.url, e)
+            return [video]
+        variants = parse_manifest(video.type, response.text, str(response.url))
+        cache.set(video.url, variants)
+    return _variant_videos(video, variants)
+
+
+def expand_videos(
+    videos: Sequence[Video],
+    http: Optional["Client"] = None,
+    cache: ManifestCache = MANIFEST_CACHE,
+    max_workers: int = 8,
+) -> list[Video]:
+    """replace m3u8/mpd videos by variants with real quality. Manifests are fetched concurrently in threads
+
+    :param videos: player videos
+    :param http: http client. Default - process wide session client
+    :param cache: parsed manifests cache
+    :param max_workers: max concurrent manifest requests
+    """
+    http = http or DEFAULT_SESSION.http
+    manifests = [v for v in videos if _is_manifest(v)]
+    if len(manifests) < 2:
+        return _merge([_fetch(http, v, cache) for v in videos])
+    with ThreadPoolExecutor(min(max_workers, len(manifests)), thread_name_prefix="anicli-manifest") as executor:
+        return _merge(list(executor.map(lambda v: _fetch(http, v, cache), videos)))
+
+
+async def a_expand_videos(
+    videos: Sequence[Video],
+    http: Optional["AsyncClient"] = None,
+    cache: ManifestCache = MANIFEST_CACHE,
+) -> list[Video]:
+    """replace m3u8/mpd videos by variants with real quality in async mode. Manifests are fetched concurrently
+
+    :param videos: player videos
+    :param http: http client. Default - process wide session client
+    :param cache: parsed manifests cache
+    """
+    http = http or DEFAULT_SESSION.http_async
+    return _merge(list(await asyncio.gather(*(_a_fetch(http, v, cache) for v in videos))))
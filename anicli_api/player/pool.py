@@ -0,0 +1,201 @@
+"""Pool of long-lived video extractor instances.
+
+Every extractor owns pre-configured http clients, so creating a new extractor per `Source.get_videos()` call
+drops keep-alive connections and repeats TLS/HTTP2 handshakes. The pool reuses one extractor per
+(extractor class, httpx configuration) key.
+
+Async extractors are stored per running event loop: httpx.AsyncClient connections are bound to the loop
+that opened them and can not be reused from another loop (eg: several `asyncio.run()` calls).
+
+Usage:
+
+    >>> from anicli_api.player.pool import ExtractorPool
+    >>> from anicli_api.player.kodik import Kodik
+    >>> with ExtractorPool() as pool:
+    ...     videos = [pool.get(Kodik).parse(url) for url in urls]
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Hashable, Optional, TypeVar
+from weakref import WeakKeyDictionary
+
+from httpx import Limits, Timeout
+
+if TYPE_CHECKING:
+    from anicli_api.player.base import ABCVideoExtractor
+
+__all__ = ["ExtractorPool", "EXTRACTOR_POOL"]
+
+T_Extractor = TypeVar("T_Extractor", bound="ABCVideoExtractor")
+T_Key = tuple[type, Hashable]
+T_Item = tuple["ABCVideoExtractor", dict[str, Any]]
+
+
+def _freeze(value: Any) -> Hashable:
+    """convert httpx kwargs value to hashable key part.
+
+    httpx config objects compared by value, other unhashable objects (eg: custom transports, auth objects)
+    compared by identity
+    """
+    if isinstance(value, Timeout):
+        return ("__timeout__", value.connect, value.read, value.write, value.pool)
+    elif isinstance(value, Limits):
+        return ("__limits__", value.max_connections, value.max_keepalive_connections, value.keepalive_expiry)
+    elif isinstance(value, dict):
+        return tuple(sorted(((str(k), _freeze(v)) for k, v in value.items()), key=lambda i: i[0]))
+    elif isinstance(value, (list, tuple)):
+        return tuple(_freeze(i) for i in value)
+    try:
+        hash(value)
+    except TypeError:
+        return ("__id__", id(value))
+    return value
+
+
+async def _aclose_all(extractors: list["ABCVideoExtractor"]) -> None:
+    for extractor in extractors:
+        await extractor.aclose()
+
+
+class ExtractorPool:
+    """Thread-safe registry of reusable video extractors
+
+    - `get` - returns shared extractor for sync `parse` calls
+    - `a_get` - returns shared extractor bound to the current event loop for `a_parse` calls
+    - `close`, `aclose` - close all pooled http clients. Pool can be used again after closing
+
+    Every registry (sync and per event loop) keeps at most `maxsize` extractors: least recently used
+    extractor is closed on overflow (eg: new transport or auth object passed on every call).
+    Extractors of closed event loops can not be closed anymore: references are dropped.
+
+    :param maxsize: max extractors per registry
+    """
+
+    def __init__(self, maxsize: int = 32):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        # value: extractor, httpx kwargs (keep references alive for id-based keys)
+        self._extractors: OrderedDict[T_Key, T_Item] = OrderedDict()
+        self._async_extractors: WeakKeyDictionary[asyncio.AbstractEventLoop, OrderedDict[T_Key, T_Item]] = (
+            WeakKeyDictionary()
+        )
+        # close tasks, scheduled by sync `close` in the running loop
+        self._closing: set[asyncio.Task] = set()
+
+    @staticmethod
+    def _key(extractor_cls: type, httpx_kwargs: dict[str, Any]) -> T_Key:
+        return extractor_cls, _freeze(httpx_kwargs)
+
+    def _get_or_create(
+        self, items: OrderedDict[T_Key, T_Item], extractor_cls: type, httpx_kwargs: dict[str, Any]
+    ) -> tuple["ABCVideoExtractor", list["ABCVideoExtractor"]]:
+        # call under lock. Returns extractor and evicted extractors (close them outside lock)
+        key = self._key(extractor_cls, httpx_kwargs)
+        if item := items.get(key):
+            items.move_to_end(key)
+            return item[0], []
+        items[key] = (extractor_cls(**httpx_kwargs), httpx_kwargs)
+        evicted = []
+        while len(items) > self.maxsize:
+            evicted.append(items.popitem(last=False)[1][0])
+        return items[key][0], evicted
+
+    def get(self, extractor_cls: type[T_Extractor], **httpx_kwargs) -> T_Extractor:
+        """get or create extractor for sync usage
+
+        :param extractor_cls: video extractor class
+        :param httpx_kwargs: httpx.Client configuration
+        """
+        with self._lock:
+            extractor, evicted = self._get_or_create(self._extractors, extractor_cls, httpx_kwargs)
+        for old in evicted:
+            old.close()
+        return extractor  # type: ignore[return-value]
+
+    async def a_get(self, extractor_cls: type[T_Extractor], **httpx_kwargs) -> T_Extractor:
+        """get or create extractor for usage in the current event loop
+
+        :param extractor_cls: video extractor class
+        :param httpx_kwargs: httpx.AsyncClient configuration
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for closed_loop in [i for i in self._async_extractors if i.is_closed()]:
+                del self._async_extractors[closed_loop]
+            extractors = self._async_extractors.setdefault(loop, OrderedDict())
+            extractor, evicted = self._get_or_create(extractors, extractor_cls, httpx_kwargs)
+        await _aclose_all(evicted)
+        return extractor  # type: ignore[return-value]
+
+    def _pop_all(
+        self,
+    ) -> tuple[list["ABCVideoExtractor"], dict[asyncio.AbstractEventLoop, list["ABCVideoExtractor"]]]:
+        with self._lock:
+            sync_extractors = [i[0] for i in self._extractors.values()]
+            self._extractors.clear()
+            async_extractors = {
+                loop: [i[0] for i in items.values()]
+                for loop, items in self._async_extractors.items()
+                if not loop.is_closed()
+            }
+            self._async_extractors.clear()
+        return sync_extractors, async_extractors
+
+    def _close_in_loop(self, loop: asyncio.AbstractEventLoop, extractors: list["ABCVideoExtractor"]) -> None:
+        # async clients are closed only in the loop they are bound to
+        try:
+            running_loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if loop is running_loop:
+            task = loop.create_task(_aclose_all(extractors))
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(_aclose_all(extractors), loop)
+        else:
+            loop.run_until_complete(_aclose_all(extractors))
+
+    def close(self) -> None:
+        """close all pooled http clients. Async clients are closed in their event loops"""
+        sync_extractors, async_extractors = self._pop_all()
+        for extractor in sync_extractors:
+            extractor.close()
+        for loop, extractors in async_extractors.items():
+            self._close_in_loop(loop, extractors)
+
+    async def aclose(self) -> None:
+        """close all pooled http clients. Async clients of the current event loop are closed before return"""
+        sync_extractors, async_extractors = self._pop_all()
+        for extractor in sync_extractors:
+            extractor.close()
+        current_loop = asyncio.get_running_loop()
+        for loop, extractors in async_extractors.items():
+            if loop is current_loop:
+                await _aclose_all(extractors)
+            else:
+                self._close_in_loop(loop, extractors)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._extractors) + sum(len(i) for i in self._async_extractors.values())
+
+    def __enter__(self) -> "ExtractorPool":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "ExtractorPool":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+
+EXTRACTOR_POOL = ExtractorPool()
+"""default pool, used in `BaseSource.get_videos` and `BaseSource.a_get_videos`"""
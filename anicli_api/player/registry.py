@@ -0,0 +1,73 @@
+"""Lazy video extractors registry
+
+Player modules import ssc-gen lxml parsers and generated API clients, so importing all of them on
+`import anicli_api.base` is wasted time for processes which never hit most players. Every player declared here
+by class name, module path and url rules: module imported only when url matched (`PlayerSpec.load`).
+
+`url_rule` and `hosts` must be equal to `URL_RULE` and `URL_HOSTS` of the extractor class
+(checked in tests/test_registry.py).
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Optional
+
+from anicli_api.typing import NamedTuple
+
+if TYPE_CHECKING:
+    from anicli_api.player.base import BaseVideoExtractor
+
+__all__ = ["PlayerSpec", "PLAYERS", "get_player_spec"]
+
+
+class PlayerSpec(NamedTuple):
+    name: str
+    """extractor class name"""
+    module: str
+    """extractor module path"""
+    url_rule: str
+    """`URL_RULE` pattern of extractor"""
+    hosts: tuple[str, ...] = ()
+    """`URL_HOSTS` of extractor"""
+
+    def load(self) -> type[BaseVideoExtractor]:
+        """import module and get extractor class"""
+        return getattr(importlib.import_module(self.module), self.name)
+
+
+# priority order
+PLAYERS = (
+    PlayerSpec(
+        "Kodik",
+        "anicli_api.player.kodik",
+        r"https://(www\.)?\w{5,32}\.\w{2,6}/(?:serial?|season|video|film)/\d+/\w+/\d{3,4}p",
+    ),
+    PlayerSpec("Aniboom", "anicli_api.player.aniboom", r"https://(www.)?aniboom\.one/", ("aniboom.one",)),
+    PlayerSpec(
+        "Askor", "anicli_api.player.askor", r"https?://(www\.)?aksor\.(yani\.)?tv/.*", ("aksor.tv", "aksor.yani.tv")
+    ),
+    PlayerSpec("SibNet", "anicli_api.player.sibnet", r"https?://(www\.)?video\.sibnet", ("video.sibnet.ru",)),
+    PlayerSpec("CsstOnline", "anicli_api.player.csst", r"https?://(www\.)?csst\.online/embed/\d+", ("csst.online",)),
+    PlayerSpec(
+        "SovietRomanticaPlayer",
+        "anicli_api.player.sovetromantica",
+        r"https?://(www\.)?[a-z1-9]{1,6}\.sovetromantica\.com/(?:anime|dorama)/.*\.m3u8",
+    ),
+    PlayerSpec(
+        "SovietRomanticaEmbed",
+        "anicli_api.player.sovetromantica_embed",
+        r"https?://(www\.)?sovetromantica\.com/embed/.*",
+        ("sovetromantica.com",),
+    ),
+    PlayerSpec(
+        "CdnVideoHub",
+        "anicli_api.player.cdnvideohub",
+        r"https?://(www\.)?animego\.\w+/cdn\-iframe/\d+/[\w\s]+/\d+/\d+",
+    ),
+)
+
+
+def get_player_spec(name: str) -> Optional[PlayerSpec]:
+    """get registered player by extractor class name"""
+    return next((spec for spec in PLAYERS if spec.name == name), None)
@@ -12,6 +12,7 @@ player_validator = url_validator(_URL_EQ)
 
 class SovietRomanticaEmbed(SovietRomanticaPlayer):
     URL_RULE = _URL_EQ
+    URL_HOSTS = ("sovetromantica.com",)
 
     @player_validator
     def parse(self, url: str, **kwargs) -> list[Video]:
@@ -20,9 +21,8 @@ class SovietRomanticaEmbed(SovietRomanticaPlayer):
 
     @player_validator
     async def a_parse(self, url: str, **kwargs) -> list[Video]:
-        async with self.a_http as client:
-            response = await client.get(url)
-            return self._extract(response.text)
+        response = await self.a_http.get(url)
+        return self._extract(response.text)
 
     def _extract(self, response: str) -> list[Video]:
         if url := re.search(r'"file":"(.+?)"', response):
@@ -0,0 +1 @@
+from anicli_api.source.registry import SOURCES, SourceSpec, get_source, resolve_source
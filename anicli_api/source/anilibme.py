@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from attrs import define, field
 
 from anicli_api.typing import TypedDict
-from anicli_api._http import HTTPAsync, HTTPSync
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 from anicli_api.player.base import Video
 from anicli_api.source.apis.animelib_org import (
@@ -20,6 +19,8 @@ from anicli_api.source.apis.animelib_org import (
 if TYPE_CHECKING:
     from httpx import AsyncClient, Client
 
+    from anicli_api._http import HTTPSession
+
 
 T_KW_APIS = TypedDict("T_KW_APIS", {"sync_api": AnimeliborgAPISync, "async_api": AnimeliborgAPIAsync})
 
@@ -63,17 +64,28 @@ _SITE_ID = [1, 3]
 class Extractor(BaseExtractor):
     BASE_URL = "https://api.cdnlibs.org/api/"
 
-    def __init__(self, http_client: "Client" = HTTPSync(), http_async_client: "AsyncClient" = HTTPAsync()):
-        super().__init__(http_client=http_client, http_async_client=http_async_client)
-        self._sync_api = AnimeliborgAPISync(client=http_client)
-        self._async_api = AnimeliborgAPIAsync(client=http_async_client)
+    def __init__(
+        self,
+        http_client: Optional["Client"] = None,
+        http_async_client: Optional["AsyncClient"] = None,
+        *,
+        session: Optional["HTTPSession"] = None,
+    ):
+        super().__init__(http_client=http_client, http_async_client=http_async_client, session=session)
+        # API clients created on first usage: http clients are lazy
+        self._sync_api: Optional[AnimeliborgAPISync] = None
+        self._async_api: Optional[AnimeliborgAPIAsync] = None
 
     @property
     def sync_api(self) -> AnimeliborgAPISync:
+        if self._sync_api is None:
+            self._sync_api = AnimeliborgAPISync(client=self.http)
         return self._sync_api
 
     @property
     def async_api(self) -> AnimeliborgAPIAsync:
+        if self._async_api is None:
+            self._async_api = AnimeliborgAPIAsync(client=self.http_async)
         return self._async_api
 
     @property
@@ -386,7 +398,7 @@ class Source(_ApiInstancesMixin, BaseSource):
                         type="mp4",
                         quality=video["quality"],
                         url=self.url + video["href"],
-                        headers={"Referrer": "https://v3.animelib.org", "User-Agent": self.http.headers["User-Agent"]},
+                        headers={"Referrer": "https://v3.animelib.org", "User-Agent": self.http_async.headers["User-Agent"]},
                     )
                 )
             return results
@@ -6,11 +6,10 @@ saved old extractor name for backport support purposes
 from __future__ import annotations
 
 from anicli_api.typing import TypedDict
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, TypeVar
 
 from attrs import define, field
 
-from anicli_api._http import HTTPAsync, HTTPSync
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 from anicli_api.player.base import Video  # direct make this object
 from anicli_api.source.apis.aniliberty import (
@@ -23,24 +22,45 @@ from anicli_api.source.apis.aniliberty import (
 if TYPE_CHECKING:
     from httpx import AsyncClient, Client
 
+    from anicli_api._http import HTTPSession
+    from anicli_api.source.anilibria_mirror import CatalogMirror
 
+
+T_ITEM = TypeVar("T_ITEM", "Search", "Ongoing")
 T_KW_APIS = TypedDict("T_KW_APIS", {"sync_api": AniLibertySync, "async_api": AniLibertyAsync})
 
 
 class Extractor(BaseExtractor):
     BASE_URL = "https://aniliberty.top/api/v1"
 
-    def __init__(self, http_client: "Client" = HTTPSync(), http_async_client: "AsyncClient" = HTTPAsync()):
-        super().__init__(http_client=http_client, http_async_client=http_async_client)
-        self._sync_api = AniLibertySync(client=self.http, raise_on_error=True)
-        self._async_api = AniLibertyAsync(client=self.http_async, raise_on_error=True)
+    def __init__(
+        self,
+        http_client: Optional["Client"] = None,
+        http_async_client: Optional["AsyncClient"] = None,
+        *,
+        session: Optional["HTTPSession"] = None,
+        mirror: Optional["CatalogMirror"] = None,
+    ):
+        """
+        :param mirror: local catalog mirror. If passed, search and ongoing are served from mirror
+            (synced before request, if freshness SLA expired), episodes lists are cached in mirror
+        """
+        super().__init__(http_client=http_client, http_async_client=http_async_client, session=session)
+        # API clients created on first usage: http clients are lazy
+        self._sync_api: Optional[AniLibertySync] = None
+        self._async_api: Optional[AniLibertyAsync] = None
+        self._mirror = mirror
 
     @property
     def sync_api(self) -> AniLibertySync:
+        if self._sync_api is None:
+            self._sync_api = AniLibertySync(client=self.http, raise_on_error=True)
         return self._sync_api
 
     @property
     def async_api(self) -> AniLibertyAsync:
+        if self._async_api is None:
+            self._async_api = AniLibertyAsync(client=self.http_async, raise_on_error=True)
         return self._async_api
 
     @property
@@ -48,77 +68,56 @@ class Extractor(BaseExtractor):
         """shortcut for pass API objects arguments in kwargs style"""
         return {"sync_api": self.sync_api, "async_api": self.async_api}
 
+    def _create_item(self, cls: type[T_ITEM], data: T_ModelsAnimeReleasesV1Release) -> T_ITEM:
+        return cls(
+            title=data["name"]["main"],
+            thumbnail=data["poster"]["thumbnail"],
+            url="_",  # STUB
+            data=data,
+            mirror=self._mirror,
+            **self._kwargs_api,
+            **self._kwargs_http,
+        )
+
     def search(self, query: str) -> list["Search"]:
+        if self._mirror is not None:
+            self._mirror.ensure_fresh(self.sync_api)
+            return [self._create_item(Search, data) for data in self._mirror.search(query)]
         # https://anilibria.top/api/docs/v1#/Аниме.Каталог
         result = self.sync_api.get_anime_catalog_releases(search=query)
-        searches = []
         if result.success and result.data:
-            for data in result.data["data"]:
-                searches.append(
-                    Search(
-                        title=data["name"]["main"],
-                        thumbnail=data["poster"]["thumbnail"],
-                        url="_",  # STUB
-                        data=data,
-                        **self._kwargs_api,
-                        **self._kwargs_http,
-                    )
-                )
-        return searches
+            return [self._create_item(Search, data) for data in result.data["data"]]
+        return []
 
     async def a_search(self, query: str) -> list["Search"]:
+        if self._mirror is not None:
+            await self._mirror.a_ensure_fresh(self.async_api)
+            return [self._create_item(Search, data) for data in self._mirror.search(query)]
         # https://anilibria.top/api/docs/v1#/Аниме.Каталог
         result = await self.async_api.get_anime_catalog_releases(search=query)
-        searches = []
         if result.success and result.data:
-            for data in result.data["data"]:
-                searches.append(
-                    Search(
-                        title=data["name"]["main"],
-                        thumbnail=data["poster"]["thumbnail"],
-                        url="_",  # STUB
-                        data=data,
-                        **self._kwargs_api,
-                        **self._kwargs_http,
-                    )
-                )
-        return searches
+            return [self._create_item(Search, data) for data in result.data["data"]]
+        return []
 
     def ongoing(self) -> list["Ongoing"]:
+        if self._mirror is not None:
+            self._mirror.ensure_fresh(self.sync_api)
+            return [self._create_item(Ongoing, data) for data in self._mirror.ongoing()]
         # https://anilibria.top/api/docs/v1#/Аниме.Каталог
         result = self.sync_api.get_anime_catalog_releases()
-        ongoings = []
         if result.success and result.data:
-            for data in result.data["data"]:
-                ongoings.append(
-                    Ongoing(
-                        title=data["name"]["main"],
-                        thumbnail=data["poster"]["thumbnail"],
-                        url="_",  # STUB
-                        data=data,
-                        **self._kwargs_api,
-                        **self._kwargs_http,
-                    )
-                )
-        return ongoings
+            return [self._create_item(Ongoing, data) for data in result.data["data"]]
+        return []
 
     async def a_ongoing(self) -> list["Ongoing"]:
+        if self._mirror is not None:
+            await self._mirror.a_ensure_fresh(self.async_api)
+            return [self._create_item(Ongoing, data) for data in self._mirror.ongoing()]
         # https://anilibria.top/api/docs/v1#/Аниме.Каталог
         result = await self.async_api.get_anime_catalog_releases()
-        ongoings = []
         if result.success and result.data:
-            for data in result.data["data"]:
-                ongoings.append(
-                    Ongoing(
-                        title=data["name"]["main"],
-                        thumbnail=data["poster"]["thumbnail"],
-                        url="_",  # STUB
-                        data=data,
-                        **self._kwargs_api,
-                        **self._kwargs_http,
-                    )
-                )
-        return ongoings
+            return [self._create_item(Ongoing, data) for data in result.data["data"]]
+        return []
 
 
 class _ApiInstancesMixin:
@@ -143,6 +142,7 @@ class Search(_ApiInstancesMixin, BaseSearch):
     data: T_ModelsAnimeReleasesV1Release
     _sync_api: AniLibertySync = field(alias="sync_api")
     _async_api: AniLibertyAsync = field(alias="async_api")
+    _mirror: Optional["CatalogMirror"] = field(default=None, alias="mirror")
 
     def get_anime(self) -> "Anime":
         return Anime(
@@ -150,6 +150,7 @@ class Search(_ApiInstancesMixin, BaseSearch):
             thumbnail=self.thumbnail,
             description=self.data["description"],
             data=self.data,
+            mirror=self._mirror,
             **self._kwargs_http,
             **self._kwargs_apis,
         )
@@ -163,6 +164,7 @@ class Ongoing(_ApiInstancesMixin, BaseOngoing):
     data: T_ModelsAnimeReleasesV1Release
     _sync_api: AniLibertySync = field(alias="sync_api")
     _async_api: AniLibertyAsync = field(alias="async_api")
+    _mirror: Optional["CatalogMirror"] = field(default=None, alias="mirror")
 
     def get_anime(self) -> "Anime":
         return Anime(
@@ -170,6 +172,7 @@ class Ongoing(_ApiInstancesMixin, BaseOngoing):
             thumbnail=self.thumbnail,
             description=self.data["description"],
             data=self.data,
+            mirror=self._mirror,
             **self._kwargs_http,
             **self._kwargs_apis,
         )
@@ -183,46 +186,47 @@ class Anime(_ApiInstancesMixin, BaseAnime):
     data: T_ModelsAnimeReleasesV1Release
     _sync_api: AniLibertySync = field(alias="sync_api")
     _async_api: AniLibertyAsync = field(alias="async_api")
+    _mirror: Optional["CatalogMirror"] = field(default=None, alias="mirror")
 
     def __str__(self):
         return self.title
 
+    def _create_episodes(self, items: list[T_ModelsAnimeReleasesV1ReleaseEpisode]) -> list["Episode"]:
+        return [
+            Episode(
+                # swagger schema says, contains string, but can be null
+                title=data["name"] or "Episode",
+                ordinal=int(data["ordinal"]),
+                data=data,
+                **self._kwargs_http,
+                **self._kwargs_apis,
+            )
+            for data in items
+        ]
+
     def get_episodes(self) -> list["Episode"]:
-        # https://anilibria.top/api/docs/v1#/Аниме.Релизы/1a04f3ab108f6960aacb815ecabe29d2
         release_id = self.data["id"]
+        if self._mirror is not None and (items := self._mirror.episodes(release_id)) is not None:
+            return self._create_episodes(items)
+        # https://anilibria.top/api/docs/v1#/Аниме.Релизы/1a04f3ab108f6960aacb815ecabe29d2
         result = self.sync_api.get_anime_release(id_or_alias=str(release_id), include="id,episodes")
-        episodes = []
-        if result.success and result.data:
-            for data in result.data["episodes"]:
-                episodes.append(
-                    Episode(
-                        # swagger schema says, contains string, but can be null
-                        title=data["name"] or "Episode",
-                        ordinal=int(data["ordinal"]),
-                        data=data,
-                        **self._kwargs_http,
-                        **self._kwargs_apis,
-                    )
-                )
-        return episodes
+        if not (result.success and result.data):
+            return []
+        if self._mirror is not None:
+            self._mirror.set_episodes(release_id, result.data["episodes"])
+        return self._create_episodes(result.data["episodes"])
 
     async def a_get_episodes(self) -> list["Episode"]:
-        # https://anilibria.top/api/docs/v1#/Аниме.Релизы/1a04f3ab108f6960aacb815ecabe29d2
         release_id = self.data["id"]
+        if self._mirror is not None and (items := self._mirror.episodes(release_id)) is not None:
+            return self._create_episodes(items)
+        # https://anilibria.top/api/docs/v1#/Аниме.Релизы/1a04f3ab108f6960aacb815ecabe29d2
         result = await self.async_api.get_anime_release(id_or_alias=str(release_id), include="id,episodes")
-        episodes = []
-        if result.success and result.data:
-            for data in result.data["episodes"]:
-                episodes.append(
-                    Episode(
-                        title=data["name"],
-                        ordinal=int(data["ordinal"]),
-                        data=data,
-                        **self._kwargs_http,
-                        **self._kwargs_apis,
-                    )
-                )
-        return episodes
+        if not (result.success and result.data):
+            return []
+        if self._mirror is not None:
+            self._mirror.set_episodes(release_id, result.data["episodes"])
+        return self._create_episodes(result.data["episodes"])
 
 
 @define(kw_only=True)
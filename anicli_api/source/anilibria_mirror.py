@@ -0,0 +1,389 @@
+"""Local SQLite mirror of AniLiberty releases catalog
+
+`anilibria.Extractor` calls catalog endpoint for every search and ongoing request. Mirror stores catalog
+releases and episodes lists locally and serves search/ongoing from memory index:
+
+- first sync paginates the whole catalog (`FRESH_AT_DESC` sorting)
+- incremental sync fetches catalog pages until releases older than the last seen `fresh_at`,
+  plus weekly schedule (`get_anime_schedule_week`) for updated ongoings
+- full sync repeats every `full_sync_interval` (metadata changes without `fresh_at` update). Releases missing
+  from the full catalog are removed with their episodes
+- `max_age` - freshness SLA: extractor syncs mirror before serving request if last sync is older.
+  If sync failed, stale data is served (with warning) and next sync is tried after `retry_interval`
+- episodes lists are stored by release and valid while release `fresh_at` is not changed
+
+Usage:
+
+    >>> from anicli_api.source.anilibria import Extractor
+    >>> from anicli_api.source.anilibria_mirror import CatalogMirror
+    >>>
+    >>> mirror = CatalogMirror("~/.cache/anicli_api/aniliberty.sqlite", max_age=60 * 30)
+    >>> ex = Extractor(mirror=mirror)
+    >>> ex.search("lain")  # first call - full catalog sync
+    >>> ex.ongoing()  # served from mirror
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, TypeVar, Union
+
+from httpx import HTTPError
+
+from anicli_api._logger import logger
+from anicli_api.source.apis.aniliberty import ApiError
+from anicli_api.typing import NamedTuple, Sequence
+
+if TYPE_CHECKING:
+    from anicli_api.source.apis.aniliberty import (
+        AniLibertyAsync,
+        AniLibertySync,
+        APIResponse,
+        T_ModelsAnimeReleasesV1Release,
+        T_ReleaseWithGenres,
+        T_ModelsAnimeReleasesV1ReleaseEpisode,
+        T_ResponsesApiV1AnimeCatalogReleases,
+    )
+
+__all__ = ["SyncStats", "CatalogMirror", "SYNC_ERRORS"]
+
+T = TypeVar("T")
+
+SYNC_ERRORS = (ApiError, HTTPError, sqlite3.Error, KeyError, ValueError)
+"""expected sync failures: API errors, network errors, storage errors, unexpected response structure"""
+
+_RE_NON_WORD = re.compile(r"[\W_]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_RE_NON_WORD.sub(" ", text.casefold().replace("ё", "е")).split())
+
+
+def _search_text(release: "T_ModelsAnimeReleasesV1Release") -> str:
+    name = release.get("name") or {}
+    parts = (name.get("main"), name.get("english"), name.get("alternative"), release.get("alias"))
+    return " | ".join(_normalize(p) for p in parts if p)
+
+
+class SyncStats(NamedTuple):
+    full: bool
+    pages: int
+    """catalog pages requested"""
+    releases: int
+    """upserted releases (include schedule)"""
+    elapsed: float
+
+
+class CatalogMirror:
+    """thread-safe SQLite mirror of AniLiberty catalog
+
+    :param path: database path. `:memory:` - in-memory database
+    :param max_age: freshness SLA in seconds: max time from the last successful sync
+    :param full_sync_interval: full catalog sync interval in seconds
+    :param page_limit: catalog page size
+    :param retry_interval: min seconds between sync attempts after failed sync (capped by `max_age`)
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path] = ":memory:",
+        max_age: float = 60 * 60,
+        full_sync_interval: float = 60 * 60 * 24 * 7,
+        page_limit: int = 50,
+        retry_interval: float = 60,
+    ):
+        self.max_age = max_age
+        self.retry_interval = retry_interval
+        self.full_sync_interval = full_sync_interval
+        self.page_limit = page_limit
+        if str(path) != ":memory:":
+            path = Path(path).expanduser()
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS releases ("
+                "id INTEGER PRIMARY KEY, search_text TEXT, is_ongoing INTEGER, fresh_at TEXT, data TEXT)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS episodes (release_id INTEGER PRIMARY KEY, fresh_at TEXT, data TEXT)"
+            )
+            self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        # memory index: (search text, id) sorted by fresh_at desc, id: release
+        self._index: Optional[list[tuple[str, int]]] = None
+        self._releases: dict[int, "T_ModelsAnimeReleasesV1Release"] = {}
+        self._sync_lock = threading.Lock()
+        self._a_sync_task: Optional[asyncio.Task] = None
+        # monotonic time of the last failed sync
+        self._failed_at: Optional[float] = None
+
+    # region storage
+
+    def _meta(self, key: str) -> Optional[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchall()
+        return rows[0][0] if rows else None
+
+    def _set_meta(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO meta VALUES (?, ?)", (key, str(value)))
+
+    def _upsert(self, releases: Sequence[Union["T_ModelsAnimeReleasesV1Release", "T_ReleaseWithGenres"]]) -> int:
+        if not releases:
+            return 0
+        with self._lock:
+            ids = [r["id"] for r in releases]
+            stored = dict(
+                self._conn.execute(
+                    f"SELECT id, data FROM releases WHERE id IN ({','.join('?' * len(ids))})", ids
+                ).fetchall()
+            )
+            rows = []
+            for release in releases:
+                # schedule releases do not contain catalog fields (genres): keep them
+                data = {**json.loads(stored[release["id"]]), **release} if release["id"] in stored else release
+                rows.append(
+                    (
+                        release["id"],
+                        _search_text(data),  # type: ignore[arg-type]
+                        int(bool(data.get("is_ongoing"))),
+                        data.get("fresh_at") or "",
+                        json.dumps(data, ensure_ascii=False),
+                    )
+                )
+            self._conn.execute("BEGIN")
+            self._conn.executemany("INSERT OR REPLACE INTO releases VALUES (?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+            self._index = None
+        return len(rows)
+
+    def _prune(self, keep: set[int]) -> int:
+        """delete releases (and their episodes) not in `keep`. Returns deleted releases count"""
+        with self._lock:
+            stored = {row[0] for row in self._conn.execute("SELECT id FROM releases").fetchall()}
+            removed = [(id_,) for id_ in stored - keep]
+            if removed:
+                self._conn.execute("BEGIN")
+                self._conn.executemany("DELETE FROM releases WHERE id = ?", removed)
+                self._conn.executemany("DELETE FROM episodes WHERE release_id = ?", removed)
+                self._conn.execute("COMMIT")
+                self._index = None
+        if removed:
+            logger.debug("[aniliberty mirror] removed %s releases", len(removed))
+        return len(removed)
+
+    def _load_index(self) -> list[tuple[str, int]]:
+        with self._lock:
+            if self._index is None:
+                rows = self._conn.execute(
+                    "SELECT id, search_text, data FROM releases ORDER BY fresh_at DESC"
+                ).fetchall()
+                self._releases = {id_: json.loads(data) for id_, _, data in rows}
+                self._index = [(text, id_) for id_, text, _ in rows]
+            return self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM releases").fetchall()[0][0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # endregion storage
+
+    # region queries
+
+    def search(self, query: str, limit: int = 50) -> list["T_ModelsAnimeReleasesV1Release"]:
+        """search releases by main, english, alternative names and alias. Prefix matches first
+
+        :param query: search query
+        :param limit: max results
+        """
+        needle = _normalize(query)
+        index = self._load_index()
+        # (not prefix, position by fresh_at)
+        hits = sorted((not text.startswith(needle), i) for i, (text, _) in enumerate(index) if needle in text)
+        return [self._releases[index[i][1]] for _, i in hits[:limit]]
+
+    def ongoing(self, limit: Optional[int] = None) -> list["T_ModelsAnimeReleasesV1Release"]:
+        """ongoing releases, sorted by fresh_at (last updated first)"""
+        self._load_index()
+        result = [r for r in (self._releases[id_] for _, id_ in self._index or ()) if r.get("is_ongoing")]
+        return result[:limit] if limit is not None else result
+
+    def get(self, release_id: int) -> Optional["T_ModelsAnimeReleasesV1Release"]:
+        self._load_index()
+        return self._releases.get(release_id)
+
+    def releases(self) -> list["T_ModelsAnimeReleasesV1Release"]:
+        """all stored releases, sorted by fresh_at (last updated first)"""
+        index = self._load_index()
+        return [self._releases[id_] for _, id_ in index]
+
+    def episodes(self, release_id: int) -> Optional[list["T_ModelsAnimeReleasesV1ReleaseEpisode"]]:
+        """stored episodes of release. None if not stored or release updated after store"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT e.data FROM episodes e JOIN releases r ON r.id = e.release_id "
+                "WHERE e.release_id = ? AND e.fresh_at = r.fresh_at",
+                (release_id,),
+            ).fetchall()
+        return json.loads(rows[0][0]) if rows else None
+
+    def set_episodes(self, release_id: int, episodes: list["T_ModelsAnimeReleasesV1ReleaseEpisode"]) -> None:
+        """store episodes of release. Ignored for releases not in mirror"""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO episodes SELECT id, fresh_at, ? FROM releases WHERE id = ?",
+                (json.dumps(episodes, ensure_ascii=False), release_id),
+            )
+
+    # endregion queries
+
+    # region sync
+
+    @property
+    def last_sync(self) -> Optional[float]:
+        """timestamp of the last successful sync"""
+        value = self._meta("last_sync")
+        return float(value) if value else None
+
+    def is_fresh(self) -> bool:
+        """last sync is not older than `max_age`"""
+        last_sync = self.last_sync
+        return last_sync is not None and time.time() - last_sync < self.max_age
+
+    def _in_backoff(self) -> bool:
+        # last sync failed recently: serve stored data without waiting for the API timeouts again
+        return (
+            self._failed_at is not None
+            and time.monotonic() - self._failed_at < min(self.retry_interval, self.max_age)
+            and len(self) > 0
+        )
+
+    def _needs_full_sync(self) -> bool:
+        last_full_sync = self._meta("last_full_sync")
+        return not last_full_sync or time.time() - float(last_full_sync) >= self.full_sync_interval
+
+    def _page_params(self, page: int) -> dict[str, Any]:
+        return {"page": page, "limit": self.page_limit, "sorting": "FRESH_AT_DESC"}
+
+    @staticmethod
+    def _data(response: "APIResponse[T]", endpoint: str) -> T:
+        if response.data is None:
+            raise ApiError(f"{endpoint} returns empty response (status {response.status_code})")
+        return response.data
+
+    @staticmethod
+    def _is_last_page(data: "T_ResponsesApiV1AnimeCatalogReleases", watermark: Optional[str]) -> bool:
+        pagination = data["meta"]["pagination"]
+        if not data["data"] or pagination["current_page"] >= pagination["total_pages"]:
+            return True
+        # sorted by fresh_at desc: next pages contain already stored releases
+        return watermark is not None and data["data"][-1].get("fresh_at", "") < watermark
+
+    def _finish_sync(self, full: bool, pages: int, releases: int, started: float) -> SyncStats:
+        now = time.time()
+        with self._lock:
+            if full:
+                self._set_meta("last_full_sync", now)
+            self._set_meta("last_sync", now)
+            watermark = self._conn.execute("SELECT MAX(fresh_at) FROM releases").fetchall()[0][0]
+            self._set_meta("fresh_at", watermark or "")
+        self._failed_at = None
+        stats = SyncStats(full, pages, releases, time.perf_counter() - started)
+        logger.debug("[aniliberty mirror] synced %s", stats)
+        return stats
+
+    def sync(self, api: "AniLibertySync", full: Optional[bool] = None) -> SyncStats:
+        """fetch new and updated releases
+
+        :param api: AniLiberty API client (`raise_on_error=True`)
+        :param full: paginate whole catalog. Default - if `full_sync_interval` expired
+        :raise ApiError: API returns empty response
+        """
+        full = self._needs_full_sync() if full is None else full
+        started = time.perf_counter()
+        watermark = None if full else self._meta("fresh_at") or None
+        page = releases = 0
+        seen: set[int] = set()
+        while True:
+            page += 1
+            data = self._data(api.get_anime_catalog_releases(**self._page_params(page)), "catalog")
+            releases += self._upsert(data["data"])
+            seen.update(r["id"] for r in data["data"])
+            if self._is_last_page(data, watermark):
+                break
+        if full:
+            self._prune(seen)
+        else:
+            schedule = self._data(api.get_anime_schedule_week(), "schedule")
+            releases += self._upsert([i["release"] for i in schedule["data"]])
+        return self._finish_sync(full, page, releases, started)
+
+    async def a_sync(self, api: "AniLibertyAsync", full: Optional[bool] = None) -> SyncStats:
+        """fetch new and updated releases in async mode. Database writes run in a worker thread
+
+        :param api: AniLiberty API client (`raise_on_error=True`)
+        :param full: paginate whole catalog. Default - if `full_sync_interval` expired
+        :raise ApiError: API returns empty response
+        """
+        full = self._needs_full_sync() if full is None else full
+        started = time.perf_counter()
+        watermark = None if full else self._meta("fresh_at") or None
+        page = releases = 0
+        seen: set[int] = set()
+        while True:
+            page += 1
+            data = self._data(await api.get_anime_catalog_releases(**self._page_params(page)), "catalog")
+            releases += await asyncio.to_thread(self._upsert, data["data"])
+            seen.update(r["id"] for r in data["data"])
+            if self._is_last_page(data, watermark):
+                break
+        if full:
+            await asyncio.to_thread(self._prune, seen)
+        else:
+            schedule = self._data(await api.get_anime_schedule_week(), "schedule")
+            releases += await asyncio.to_thread(self._upsert, [i["release"] for i in schedule["data"]])
+        return await asyncio.to_thread(self._finish_sync, full, page, releases, started)
+
+    def _on_sync_error(self, e: Exception) -> None:
+        self._failed_at = time.monotonic()
+        if not len(self):
+            raise e
+        logger.warning("[aniliberty mirror] sync failed, serve stale data (last sync %s): %r", self.last_sync, e)
+
+    def ensure_fresh(self, api: "AniLibertySync") -> None:
+        """sync mirror if freshness SLA expired. After failed sync next try is not earlier than `retry_interval`"""
+        if self.is_fresh() or self._in_backoff():
+            return
+        with self._sync_lock:
+            # synced (or failed) by another thread
+            if self.is_fresh() or self._in_backoff():
+                return
+            try:
+                self.sync(api)
+            except SYNC_ERRORS as e:
+                self._on_sync_error(e)
+
+    async def a_ensure_fresh(self, api: "AniLibertyAsync") -> None:
+        """sync mirror if freshness SLA expired in async mode. Concurrent calls wait for one sync"""
+        if self.is_fresh() or self._in_backoff():
+            return
+        task = self._a_sync_task
+        if task is None or task.done() or task.get_loop() is not asyncio.get_running_loop():
+            task = self._a_sync_task = asyncio.ensure_future(self.a_sync(api))
+        try:
+            await asyncio.shield(task)
+        except SYNC_ERRORS as e:
+            self._on_sync_error(e)
+
+    # endregion sync
@@ -2,11 +2,13 @@ from __future__ import annotations
 
 import logging
 import re
+from typing import Union, cast
 
 from attr import field
 from attr import define
 from httpx import Response
 
+from anicli_api._document import a_parse_html, parse_html
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 from anicli_api.source.parsers.animego_parser import (
     PageAnime,
@@ -18,6 +20,13 @@ from anicli_api.source.parsers.animego_parser import (
     PageUtils,
     ContentJson,
     EpisodeVideosType,
+    PageAnimeType,
+    PageEpisodeType,
+    PageEpisodeVideoType,
+    PageOngoingType,
+    PageSearchType,
+    PageSourceType,
+    PageUtilsType,
 )
 
 logger = logging.getLogger("anicli-api")
@@ -36,10 +45,10 @@ RE_DIV_H5_ERR = re.compile(
 class Extractor(BaseExtractor):
     BASE_URL = "https://animego.me"
 
-    def _extract_search(self, resp: str) -> list["Search"]:
+    def _extract_search(self, utils: PageUtilsType, items: list[PageSearchType]) -> list["Search"]:
         res = []
-        netloc = PageUtils(resp).parse()["url_canonical"]
-        for d in PageSearch(resp).parse():
+        netloc = utils["url_canonical"]
+        for d in items:
             url = netloc + d["url_path"]
             res.append(Search(title=d["title"], thumbnail=d["thumbnail"], url=url, **self._kwargs_http))
         return res
@@ -56,11 +65,11 @@ class Extractor(BaseExtractor):
                 sorted_ongs[key] = ong
         return list(sorted_ongs.values())
 
-    def _extract_ongoing(self, resp: str) -> list["Ongoing"]:
-        netloc = PageUtils(resp).parse()["url_canonical"]
+    def _extract_ongoing(self, utils: PageUtilsType, items: list[PageOngoingType]) -> list["Ongoing"]:
+        netloc = utils["url_canonical"]
 
         ongs = []
-        for d in PageOngoing(resp).parse():
+        for d in items:
             url = netloc + d["url_path"]
             ongs.append(
                 Ongoing(
@@ -77,33 +86,35 @@ class Extractor(BaseExtractor):
 
     def search(self, query: str) -> list["Search"]:
         resp = self.http.get(f"{self.BASE_URL}/search/anime", params={"q": query})
-        return self._extract_search(resp.text)
+        return self._extract_search(*parse_html(resp.text, PageUtils, PageSearch))
 
     async def a_search(self, query: str) -> list["Search"]:
         resp = await self.http_async.get(f"{self.BASE_URL}/search/anime", params={"q": query})
-        return self._extract_search(resp.text)
+        return self._extract_search(*await a_parse_html(resp.text, PageUtils, PageSearch))
 
     def ongoing(self) -> list["Ongoing"]:
         resp = self.http.get(self.BASE_URL)
-        return self._extract_ongoing(resp.text)
+        return self._extract_ongoing(*parse_html(resp.text, PageUtils, PageOngoing))
 
     async def a_ongoing(self) -> list["Ongoing"]:
         resp = await self.http_async.get(self.BASE_URL)
-        return self._extract_ongoing(resp.text)
+        return self._extract_ongoing(*await a_parse_html(resp.text, PageUtils, PageOngoing))
 
 
 @define(kw_only=True)
 class Search(BaseSearch):
     def get_anime(self) -> "Anime":
         resp = self.http.get(self.url)
-        return self._extract(resp.text) if self._is_valid_page(resp) else self._create_anime()
+        return self._extract(parse_html(resp.text, PageAnime)) if self._is_valid_page(resp) else self._create_anime()
 
     async def a_get_anime(self) -> "Anime":
         resp = await self.http_async.get(self.url)
-        return self._extract(resp.text) if self._is_valid_page(resp) else self._create_anime()
+        if not self._is_valid_page(resp):
+            return self._create_anime()
+        return self._extract(await a_parse_html(resp.text, PageAnime))
 
-    def _extract(self, resp: str) -> "Anime":
-        return Anime(**PageAnime(resp).parse(), **self._kwargs_http)
+    def _extract(self, data: PageAnimeType) -> "Anime":
+        return Anime(**data, **self._kwargs_http)
 
     @staticmethod
     def _is_valid_page(resp: Response) -> bool:
@@ -141,8 +152,8 @@ class Ongoing(BaseOngoing):
     episode: str
     dub: str
 
-    def _extract(self, resp: str) -> "Anime":
-        return Anime(**PageAnime(resp).parse(), **self._kwargs_http)
+    def _extract(self, data: PageAnimeType) -> "Anime":
+        return Anime(**data, **self._kwargs_http)
 
     @staticmethod
     def _is_valid_page(resp: Response) -> bool:
@@ -175,11 +186,13 @@ class Ongoing(BaseOngoing):
 
     def get_anime(self) -> "Anime":
         resp = self.http.get(self.url)
-        return self._extract(resp.text) if self._is_valid_page(resp) else self._create_anime()
+        return self._extract(parse_html(resp.text, PageAnime)) if self._is_valid_page(resp) else self._create_anime()
 
     async def a_get_anime(self) -> "Anime":
         resp = await self.http_async.get(self.url)
-        return self._extract(resp.text) if self._is_valid_page(resp) else self._create_anime()
+        if not self._is_valid_page(resp):
+            return self._create_anime()
+        return self._extract(await a_parse_html(resp.text, PageAnime))
 
     def __str__(self):
         return f"{self.title} {self.episode} ({self.dub})"
@@ -190,10 +203,18 @@ class Anime(BaseAnime):
     id: str
     raw_json: ContentJson
 
-    def _extract(self, resp: str) -> list["Episode"]:
+    @property
+    def _is_film(self) -> bool:
         # magic value:
-        if self.raw_json["@type"].lower() == "movie":
-            film_data = PageEpisodeVideo(resp).parse()
+        return self.raw_json["@type"].lower() == "movie"
+
+    @property
+    def _episodes_parser(self) -> Union[type[PageEpisodeVideo], type[PageEpisode]]:
+        return PageEpisodeVideo if self._is_film else PageEpisode
+
+    def _extract(self, data: Union[PageEpisodeVideoType, PageEpisodeType]) -> list["Episode"]:
+        if self._is_film:
+            film_data = cast(PageEpisodeVideoType, data)
             return [
                 Episode(
                     title=self.title,
@@ -206,7 +227,7 @@ class Anime(BaseAnime):
                 ),
             ]
 
-        episodes_data = PageEpisode(resp).parse()
+        episodes_data = cast(PageEpisodeType, data)
         return [
             Episode(
                 dubbers=episodes_data["dubbers"],
@@ -235,12 +256,17 @@ class Anime(BaseAnime):
     def get_episodes(self) -> list["Episode"]:
         resp = self.http.get(f"https://animego.me/player/{self.id}")
         resp = resp.json()["data"]["content"]
-        return self._extract(resp) if self._episodes_is_available(resp) else []
+        if not self._episodes_is_available(resp):
+            return []
+        # result type depends on _is_film
+        return self._extract(parse_html(resp, self._episodes_parser))  # type: ignore[arg-type]
 
     async def a_get_episodes(self) -> list["Episode"]:
         resp = await self.http_async.get(f"https://animego.me/player/{self.id}")
         resp = resp.json()["data"]["content"]
-        return self._extract(resp) if self._episodes_is_available(resp) else []
+        if not self._episodes_is_available(resp):
+            return []
+        return self._extract(await a_parse_html(resp, self._episodes_parser))  # type: ignore[arg-type]
 
 
 @define(kw_only=True)
@@ -250,8 +276,7 @@ class Episode(BaseEpisode):
     _is_film: bool = field(alias="is_film", default=False)
     _videos: list[EpisodeVideosType] = field(alias="videos")
 
-    def _extract(self, resp: str):
-        data = PageSource(resp).parse()
+    def _extract(self, data: PageSourceType):
         dubbers_ = data["dubbers"]
         data_source = [
             {"title": dubbers_.get(d["data_provide_dubbing"], "???"), "url": d["url"]} for d in data["videos"]
@@ -275,7 +300,7 @@ class Episode(BaseEpisode):
         resp = self.http.get(
             f"https://animego.me/player/videos/{self.id}",
         ).json()["data"]["content"]
-        return self._extract(resp)
+        return self._extract(parse_html(resp, PageSource))
 
     async def a_get_sources(self):
         if self._is_film:
@@ -285,7 +310,7 @@ class Episode(BaseEpisode):
                 f"https://animego.me/player/videos/{self.id}",
             )
         ).json()["data"]["content"]
-        return self._extract(resp)
+        return self._extract(await a_parse_html(resp, PageSource))
 
 
 @define(kw_only=True)
@@ -1,10 +1,9 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 from attrs import define, field
 
 from anicli_api.typing import TypedDict
-from anicli_api._http import HTTPAsync, HTTPSync
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 from anicli_api.player.base import Video  # direct make this object
 from anicli_api.source.apis.animevost import AnimeVostSync, AnimeVostAsync, T_Item, T_PlaylistResponse
@@ -12,23 +11,36 @@ from anicli_api.source.apis.animevost import AnimeVostSync, AnimeVostAsync, T_It
 if TYPE_CHECKING:
     from httpx import AsyncClient, Client
 
+    from anicli_api._http import HTTPSession
+
 T_KW_APIS = TypedDict("T_KW_APIS", {"sync_api": AnimeVostSync, "async_api": AnimeVostAsync})
 
 
 class Extractor(BaseExtractor):
     BASE_URL = "https://api.animevost.org/v1/"
 
-    def __init__(self, http_client: "Client" = HTTPSync(), http_async_client: "AsyncClient" = HTTPAsync()):
-        super().__init__(http_client=http_client, http_async_client=http_async_client)
-        self._sync_api = AnimeVostSync(client=self.http, raise_on_error=False)
-        self._async_api = AnimeVostAsync(client=self.http_async, raise_on_error=False)
+    def __init__(
+        self,
+        http_client: Optional["Client"] = None,
+        http_async_client: Optional["AsyncClient"] = None,
+        *,
+        session: Optional["HTTPSession"] = None,
+    ):
+        super().__init__(http_client=http_client, http_async_client=http_async_client, session=session)
+        # API clients created on first usage: http clients are lazy
+        self._sync_api: Optional[AnimeVostSync] = None
+        self._async_api: Optional[AnimeVostAsync] = None
 
     @property
     def sync_api(self) -> AnimeVostSync:
+        if self._sync_api is None:
+            self._sync_api = AnimeVostSync(client=self.http, raise_on_error=False)
         return self._sync_api
 
     @property
     def async_api(self) -> AnimeVostAsync:
+        if self._async_api is None:
+            self._async_api = AnimeVostAsync(client=self.http_async, raise_on_error=False)
         return self._async_api
 
     @property
@@ -1,15 +1,17 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, ClassVar, Optional, cast
 
 from attr import define, field
 from httpx import AsyncClient, Client
 
 from anicli_api.typing import TypedDict
-from anicli_api._http import HTTPAsync, HTTPSync
+from anicli_api._document import HTMLDocument, a_parse_html
+from anicli_api._executor import PARSE_EXECUTOR
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 from anicli_api.player.base import Video
-from anicli_api.player.dreamcast_chipers import extract_playlist, T_FileItem
+from anicli_api.player.dreamcast_cache import DREAMCAST_CRYPT_CODES_CACHE, CryptCodesCache
+from anicli_api.player.dreamcast_chipers import decode_playlist, T_FileItem, T_PlayerPlaylist
 from anicli_api.source.parsers.dreamerscast_parser import PageAnime
 from anicli_api.source.apis.dreamerscast import DreamerscastSync, DreamerscastAsync, T_Release
 
@@ -17,6 +19,8 @@ from anicli_api.source.apis.dreamerscast import DreamerscastSync, DreamerscastAs
 if TYPE_CHECKING:
     from httpx import AsyncClient, Client
 
+    from anicli_api._http import HTTPSession
+
 
 # used for sanitaize playlist file
 
@@ -26,18 +30,28 @@ T_KW_APIS = TypedDict("T_KW_APIS", {"sync_api": DreamerscastSync, "async_api": D
 class Extractor(BaseExtractor):
     BASE_URL = "https://dreamerscast.com/"
 
-    def __init__(self, http_client: "Client" = HTTPSync(), http_async_client: "AsyncClient" = HTTPAsync()):
-        super().__init__(http_client, http_async_client)
-
-        self._sync_api = DreamerscastSync(client=self.http, raise_on_error=False)
-        self._async_api = DreamerscastAsync(client=self.http_async, raise_on_error=False)
+    def __init__(
+        self,
+        http_client: Optional["Client"] = None,
+        http_async_client: Optional["AsyncClient"] = None,
+        *,
+        session: Optional["HTTPSession"] = None,
+    ):
+        super().__init__(http_client=http_client, http_async_client=http_async_client, session=session)
+        # API clients created on first usage: http clients are lazy
+        self._sync_api: Optional[DreamerscastSync] = None
+        self._async_api: Optional[DreamerscastAsync] = None
 
     @property
     def sync_api(self) -> DreamerscastSync:
+        if self._sync_api is None:
+            self._sync_api = DreamerscastSync(client=self.http, raise_on_error=False)
         return self._sync_api
 
     @property
     def async_api(self) -> DreamerscastAsync:
+        if self._async_api is None:
+            self._async_api = DreamerscastAsync(client=self.http_async, raise_on_error=False)
         return self._async_api
 
     @property
@@ -173,7 +187,7 @@ class Ongoing(_ApiInstancesMixin, BaseOngoing):
 
     def get_anime(self) -> "Anime":
         resp = self.http.get(self.url)
-        data = PageAnime(resp.text).parse()
+        data = HTMLDocument(resp.text).parse(PageAnime)
         return Anime(
             title=data["title"],
             thumbnail=data["thumbnail"],
@@ -186,7 +200,7 @@ class Ongoing(_ApiInstancesMixin, BaseOngoing):
 
     async def a_get_anime(self) -> "Anime":
         resp = await self.http_async.get(self.url)
-        data = PageAnime(resp.text).parse()
+        data = await a_parse_html(resp.text, PageAnime)
         return Anime(
             title=data["title"],
             thumbnail=data["thumbnail"],
@@ -206,7 +220,7 @@ class Search(_ApiInstancesMixin, BaseSearch):
 
     def get_anime(self) -> "Anime":
         resp = self.http.get(self.url)
-        data = PageAnime(resp.text).parse()
+        data = HTMLDocument(resp.text).parse(PageAnime)
         return Anime(
             title=data["title"],
             thumbnail=data["thumbnail"],
@@ -219,7 +233,7 @@ class Search(_ApiInstancesMixin, BaseSearch):
 
     async def a_get_anime(self) -> "Anime":
         resp = await self.http_async.get(self.url)
-        data = PageAnime(resp.text).parse()
+        data = await a_parse_html(resp.text, PageAnime)
         return Anime(
             title=data["title"],
             thumbnail=data["thumbnail"],
@@ -238,10 +252,34 @@ class Anime(_ApiInstancesMixin, BaseAnime):
     _async_api: DreamerscastAsync = field(alias="async_api")
     _player_js_encoded: str = field(alias="player_js_encoded")
     _player_js_url: str = field(alias="player_js_url")
+    # shared unpacked playerjs crypt codes: same script for all titles
+    CRYPT_CODES_CACHE: ClassVar[CryptCodesCache] = DREAMCAST_CRYPT_CODES_CACHE
+
+    def _extract_playlist(self) -> T_PlayerPlaylist:
+        url = self._player_js_url
+        if codes := self.CRYPT_CODES_CACHE.get(url):
+            try:
+                return decode_playlist(codes, self._player_js_encoded)
+            except ValueError:
+                # playerjs updated, download again
+                self.CRYPT_CODES_CACHE.invalidate(url)
+        codes = self.CRYPT_CODES_CACHE.extract(url, self.http.get(url).text)
+        return decode_playlist(codes, self._player_js_encoded)
+
+    async def _a_extract_playlist(self) -> T_PlayerPlaylist:
+        url = self._player_js_url
+        encoded = self._player_js_encoded
+        if codes := self.CRYPT_CODES_CACHE.get(url):
+            try:
+                return await PARSE_EXECUTOR.run(len(encoded), decode_playlist, codes, encoded)
+            except ValueError:
+                # playerjs updated, download again
+                self.CRYPT_CODES_CACHE.invalidate(url)
+        codes = await self.CRYPT_CODES_CACHE.a_extract(url, (await self.http_async.get(url)).text)
+        return await PARSE_EXECUTOR.run(len(encoded), decode_playlist, codes, encoded)
 
     def get_episodes(self) -> list["Episode"]:
-        js_encoded_resp = self.http.get(self._player_js_url).text
-        result = extract_playlist(js_encoded_resp, self._player_js_encoded)
+        result = self._extract_playlist()
 
         if not result.get("file", None):
             return []
@@ -270,8 +308,7 @@ class Anime(_ApiInstancesMixin, BaseAnime):
         return results
 
     async def a_get_episodes(self) -> list["Episode"]:
-        js_encoded_resp = (await self.http_async.get(self._player_js_url)).text
-        result = extract_playlist(js_encoded_resp, self._player_js_encoded)
+        result = await self._a_extract_playlist()
 
         if not result.get("file", None):
             return []
@@ -5,11 +5,13 @@ from typing import TypedDict
 from time import time
 
 from attr import field, define
-from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
+from anicli_api._document import a_parse_html, parse_html
+from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource, T_KW_HTTPS
 from anicli_api.source.parsers.hdrezka_parser import PageAnime, PageOngoing, PageSearch, PageUtils
 
 # types
 from anicli_api.source.parsers.hdrezka_parser import SeasonBoxType, EpisodeType, TranslationType
+from anicli_api.source.parsers.hdrezka_parser import PageAnimeType, PageOngoingType, PageSearchType, PageUtilsType
 from anicli_api.player.base import Video
 
 logger = logging.getLogger("anicli-api")
@@ -33,15 +35,13 @@ class Extractor(BaseExtractor):
     #
     SEARCH_PARAMS = {"do": "search", "subaction": "search", "q": ""}
 
-    def _parse_search(self, resp: str):
-        data = PageSearch(resp).parse()
+    def _parse_search(self, data: list[PageSearchType]):
         return [
             Search(title=f"{i['title']} {i['season']}", url=i["url"], thumbnail=i["thumbnail"], **self._kwargs_http)
             for i in data
         ]
 
-    def _parse_ongoing(self, resp: str):
-        data = PageOngoing(resp).parse()
+    def _parse_ongoing(self, data: list[PageOngoingType]):
         return [
             Ongoing(title=f"{i['title']} {i['season']}", url=i["url"], thumbnail=i["thumbnail"], **self._kwargs_http)
             for i in data
@@ -51,95 +51,59 @@ class Extractor(BaseExtractor):
         params = self.SEARCH_PARAMS.copy()
         params["q"] = query
         resp = self.http.get(self.BASE_URL + "/search/", params=params)
-        return self._parse_search(resp.text)
+        return self._parse_search(parse_html(resp.text, PageSearch))
 
     async def a_search(self, query):
         params = self.SEARCH_PARAMS.copy()
         params["q"] = query
         resp = await self.http_async.get(self.BASE_URL + "/search/", params=params)
-        return self._parse_search(resp.text)
+        return self._parse_search(await a_parse_html(resp.text, PageSearch))
 
     def ongoing(self):
         resp = self.http.get(self.BASE_URL, params=self.ONGOING_PARAMS)
-        return self._parse_ongoing(resp.text)
+        return self._parse_ongoing(parse_html(resp.text, PageOngoing))
 
     async def a_ongoing(self):
         resp = await self.http_async.get(self.BASE_URL, params=self.ONGOING_PARAMS)
-        return self._parse_ongoing(resp.text)
+        return self._parse_ongoing(await a_parse_html(resp.text, PageOngoing))
+
+
+def _extract_anime(data: PageAnimeType, utils: PageUtilsType, kwargs_http: "T_KW_HTTPS") -> "Anime":
+    url = utils["url"]
+    return Anime(
+        title=data["title"],
+        thumbnail=data["thumbnail"],
+        description=data["description"],
+        translation_list=data["translation_list"],
+        translation_id=data["translation_id"],
+        episode_list=data["episode_list"],
+        season_box=data["season_box"],
+        favs=data["favs"],
+        url=url,
+        **kwargs_http,
+    )
 
 
 @define(kw_only=True)
 class Search(BaseSearch):
     def get_anime(self):
         resp = self.http.get(self.url)
-        data = PageAnime(resp.text).parse()
-        url = PageUtils(resp.text).parse()["url"]
-        return Anime(
-            title=data["title"],
-            thumbnail=data["thumbnail"],
-            description=data["description"],
-            translation_list=data["translation_list"],
-            translation_id=data["translation_id"],
-            episode_list=data["episode_list"],
-            season_box=data["season_box"],
-            favs=data["favs"],
-            url=url,
-            **self._kwargs_http,
-        )
+        return _extract_anime(*parse_html(resp.text, PageAnime, PageUtils), self._kwargs_http)
 
     async def a_get_anime(self):
         resp = await self.http_async.get(self.url)
-        data = PageAnime(resp.text).parse()
-        url = PageUtils(resp.text).parse()["url"]
-        return Anime(
-            title=data["title"],
-            thumbnail=data["thumbnail"],
-            description=data["description"],
-            translation_list=data["translation_list"],
-            translation_id=data["translation_id"],
-            episode_list=data["episode_list"],
-            season_box=data["season_box"],
-            favs=data["favs"],
-            url=url,
-            **self._kwargs_http,
-        )
+        return _extract_anime(*await a_parse_html(resp.text, PageAnime, PageUtils), self._kwargs_http)
 
 
 @define(kw_only=True)
 class Ongoing(BaseOngoing):
     def get_anime(self):
         resp = self.http.get(self.url)
-        data = PageAnime(resp.text).parse()
-        url = PageUtils(resp.text).parse()["url"]
-        return Anime(
-            title=data["title"],
-            thumbnail=data["thumbnail"],
-            description=data["description"],
-            translation_list=data["translation_list"],
-            translation_id=data["translation_id"],
-            episode_list=data["episode_list"],
-            season_box=data["season_box"],
-            favs=data["favs"],
-            url=url,
-            **self._kwargs_http,
-        )
+        return _extract_anime(*parse_html(resp.text, PageAnime, PageUtils), self._kwargs_http)
 
     async def a_get_anime(self):
         resp = await self.http_async.get(self.url)
-        data = PageAnime(resp.text).parse()
-        url = PageUtils(resp.text).parse()["url"]
-        return Anime(
-            title=data["title"],
-            thumbnail=data["thumbnail"],
-            description=data["description"],
-            translation_list=data["translation_list"],
-            translation_id=data["translation_id"],
-            episode_list=data["episode_list"],
-            season_box=data["season_box"],
-            favs=data["favs"],
-            url=url,
-            **self._kwargs_http,
-        )
+        return _extract_anime(*await a_parse_html(resp.text, PageAnime, PageUtils), self._kwargs_http)
 
 
 @define(kw_only=True)
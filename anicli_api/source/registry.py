@@ -0,0 +1,74 @@
+"""Lazy sources registry
+
+Source module imported only on `SourceSpec.load` call, so applications can list sources or pick source by
+name/url without importing every source module with their parsers and API clients.
+
+`base_url` must be equal to `Extractor.BASE_URL` of the source module (checked in tests/test_registry.py).
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlsplit
+
+from anicli_api.typing import NamedTuple
+
+if TYPE_CHECKING:
+    from anicli_api.base import BaseExtractor
+
+__all__ = ["SourceSpec", "SOURCES", "get_source", "resolve_source"]
+
+
+class SourceSpec(NamedTuple):
+    name: str
+    """source module name"""
+    base_url: str
+    """`Extractor.BASE_URL` of source"""
+
+    @property
+    def module(self) -> str:
+        return f"anicli_api.source.{self.name}"
+
+    @property
+    def host(self) -> str:
+        return urlsplit(self.base_url).netloc
+
+    def load(self) -> type[BaseExtractor]:
+        """import source module and get `Extractor` class"""
+        return importlib.import_module(self.module).Extractor
+
+
+SOURCES: dict[str, SourceSpec] = {
+    spec.name: spec
+    for spec in (
+        SourceSpec("animego", "https://animego.me"),
+        SourceSpec("anilibria", "https://aniliberty.top/api/v1"),
+        SourceSpec("anilibme", "https://api.cdnlibs.org/api/"),
+        SourceSpec("animevost", "https://api.animevost.org/v1/"),
+        SourceSpec("dreamcast", "https://dreamerscast.com/"),
+        SourceSpec("hdrezka", "https://hdrezka-home.tv"),
+        SourceSpec("sameband", "https://sameband.studio"),
+        SourceSpec("yummy_anime", "https://site.yummyani.me"),
+        SourceSpec("yummy_anime_org", "https://yummyanime.in"),
+    )
+}
+"""source module name: source spec"""
+
+
+def get_source(name: str) -> type[BaseExtractor]:
+    """get `Extractor` class of source by module name
+
+    :param name: source module name (eg: animego, anilibria)
+    """
+    try:
+        spec = SOURCES[name]
+    except KeyError:
+        raise KeyError(f"Unknown source {name!r}. Available: {', '.join(SOURCES)}") from None
+    return spec.load()
+
+
+def resolve_source(url: str) -> Optional[SourceSpec]:
+    """get registered source by url host (or its subdomain). Source module is not imported"""
+    host = urlsplit(url).netloc.lower()
+    return next((spec for spec in SOURCES.values() if host == spec.host or host.endswith(f".{spec.host}")), None)
@@ -8,19 +8,21 @@ from attrs import define
 from httpx import Response
 
 from anicli_api.typing import TypedDict
+from anicli_api._document import a_parse_html, parse_html
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 from anicli_api.player.base import Video
 from anicli_api.source.parsers.sameband_parser import PageAnime, PageOngoing, PagePlaylistURL, PageSearch
+from anicli_api.source.parsers.sameband_parser import PageAnimeType, PageOngoingType, PageSearchType
 
 
 class Extractor(BaseExtractor):
     BASE_URL = "https://sameband.studio"
 
-    def _extract_search(self, resp: str) -> list["Search"]:
-        return [Search(**kw, **self._kwargs_http) for kw in PageSearch(resp).parse()]
+    def _extract_search(self, items: list[PageSearchType]) -> list["Search"]:
+        return [Search(**kw, **self._kwargs_http) for kw in items]
 
-    def _extract_ongoing(self, resp: str) -> list["Ongoing"]:
-        return [Ongoing(**kw, **self._kwargs_http) for kw in PageOngoing(resp).parse()]
+    def _extract_ongoing(self, items: list[PageOngoingType]) -> list["Ongoing"]:
+        return [Ongoing(**kw, **self._kwargs_http) for kw in items]
 
     def search(self, query: str) -> list["Search"]:
         resp = self.http.post(
@@ -34,7 +36,7 @@ class Extractor(BaseExtractor):
                 "story": query,
             },
         )
-        return self._extract_search(resp.text)
+        return self._extract_search(parse_html(resp.text, PageSearch))
 
     async def a_search(self, query: str) -> list["Search"]:
         resp = await self.http_async.post(
@@ -48,43 +50,43 @@ class Extractor(BaseExtractor):
                 "story": query,
             },
         )
-        return self._extract_search(resp.text)
+        return self._extract_search(await a_parse_html(resp.text, PageSearch))
 
     def ongoing(self) -> list["Ongoing"]:
         resp = self.http.get(f"{self.BASE_URL}/novinki")
-        return self._extract_ongoing(resp.text)
+        return self._extract_ongoing(parse_html(resp.text, PageOngoing))
 
     async def a_ongoing(self) -> list["Ongoing"]:
         resp = await self.http_async.get(f"{self.BASE_URL}/novinki")
-        return self._extract_ongoing(resp.text)
+        return self._extract_ongoing(await a_parse_html(resp.text, PageOngoing))
 
 
 @define(kw_only=True)
 class Search(BaseSearch):
-    def _extract(self, resp: str) -> "Anime":
-        return Anime(**PageAnime(resp).parse(), **self._kwargs_http)
+    def _extract(self, data: PageAnimeType) -> "Anime":
+        return Anime(**data, **self._kwargs_http)
 
     def get_anime(self) -> "Anime":
         resp = self.http.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(parse_html(resp.text, PageAnime))
 
     async def a_get_anime(self) -> "Anime":
         resp = await self.http_async.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(await a_parse_html(resp.text, PageAnime))
 
 
 @define(kw_only=True)
 class Ongoing(BaseOngoing):
-    def _extract(self, resp: str) -> "Anime":
-        return Anime(**PageAnime(resp).parse(), **self._kwargs_http)
+    def _extract(self, data: PageAnimeType) -> "Anime":
+        return Anime(**data, **self._kwargs_http)
 
     def get_anime(self) -> "Anime":
         resp = self.http.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(parse_html(resp.text, PageAnime))
 
     async def a_get_anime(self) -> "Anime":
         resp = await self.http_async.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(await a_parse_html(resp.text, PageAnime))
 
 
 @define(kw_only=True)
@@ -117,14 +119,15 @@ class Anime(BaseAnime):
 
     def get_episodes(self) -> list["Episode"]:
         resp = self.http.get(self._player_url)
-        player_data = PagePlaylistURL(resp.text).parse()
+        player_data = parse_html(resp.text, PagePlaylistURL)
         playlist_url = player_data["playlist_url"]
         resp2 = self.http.get(playlist_url)
         return self._extract(resp2)
 
     async def a_get_episodes(self) -> list["Episode"]:
         resp = await self.http_async.get(self._player_url)
-        player_url = PagePlaylistURL(resp.text).parse()["playlist_url"]
+        player_data = await a_parse_html(resp.text, PagePlaylistURL)
+        player_url = player_data["playlist_url"]
         resp2 = await self.http_async.get(player_url)
         return self._extract(resp2)
 
@@ -1,11 +1,10 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 from attrs import define, field
 
 from anicli_api.typing import TypedDict
-from anicli_api._http import HTTPAsync, HTTPSync
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 from anicli_api.source.apis.yummy_anime import (
     YummyAnimeAPIAsync,
@@ -18,6 +17,8 @@ from anicli_api.source.apis.yummy_anime import (
 if TYPE_CHECKING:
     from httpx import AsyncClient, Client
 
+    from anicli_api._http import HTTPSession
+
 
 T_KW_APIS = TypedDict("T_KW_APIS", {"sync_api": YummyAnimeAPISync, "async_api": YummyAnimeAPIAsync})
 
@@ -25,22 +26,33 @@ T_KW_APIS = TypedDict("T_KW_APIS", {"sync_api": YummyAnimeAPISync, "async_api":
 class Extractor(BaseExtractor):
     BASE_URL = "https://site.yummyani.me"
 
-    def __init__(self, http_client: "Client" = HTTPSync(), http_async_client: "AsyncClient" = HTTPAsync()):
-        super().__init__(http_client=http_client, http_async_client=http_async_client)
-        self._sync_api = YummyAnimeAPISync(client=http_client)
-        self._async_api = YummyAnimeAPIAsync(client=http_async_client)
+    def __init__(
+        self,
+        http_client: Optional["Client"] = None,
+        http_async_client: Optional["AsyncClient"] = None,
+        *,
+        session: Optional["HTTPSession"] = None,
+    ):
+        super().__init__(http_client=http_client, http_async_client=http_async_client, session=session)
+        # API clients created on first usage: http clients are lazy
+        self._sync_api: Optional[YummyAnimeAPISync] = None
+        self._async_api: Optional[YummyAnimeAPIAsync] = None
 
     @property
     def sync_api(self) -> YummyAnimeAPISync:
+        if self._sync_api is None:
+            self._sync_api = YummyAnimeAPISync(client=self.http)
         return self._sync_api
 
     @property
     def async_api(self) -> YummyAnimeAPIAsync:
+        if self._async_api is None:
+            self._async_api = YummyAnimeAPIAsync(client=self.http_async)
         return self._async_api
 
     @property
     def _kwargs_api(self) -> T_KW_APIS:
-        return {"sync_api": self._sync_api, "async_api": self._async_api}
+        return {"sync_api": self.sync_api, "async_api": self.async_api}
 
     def search(self, query: str) -> list["Search"]:
         # https://yummy-anime.ru/api/swagger#/Anime/get_anime
@@ -4,11 +4,18 @@ import re
 
 from attrs import define
 
+from anicli_api._document import a_parse_html, parse_html
 from anicli_api.base import BaseAnime, BaseEpisode, BaseExtractor, BaseOngoing, BaseSearch, BaseSource
 
 # data about anime storage in iframe kodik player page
 from anicli_api.player.base import Video
 from anicli_api.source.parsers.yummy_anime_org_parser import PageOngoing, PageSearch, PageAnime, PageUtils
+from anicli_api.source.parsers.yummy_anime_org_parser import (
+    PageAnimeType,
+    PageOngoingType,
+    PageSearchType,
+    PageUtilsType,
+)
 from anicli_api.player.parsers.cdnvideohub_parser import PageParseCdnVideoData, PageParseCdnVideoDataType
 from anicli_api.player.apis.cdnvideohub import CdnVideoHubSync, CdnVideoHubAsync, T_PlaylistItem
 from anicli_api.player.cdnvideohub import video_playlist_from_vk_id, a_video_playlist_from_vk_id
@@ -22,17 +29,15 @@ RE_IS_CYRRILIC = re.compile(r"[А-Яа-яЁё]")
 class Extractor(BaseExtractor):
     BASE_URL = "https://yummyanime.in"
 
-    def _extract_search(self, resp: str) -> list["Search"]:
-        data = PageSearch(resp).parse()
-        full_url = PageUtils(resp).parse()["url"]
+    def _extract_search(self, data: list[PageSearchType], utils: PageUtilsType) -> list["Search"]:
+        full_url = utils["url"]
         return [
             Search(title=i["title"], url=i["url"], thumbnail=full_url + i["thumbnail_path"], **self._kwargs_http)
             for i in data
         ]
 
-    def _extract_ongoing(self, resp: str) -> list["Ongoing"]:
-        data = PageOngoing(resp).parse()
-        full_url = PageUtils(resp).parse()["url"]
+    def _extract_ongoing(self, data: list[PageOngoingType], utils: PageUtilsType) -> list["Ongoing"]:
+        full_url = utils["url"]
 
         return [
             Ongoing(
@@ -47,32 +52,30 @@ class Extractor(BaseExtractor):
 
     def search(self, query: str):
         resp = self.http.post(self.BASE_URL, data={"do": "search", "subaction": "search", "story": query})
-        result = self._extract_search(resp.text)
+        result = self._extract_search(*parse_html(resp.text, PageSearch, PageUtils))
         if not result and not (RE_IS_CYRRILIC.search(query)):
             logger.warning("[yummyanime.in] search works only with cyrrilic query input")
         return result
 
     async def a_search(self, query: str):
         resp = await self.http_async.post(self.BASE_URL, data={"do": "search", "subaction": "search", "story": query})
-        result = self._extract_search(resp.text)
+        result = self._extract_search(*await a_parse_html(resp.text, PageSearch, PageUtils))
         if not result and not (RE_IS_CYRRILIC.search(query)):
             logger.warning("[yummyanime.in] search works only with cyrrilic query input")
         return result
 
     def ongoing(self):
         resp = self.http.get(self.BASE_URL)
-        return self._extract_ongoing(resp.text)
+        return self._extract_ongoing(*parse_html(resp.text, PageOngoing, PageUtils))
 
     async def a_ongoing(self):
         resp = await self.http_async.get(self.BASE_URL)
-        return self._extract_ongoing(resp.text)
+        return self._extract_ongoing(*await a_parse_html(resp.text, PageOngoing, PageUtils))
 
 
 @define(kw_only=True)
 class Search(BaseSearch):
-    def _extract(self, resp: str) -> "Anime":
-        data = PageAnime(resp).parse()
-        cdn_data = PageParseCdnVideoData(resp).parse()
+    def _extract(self, data: PageAnimeType, cdn_data: PageParseCdnVideoDataType) -> "Anime":
         return Anime(
             title=data["title"],
             description=data["description"],
@@ -83,20 +86,18 @@ class Search(BaseSearch):
 
     def get_anime(self):
         resp = self.http.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(*parse_html(resp.text, PageAnime, PageParseCdnVideoData))
 
     async def a_get_anime(self):
         resp = await self.http_async.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(*await a_parse_html(resp.text, PageAnime, PageParseCdnVideoData))
 
 
 @define(kw_only=True)
 class Ongoing(BaseOngoing):
     episode: int
 
-    def _extract(self, resp: str) -> "Anime":
-        data = PageAnime(resp).parse()
-        cdn_data = PageParseCdnVideoData(resp).parse()
+    def _extract(self, data: PageAnimeType, cdn_data: PageParseCdnVideoDataType) -> "Anime":
         return Anime(
             title=data["title"],
             description=data["description"],
@@ -107,11 +108,11 @@ class Ongoing(BaseOngoing):
 
     def get_anime(self) -> "Anime":
         resp = self.http.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(*parse_html(resp.text, PageAnime, PageParseCdnVideoData))
 
     async def a_get_anime(self) -> "Anime":
         resp = await self.http_async.get(self.url)
-        return self._extract(resp.text)
+        return self._extract(*await a_parse_html(resp.text, PageAnime, PageParseCdnVideoData))
 
     def __str__(self):
         return f"{self.title} ({self.episode})"
@@ -188,10 +189,10 @@ class Source(BaseSource):
 
     # todo: move to player extractor (how?)
     def get_videos(self, **httpx_kwargs) -> list[Video]:
-        return video_playlist_from_vk_id(self.vk_id, user_agent=self._http.headers["User-Agent"])
+        return video_playlist_from_vk_id(self.vk_id, user_agent=self.http.headers["User-Agent"])
 
     async def a_get_videos(self, **httpx_kwargs) -> list[Video]:
-        return await a_video_playlist_from_vk_id(self.vk_id, user_agent=self._http_async.headers["User-Agent"])
+        return await a_video_playlist_from_vk_id(self.vk_id, user_agent=self.http_async.headers["User-Agent"])
 
 
 if __name__ == "__main__":
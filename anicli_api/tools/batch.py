@@ -0,0 +1,284 @@
+"""Batch resolution of episodes: Episode -> Source -> Video with bounded concurrency
+
+`get_sources` and `get_videos` calls of several episodes run in parallel (asyncio tasks or threads):
+
+- `concurrency` - max in-flight calls in total
+- `per_host_limit` - max in-flight calls to one host (source or player netloc)
+
+Usage:
+
+    >>> from anicli_api.source.animego import Extractor
+    >>> from anicli_api.tools.batch import a_resolve_episodes
+    >>>
+    >>> async def main():
+    ...     anime = await (await Extractor().a_search("lain"))[0].a_get_anime()
+    ...     episodes = await anime.a_get_episodes()
+    ...     for result in await a_resolve_episodes(episodes, concurrency=8, per_host_limit=4):
+    ...         print(result.episode, [(s.source, len(s.videos)) for s in result.sources])
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, AsyncGenerator, Callable, Generator, Optional
+
+from anicli_api._concurrency import AsyncHostLimiter, SyncHostLimiter, call_limited, host_key
+from anicli_api._logger import logger
+from anicli_api.typing import NamedTuple, Sequence
+
+if TYPE_CHECKING:
+    from anicli_api.base import BaseEpisode, BaseSource
+    from anicli_api.player.base import Video
+
+__all__ = [
+    "SourceVideos",
+    "EpisodeVideos",
+    "resolve_episodes",
+    "iter_resolve_episodes",
+    "a_resolve_episodes",
+    "a_iter_resolve_episodes",
+]
+
+T_SOURCE_FILTER = Callable[["BaseSource"], bool]
+
+
+class SourceVideos(NamedTuple):
+    source: "BaseSource"
+    videos: list["Video"]
+    error: Optional[BaseException] = None
+    """populated if `get_videos` call failed"""
+
+
+class EpisodeVideos(NamedTuple):
+    position: int
+    """episode position in the input sequence"""
+    episode: "BaseEpisode"
+    sources: list[SourceVideos]
+    error: Optional[BaseException] = None
+    """populated if `get_sources` call failed"""
+
+
+class _OrderedBuffer:
+    """accumulate results and release the contiguous prefix"""
+
+    def __init__(self):
+        self._next = 0
+        self._buffer: dict[int, EpisodeVideos] = {}
+
+    def push(self, result: EpisodeVideos) -> list[EpisodeVideos]:
+        self._buffer[result.position] = result
+        ready = []
+        while self._next in self._buffer:
+            ready.append(self._buffer.pop(self._next))
+            self._next += 1
+        return ready
+
+
+# region asyncio
+
+
+async def _a_resolve_source(source: "BaseSource", limiter: AsyncHostLimiter) -> SourceVideos:
+    try:
+        async with limiter.acquire(host_key(source)):
+            videos = await source.a_get_videos()
+        return SourceVideos(source, list(videos))
+    except Exception as e:  # noqa: BLE001 - any failure is reported in the result, not raised
+        logger.warning("Failed extract videos from %s: %r", source, e)
+        return SourceVideos(source, [], e)
+
+
+async def _a_resolve_episode(
+    position: int, episode: "BaseEpisode", limiter: AsyncHostLimiter, source_filter: Optional[T_SOURCE_FILTER]
+) -> EpisodeVideos:
+    try:
+        async with limiter.acquire(host_key(episode)):
+            sources = await episode.a_get_sources()
+    except Exception as e:  # noqa: BLE001 - any failure is reported in the result, not raised
+        logger.warning("Failed extract sources from %s: %r", episode, e)
+        return EpisodeVideos(position, episode, [], e)
+
+    if source_filter:
+        sources = [s for s in sources if source_filter(s)]
+    results = await asyncio.gather(*[_a_resolve_source(s, limiter) for s in sources])
+    return EpisodeVideos(position, episode, list(results))
+
+
+async def a_iter_resolve_episodes(
+    episodes: Sequence["BaseEpisode"],
+    *,
+    concurrency: int = 8,
+    per_host_limit: int = 4,
+    source_filter: Optional[T_SOURCE_FILTER] = None,
+    ordered: bool = False,
+) -> AsyncGenerator[EpisodeVideos, None]:
+    """resolve videos of all episodes in async mode and yield results as soon as they are completed
+
+    :param episodes: sequence of Episode objects
+    :param concurrency: max in-flight `a_get_sources`, `a_get_videos` calls
+    :param per_host_limit: max in-flight calls to one host
+    :param source_filter: optional predicate for skip unwanted sources
+    :param ordered: yield results in episodes order (contiguous prefix as soon as it's ready)
+    """
+    limiter = AsyncHostLimiter(concurrency, per_host_limit)
+    tasks = [
+        asyncio.ensure_future(_a_resolve_episode(i, episode, limiter, source_filter))
+        for i, episode in enumerate(episodes)
+    ]
+    buffer = _OrderedBuffer()
+    try:
+        for coro in asyncio.as_completed(tasks):
+            result = await coro
+            if not ordered:
+                yield result
+                continue
+            for item in buffer.push(result):
+                yield item
+    finally:
+        # generator closed early - cancel unfinished tasks
+        for task in tasks:
+            task.cancel()
+
+
+async def a_resolve_episodes(
+    episodes: Sequence["BaseEpisode"],
+    *,
+    concurrency: int = 8,
+    per_host_limit: int = 4,
+    source_filter: Optional[T_SOURCE_FILTER] = None,
+) -> list[EpisodeVideos]:
+    """resolve videos of all episodes in async mode. Results are returned in episodes order
+
+    :param episodes: sequence of Episode objects
+    :param concurrency: max in-flight `a_get_sources`, `a_get_videos` calls
+    :param per_host_limit: max in-flight calls to one host
+    :param source_filter: optional predicate for skip unwanted sources
+    """
+    results = [
+        r
+        async for r in a_iter_resolve_episodes(
+            episodes, concurrency=concurrency, per_host_limit=per_host_limit, source_filter=source_filter
+        )
+    ]
+    results.sort(key=lambda r: r.position)
+    return results
+
+
+# endregion asyncio
+
+# region threads
+
+
+class _EpisodeState:
+    """resolved sources of one episode in threads mode"""
+
+    def __init__(self, position: int, episode: "BaseEpisode", sources: list["BaseSource"]):
+        self.position = position
+        self.episode = episode
+        self.sources = sources
+        self.results: list[Optional[SourceVideos]] = [None] * len(sources)
+        self.left = len(sources)
+
+    def set_result(self, source_index: int, future: Future) -> Optional[EpisodeVideos]:
+        """store source videos. Returns episode result if all sources are resolved"""
+        source = self.sources[source_index]
+        try:
+            self.results[source_index] = SourceVideos(source, list(future.result()))
+        except Exception as e:  # noqa: BLE001 - any failure is reported in the result, not raised
+            logger.warning("Failed extract videos from %s: %r", source, e)
+            self.results[source_index] = SourceVideos(source, [], e)
+        self.left -= 1
+        if self.left:
+            return None
+        return EpisodeVideos(self.position, self.episode, self.results)  # type: ignore[arg-type]
+
+
+def iter_resolve_episodes(
+    episodes: Sequence["BaseEpisode"],
+    *,
+    concurrency: int = 8,
+    per_host_limit: int = 4,
+    source_filter: Optional[T_SOURCE_FILTER] = None,
+    ordered: bool = False,
+) -> Generator[EpisodeVideos, None, None]:
+    """resolve videos of all episodes in threads and yield results as soon as they are completed
+
+    :param episodes: sequence of Episode objects
+    :param concurrency: max worker threads (in-flight `get_sources`, `get_videos` calls)
+    :param per_host_limit: max in-flight calls to one host
+    :param source_filter: optional predicate for skip unwanted sources
+    :param ordered: yield results in episodes order (contiguous prefix as soon as it's ready)
+    """
+    limiter = SyncHostLimiter(per_host_limit)
+    buffer = _OrderedBuffer()
+    # future: (episode index, episode state or None for get_sources call, source index)
+    pending: dict[Future, tuple[int, Optional[_EpisodeState], int]] = {}
+
+    # the main thread only schedules calls: workers never wait for other futures (no pool deadlocks)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for i, episode in enumerate(episodes):
+            pending[pool.submit(call_limited, limiter, episode, episode.get_sources)] = (i, None, -1)
+        try:
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, state, source_index = pending.pop(future)
+                    if state:
+                        result = state.set_result(source_index, future)
+                    else:
+                        result, state = _on_sources_done(i, episodes[i], future, source_filter)
+                        for j, source in enumerate(state.sources if state else []):
+                            pending[pool.submit(call_limited, limiter, source, source.get_videos)] = (i, state, j)
+                    if not result:
+                        continue
+                    if ordered:
+                        yield from buffer.push(result)
+                    else:
+                        yield result
+        finally:
+            # generator closed early - drop not started calls
+            for future in pending:
+                future.cancel()
+
+
+def _on_sources_done(
+    i: int, episode: "BaseEpisode", future: Future, source_filter: Optional[T_SOURCE_FILTER]
+) -> tuple[Optional[EpisodeVideos], Optional[_EpisodeState]]:
+    try:
+        sources = list(future.result())
+    except Exception as e:  # noqa: BLE001 - any failure is reported in the result, not raised
+        logger.warning("Failed extract sources from %s: %r", episode, e)
+        return EpisodeVideos(i, episode, [], e), None
+    if source_filter:
+        sources = [s for s in sources if source_filter(s)]
+    if not sources:
+        return EpisodeVideos(i, episode, []), None
+    return None, _EpisodeState(i, episode, sources)
+
+
+def resolve_episodes(
+    episodes: Sequence["BaseEpisode"],
+    *,
+    concurrency: int = 8,
+    per_host_limit: int = 4,
+    source_filter: Optional[T_SOURCE_FILTER] = None,
+) -> list[EpisodeVideos]:
+    """resolve videos of all episodes in threads. Results are returned in episodes order
+
+    :param episodes: sequence of Episode objects
+    :param concurrency: max worker threads (in-flight `get_sources`, `get_videos` calls)
+    :param per_host_limit: max in-flight calls to one host
+    :param source_filter: optional predicate for skip unwanted sources
+    """
+    return list(
+        iter_resolve_episodes(
+            episodes,
+            concurrency=concurrency,
+            per_host_limit=per_host_limit,
+            source_filter=source_filter,
+            ordered=True,
+        )
+    )
+
+
+# endregion threads
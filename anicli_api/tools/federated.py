@@ -0,0 +1,219 @@
+"""Federated search: one query across several sources with a global deadline
+
+`a_search` of every extractor runs concurrently. Results of fast sources are yielded as soon as they are
+completed, sources not completed before deadline are cancelled. Hits are merged by normalized title and year:
+one `FederatedHit` contains search results of the same title from several sources.
+
+With title index (`anicli_api.tools.title_index`) search results are stored in the index, next searches
+are answered locally and fan out to sources on a miss only.
+
+Usage:
+
+    >>> from anicli_api.tools.federated import FederatedSearch
+    >>>
+    >>> async def main():
+    ...     search = FederatedSearch(deadline=3)
+    ...     # partial results
+    ...     async for result in search.a_iter_search("lain"):
+    ...         print(result.source, len(result.results), result.elapsed, result.error)
+    ...     # merged results
+    ...     for hit in await search.a_search("lain"):
+    ...         print(hit.title, hit.year, hit.sources)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import re
+import time
+from typing import TYPE_CHECKING, Any, AsyncGenerator, Iterable, Mapping, Optional
+
+from anicli_api._logger import logger
+from anicli_api.base import BaseSearch
+from anicli_api.source.registry import SOURCES, get_source
+from anicli_api.typing import NamedTuple, Sequence
+
+if TYPE_CHECKING:
+    from anicli_api.base import BaseExtractor
+    from anicli_api.tools.title_index import TitleIndex
+
+__all__ = [
+    "SourceResults",
+    "FederatedHit",
+    "FederatedSearch",
+    "normalize_title",
+    "search_year",
+    "merge_results",
+]
+
+_RE_YEAR = re.compile(r"\b(19[5-9]\d|20\d\d)\b")
+_RE_NON_WORD = re.compile(r"[\W_]+")
+
+
+class SourceResults(NamedTuple):
+    source: str
+    """source name (eg: animego, anilibria)"""
+    results: list["BaseSearch"]
+    elapsed: float
+    """seconds from federated search start"""
+    error: Optional[BaseException] = None
+    """populated if `a_search` call failed or cancelled by deadline (`asyncio.TimeoutError`)"""
+
+
+class FederatedHit(NamedTuple):
+    title: str
+    """title of the first result"""
+    year: Optional[int]
+    key: str
+    """normalized title"""
+    results: list[tuple[str, "BaseSearch"]]
+    """(source name, search result) in arrival order"""
+
+    @property
+    def sources(self) -> list[str]:
+        return [source for source, _ in self.results]
+
+
+def normalize_title(title: str) -> str:
+    """title key for deduplicate: lower case, without year and punctuation"""
+    title = _RE_YEAR.sub(" ", title.casefold().replace("ё", "е"))
+    return " ".join(_RE_NON_WORD.sub(" ", title).split())
+
+
+def search_year(result: "BaseSearch") -> Optional[int]:
+    """release year of search result: from API data (`data["year"]`) or title. None if unknown"""
+    data = getattr(result, "data", None)
+    if isinstance(data, Mapping) and (year := data.get("year")):
+        try:
+            return int(str(year)[:4])
+        except ValueError:
+            pass
+    if match := _RE_YEAR.search(result.title):
+        return int(match[1])
+    return None
+
+
+def merge_results(results: Iterable[SourceResults]) -> list[FederatedHit]:
+    """merge search results of several sources by normalized title and year.
+
+    Results with unknown year are merged with the same title of any year.
+    Hits are sorted by sources count (stable: ties keep arrival order)
+    """
+    # normalized title: groups [title, year, results] of different years
+    groups: dict[str, list[list[Any]]] = {}
+    ordered: list[tuple[str, list[Any]]] = []
+    for source_results in results:
+        for result in source_results.results:
+            key, year = normalize_title(result.title), search_year(result)
+            candidates = groups.setdefault(key, [])
+            for group in candidates:
+                if group[1] is None or year is None or group[1] == year:
+                    group[1] = group[1] or year
+                    group[2].append((source_results.source, result))
+                    break
+            else:
+                group = [result.title, year, [(source_results.source, result)]]
+                candidates.append(group)
+                ordered.append((key, group))
+    hits = [FederatedHit(title, year, key, items) for key, (title, year, items) in ordered]
+    return sorted(hits, key=lambda h: len(set(h.sources)), reverse=True)
+
+
+class FederatedSearch:
+    """concurrent search across sources
+
+    :param sources: source names (`anicli_api.source.registry.SOURCES` keys). Default - all sources
+    :param deadline: global timeout in seconds. Sources not completed in time are cancelled
+    :param extractors: pre-configured extractors (source name: extractor). Missing extractors are created
+        on first search
+    :param index: title index. `a_search` answers from index if it contains hits of configured sources
+    :param index_min_score: min index hit score for local answer
+    """
+
+    def __init__(
+        self,
+        sources: Optional[Sequence[str]] = None,
+        *,
+        deadline: float = 5.0,
+        extractors: Optional[Mapping[str, "BaseExtractor"]] = None,
+        index: Optional["TitleIndex"] = None,
+        index_min_score: float = 0.8,
+    ):
+        self.extractors: dict[str, "BaseExtractor"] = dict(extractors or {})
+        self.sources = list(sources) if sources is not None else list(self.extractors or SOURCES)
+        self.deadline = deadline
+        self.index = index
+        self.index_min_score = index_min_score
+
+    def _extractor(self, name: str) -> "BaseExtractor":
+        if name not in self.extractors:
+            self.extractors[name] = get_source(name)()
+        return self.extractors[name]
+
+    async def _search(self, name: str, query: str, started: float) -> SourceResults:
+        try:
+            results = await self._extractor(name).a_search(query)
+        except Exception as e:  # noqa: BLE001 - failed source is reported in results, other sources go on
+            logger.warning("[federated] %s search failed: %r", name, e)
+            return SourceResults(name, [], time.perf_counter() - started, e)
+        return SourceResults(name, list(results), time.perf_counter() - started)
+
+    async def a_iter_search(self, query: str, deadline: Optional[float] = None) -> AsyncGenerator[SourceResults, None]:
+        """yield search results of every source as soon as they are completed.
+
+        After deadline unfinished searches are cancelled and yielded with `asyncio.TimeoutError` error
+
+        :param query: search query
+        :param deadline: override global timeout
+        """
+        deadline = self.deadline if deadline is None else deadline
+        started = time.perf_counter()
+        tasks: dict[asyncio.Future[Any], str] = {
+            asyncio.ensure_future(self._search(name, query, started)): name for name in self.sources
+        }
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = deadline - (time.perf_counter() - started)
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=lambda t: tasks[t]):
+                    yield task.result()
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            for task in sorted(pending, key=lambda t: tasks[t]):
+                logger.warning("[federated] %s search cancelled by deadline %ss", tasks[task], deadline)
+                yield SourceResults(tasks[task], [], time.perf_counter() - started, asyncio.TimeoutError())
+        finally:
+            # generator closed early - cancel unfinished searches and wait for them
+            unfinished = [task for task in tasks if not task.done()]
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+
+    def _index_results(self, query: str) -> list[SourceResults]:
+        grouped: dict[str, list[BaseSearch]] = {}
+        for hit in self.index.search(query, min_score=self.index_min_score) if self.index is not None else ():
+            if hit.source in self.sources and isinstance(hit.item, BaseSearch):
+                grouped.setdefault(hit.source, []).append(hit.item)
+        return [SourceResults(source, items, 0.0) for source, items in grouped.items()]
+
+    async def a_search(self, query: str, deadline: Optional[float] = None) -> list[FederatedHit]:
+        """search in all sources and merge results. Sources not completed before deadline are skipped.
+
+        If title index is set, answer from index and fan out to sources on a miss only
+
+        :param query: search query
+        :param deadline: override global timeout
+        """
+        if local := self._index_results(query):
+            logger.debug("[federated] %r answered from index: %s", query, [r.source for r in local])
+            return merge_results(local)
+        results = [r async for r in self.a_iter_search(query, deadline)]
+        if self.index is not None:
+            for source_results in results:
+                for item in source_results.results:
+                    self.index.add_item(item, source_results.source)
+        return merge_results(results)
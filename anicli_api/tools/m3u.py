@@ -1,151 +1,299 @@
 """simple M3U playlist generators"""
 
-from typing import Optional, Union
+from __future__ import annotations
 
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import IO, AsyncIterator, Callable, Iterable, Iterator, Optional, Union
+
+from anicli_api._concurrency import AsyncHostLimiter, SyncHostLimiter, call_limited, host_key
 from anicli_api.typing import NamedTuple, MutableSequence
 from anicli_api.base import BaseSource
 from anicli_api.player.base import Video
 
 _M3U_HEADER = "#EXTM3U"
-_M3U_ITEM = "#EXTINF:0,{name}\n{url}"
-
-__all__ = ["M3UPlaylistItem", "Playlist", "generate_playlist", "generate_asyncio_playlist"]
+_M3U_ITEM = "#EXTINF:{duration},{name}\n{options}{url}"
+# VLC compatible options. mpv, IINA and other players also understand them
+_M3U_VLC_OPTIONS = {"user-agent": "#EXTVLCOPT:http-user-agent={}\n", "referer": "#EXTVLCOPT:http-referrer={}\n"}
+
+__all__ = [
+    "M3UPlaylistItem",
+    "Playlist",
+    "generate_playlist",
+    "generate_asyncio_playlist",
+    "iter_playlist_items",
+    "a_iter_playlist_items",
+    "write_playlist",
+    "a_write_playlist",
+]
+
+T_PROGRESS_CB = Callable[[int, int], None]
+"""progress callback signature: (done, total)"""
+T_TARGET = Union[str, Path, IO[str]]
 
 
 class M3UPlaylistItem(NamedTuple):
     url: str
     name: Optional[str] = None
+    duration: int = 0
+    """#EXTINF duration in seconds. 0 - unknown"""
+    headers: Optional[dict[str, str]] = None
+    """Video.headers. User-Agent and Referer keys are written as #EXTVLCOPT lines"""
+
+    @classmethod
+    def from_video(cls, video: Video, name: Optional[str] = None, duration: int = 0) -> "M3UPlaylistItem":
+        return cls(url=video.url, name=name, duration=duration, headers=video.headers or None)
 
     def __str__(self):
-        return _M3U_ITEM.format(name=self.name, url=self.url)
+        options = ""
+        if self.headers:
+            for key, value in self.headers.items():
+                if fmt := _M3U_VLC_OPTIONS.get(key.lower()):
+                    options += fmt.format(value)
+        return _M3U_ITEM.format(duration=self.duration, name=self.name, options=options, url=self.url)
 
 
 class Playlist:
-    def __init__(self, playlist: MutableSequence[M3UPlaylistItem]):
+    def __init__(self, playlist: Iterable[M3UPlaylistItem]):
         self._playlist = playlist
 
     @classmethod
     def from_urls(cls, urls: MutableSequence[str], names: Optional[MutableSequence[str]] = None):
-        if not names:
-            names = [f"Episode {i + 1}" for i in range(len(urls))]
-
-        playlists: list["M3UPlaylistItem"] = []
-
-        for url, name in zip(urls, names):
-            playlists.append(M3UPlaylistItem(url=url, name=name))
-        return cls(playlists).generate()
+        names = names or _default_names(len(urls))
+        return cls([M3UPlaylistItem(url=url, name=name) for url, name in zip(urls, names)]).generate()
 
     @classmethod
     def from_videos(cls, videos: MutableSequence["Video"], names: Optional[MutableSequence[str]]) -> str:
-        if not names:
-            names = [f"Episode {i + 1}" for i in range(len(videos))]
-        playlists: list["M3UPlaylistItem"] = []
-        for video, name in zip(videos, names):
-            playlists.append(M3UPlaylistItem(url=video.url, name=name))
-        return cls(playlists).generate()
+        names = names or _default_names(len(videos))
+        return cls([M3UPlaylistItem.from_video(video, name) for video, name in zip(videos, names)]).generate()
+
+    def iter_lines(self) -> Iterator[str]:
+        """iterate playlist chunks: header and items"""
+        yield _M3U_HEADER
+        for item in self._playlist:
+            yield f"\n\n{item}"
 
     def generate(self) -> str:
-        raw_playlist = _M3U_HEADER
+        return "".join(self.iter_lines())
+
+    def write(self, stream: IO[str]) -> None:
+        """write playlist to text stream incrementally"""
+        for chunk in self.iter_lines():
+            stream.write(chunk)
+
+
+def _default_names(count: int) -> list[str]:
+    return [f"Episode {i + 1}" for i in range(count)]
+
+
+def _get_preferred_video_quality(videos: MutableSequence[Video], quality: int) -> Video:
+    return sorted(videos, key=lambda x: abs(x.quality - quality))[0]
+
+
+def _to_playlist_item(videos: MutableSequence[Video], name: str, quality: int) -> Optional[M3UPlaylistItem]:
+    if not videos:
+        return None
+    return M3UPlaylistItem.from_video(_get_preferred_video_quality(videos, quality), name)
+
+
+def iter_playlist_items(
+    sources: MutableSequence["BaseSource"],
+    names: Optional[MutableSequence[str]] = None,
+    quality: int = 1080,
+    *,
+    concurrency: int = 4,
+    per_host_limit: int = 2,
+    progress_cb: Optional[T_PROGRESS_CB] = None,
+) -> Iterator[M3UPlaylistItem]:
+    """resolve sources in threads and yield playlist items in sources order.
+    Sources without videos are skipped
+
+    :param sources: sequence of Source objects
+    :param names: names for items. If not passed, default naming `Episode {i}`
+    :param quality: preferred near video quality
+    :param concurrency: max worker threads
+    :param per_host_limit: max in-flight requests to one host
+    :param progress_cb: callback, called with (done, total) arguments after every resolved source
+        (from worker threads, serialized)
+    """
+    names = names or _default_names(len(sources))
+    limiter = SyncHostLimiter(per_host_limit)
+    lock = threading.Lock()
+    done = 0
+
+    def resolve(source: "BaseSource") -> MutableSequence[Video]:
+        nonlocal done
+        videos = call_limited(limiter, source, source.get_videos)
+        with lock:
+            done += 1
+            if progress_cb:
+                progress_cb(done, len(sources))
+        return videos
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        # Executor.map returns results in order: prefix released as soon as it's ready
+        for videos, name in zip(pool.map(resolve, sources), names):
+            if item := _to_playlist_item(videos, name, quality):
+                yield item
+
+
+async def a_iter_playlist_items(
+    sources: MutableSequence["BaseSource"],
+    names: Optional[MutableSequence[str]] = None,
+    quality: int = 1080,
+    *,
+    concurrency: int = 4,
+    per_host_limit: int = 2,
+    progress_cb: Optional[T_PROGRESS_CB] = None,
+) -> AsyncIterator[M3UPlaylistItem]:
+    """resolve sources concurrently IN ASYNCIO MODE and yield playlist items in sources order.
+    Sources without videos are skipped
+
+    :param sources: sequence of Source objects
+    :param names: names for items. If not passed, default naming `Episode {i}`
+    :param quality: preferred near video quality
+    :param concurrency: max in-flight `a_get_videos` calls
+    :param per_host_limit: max in-flight `a_get_videos` calls to one host
+    :param progress_cb: callback, called with (done, total) arguments after every resolved source
+    """
+    names = names or _default_names(len(sources))
+    limiter = AsyncHostLimiter(concurrency, per_host_limit)
+    done = 0
+
+    async def resolve(source: "BaseSource") -> MutableSequence[Video]:
+        nonlocal done
+        async with limiter.acquire(host_key(source)):
+            videos = await source.a_get_videos()
+        done += 1
+        if progress_cb:
+            progress_cb(done, len(sources))
+        return videos
+
+    tasks = [asyncio.ensure_future(resolve(source)) for source in sources]
+    try:
+        # await in order: prefix released as soon as it's ready, next tasks keep running
+        for task, name in zip(tasks, names):
+            if item := _to_playlist_item(await task, name, quality):
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _open_target(target: T_TARGET):
+    if isinstance(target, (str, Path)):
+        return open(target, "w", encoding="utf-8")
+    return None
+
+
+def write_playlist(target: T_TARGET, sources: MutableSequence["BaseSource"], **kwargs) -> None:
+    """resolve sources and write m3u playlist to file path or text stream incrementally
+
+    :param target: file path or text stream
+    :param sources: sequence of Source objects
+    :param kwargs: `iter_playlist_items` arguments
+    """
+    file = _open_target(target)
+    stream: IO[str] = file or target  # type: ignore[assignment]
+    try:
+        Playlist(iter_playlist_items(sources, **kwargs)).write(stream)
+    finally:
+        if file:
+            file.close()
 
-        for video in self._playlist:
-            raw_playlist += "\n\n"
-            raw_playlist += str(video)
 
-        return raw_playlist
+async def a_write_playlist(target: T_TARGET, sources: MutableSequence["BaseSource"], **kwargs) -> None:
+    """resolve sources IN ASYNCIO MODE and write m3u playlist to file path or text stream incrementally
+
+    :param target: file path or text stream
+    :param sources: sequence of Source objects
+    :param kwargs: `a_iter_playlist_items` arguments
+    """
+    file = _open_target(target)
+    stream: IO[str] = file or target  # type: ignore[assignment]
+    try:
+        stream.write(_M3U_HEADER)
+        async for item in a_iter_playlist_items(sources, **kwargs):
+            stream.write(f"\n\n{item}")
+    finally:
+        if file:
+            file.close()
 
 
 def generate_playlist_from_urls(
     videos: MutableSequence[Union[str, Video]], names: Optional[MutableSequence[str]] = None
 ) -> str:
     if isinstance(videos[0], Video):
-        videos = [v.url for v in videos]
-    if not names:
-        names = [f"Episode {i + 1}" for i in range(len(videos))]
-    return Playlist.from_urls(urls=videos, names=names)
-
-
-def _get_preferred_video_quality(videos: MutableSequence[Video], quality: int) -> Video:
-    return sorted(videos, key=lambda x: abs(x.quality - quality))[0]
+        videos = [v.url for v in videos]  # type: ignore[union-attr]
+    return Playlist.from_urls(urls=videos, names=names)  # type: ignore[arg-type]
 
 
 def generate_playlist_from_sources(
-    sources: MutableSequence["BaseSource"], names: Optional[MutableSequence[str]] = None, quality: int = 1080
+    sources: MutableSequence["BaseSource"],
+    names: Optional[MutableSequence[str]] = None,
+    quality: int = 1080,
+    **kwargs,
 ) -> str:
-    _is_empty_names = False
-    if not names:
-        names = []
-    else:
-        _is_empty_names = True
-    videos = []
+    """generate m3u playlist structure from sources
 
-    for i, source in enumerate(sources):
-        print(f"Parse source: {i + 1}/{len(sources)}", end="\r")
-        videos = source.get_videos()
-        video = _get_preferred_video_quality(videos, quality)
-        videos.append(video)
-        if _is_empty_names:
-            names.append(f"Episode {i + 1}")
-
-    return Playlist.from_videos(videos, names)
+    :param sources: sequence of Source objects
+    :param names: names for urls. If not passed, default naming `Episode {i}`
+    :param quality: preferred near video quality
+    :param kwargs: `iter_playlist_items` arguments (concurrency, per_host_limit, progress_cb)
+    """
+    return Playlist(iter_playlist_items(sources, names, quality, **kwargs)).generate()
 
 
 async def generate_playlist_from_async_sources(
-    target: MutableSequence["BaseSource"], names: Optional[MutableSequence[str]] = None, quality: int = 1080
+    target: MutableSequence["BaseSource"],
+    names: Optional[MutableSequence[str]] = None,
+    quality: int = 1080,
+    **kwargs,
 ) -> str:
     """generate m3u playlist structure IN ASYNCIO MODE
 
     :param target: sequence of source, video or direct url links
     :param names: names for urls. If not passed, default naming `Episode {i}`
     :param quality: preferred near video quality (if passed Source object)
+    :param kwargs: `a_iter_playlist_items` arguments (concurrency, per_host_limit, progress_cb)
     """
-    _is_empty_names = False
-    if not names:
-        names = []
-    else:
-        _is_empty_names = True
-    videos = []
-
-    for i, source in enumerate(target):
-        print(f"Parse source: {i + 1}/{len(target)}", end="\r")
-        videos = await source.a_get_videos()
-        video = _get_preferred_video_quality(videos, quality)
-        videos.append(video)
-        if _is_empty_names:
-            names.append(f"Episode {i + 1}")
-
-    return Playlist.from_videos(videos, names)
+    items = [item async for item in a_iter_playlist_items(target, names, quality, **kwargs)]
+    return Playlist(items).generate()
 
 
 def generate_playlist(
     target: MutableSequence[Union[BaseSource, Video, str]],
     names: Optional[MutableSequence[str]] = None,
     quality: int = 1080,
+    **kwargs,
 ) -> str:
     """generate m3u playlist structure
 
     :param target: sequence of source, video or direct url links
     :param names: names for urls. If not passed, default naming `Episode {i}`
     :param quality: preferred near video quality (if passed Source object)
+    :param kwargs: extra `iter_playlist_items` arguments (if passed Source object)
     """
     if isinstance(target[0], BaseSource):
-        return generate_playlist_from_sources(target, names, quality=quality)
+        return generate_playlist_from_sources(target, names, quality=quality, **kwargs)  # type: ignore[arg-type]
     elif isinstance(target[0], Video):
-        return Playlist.from_videos(target, names)
-    elif isinstance(target[0], str):
-        return Playlist.from_urls(target, names)
+        return Playlist.from_videos(target, names)  # type: ignore[arg-type]
+    return Playlist.from_urls(target, names)  # type: ignore[arg-type]
 
 
 async def generate_asyncio_playlist(
     target: MutableSequence[Union[BaseSource, Video, str]],
     names: Optional[MutableSequence[str]] = None,
     quality: int = 1080,
+    **kwargs,
 ) -> str:
     if isinstance(target[0], BaseSource):
-        return await generate_playlist_from_async_sources(target, names, quality=quality)
+        return await generate_playlist_from_async_sources(target, names, quality=quality, **kwargs)  # type: ignore[arg-type]
     elif isinstance(target[0], Video):
-        return Playlist.from_videos(target, names)
-    elif isinstance(target[0], str):
-        return Playlist.from_urls(target, names)
+        return Playlist.from_videos(target, names)  # type: ignore[arg-type]
+    return Playlist.from_urls(target, names)  # type: ignore[arg-type]
 
 
 if __name__ == "__main__":
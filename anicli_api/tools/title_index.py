@@ -0,0 +1,297 @@
+"""Offline fuzzy title index: answer searches locally, without source requests
+
+In-memory inverted trigram index of titles. Names are indexed in two forms:
+
+- normalized: lower case, `ё` -> `е`, without punctuation
+- phonetic: cyrillic transliteration, folded with Hepburn romaji to common spelling
+  (`Сидзуку`, `Shizuku` -> `sizuku`; `Дзюндзи`, `Junji` -> `zyunzi`). Latin query finds cyrillic titles
+  (eg: yummy_anime_org accepts cyrillic queries only) and vice versa
+
+Hits are ranked by query trigrams coverage and title similarity. Index is populated by:
+
+- `IndexTracer` tracing hook: every `Search`/`Ongoing`/`Anime` object returned by extractors
+- `TitleIndex.add_catalog`: releases of AniLiberty catalog mirror (`anicli_api.source.anilibria_mirror`)
+- `TitleIndex.add`/`add_item` manually
+
+Usage:
+
+    >>> from anicli_api._tracing import add_tracer
+    >>> from anicli_api.source.animego import Extractor
+    >>> from anicli_api.tools.title_index import IndexTracer, TitleIndex
+    >>>
+    >>> index = TitleIndex()
+    >>> add_tracer(IndexTracer(index))
+    >>> Extractor().search("Наруто")
+    >>> for hit in index.search("naruto"):
+    ...     print(hit.score, hit.source, hit.title, hit.item)
+"""
+
+from __future__ import annotations
+
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, Any, Iterable, Optional
+
+from anicli_api.typing import NamedTuple
+
+if TYPE_CHECKING:
+    from anicli_api._tracing import Span
+    from anicli_api.source.anilibria_mirror import CatalogMirror
+
+__all__ = [
+    "IndexEntry",
+    "TitleHit",
+    "TitleIndex",
+    "IndexTracer",
+    "normalize",
+    "transliterate",
+    "phonetic_key",
+    "trigrams",
+]
+
+_RE_NON_WORD = re.compile(r"[\W_]+")
+
+_CYRILLIC = {
+    "а": "a",
+    "б": "b",
+    "в": "v",
+    "г": "g",
+    "д": "d",
+    "е": "e",
+    "ё": "yo",
+    "ж": "zh",
+    "з": "z",
+    "и": "i",
+    "й": "y",
+    "к": "k",
+    "л": "l",
+    "м": "m",
+    "н": "n",
+    "о": "o",
+    "п": "p",
+    "р": "r",
+    "с": "s",
+    "т": "t",
+    "у": "u",
+    "ф": "f",
+    # Polivanov system: `х` is romaji `h` (Хаяо - Hayao)
+    "х": "h",
+    "ц": "ts",
+    "ч": "ch",
+    "ш": "sh",
+    "щ": "shch",
+    "ъ": "",
+    "ы": "y",
+    "ь": "",
+    "э": "e",
+    "ю": "yu",
+    "я": "ya",
+}
+_CYRILLIC_TABLE = str.maketrans(_CYRILLIC)
+
+# Hepburn romaji and Polivanov transliteration to the common spelling. Order matters
+_FOLD_RULES = (
+    ("shi", "si"),
+    ("chi", "ti"),
+    ("tsu", "tu"),
+    ("ts", "t"),
+    ("ji", "zi"),
+    ("dz", "z"),
+    ("sh", "sy"),
+    ("ch", "ty"),
+    ("j", "zy"),
+    ("w", "v"),
+    # long vowels: ou, uu, oo
+    ("ou", "o"),
+    ("uu", "u"),
+    ("oo", "o"),
+)
+
+
+def normalize(text: str) -> str:
+    """lower case, `ё` -> `е`, punctuation replaced by space"""
+    return " ".join(_RE_NON_WORD.sub(" ", text.casefold().replace("ё", "е")).split())
+
+
+def transliterate(text: str) -> str:
+    """cyrillic to latin (Polivanov-compatible). Latin chars are kept"""
+    return text.casefold().translate(_CYRILLIC_TABLE)
+
+
+def phonetic_key(text: str) -> str:
+    """transliterated and romaji-folded title: same key for cyrillic and latin spelling of japanese names"""
+    key = " ".join(_RE_NON_WORD.sub(" ", transliterate(text)).split())
+    for old, new in _FOLD_RULES:
+        key = key.replace(old, new)
+    return key
+
+
+def trigrams(key: str) -> set[str]:
+    """trigrams of padded words: `lain` -> `  l`, ` la`, `lai`, `ain`, `in `"""
+    result: set[str] = set()
+    for word in key.split():
+        padded = f"  {word} "
+        result.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def _keys(text: str) -> set[str]:
+    return {k for k in (normalize(text), phonetic_key(text)) if k}
+
+
+class IndexEntry(NamedTuple):
+    title: str
+    source: Optional[str]
+    """source name (eg: animego, anilibria)"""
+    item: Any
+    """indexed object (`Search`, `Ongoing`, `Anime`) or catalog data"""
+    names: tuple[str, ...]
+    """indexed names: title and aliases"""
+
+
+class TitleHit(NamedTuple):
+    score: float
+    """0..1. 1 - all query trigrams found, same title length"""
+    title: str
+    source: Optional[str]
+    item: Any
+
+
+class TitleIndex:
+    """thread-safe in-memory trigram index of titles
+
+    :param max_entries: max stored entries, oldest are evicted
+    """
+
+    def __init__(self, max_entries: int = 100_000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # (source, normalized title): entry id
+        self._ids: dict[tuple[Optional[str], str], int] = {}
+        self._entries: OrderedDict[int, IndexEntry] = OrderedDict()
+        # entry id: trigram sets of indexed keys
+        self._keys: dict[int, list[set[str]]] = {}
+        self._postings: dict[str, set[int]] = {}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        del self._ids[(entry.source, normalize(entry.title))]
+        for grams in self._keys.pop(entry_id):
+            for gram in grams:
+                ids = self._postings[gram]
+                ids.discard(entry_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def add(self, title: str, source: Optional[str] = None, item: Any = None, aliases: Iterable[str] = ()) -> None:
+        """add or replace title of source
+
+        :param title: title
+        :param source: source name
+        :param item: stored object, returned in hits
+        :param aliases: alternative names (english, romaji...)
+        """
+        names = tuple(dict.fromkeys(n for n in (title, *aliases) if n))
+        key_grams = [grams for grams in (trigrams(k) for n in names for k in _keys(n)) if grams]
+        if not key_grams:
+            return
+        with self._lock:
+            if (old_id := self._ids.get((source, normalize(title)))) is not None:
+                self._remove(old_id)
+            entry_id, self._next_id = self._next_id, self._next_id + 1
+            self._ids[(source, normalize(title))] = entry_id
+            self._entries[entry_id] = IndexEntry(title, source, item, names)
+            self._keys[entry_id] = key_grams
+            for grams in key_grams:
+                for gram in grams:
+                    self._postings.setdefault(gram, set()).add(entry_id)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def add_item(self, item: Any, source: Optional[str] = None) -> None:
+        """add `Search`/`Ongoing`/`Anime` object. Aliases are taken from API data (`name`) if exists
+
+        :param item: extractor object with `title` attribute
+        :param source: source name. Default - extractor module name (eg: animego)
+        """
+        title = getattr(item, "title", None)
+        if not isinstance(title, str):
+            return
+        aliases: list[str] = []
+        data = getattr(item, "data", None)
+        if isinstance(data, dict) and isinstance(data.get("name"), dict):
+            aliases.extend(v for v in data["name"].values() if isinstance(v, str))
+        if source is None:
+            source = type(item).__module__.rpartition(".")[-1]
+        self.add(title, source, item, aliases)
+
+    def add_catalog(self, mirror: "CatalogMirror", source: str = "anilibria") -> int:
+        """add releases of AniLiberty catalog mirror. Item - release data. Returns added releases count"""
+        count = 0
+        for release in mirror.releases():
+            name = release.get("name") or {}
+            if not name.get("main"):
+                continue
+            self.add(name["main"], source, release, (name.get("english") or "", name.get("alternative") or ""))
+            count += 1
+        return count
+
+    def search(self, query: str, limit: int = 20, min_score: float = 0.5) -> list[TitleHit]:
+        """ranked titles similar to query
+
+        :param query: search query
+        :param limit: max hits
+        :param min_score: min hit score (0..1)
+        """
+        query_grams = [grams for grams in (trigrams(k) for k in _keys(query)) if grams]
+        scores: dict[int, float] = {}
+        with self._lock:
+            for q_grams in query_grams:
+                counts = Counter(i for gram in q_grams for i in self._postings.get(gram, ()))
+                for entry_id, _ in counts.most_common():
+                    for grams in self._keys[entry_id]:
+                        common = len(q_grams & grams)
+                        if not common:
+                            continue
+                        coverage = common / len(q_grams)
+                        similarity = 2 * common / (len(q_grams) + len(grams))
+                        score = 0.8 * coverage + 0.2 * similarity
+                        if score > scores.get(entry_id, 0.0):
+                            scores[entry_id] = score
+            ranked = sorted(((s, i) for i, s in scores.items() if s >= min_score), key=lambda x: (-x[0], -x[1]))
+            entries = [(s, self._entries[i]) for s, i in ranked[:limit]]
+        return [TitleHit(round(score, 4), e.title, e.source, e.item) for score, e in entries]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._entries.clear()
+            self._keys.clear()
+            self._postings.clear()
+
+
+class IndexTracer:
+    """tracing hooks adapter: adds results of `search`, `ongoing` and `anime` stages to index
+
+    :param index: title index
+    """
+
+    STAGES = ("search", "ongoing", "anime")
+
+    def __init__(self, index: TitleIndex):
+        self.index = index
+
+    def on_span_start(self, span: "Span") -> None:
+        pass
+
+    def on_span_end(self, span: "Span") -> None:
+        if span.error or span.stage not in self.STAGES or span.result is None:
+            return
+        items = span.result if isinstance(span.result, list) else [span.result]
+        for item in items:
+            self.index.add_item(item, span.source)
@@ -0,0 +1,78 @@
+"""Full Search -> Video chain benchmark with recorded cassette (no network on replay)
+
+Chain: search -> first result anime -> first `--episodes` episodes -> all sources -> videos.
+Sync run walks the chain sequentially, async run gathers episodes and sources concurrently.
+
+Record cassette once (network required), then replay it with injected latency on any machine:
+
+Usage:
+
+    PYTHONPATH=. python dev/benchmarks/bench_cassette_chain.py animego "lain" --record
+    PYTHONPATH=. python dev/benchmarks/bench_cassette_chain.py animego "lain" [--latency 0.1] [--cache]
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+from anicli_api._cassette import Cassette
+from anicli_api._http import HTTPSession
+from anicli_api._http_cache import HTTPCache
+from anicli_api.source.registry import get_source
+
+CASSETTES = Path(__file__).parent / "cassettes"
+
+
+def chain(extractor, query: str, episodes: int, **httpx_kwargs) -> int:
+    anime = extractor.search(query)[0].get_anime()
+    videos = 0
+    for episode in anime.get_episodes()[:episodes]:
+        for source in episode.get_sources():
+            videos += len(source.get_videos(**httpx_kwargs))
+    return videos
+
+
+async def a_chain(extractor, query: str, episodes: int, **httpx_kwargs) -> int:
+    anime = await (await extractor.a_search(query))[0].a_get_anime()
+
+    async def episode_videos(episode) -> int:
+        sources = await episode.a_get_sources()
+        results = await asyncio.gather(*(source.a_get_videos(**httpx_kwargs) for source in sources))
+        return sum(map(len, results))
+
+    return sum(await asyncio.gather(*(episode_videos(e) for e in (await anime.a_get_episodes())[:episodes])))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("source", help="source name, eg: animego, anilibria")
+    parser.add_argument("query")
+    parser.add_argument("--episodes", type=int, default=3)
+    parser.add_argument("--cassette", type=Path, default=None, help="default: cassettes/<source>.json")
+    parser.add_argument("--record", action="store_true", help="send real requests and record unknown")
+    parser.add_argument("--latency", type=float, default=None, help="replay delay. default - recorded time")
+    parser.add_argument("--cache", action="store_true", help="enable in-memory http cache (ttl=60s)")
+    args = parser.parse_args()
+
+    path = args.cassette or CASSETTES / f"{args.source}.json"
+    with Cassette(path, mode="auto" if args.record else "replay", latency=args.latency) as cassette:
+        print(f"cassette: {path}, interactions: {len(cassette)}")
+        for name in ("sync", "async"):
+            cassette.rewind()
+            httpx_kwargs = {"cassette": cassette}
+            if args.cache:
+                httpx_kwargs["cache"] = HTTPCache(default_ttl=60)
+            extractor = get_source(args.source)(session=HTTPSession(**httpx_kwargs))
+            hits = cassette.hits
+            start = time.perf_counter()
+            if name == "sync":
+                videos = chain(extractor, args.query, args.episodes, **httpx_kwargs)
+            else:
+                videos = asyncio.run(a_chain(extractor, args.query, args.episodes, **httpx_kwargs))
+            elapsed = time.perf_counter() - start
+            print(f"{name:<6} {elapsed:8.3f}s videos: {videos:<4} replayed requests: {cassette.hits - hits}")
+
+
+if __name__ == "__main__":
+    main()
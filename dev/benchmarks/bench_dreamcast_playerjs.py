@@ -0,0 +1,123 @@
+"""dreamerscast playerjs decoder micro-benchmark: legacy implementation vs dreamcast_chipers
+
+Fixture: anonymized packed playerjs script (several thousand dictionary words), encoded player string
+and expected playlist.
+
+- unpack: `get_crypt_codes` (packer tokens generation + words replace)
+- decode: crypt codes `decode` (base64 with playerjs alphabet + utf-8)
+- catalog: `--titles` titles episodes resolve. Legacy unpacks playerjs for every title, new - once (CryptCodesCache)
+
+Usage:
+
+    PYTHONPATH=. python dev/benchmarks/bench_dreamcast_playerjs.py [-n 5] [--titles 100]
+"""
+
+import argparse
+import json
+import re
+import timeit
+from pathlib import Path
+
+from anicli_api.player.dreamcast_cache import CryptCodesCache
+from anicli_api.player.dreamcast_chipers import (
+    _RE_O_U1,
+    _SALT_ABC_STRING,
+    decode,
+    decode_playlist,
+    get_crypt_codes,
+    parse_params_to_unpack,
+    pepper,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "dreamcast_playerjs.json"
+_BASE36_STRING = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+# region legacy implementation
+def legacy_unpack_playerjs(p, a, c, k, _, d):
+    def e(c: int):
+        return ("" if c < a else e(c // a)) + (chr(c + 29) if (c := c % a) > 35 else _BASE36_STRING[c])
+
+    while c:
+        c -= 1
+        d[e(c)] = k[c] or e(c)
+    return re.sub(r"\b\w+\b", lambda e: d.get(e.group(), e.group()), p)
+
+
+def legacy_get_crypt_codes(script):
+    return _RE_O_U1.search(legacy_unpack_playerjs(*parse_params_to_unpack(script)))[1]
+
+
+def legacy_salt_d(e, key=_SALT_ABC_STRING):
+    t = ""
+    f = 0
+    e = "".join([c for c in e if c in key])
+    while f < len(e):
+        s, o, u, a = (key.index(e[f + i]) for i in range(4))
+        f += 4
+        t += chr((s << 2) | (o >> 4))
+        if u != 64:
+            t += chr(((o & 15) << 4) | (u >> 2))
+        if a != 64:
+            t += chr(((u & 3) << 6) | a)
+    r = ""
+    n = 0
+    while n < len(t):
+        c = ord(t[n])
+        if c < 128:
+            r += chr(c)
+            n += 1
+        elif 191 < c < 224:
+            r += chr(((c & 31) << 6) | (ord(t[n + 1]) & 63))
+            n += 2
+        else:
+            r += chr(((c & 15) << 12) | ((ord(t[n + 1]) & 63) << 6) | (ord(t[n + 2]) & 63))
+            n += 3
+    return r
+
+
+def legacy_decode(x):
+    return legacy_salt_d(pepper(x[2:], -1)) if x[:2] == "#1" else x
+
+
+# endregion
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=5)
+    parser.add_argument("--titles", type=int, default=100, help="titles count in catalog case")
+    args = parser.parse_args()
+
+    fixture = json.loads(FIXTURE.read_text(encoding="utf-8"))
+    script, encoded = fixture["player_js"], fixture["player_js_encoded"]
+    codes = get_crypt_codes(script)
+    assert legacy_get_crypt_codes(script) == codes
+    assert legacy_decode(codes) == decode(codes)
+
+    def legacy_catalog():
+        for _ in range(args.titles):
+            v = json.loads(legacy_decode(legacy_get_crypt_codes(script)))
+            assert v
+
+    def catalog():
+        cache = CryptCodesCache()
+        for _ in range(args.titles):
+            assert decode_playlist(cache.get("playerjs") or cache.extract("playerjs", script), encoded)
+
+    cases = {
+        "unpack": (lambda: legacy_get_crypt_codes(script), lambda: get_crypt_codes(script)),
+        "decode": (lambda: legacy_decode(codes), lambda: decode(codes)),
+        f"catalog x{args.titles}": (legacy_catalog, catalog),
+    }
+    print(f"playerjs size: {len(script)} chars, best of {args.number} runs")
+    print(f"{'case':<16} {'legacy, ms':>11} {'new, ms':>9} {'speedup':>8}")
+    for name, (legacy, new) in cases.items():
+        number = 1 if name.startswith("catalog") else 20
+        legacy_ms = min(timeit.repeat(legacy, number=number, repeat=args.number)) / number * 1000
+        new_ms = min(timeit.repeat(new, number=number, repeat=args.number)) / number * 1000
+        print(f"{name:<16} {legacy_ms:11.3f} {new_ms:9.3f} {legacy_ms / new_ms:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Import time benchmark of anicli_api modules
+
+Every module imported in a fresh interpreter (`python -X importtime`), best of N runs.
+Also measures first http client creation time (SSL context setup) - paid only on first request.
+
+Usage:
+
+    PYTHONPATH=. python dev/benchmarks/bench_import_time.py [-n 5] [modules...]
+"""
+
+import argparse
+import subprocess
+import sys
+
+MODULES = [
+    "anicli_api.base",
+    "anicli_api.source.animego",
+    "anicli_api.source.anilibria",
+    "anicli_api.source.animevost",
+    "anicli_api.source.anilibme",
+    "anicli_api.source.dreamcast",
+    "anicli_api.source.hdrezka",
+    "anicli_api.source.sameband",
+    "anicli_api.source.yummy_anime",
+    "anicli_api.source.yummy_anime_org",
+]
+
+_CLIENT_CODE = (
+    "import time;from anicli_api._http import HTTPSession;s=HTTPSession();"
+    "t=time.perf_counter();s.http;s.http_async;print(int((time.perf_counter()-t)*1e6))"
+)
+
+
+def import_time_us(module: str) -> int:
+    """cumulative import time of module in microseconds"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True, text=True, check=True
+    )
+    for line in reversed(proc.stderr.splitlines()):
+        # import time: self [us] | cumulative | imported package
+        _, cumulative, name = line.split("|")
+        if name.strip() == module:
+            return int(cumulative)
+    raise RuntimeError(f"{module} not found in importtime output")
+
+
+def clients_time_us() -> int:
+    proc = subprocess.run([sys.executable, "-c", _CLIENT_CODE], capture_output=True, text=True, check=True)
+    return int(proc.stdout.strip())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=5)
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    args = parser.parse_args()
+
+    print(f"{'module':<36} {'import, ms':>12}")
+    for module in args.modules:
+        best = min(import_time_us(module) for _ in range(args.number))
+        print(f"{module:<36} {best / 1000:12.1f}")
+    best = min(clients_time_us() for _ in range(args.number))
+    print(f"{'first sync + async clients':<36} {best / 1000:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
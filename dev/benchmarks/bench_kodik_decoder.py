@@ -0,0 +1,103 @@
+"""Kodik links decoder micro-benchmark: legacy char loop decoder vs kodik_decoder
+
+Links are generated with fixed seed in Kodik API format: anonymized `//cloud.kodik-storage.com/...` urls,
+base64 encoded without padding and ROT cipher applied.
+
+- legacy: old `Kodik._decode` (str += char loop, double base64 decode)
+- decode_url cold: memoization cache cleared before every run
+- decode_url warm: all links memoized
+- decode_links: decode `links` responses (360, 480, 720 qualities), memoization cache cleared before every run
+
+Usage:
+
+    PYTHONPATH=. python dev/benchmarks/bench_kodik_decoder.py [-c 3000] [-n 5]
+"""
+
+import argparse
+import random
+import string
+import timeit
+from base64 import b64decode, b64encode
+
+from anicli_api.player.kodik_decoder import ROT_SHIFT, _rot_table, decode_links, decode_url
+
+
+def legacy_decode(url_encoded: str) -> str:
+    if url_encoded.endswith(".m3u8"):
+        return url_encoded if url_encoded.startswith("https") else f"https:{url_encoded}"
+    base64_url = ""
+    for char in url_encoded:
+        if char.isupper():
+            base64_url += chr((ord(char) - 65 + 18) % 26 + 65)
+        elif char.islower():
+            base64_url += chr((ord(char) - 97 + 18) % 26 + 97)
+        else:
+            base64_url += char
+    if not base64_url.endswith("=="):
+        base64_url += "=="
+    decoded_url = b64decode(base64_url).decode()
+    return decoded_url if decoded_url.startswith("https") else f"https:{b64decode(base64_url).decode()}"
+
+
+_ENCODE_TABLE = _rot_table(26 - ROT_SHIFT)
+
+
+def encode_url(url: str) -> str:
+    """inverse of decode_url"""
+    return b64encode(url.encode()).decode().rstrip("=").translate(_ENCODE_TABLE)
+
+
+def make_links(count: int, seed: int = 0) -> list[dict]:
+    """`count` links responses with 360, 480, 720 qualities"""
+    rnd = random.Random(seed)
+    responses = []
+    for _ in range(count):
+        key = "".join(rnd.choices(string.hexdigits.lower(), k=32))
+        stamp = rnd.randint(1_700_000_000, 1_800_000_000)
+        base = f"//cloud.kodik-storage.com/useruploads/{key}/{key[::-1]}:{stamp}"
+        responses.append(
+            {
+                str(q): [
+                    {"src": encode_url(f"{base}/{min(q, 480)}.mp4:hls:manifest.m3u8"), "type": "application/x-mpegURL"}
+                ]
+                for q in (360, 480, 720)
+            }
+        )
+    return responses
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-c", "--count", type=int, default=3000, help="encoded links count")
+    parser.add_argument("-n", "--number", type=int, default=5)
+    args = parser.parse_args()
+
+    responses = make_links(args.count // 3)
+    encoded = [item["src"] for links in responses for items in links.values() for item in items]
+    assert [legacy_decode(e) for e in encoded] == [decode_url(e) for e in encoded]
+
+    def cold():
+        decode_url.cache_clear()
+        for e in encoded:
+            decode_url(e)
+
+    def links_cold():
+        decode_url.cache_clear()
+        for links in responses:
+            decode_links(links)
+
+    cases = {
+        "legacy": lambda: [legacy_decode(e) for e in encoded],
+        "decode_url cold": cold,
+        "decode_url warm": lambda: [decode_url(e) for e in encoded],
+        "decode_links": links_cold,
+    }
+    print(f"{len(encoded)} links, best of {args.number} runs")
+    print(f"{'case':<18} {'total, ms':>10} {'per link, us':>13}")
+    for name, func in cases.items():
+        best = min(timeit.repeat(func, number=1, repeat=args.number))
+        print(f"{name:<18} {best * 1000:10.2f} {best / len(encoded) * 1e6:13.2f}")
+
+
+if __name__ == "__main__":
+    main()
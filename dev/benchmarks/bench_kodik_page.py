@@ -0,0 +1,40 @@
+"""Kodik player page parse micro-benchmark: generated PageMainKodikMin vs parse_page_min fast path
+
+Usage:
+
+    PYTHONPATH=. python dev/benchmarks/bench_kodik_page.py [-n 2000]
+"""
+
+import argparse
+import timeit
+from pathlib import Path
+
+from anicli_api.player.kodik_page import parse_page_min
+from anicli_api.player.parsers.kodik_parser import PageMainKodikMin
+
+FIXTURE = Path(__file__).parent / "fixtures" / "kodik_seria.html"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    text = FIXTURE.read_text(encoding="utf-8")
+    assert parse_page_min(text) == PageMainKodikMin(text).parse()
+
+    cases = {
+        "PageMainKodikMin": lambda: PageMainKodikMin(text).parse(),
+        "parse_page_min": lambda: parse_page_min(text),
+    }
+    print(f"page size: {len(text)} chars, {args.number} runs")
+    results = {}
+    for name, func in cases.items():
+        elapsed = min(timeit.repeat(func, number=args.number, repeat=3))
+        results[name] = elapsed / args.number
+        print(f"{name:<20} {results[name] * 1e6:10.1f} us/page {1 / results[name]:10.0f} pages/sec")
+    print(f"speedup: x{results['PageMainKodikMin'] / results['parse_page_min']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
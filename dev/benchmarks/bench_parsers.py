@@ -0,0 +1,189 @@
+"""Generated (ssc-gen) page parsers offline benchmark
+
+Fixtures: anonymized pages from `dev/benchmarks/fixtures` (see make_parser_fixtures.py).
+For every parser prints:
+
+- ops/sec: `Parser(text).parse()` calls per second (include lxml document build)
+- x lxml: parse time relative to `lxml.html.fromstring(text)` of the same page. Machine independent, used for check
+- peak KiB: tracemalloc peak memory per parse
+- kept KiB: tracemalloc memory retained by parse result
+
+Baseline stored in `dev/benchmarks/baseline_parsers.json`. After parsers regenerate (scripts/generate.sh) run `--check`:
+exit code 1 if `x lxml` or `peak KiB` of any parser increased more than threshold.
+
+Usage:
+
+    PYTHONPATH=. python dev/benchmarks/bench_parsers.py [-n 50] [-k animego] [--save | --check [--threshold 0.3]]
+"""
+
+import argparse
+import importlib
+import json
+import sys
+import timeit
+import tracemalloc
+import warnings
+from pathlib import Path
+
+from lxml import html
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASELINE = Path(__file__).parent / "baseline_parsers.json"
+
+# case name: ("module:Parser", fixture)
+# NOTE: aniboom_paser (dev/player/aniboom_paser.kdl) is not used by Aniboom extractor
+# and not parse escaped data-parameters attribute, aniboom_parser module benchmarked instead
+CASES = {
+    "animego.PageUtils": ("anicli_api.source.parsers.animego_parser:PageUtils", "animego_main.html"),
+    "animego.PageOngoing": ("anicli_api.source.parsers.animego_parser:PageOngoing", "animego_main.html"),
+    "animego.PageSearch": ("anicli_api.source.parsers.animego_parser:PageSearch", "animego_search.html"),
+    "animego.PageAnime": ("anicli_api.source.parsers.animego_parser:PageAnime", "animego_anime.html"),
+    "animego.PageEpisode": ("anicli_api.source.parsers.animego_parser:PageEpisode", "animego_player.html"),
+    "animego.PageEpisodeVideo": (
+        "anicli_api.source.parsers.animego_parser:PageEpisodeVideo",
+        "animego_player_film.html",
+    ),
+    "animego.PageSource": ("anicli_api.source.parsers.animego_parser:PageSource", "animego_videos.html"),
+    "hdrezka.PageUtils": ("anicli_api.source.parsers.hdrezka_parser:PageUtils", "hdrezka_ongoing.html"),
+    "hdrezka.PageOngoing": ("anicli_api.source.parsers.hdrezka_parser:PageOngoing", "hdrezka_ongoing.html"),
+    "hdrezka.PageSearch": ("anicli_api.source.parsers.hdrezka_parser:PageSearch", "hdrezka_search.html"),
+    "hdrezka.PageAnime": ("anicli_api.source.parsers.hdrezka_parser:PageAnime", "hdrezka_anime.html"),
+    "sameband.PageOngoing": ("anicli_api.source.parsers.sameband_parser:PageOngoing", "sameband_ongoing.html"),
+    "sameband.PageSearch": ("anicli_api.source.parsers.sameband_parser:PageSearch", "sameband_search.html"),
+    "sameband.PageAnime": ("anicli_api.source.parsers.sameband_parser:PageAnime", "sameband_anime.html"),
+    "sameband.PagePlaylistURL": (
+        "anicli_api.source.parsers.sameband_parser:PagePlaylistURL",
+        "sameband_playlist.html",
+    ),
+    "yummy_anime_org.PageUtils": (
+        "anicli_api.source.parsers.yummy_anime_org_parser:PageUtils",
+        "yummy_anime_org_main.html",
+    ),
+    "yummy_anime_org.PageOngoing": (
+        "anicli_api.source.parsers.yummy_anime_org_parser:PageOngoing",
+        "yummy_anime_org_main.html",
+    ),
+    "yummy_anime_org.PageSearch": (
+        "anicli_api.source.parsers.yummy_anime_org_parser:PageSearch",
+        "yummy_anime_org_search.html",
+    ),
+    "yummy_anime_org.PageAnime": (
+        "anicli_api.source.parsers.yummy_anime_org_parser:PageAnime",
+        "yummy_anime_org_anime.html",
+    ),
+    "dreamerscast.PageAnime": ("anicli_api.source.parsers.dreamerscast_parser:PageAnime", "dreamerscast_anime.html"),
+    "kodik.PageMainKodikMin": ("anicli_api.player.parsers.kodik_parser:PageMainKodikMin", "kodik_seria.html"),
+    "kodik.PageMainKodikSerial": ("anicli_api.player.parsers.kodik_parser:PageMainKodikSerial", "kodik_seria.html"),
+    "kodik.PageMainKodikVideo": ("anicli_api.player.parsers.kodik_parser:PageMainKodikVideo", "kodik_video.html"),
+    "aniboom.PageAniboom": ("anicli_api.player.parsers.aniboom_parser:PageAniboom", "aniboom_embed.html"),
+    "cdnvideohub.PageAnimegoIframe": (
+        "anicli_api.player.parsers.cdnvideohub_parser:PageAnimegoIframe",
+        "cdnvideohub_animego_iframe.html",
+    ),
+    "cdnvideohub.PageParseCdnVideoData": (
+        "anicli_api.player.parsers.cdnvideohub_parser:PageParseCdnVideoData",
+        "cdnvideohub_animego_iframe.html",
+    ),
+}
+
+
+def load_case(name: str):
+    """returns (parser class, fixture text) of case"""
+    target, fixture = CASES[name]
+    module, cls_name = target.split(":")
+    return getattr(importlib.import_module(module), cls_name), (FIXTURES / fixture).read_text(encoding="utf-8")
+
+
+def measure_memory(func) -> tuple[float, float]:
+    """returns (peak KiB, retained by result KiB) of one func call"""
+    func()  # warmup: lazy imports, compiled css selectors, regex cache
+    tracemalloc.start()
+    try:
+        result = func()  # noqa: F841
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024, 1), round(current / 1024, 1)
+
+
+def bench_case(name: str, number: int, repeat: int = 7) -> dict:
+    cls, text = load_case(name)
+
+    def parse():
+        return cls(text).parse()
+
+    def build():
+        return html.fromstring(text)
+
+    # interleaved runs: CPU frequency changes affect both timings
+    parse_times, build_times = [], []
+    for _ in range(repeat):
+        build_times.append(timeit.timeit(build, number=number))
+        parse_times.append(timeit.timeit(parse, number=number))
+    parse_time, build_time = min(parse_times) / number, min(build_times) / number
+    peak_kib, kept_kib = measure_memory(parse)
+    return {
+        "ops": round(1 / parse_time),
+        "lxml_ratio": round(parse_time / build_time, 3),
+        "peak_kib": peak_kib,
+        "kept_kib": kept_kib,
+    }
+
+
+def check(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """returns regressions messages. Compared `lxml_ratio` and `peak_kib` metrics"""
+    errors = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        for key in ("lxml_ratio", "peak_kib"):
+            old, new = baseline[name][key], result[key]
+            if new > old * (1 + threshold):
+                errors.append(f"{name}: {key} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=50)
+    parser.add_argument("-k", "--filter", default="", help="run only cases contains substring")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--save", action="store_true", help="write results to baseline file")
+    mode.add_argument("--check", action="store_true", help="compare results with baseline file")
+    parser.add_argument("--threshold", type=float, default=0.3, help="allowed regression, 0.3 == 30%%")
+    args = parser.parse_args()
+    # generated code element truth-testing warnings
+    warnings.simplefilter("ignore", FutureWarning)
+
+    results = {}
+    print(f"{'parser':<36} {'ops/sec':>9} {'x lxml':>7} {'peak KiB':>9} {'kept KiB':>9}")
+    for name in CASES:
+        if args.filter not in name:
+            continue
+        results[name] = r = bench_case(name, args.number)
+        print(f"{name:<36} {r['ops']:9d} {r['lxml_ratio']:7.2f} {r['peak_kib']:9.1f} {r['kept_kib']:9.1f}")
+
+    if args.save:
+        baseline = json.loads(BASELINE.read_text(encoding="utf-8")) if BASELINE.exists() else {}
+        baseline.update(results)
+        BASELINE.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"saved: {BASELINE}")
+    elif args.check:
+        baseline = json.loads(BASELINE.read_text(encoding="utf-8"))
+        errors = check(results, baseline, args.threshold)
+        # noisy machine: confirm regressions with the second run, keep best metrics
+        if errors:
+            for name in sorted({error.split(":")[0] for error in errors}):
+                rerun = bench_case(name, args.number)
+                for key in ("lxml_ratio", "peak_kib"):
+                    results[name][key] = min(results[name][key], rerun[key])
+            errors = check(results, baseline, args.threshold)
+        for error in errors:
+            print(f"REGRESSION {error}")
+        if errors:
+            sys.exit(1)
+        print("OK: no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""URL -> video extractor dispatch micro-benchmark
+
+- legacy: `url == extractor()` loop over ALL_DECODERS (instantiate every extractor)
+- linear: `extractor._compare_url(url)` loop, without instances
+- index: `resolve_extractor(url)` compiled dispatch index
+
+Scaling section: N synthetic fixed host extractors, last extractor hit and miss urls
+
+Usage:
+
+    PYTHONPATH=. python dev/benchmarks/bench_resolve_extractor.py [-n 2000]
+"""
+
+import argparse
+import re
+import timeit
+
+from anicli_api.player import ALL_DECODERS, resolve_extractor
+from anicli_api.player.base import BaseVideoExtractor
+from anicli_api.player.dispatch import ExtractorIndex
+
+URLS = [
+    "https://kodik.info/seria/1133512/04d5f7824ba3563bd78e44a22451bb45/720p",
+    "https://aniboom.one/embed/N9QdKm4Mwz1?episode=1&translation=2",
+    "https://video.sibnet.ru/shell.php?videoid=123",
+    "https://sovetromantica.com/embed/episode_1_1-subtitles",
+    "https://animego.me/cdn-iframe/47158/Dream Cast/1/1",
+    # miss: worst case for linear scan
+    "https://example.org/video.mp4",
+]
+
+
+def legacy(url):
+    for extractor in ALL_DECODERS:
+        if url == extractor():
+            return extractor
+    return None
+
+
+def linear(url):
+    for extractor in ALL_DECODERS:
+        if extractor._compare_url(url):
+            return extractor
+    return None
+
+
+def _synthetic_extractors(count: int) -> list:
+    return [
+        type(
+            f"Player{i}",
+            (BaseVideoExtractor,),
+            {
+                "URL_RULE": re.compile(rf"https?://(www\.)?player{i}\.example/embed/\d+"),
+                "URL_HOSTS": (f"player{i}.example",),
+                "parse": lambda self, url, **kwargs: [],
+                "a_parse": lambda self, url, **kwargs: [],
+            },
+        )
+        for i in range(count)
+    ]
+
+
+def scaling(number: int):
+    print(f"\n{'extractors':<12} {'url':<36} {'linear, us':>11} {'index, us':>10}")
+    for count in (8, 32, 128):
+        extractors = _synthetic_extractors(count)
+        index = ExtractorIndex(extractors)
+        for url in (f"https://player{count - 1}.example/embed/1", "https://example.org/embed/1"):
+            row = []
+            for func in (
+                lambda: next((e for e in extractors if e._compare_url(url)), None),
+                lambda: index.resolve(url),
+            ):
+                row.append(min(timeit.repeat(func, number=number, repeat=3)) / number * 1e6)
+            print(f"{count:<12} {url:<36} {row[0]:11.2f} {row[1]:10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-n", "--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    for url in URLS:
+        assert legacy(url) is linear(url) is resolve_extractor(url)
+
+    print(f"{'url':<72} {'legacy, us':>11} {'linear, us':>11} {'index, us':>10}")
+    for url in URLS:
+        row = []
+        for func in (legacy, linear, resolve_extractor):
+            number = max(args.number // 20, 1) if func is legacy else args.number
+            elapsed = min(timeit.repeat(lambda: func(url), number=number, repeat=3))
+            row.append(elapsed / number * 1e6)
+        print(f"{url[:72]:<72} {row[0]:11.2f} {row[1]:11.2f} {row[2]:10.2f}")
+    scaling(args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,404 @@
+"""Generate anonymized page fixtures for generated (ssc-gen) parsers benchmark
+
+Pages repeat layout (selectors, nesting, attributes, inline scripts) of real source/player pages. Titles, ids,
+hashes, signs and urls are fake, page "chrome" (styles, navigation, footer) is synthetic and
+keeps documents size close to real pages.
+
+Fixtures are checked in `dev/benchmarks/fixtures`, regenerate only if parser selectors changed:
+
+    PYTHONPATH=. python dev/benchmarks/make_parser_fixtures.py
+"""
+
+import html
+import json
+from pathlib import Path
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+# playerjs encoded string and script from dreamerscast fixture (anonymized)
+_DREAMCAST_PLAYERJS = json.loads((FIXTURES / "dreamcast_playerjs.json").read_text(encoding="utf-8"))
+
+
+def chrome(title: str, body: str, *, head: str = "", styles: int = 150, links: int = 60) -> str:
+    """wrap body to page with synthetic styles, navigation and footer"""
+    css = "\n".join(f"    .b-{i} {{ margin: {i % 7}px; padding: {i % 5}px; color: #{i:06x}; }}" for i in range(styles))
+    nav = "\n".join(f'      <li class="nav-item"><a href="/catalog/genre-{i}">Genre {i}</a></li>' for i in range(links))
+    footer = "\n".join(f'      <a class="footer-link" href="/page/{i}">Page {i}</a>' for i in range(links))
+    return f"""<!DOCTYPE html>
+<html lang="ru">
+<head>
+  <meta charset="utf-8">
+  <title>{title}</title>
+  <meta name="viewport" content="width=device-width, initial-scale=1">
+  <style>
+{css}
+  </style>
+{head}
+</head>
+<body>
+  <header>
+    <ul class="nav">
+{nav}
+    </ul>
+  </header>
+  <main>
+{body}
+  </main>
+  <footer>
+{footer}
+  </footer>
+  <script>window.dataLayer = window.dataLayer || []; function gtag() {{ dataLayer.push(arguments); }}</script>
+</body>
+</html>
+"""
+
+
+# region animego
+def animego_main() -> str:
+    items = "\n".join(
+        f"""      <a class="aw-item" href="/anime/title-{i}-{1000 + i}">
+        <div class="image"><img class="image__img" src="/upload/anime/images/{i:04d}.jpg" alt="Title {i}"></div>
+        <div class="aw-meta"><span> {i % 24 + 1} серия</span> Dub{i % 5} — 10:{i % 60:02d}</div>
+      </a>"""
+        for i in range(40)
+    )
+    body = f"""    <div class="updates-body">
+      <div class="d-grid">
+{items}
+      </div>
+    </div>"""
+    return chrome("animego", body, head='  <link rel="canonical" href="https://animego.me/">')
+
+
+def animego_search() -> str:
+    items = "\n".join(
+        f"""      <div class="ani-grid__item">
+        <a class="ani-grid__item-picture" href="/anime/title-{i}-{1000 + i}">
+          <img class="image__img" src="/upload/anime/images/{i:04d}.jpg" alt="Title {i}">
+        </a>
+        <div class="ani-grid__item-title"><a href="/anime/title-{i}-{1000 + i}">Title {i}</a></div>
+      </div>"""
+        for i in range(30)
+    )
+    body = f"""    <div class="grid ani-list">
+{items}
+    </div>"""
+    return chrome("animego search", body, head='  <link rel="canonical" href="https://animego.me/search/anime">')
+
+
+def animego_anime() -> str:
+    ld_json = json.dumps(
+        {"@context": "https://schema.org", "@type": "TVSeries", "name": "Title", "datePublished": "1998-07-06"}
+    )
+    description = "\n".join(f"        <p>Description paragraph {i}.</p>" for i in range(10))
+    body = f"""    <div class="entity__title"><h1>Title</h1></div>
+    <div class="d-sm-flex">
+      <div class="image__picture"><img class="image__img" src="/upload/anime/images/0001.jpg" alt="Title"></div>
+    </div>
+    <div class="description">
+{description}
+    </div>"""
+    head = (
+        '  <link rel="canonical" href="https://animego.me/anime/title-1114">\n'
+        f'  <script type="application/ld+json">{ld_json}</script>'
+    )
+    return chrome("animego anime", body, head=head)
+
+
+def _animego_dubbers(count: int) -> str:
+    return "\n".join(
+        f'      <button data-translation="{i}" class="player-dubbing"><span> Dub {i} </span></button>'
+        for i in range(count)
+    )
+
+
+def animego_player() -> str:
+    episodes = "\n".join(
+        f"""      <div class="scroll-snap-slide player-video-bar__item" data-episode-number="{i}" data-episode-type="1"
+        data-episode-title="Episode {i}" data-episode-released="{i} октября 2020" data-episode="{20000 + i}"></div>"""
+        for i in range(1, 25)
+    )
+    options = "\n".join(f'        <option value="{i}">{i} серия</option>' for i in range(1, 25))
+    body = f"""    <select name="series">
+{options}
+    </select>
+    <div class="scroll-snap-slider">
+{episodes}
+    </div>
+    <div class="dubbings">
+{_animego_dubbers(15)}
+    </div>"""
+    return chrome("animego player", body, styles=40, links=20)
+
+
+def _animego_players(count: int) -> str:
+    return "\n".join(
+        f"""      <button data-player="//kodik.info/seria/{100000 + i}/{i:032x}/720p" data-provider="{i % 3}"
+        data-ptranslation=" {i} " data-translation-title="Dub {i}"><span>Player {i % 3}</span></button>"""
+        for i in range(count)
+    )
+
+
+def animego_player_film() -> str:
+    body = f"""    <div class="dubbings">
+{_animego_dubbers(10)}
+    </div>
+    <div class="players">
+{_animego_players(20)}
+    </div>"""
+    return chrome("animego player", body, styles=40, links=20)
+
+
+def animego_videos() -> str:
+    body = f"""    <div class="dubbings">
+{_animego_dubbers(15)}
+    </div>
+    <div class="players">
+{_animego_players(30)}
+    </div>"""
+    return chrome("animego videos", body, styles=40, links=20)
+
+
+# endregion
+
+
+# region hdrezka
+def _hdrezka_items(count: int) -> str:
+    return "\n".join(
+        f"""      <div class="b-content__inline_item" data-id="{i}" data-url="https://hdrezka-home.tv/animation/adventures/{i}-title-{i}.html">
+        <div class="b-content__inline_item-cover">
+          <a href="https://hdrezka-home.tv/animation/adventures/{i}-title-{i}.html"><img src="https://static.example.org/i/{i}.jpg" height="250" width="166" alt="Title {i}"></a>
+          <span class="info">{i % 3 + 1} сезон</span>
+        </div>
+        <div class="b-content__inline_item-link"><a href="https://hdrezka-home.tv/animation/adventures/{i}-title-{i}.html"> Title {i} </a><div>2024, Japan</div></div>
+      </div>"""
+        for i in range(36)
+    )
+
+
+def hdrezka_ongoing() -> str:
+    head = '  <meta property="og:url" content="https://hdrezka-home.tv/?filter=last&genre=82">'
+    return chrome("hdrezka", f'    <div class="b-content__inline_items">\n{_hdrezka_items(36)}\n    </div>', head=head)
+
+
+def hdrezka_search() -> str:
+    return chrome("hdrezka search", f'    <div class="b-content__inline_items">\n{_hdrezka_items(36)}\n    </div>')
+
+
+def hdrezka_anime() -> str:
+    translators = "\n".join(
+        f'      <li class="b-translator__item" title="Dub {i}" data-translator_id="{i}">Dub {i}</li>' for i in range(12)
+    )
+    seasons = "\n".join(
+        f'      <li class="b-simple_season__item" data-tab_id="{i}"> Сезон {i} </li>' for i in range(1, 4)
+    )
+    episodes = "\n".join(
+        f'        <li class="b-simple_episode__item" data-id="88328" data-season_id="{s}" data-episode_id="{e}"> Серия {e} </li>'
+        for s in range(1, 4)
+        for e in range(1, 13)
+    )
+    body = f"""    <div class="b-post__title"><h1>Title</h1></div>
+    <div class="b-sidecover"><img data-caption-title="Title" src="https://static.example.org/i/88328.jpg"></div>
+    <div class="b-post__description_text">Description text.</div>
+    <input type="hidden" id="ctrl_favs" value="aaaaaaaa-bbbb-cccc-dddd-0123456789ab">
+    <ul id="translators-list">
+{translators}
+    </ul>
+    <ul id="simple-seasons-tabs">
+{seasons}
+    </ul>
+    <div class="b-simple_episodes__list">
+      <ul>
+{episodes}
+      </ul>
+    </div>
+    <script>$(function () {{ sof.tv.initCDNSeriesEvents(88328, 56, 1, 1, false, 'hdrezka-home.tv', false, {{}}); }});</script>"""
+    return chrome("hdrezka anime", body)
+
+
+# endregion
+
+
+# region sameband
+def _sameband_items(count: int) -> str:
+    return "\n".join(
+        f"""      <div class="col-auto">
+        <a class="image" href="https://sameband.studio/anime/{i}-title-{i}.html">
+          <div class="poster" title="Title {i}"><img class="swiper-lazy" src="/uploads/posts/{i:04d}.webp"></div>
+        </a>
+      </div>"""
+        for i in range(count)
+    )
+
+
+def sameband_ongoing() -> str:
+    return chrome("sameband", f'    <div class="row">\n{_sameband_items(30)}\n    </div>')
+
+
+def sameband_search() -> str:
+    return chrome("sameband search", f'    <div class="row">\n{_sameband_items(20)}\n    </div>')
+
+
+def sameband_anime() -> str:
+    description = "\n".join(f"      <span>Description sentence {i}.</span>" for i in range(8))
+    body = f"""    <h1 class="m-0">Title</h1>
+    <div class="help">Alt title</div>
+    <div class="image"><img src="/uploads/posts/0001.webp"></div>
+    <div class="limiter">
+{description}
+    </div>
+    <div class="player"><div class="player-content"><iframe src="/pl/a/Title_Season.html"></iframe></div></div>"""
+    return chrome("sameband anime", body)
+
+
+def sameband_playlist() -> str:
+    body = '    <div id="player"></div>\n    <script>var player = new Playerjs({id:"player",file:"/v/list/Title_Season.txt"});</script>'
+    return chrome("sameband player", body, styles=20, links=0)
+
+
+# endregion
+
+
+# region yummy_anime_org
+def yummy_anime_org_main() -> str:
+    items = "\n".join(
+        f"""      <a class="grid-item" href="https://yummyanime.in/{i}-title-{i}.html">
+        <div class="poster"><img data-src="/uploads/posts/{i:04d}.webp" src="/templates/lazy.svg"><div class="poster__label">{i % 24 + 1} серия</div></div>
+        <h3> Title {i} </h3>
+      </a>"""
+        for i in range(40)
+    )
+    head = '  <link rel="canonical" href="https://yummyanime.in/">'
+    return chrome("yummyanime", f'    <div class="grid">\n{items}\n    </div>', head=head)
+
+
+def yummy_anime_org_search() -> str:
+    items = "\n".join(
+        f"""      <a class="has-overlay" href="https://yummyanime.in/{i}-title-{i}.html">
+        <img class="xfieldimage" data-src="/uploads/posts/{i:04d}.webp">
+        <div class="poster__title">Title {i}</div>
+      </a>"""
+        for i in range(30)
+    )
+    return chrome("yummyanime search", f'    <div class="grid">\n{items}\n    </div>')
+
+
+def yummy_anime_org_anime() -> str:
+    body = """    <div class="anime__title"><h1>Title</h1><div class="pmovie__original-title">Original title</div></div>
+    <div class="pmovie__poster"><img class="xfieldimage" data-src="/uploads/posts/0001.webp"></div>
+    <div class="page__text">Description text.</div>
+    <div class="player-cvh"><video-player id="cvh" data-title-id="1001" data-publisher-id="2002" ident="ident-1" data-aggregator="mali"></video-player></div>"""
+    return chrome("yummyanime anime", body)
+
+
+# endregion
+
+
+def dreamerscast_anime() -> str:
+    body = f"""    <h3>Title</h3>
+    <div class="postDesc">Description text.</div>
+    <div class="details_poster"><img src="//dreamerscast.com/images/0001.jpg"></div>
+    <div id="player"></div>
+    <script type="text/javascript" src="/js/playerjs.js?v=0001"></script>
+    <script>$(function() {{ new Playerjs("{_DREAMCAST_PLAYERJS["player_js_encoded"]}") }});</script>"""
+    return chrome("dreamerscast", body)
+
+
+def kodik_video() -> str:
+    page = (FIXTURES / "kodik_seria.html").read_text(encoding="utf-8")
+    start, end = (
+        page.index('    <div class="serial-panel">'),
+        page.index('  <script type="text/javascript">\n    var domain'),
+    )
+    translations = "\n".join(
+        f'          <option value="{i}" data-id="{i}" data-translation-type="voice" data-media-id="{6000 + i}" '
+        f'data-media-hash="{i:032x}" data-media-type="video" data-title="Translation {i}">Translation {i}</option>'
+        for i in range(1, 20)
+    )
+    panel = f"""    <div class="movie-panel">
+      <div class="movie-translations-box">
+        <select>
+{translations}
+        </select>
+      </div>
+    </div>
+  </div>
+  <script type="text/javascript">
+    $.ajax({{type: "POST", url: atob("L2Z0b3I="), cache: false, dataType: "json"}});
+  </script>
+"""
+    return page[:start] + panel + page[end:].replace("vInfo.type = 'seria'", "vInfo.type = 'video'")
+
+
+def aniboom_embed() -> str:
+    parameters = {
+        "id": "AbCdEf12345",
+        "error": "",
+        "domain": "animego.me",
+        "cdn": "/video/cdn",
+        "counter": "",
+        "duration": "1440",
+        "poster": "https://aniboom.one/uploads/poster.jpg",
+        "thumbnails": "https://aniboom.one/uploads/thumbnails.vtt",
+        "dash": json.dumps(
+            {"src": "https://cdn.example.org/video/abcdef/manifest.mpd", "type": "application/dash+xml"},
+            separators=(",", ":"),
+        ),
+        "hls": json.dumps(
+            {"src": "https://cdn.example.org/video/abcdef/master.m3u8", "type": "application/x-mpegURL"},
+            separators=(",", ":"),
+        ),
+        "quality": True,
+        "qualityVideo": 1080,
+        "vast": False,
+        "country": "RU",
+        "platform": "Desktop",
+        "rating": "16+",
+        "nshowbl": False,
+        "limitRate": False,
+        "aBlocklimitRate": False,
+    }
+    body = f'    <div class="video-container"><div id="video" data-parameters="{html.escape(json.dumps(parameters, separators=(",", ":")))}"></div></div>'
+    return chrome("aniboom", body, styles=60, links=10)
+
+
+def cdnvideohub_animego_iframe() -> str:
+    body = """    <div class="player-cvh">
+      <video-player id="cvh-player" data-title-id="60254" data-publisher-id="1000" ident="animego" data-aggregator="mali"
+        is-show-voice-only="true" is_show_banner="false" episode="1" priority-voice="Dream Cast"></video-player>
+    </div>"""
+    return chrome("cdn-iframe", body, styles=30, links=0)
+
+
+FIXTURE_BUILDERS = {
+    "animego_main.html": animego_main,
+    "animego_search.html": animego_search,
+    "animego_anime.html": animego_anime,
+    "animego_player.html": animego_player,
+    "animego_player_film.html": animego_player_film,
+    "animego_videos.html": animego_videos,
+    "hdrezka_ongoing.html": hdrezka_ongoing,
+    "hdrezka_search.html": hdrezka_search,
+    "hdrezka_anime.html": hdrezka_anime,
+    "sameband_ongoing.html": sameband_ongoing,
+    "sameband_search.html": sameband_search,
+    "sameband_anime.html": sameband_anime,
+    "sameband_playlist.html": sameband_playlist,
+    "yummy_anime_org_main.html": yummy_anime_org_main,
+    "yummy_anime_org_search.html": yummy_anime_org_search,
+    "yummy_anime_org_anime.html": yummy_anime_org_anime,
+    "dreamerscast_anime.html": dreamerscast_anime,
+    "kodik_video.html": kodik_video,
+    "aniboom_embed.html": aniboom_embed,
+    "cdnvideohub_animego_iframe.html": cdnvideohub_animego_iframe,
+}
+
+
+def main():
+    for name, builder in FIXTURE_BUILDERS.items():
+        (FIXTURES / name).write_text(builder(), encoding="utf-8")
+        print(name)
+
+
+if __name__ == "__main__":
+    main()
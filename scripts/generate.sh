@@ -1,3 +1,5 @@
 #!/usr/bin/env sh
 ssc-gen generate -t py-lxml -o "anicli_api/player/parsers" dev/player
 ssc-gen generate -t py-lxml -o "anicli_api/source/parsers" dev/src
+# generated parsers performance regression check (offline fixtures)
+PYTHONPATH=. python dev/benchmarks/bench_parsers.py --check
@@ -0,0 +1,207 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from anicli_api.source.anilibria import Extractor
+from anicli_api.source.anilibria_mirror import CatalogMirror
+from anicli_api.source.apis.aniliberty import ApiError
+
+
+def _release(id_: int, name: str, fresh_at: str, is_ongoing: bool = False, **kwargs):
+    return {
+        "id": id_,
+        "name": {"main": name, "english": f"{name} en", "alternative": None},
+        "alias": f"alias-{id_}",
+        "poster": {"thumbnail": f"/{id_}.jpg"},
+        "description": "",
+        "fresh_at": fresh_at,
+        "is_ongoing": is_ongoing,
+        **kwargs,
+    }
+
+
+class FakeApi:
+    """catalog endpoints server, sorted by fresh_at desc"""
+
+    def __init__(self, releases, page_limit=2):
+        self.releases = releases
+        self.schedule = []
+        self.page_limit = page_limit
+        self.requests = []
+        self.fail = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.url.path, dict(request.url.params)))
+        if self.fail:
+            return httpx.Response(503)
+        path = request.url.path.removeprefix("/api/v1")
+        if path == "/anime/catalog/releases":
+            page = int(request.url.params["page"])
+            items = sorted(self.releases, key=lambda r: r["fresh_at"], reverse=True)
+            total_pages = max(1, -(-len(items) // self.page_limit))
+            data = items[(page - 1) * self.page_limit : page * self.page_limit]
+            return httpx.Response(
+                200,
+                json={"data": data, "meta": {"pagination": {"current_page": page, "total_pages": total_pages}}},
+            )
+        if path == "/anime/schedule/week":
+            return httpx.Response(200, json={"data": [{"release": r} for r in self.schedule]})
+        if path.startswith("/anime/releases/"):
+            return httpx.Response(200, json={"id": 1, "episodes": [{"name": None, "ordinal": 1, "hls_480": "a.m3u8"}]})
+        return httpx.Response(404)
+
+    def count(self, path: str) -> int:
+        return sum(p.endswith(path) for p, _ in self.requests)
+
+
+@pytest.fixture
+def api():
+    return FakeApi(
+        [
+            _release(1, "Serial Experiments Lain", "2024-01-01", genres=[{"id": 1}]),
+            _release(2, "Ещё одна Lain", "2024-02-01"),
+            _release(3, "Frieren", "2024-03-01", is_ongoing=True),
+            _release(4, "Naruto", "2023-01-01"),
+        ]
+    )
+
+
+def _extractor(api: FakeApi, mirror: CatalogMirror) -> Extractor:
+    mirror.page_limit = api.page_limit
+    return Extractor(
+        http_client=httpx.Client(transport=httpx.MockTransport(api)),
+        http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(api)),
+        mirror=mirror,
+    )
+
+
+def test_full_and_incremental_sync(api):
+    mirror = CatalogMirror(page_limit=api.page_limit)
+    ex = _extractor(api, mirror)
+
+    stats = mirror.sync(ex.sync_api)
+    assert stats.full and stats.pages == 2 and len(mirror) == 4
+    assert api.count("/schedule/week") == 0
+
+    # new episode of release 4, new release 5, metadata update of ongoing from schedule
+    api.releases[3] = _release(4, "Naruto", "2024-04-01")
+    api.releases.append(_release(5, "Dandadan", "2024-05-01", is_ongoing=True))
+    api.schedule = [_release(1, "Serial Experiments Lain (upd)", "2024-01-01")]
+    api.requests.clear()
+    stats = mirror.sync(ex.sync_api)
+    # second page contains older than watermark release: stop
+    assert not stats.full and stats.pages == 2
+    assert api.count("/schedule/week") == 1
+    assert len(mirror) == 5
+    assert mirror.get(4)["fresh_at"] == "2024-04-01"
+    # schedule release merged with stored catalog fields
+    assert mirror.get(1)["name"]["main"] == "Serial Experiments Lain (upd)"
+    assert mirror.get(1)["genres"] == [{"id": 1}]
+
+
+def test_full_sync_removes_missing(api):
+    mirror = CatalogMirror(page_limit=api.page_limit)
+    ex = _extractor(api, mirror)
+    mirror.sync(ex.sync_api)
+    mirror.set_episodes(2, [{"ordinal": 1}])
+    assert [r["id"] for r in mirror.search("lain")] == [2, 1]
+
+    del api.releases[1]
+    # incremental sync does not see removed releases
+    mirror.sync(ex.sync_api, full=False)
+    assert mirror.get(2) is not None
+
+    mirror.sync(ex.sync_api, full=True)
+    assert len(mirror) == 3 and mirror.get(2) is None
+    assert [r["id"] for r in mirror.search("lain")] == [1]
+    assert mirror._conn.execute("SELECT COUNT(*) FROM episodes").fetchall()[0][0] == 0
+
+
+def test_search_and_ongoing(api):
+    mirror = CatalogMirror()
+    ex = _extractor(api, mirror)
+
+    # last updated first
+    assert [s.data["id"] for s in ex.search("lain")] == [2, 1]
+    # prefix match first
+    assert [s.data["id"] for s in ex.search("s")] == [1, 3, 2, 4]
+    assert [s.data["id"] for s in ex.search("ещё")] == [2]
+    assert [s.data["id"] for s in ex.search("еще")] == [2]
+    assert [s.data["id"] for s in ex.search("alias-4")] == [4]
+    assert [o.title for o in ex.ongoing()] == ["Frieren"]
+    assert api.count("/catalog/releases") == 2
+
+    # freshness SLA is not expired: no requests
+    api.requests.clear()
+    ex.search("naruto")
+    assert not api.requests
+
+
+def test_freshness_sla(api):
+    mirror = CatalogMirror(max_age=60)
+    ex = _extractor(api, mirror)
+    ex.search("lain")
+    assert mirror.is_fresh()
+
+    mirror._set_meta("last_sync", time.time() - 61)
+    assert not mirror.is_fresh()
+    api.requests.clear()
+    ex.ongoing()
+    # incremental sync
+    assert api.count("/schedule/week") == 1
+    assert mirror.is_fresh()
+
+    # sync failed: serve stale data
+    mirror._set_meta("last_sync", time.time() - 61)
+    api.fail = True
+    assert [s.data["id"] for s in ex.search("frieren")] == [3]
+    assert not mirror.is_fresh()
+
+    # failed sync backoff: no sync attempts until retry interval passes
+    api.requests.clear()
+    assert [o.title for o in ex.ongoing()] == ["Frieren"]
+    assert not api.requests
+    mirror._failed_at -= mirror.retry_interval
+    api.fail = False
+    ex.ongoing()
+    assert api.count("/schedule/week") == 1 and mirror.is_fresh()
+
+    # empty mirror: raise
+    api.fail = True
+    with pytest.raises(ApiError):
+        _extractor(api, CatalogMirror()).search("lain")
+
+
+def test_episodes_cache(api):
+    mirror = CatalogMirror()
+    ex = _extractor(api, mirror)
+    anime = ex.search("naruto")[0].get_anime()
+
+    assert [e.title for e in anime.get_episodes()] == ["Episode"]
+    assert [e.title for e in anime.get_episodes()] == ["Episode"]
+    assert api.count("/anime/releases/4") == 1
+
+    # release updated: stored episodes are outdated
+    api.releases[3] = _release(4, "Naruto", "2024-04-01")
+    mirror.sync(ex.sync_api)
+    anime.get_episodes()
+    assert api.count("/anime/releases/4") == 2
+
+
+async def test_async_sync_once(api, tmp_path):
+    mirror = CatalogMirror(tmp_path / "mirror.sqlite")
+    ex = _extractor(api, mirror)
+
+    results = await asyncio.gather(ex.a_search("lain"), ex.a_ongoing(), ex.a_search("frieren"))
+    assert [len(r) for r in results] == [2, 1, 1]
+    # concurrent requests wait for one sync
+    assert api.count("/catalog/releases") == 2
+    assert [e.ordinal for e in await results[2][0].get_anime().a_get_episodes()] == [1]
+
+    # persistent storage
+    mirror.close()
+    reopened = CatalogMirror(tmp_path / "mirror.sqlite")
+    assert len(reopened) == 4 and reopened.is_fresh()
+    assert reopened.episodes(3) is not None
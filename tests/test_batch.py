@@ -0,0 +1,68 @@
+import asyncio
+import random
+import time
+
+from attrs import define
+
+from anicli_api.base import BaseEpisode, BaseSource
+from anicli_api.player.base import Video
+from anicli_api.tools.batch import a_iter_resolve_episodes, a_resolve_episodes, resolve_episodes
+
+
+@define(kw_only=True)
+class FakeSource(BaseSource):
+    def get_videos(self, **_):
+        time.sleep(random.random() / 100)
+        if "fail" in self.url:
+            raise ValueError("fail")
+        return [Video(type="mp4", quality=720, url=self.url)]
+
+    async def a_get_videos(self, **_):
+        await asyncio.sleep(random.random() / 100)
+        return self.get_videos()
+
+
+@define(kw_only=True)
+class FakeEpisode(BaseEpisode):
+    def get_sources(self):
+        time.sleep(random.random() / 100)
+        return [
+            FakeSource(title="a", url=f"https://a.example.com/{self.ordinal}"),
+            FakeSource(title="b", url=f"https://b.example.com/{self.ordinal}/fail"),
+        ]
+
+    async def a_get_sources(self):
+        await asyncio.sleep(random.random() / 100)
+        return self.get_sources()
+
+
+EPISODES = [FakeEpisode(title="Episode", ordinal=i) for i in range(1, 13)]
+
+
+def _check(results):
+    assert [r.position for r in results] == list(range(len(EPISODES)))
+    for r in results:
+        assert r.error is None
+        ok, failed = r.sources
+        assert ok.videos[0].url == f"https://a.example.com/{r.episode.ordinal}"
+        assert not failed.videos
+        assert isinstance(failed.error, ValueError)
+
+
+def test_resolve_episodes_threads():
+    _check(resolve_episodes(EPISODES, concurrency=4, per_host_limit=2))
+
+
+async def test_resolve_episodes_async():
+    _check(await a_resolve_episodes(EPISODES, concurrency=4, per_host_limit=2))
+
+
+async def test_resolve_episodes_async_ordered_filter():
+    results = [
+        r
+        async for r in a_iter_resolve_episodes(
+            EPISODES, ordered=True, source_filter=lambda s: "fail" not in s.url
+        )
+    ]
+    assert [r.position for r in results] == list(range(len(EPISODES)))
+    assert all(len(r.sources) == 1 for r in results)
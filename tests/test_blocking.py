@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from anicli_api._blocking import BlockingCallError, BlockingDetector
+from anicli_api.player.cdnvideohub import CdnVideoHub
+from anicli_api.player.sibnet import SibNet
+
+URL = "https://animego.me/cdn-iframe/1/Dream Cast/1/2"
+IFRAME = (
+    '<div class="player-cvh"><video-player id="p" data-title-id="10" data-publisher-id="20" '
+    'data-aggregator="mali" episode="2"></video-player></div>'
+)
+
+
+def cdnvideohub_server(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "animego.me":
+        return httpx.Response(200, text=IFRAME)
+    if request.url.path.endswith("/playlist"):
+        items = [{"episode": 2, "season": 1, "voiceStudio": "Dream Cast", "vkId": "vk1"}]
+        return httpx.Response(200, json={"items": items})
+    sources = {
+        "hlsUrl": "https://cdn.org/a.m3u8",
+        "dashUrl": "https://cdn.org/a.mpd",
+        "mpegHighUrl": "https://cdn.org/a",
+    }
+    return httpx.Response(200, json={"sources": sources})
+
+
+async def test_cdnvideohub_a_parse_non_blocking():
+    player = CdnVideoHub(transport=httpx.MockTransport(cdnvideohub_server))
+    async with BlockingDetector(raise_on_sync_http=True) as detector:
+        videos = await player.a_parse(URL)
+    assert [(v.type, v.quality) for v in videos] == [("mp4", 720), ("m3u8", 720), ("mpd", 720)]
+    assert detector.reports == []
+
+
+async def test_sync_http_in_event_loop():
+    player = CdnVideoHub(transport=httpx.MockTransport(cdnvideohub_server))
+    async with BlockingDetector() as detector:
+        player.parse(URL)
+    sync_reports = [r for r in detector.reports if r.kind == "sync_http"]
+    assert len(sync_reports) == 3
+    assert "cdnvideohub.py" in sync_reports[0].location
+    assert sync_reports[0].detail == URL.replace(" ", "%20")
+
+    async with BlockingDetector(raise_on_sync_http=True):
+        with pytest.raises(BlockingCallError):
+            player.parse(URL)
+    # sync clients are not checked outside event loop and after detector stop
+    assert await asyncio.to_thread(player.parse, URL)
+    assert player.parse(URL)
+
+
+async def test_loop_lag(monkeypatch):
+    def slow_extract(self, response, referer):
+        time.sleep(0.2)
+        return []
+
+    monkeypatch.setattr(SibNet, "_extract", slow_extract)
+    player = SibNet(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    async with BlockingDetector(lag_threshold=0.1) as detector:
+        await player.a_parse("https://video.sibnet.ru/shell.php?videoid=1")
+        await asyncio.sleep(0.05)
+    assert len(detector.reports) == 1
+    report = detector.reports[0]
+    assert report.kind == "loop_lag"
+    assert report.duration >= 0.15
+    assert report.method == "anicli_api.player.sibnet.SibNet.a_parse"
@@ -0,0 +1,87 @@
+import gzip
+import time
+
+import httpx
+import pytest
+
+from anicli_api._cassette import Cassette, CassetteMissError, CassetteSyncTransport, install_cassette
+from anicli_api._http import HTTPAsync, HTTPSync
+from anicli_api._rate_limit import HostRateLimiter, RateLimitSyncTransport, install_rate_limiter
+from anicli_api.source.apis.aniliberty import AniLibertySync
+
+
+class Server:
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.url.path == "/gzip":
+            return httpx.Response(200, content=gzip.compress(b"hello"), headers={"content-encoding": "gzip"})
+        return httpx.Response(
+            200,
+            text=f"{request.method} {request.url.path} {len(self.requests)} {request.content.decode()}",
+            headers={"set-cookie": "session=secret"},
+        )
+
+
+def test_record_replay(tmp_path):
+    path = tmp_path / "cassette.json"
+    server = Server()
+    with Cassette(path, mode="record") as cassette:
+        client = HTTPSync(cassette=cassette, transport=httpx.MockTransport(server))
+        assert client.get("https://example.org/page").text == "GET /page 1 "
+        assert client.get("https://example.org/page").text == "GET /page 2 "
+        assert client.post("https://example.org/page", content=b"q=1").text == "POST /page 3 q=1"
+        assert client.get("https://example.org/gzip").text == "hello"
+    assert "secret" not in path.read_text(encoding="utf-8")
+
+    cassette = Cassette(path, mode="replay")
+    client = HTTPSync(cassette=cassette, transport=httpx.MockTransport(server))
+    # repeated requests replayed in recorded order, last one - repeated
+    assert [client.get("https://example.org/page").text for _ in range(3)] == [
+        "GET /page 1 ",
+        "GET /page 2 ",
+        "GET /page 2 ",
+    ]
+    assert client.post("https://example.org/page", content=b"q=1").text == "POST /page 3 q=1"
+    assert client.get("https://example.org/gzip").text == "hello"
+    assert len(server.requests) == 4
+    with pytest.raises(CassetteMissError):
+        client.post("https://example.org/page", content=b"q=2")
+
+
+def test_auto_mode():
+    server = Server()
+    cassette = Cassette(mode="auto")
+    client = HTTPSync(cassette=cassette, transport=httpx.MockTransport(server))
+    client.get("https://example.org/a")
+    client.get("https://example.org/a")
+    client.get("https://example.org/b")
+    assert len(server.requests) == 2
+    assert (cassette.hits, cassette.misses, len(cassette)) == (1, 2, 2)
+
+
+async def test_replay_latency():
+    server = Server()
+    cassette = Cassette(mode="auto", latency=0.05)
+    client = HTTPAsync(cassette=cassette, transport=httpx.MockTransport(server))
+    await client.get("https://example.org/a")
+    start = time.monotonic()
+    assert (await client.get("https://example.org/a")).text == "GET /a 1 "
+    assert time.monotonic() - start >= 0.05
+
+
+def test_install_api_client():
+    server = Server()
+    api = AniLibertySync(client=httpx.Client(transport=httpx.MockTransport(server)))
+    install_rate_limiter(api, HostRateLimiter())
+    cassette = Cassette(mode="auto")
+    install_cassette(api, cassette)
+    # cassette is the innermost transport: rate limiter kept outside
+    assert isinstance(api._client._transport, RateLimitSyncTransport)
+    assert isinstance(api._client._transport.transport, CassetteSyncTransport)
+    for _ in range(2):
+        api._client.get("https://aniliberty.top/api/v1/anime/releases/latest")
+    assert len(server.requests) == 1
+    assert cassette.hits == 1
@@ -0,0 +1,43 @@
+import pytest
+
+from anicli_api.player import (
+    ALL_DECODERS,
+    Aniboom,
+    Askor,
+    CdnVideoHub,
+    CsstOnline,
+    Kodik,
+    SibNet,
+    SovietRomanticaEmbed,
+    SovietRomanticaPlayer,
+    resolve_extractor,
+)
+from anicli_api.player.dispatch import ExtractorIndex
+
+URLS = [
+    ("https://kodik.info/seria/1133512/04d5f7824ba3563bd78e44a22451bb45/720p", Kodik),
+    ("https://aniqit.com/video/72755/dc966c03a7cb719dac577d8004a9b091/720p", Kodik),
+    ("https://aniboom.one/embed/N9QdKm4Mwz1?episode=1&translation=2", Aniboom),
+    ("https://aksor.yani.tv/embed/123", Askor),
+    ("https://video.sibnet.ru/shell.php?videoid=123", SibNet),
+    ("https://csst.online/embed/123", CsstOnline),
+    ("https://scu2.sovetromantica.com/anime/1_x/episodes/subtitles/episode_1/episode_1.m3u8", SovietRomanticaPlayer),
+    ("https://sovetromantica.com/embed/episode_1_1-subtitles", SovietRomanticaEmbed),
+    ("https://animego.me/cdn-iframe/47158/Dream Cast/1/1", CdnVideoHub),
+    ("https://example.org/video.mp4", None),
+]
+
+
+@pytest.mark.parametrize("url,expected", URLS)
+def test_resolve_extractor(url, expected):
+    assert resolve_extractor(url) is expected
+    # same result as legacy linear scan
+    legacy = next((e for e in ALL_DECODERS if e._compare_url(url)), None)
+    assert legacy is expected
+
+
+def test_resolve_custom_extractors():
+    assert resolve_extractor(URLS[0][0], (Aniboom,)) is None
+    index = ExtractorIndex((SibNet, Kodik))
+    assert URLS[4][0] in index
+    assert index.resolve(URLS[1][0]) is Kodik
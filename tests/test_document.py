@@ -0,0 +1,23 @@
+from lxml import html
+
+from anicli_api._document import HTMLDocument
+from anicli_api.source.parsers.yummy_anime_org_parser import PageUtils
+
+PAGE = '  <html><head><link rel="canonical" href="https://yummyanime.in/rss.xml"></head><body></body></html>'
+
+
+def test_document_parse_once():
+    doc = HTMLDocument(PAGE)
+    assert repr(doc) == "<HTMLDocument [raw]>"
+    assert doc.parse(PageUtils) == PageUtils(PAGE).parse() == {"url": "https://yummyanime.in"}
+    tree = doc.tree
+    assert doc.parse(PageUtils)
+    assert doc.tree is tree
+    assert doc.text is PAGE
+
+
+def test_document_from_tree():
+    tree = html.fromstring(PAGE.strip())
+    doc = HTMLDocument(tree)
+    assert doc.tree is tree
+    assert "canonical" in doc.text
@@ -0,0 +1,101 @@
+import json
+from pathlib import Path
+
+import httpx
+import pytest
+
+from anicli_api.player.dreamcast_cache import CryptCodesCache
+from anicli_api.player.dreamcast_chipers import (
+    Salt,
+    _packer_tokens,
+    decode_playlist,
+    extract_playlist,
+    get_crypt_codes,
+    unpack_playerjs,
+)
+from anicli_api.source.dreamcast import Anime
+
+# anonymized packed playerjs with several thousand dictionary words
+FIXTURE = json.loads(
+    (Path(__file__).parent.parent / "dev" / "benchmarks" / "fixtures" / "dreamcast_playerjs.json").read_text(
+        encoding="utf-8"
+    )
+)
+PLAYER_JS_URL = "https://dreamerscast.com/js/playerjs.js"
+
+
+def legacy_token(c: int, a: int) -> str:
+    return ("" if c < a else legacy_token(c // a, a)) + (
+        chr(c % a + 29) if c % a > 35 else "0123456789abcdefghijklmnopqrstuvwxyz"[c % a]
+    )
+
+
+@pytest.mark.parametrize("a", [10, 36, 62])
+def test_packer_tokens(a):
+    assert _packer_tokens(a, 5000) == [legacy_token(c, a) for c in range(5000)]
+
+
+def test_unpack_playerjs():
+    assert unpack_playerjs("0 1.2(a)", 62, 3, ["foo", "", "bar"], None, {}) == "foo 1.bar(a)"
+
+
+def test_salt_utf8():
+    assert Salt(key_str="ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/=").d("0YLQtdGB0YI=") == "тест"
+
+
+def test_extract_playlist():
+    codes = get_crypt_codes(FIXTURE["player_js"])
+    assert decode_playlist(codes, FIXTURE["player_js_encoded"]) == FIXTURE["playlist"]
+    assert extract_playlist(FIXTURE["player_js"], FIXTURE["player_js_encoded"]) == FIXTURE["playlist"]
+
+
+def test_crypt_codes_cache():
+    cache = CryptCodesCache()
+    assert cache.get(PLAYER_JS_URL) is None
+    codes = cache.extract(PLAYER_JS_URL, FIXTURE["player_js"])
+    assert cache.get(PLAYER_JS_URL) == codes
+    # same content by other url - not unpacked again
+    assert cache.extract(f"{PLAYER_JS_URL}?v=2", FIXTURE["player_js"]) == codes
+    assert cache.unpacked == 1
+    cache.invalidate(PLAYER_JS_URL)
+    assert cache.get(PLAYER_JS_URL) is None
+
+
+def _anime(requests: list, cache: CryptCodesCache, **kwargs) -> Anime:
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, text=FIXTURE["player_js"])
+
+    anime = Anime(
+        title="title",
+        thumbnail="",
+        description="",
+        player_js_encoded=FIXTURE["player_js_encoded"],
+        player_js_url=PLAYER_JS_URL,
+        sync_api=None,
+        async_api=None,
+        http=httpx.Client(transport=httpx.MockTransport(handler)),
+        http_async=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        **kwargs,
+    )
+    anime.CRYPT_CODES_CACHE = cache
+    return anime
+
+
+async def test_anime_get_episodes_unpack_once():
+    requests: list = []
+    cache = CryptCodesCache()
+    for _ in range(3):
+        assert len(_anime(requests, cache).get_episodes()) == 12
+        assert len(await _anime(requests, cache).a_get_episodes()) == 12
+    assert len(requests) == 1
+    assert cache.unpacked == 1
+
+
+def test_anime_stale_crypt_codes():
+    requests: list = []
+    cache = CryptCodesCache()
+    cache._codes["stale"] = "#0e30="
+    cache._urls[PLAYER_JS_URL] = ("stale", float("inf"))
+    assert len(_anime(requests, cache).get_episodes()) == 12
+    assert len(requests) == 1
@@ -0,0 +1,76 @@
+import threading
+from pathlib import Path
+
+import httpx
+import pytest
+
+from anicli_api._document import a_parse_html, parse_html
+from anicli_api._executor import PARSE_EXECUTOR, ParseExecutor
+from anicli_api._tracing import InMemoryCollector, add_tracer, remove_tracer, start_span
+from anicli_api.source.animego import Extractor
+from anicli_api.source.parsers.animego_parser import PageSearch, PageUtils
+
+FIXTURES = Path(__file__).parent.parent / "dev" / "benchmarks" / "fixtures"
+SEARCH_PAGE = (FIXTURES / "animego_search.html").read_text(encoding="utf-8")
+
+
+@pytest.fixture
+def parse_executor():
+    yield PARSE_EXECUTOR
+    PARSE_EXECUTOR.configure()
+
+
+def thread_name(_) -> str:
+    return threading.current_thread().name
+
+
+def nested_http_span() -> None:
+    with start_span("http", "animego.me"):
+        pass
+
+
+async def test_threshold():
+    executor = ParseExecutor(threshold=10)
+    assert await executor.run(9, thread_name, None) == threading.current_thread().name
+    assert (await executor.run(10, thread_name, None)).startswith("anicli-parse")
+    assert (executor.inline, executor.offloaded) == (1, 1)
+    executor.shutdown()
+
+    executor = ParseExecutor(threshold=None)
+    assert await executor.run(10**9, thread_name, None) == threading.current_thread().name
+
+
+async def test_thread_pool_keeps_span_nesting(parse_executor):
+    parse_executor.configure(threshold=0)
+    collector = add_tracer(InMemoryCollector())
+    try:
+        with start_span("search", "animego") as span:
+            await parse_executor.run(1, nested_http_span)
+    finally:
+        remove_tracer(collector)
+    http_span = next(s for s in collector.spans if s.stage == "http")
+    assert http_span.parent is span
+
+
+async def test_process_pool(parse_executor):
+    parse_executor.configure(threshold=0, max_workers=1, processes=True)
+    assert await a_parse_html(SEARCH_PAGE, PageUtils, PageSearch) == parse_html(SEARCH_PAGE, PageUtils, PageSearch)
+    assert parse_executor.offloaded == 1
+
+
+async def test_async_search_offload(parse_executor):
+    parse_executor.configure(threshold=len(SEARCH_PAGE))
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, text=SEARCH_PAGE))
+    extractor = Extractor(
+        http_client=httpx.Client(transport=transport), http_async_client=httpx.AsyncClient(transport=transport)
+    )
+    results = await extractor.a_search("lain")
+    assert parse_executor.offloaded == 1
+    assert [(r.title, r.url) for r in results] == [(r.title, r.url) for r in extractor.search("lain")]
+
+
+async def test_parse_html_single_parser():
+    utils, items = parse_html(SEARCH_PAGE, PageUtils, PageSearch)
+    # one parser: result as is
+    assert parse_html(SEARCH_PAGE, PageSearch) == items
+    assert await a_parse_html(SEARCH_PAGE, PageUtils) == utils
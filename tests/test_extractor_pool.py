@@ -0,0 +1,80 @@
+import asyncio
+
+import httpx
+import pytest
+
+from anicli_api.player.pool import ExtractorPool
+from anicli_api.player.sibnet import SibNet
+from anicli_api.player.kodik import Kodik
+
+
+def test_pool_reuse_by_config():
+    pool = ExtractorPool()
+    e1 = pool.get(SibNet)
+    http = e1.http  # clients are lazy
+    assert pool.get(SibNet) is e1
+    assert pool.get(Kodik) is not e1
+    assert pool.get(SibNet, headers={"User-Agent": "007"}) is not e1
+    assert pool.get(SibNet, headers={"User-Agent": "007"}) is pool.get(SibNet, headers={"User-Agent": "007"})
+    assert len(pool) == 3
+
+    pool.close()
+    assert len(pool) == 0
+    assert http.is_closed
+    assert pool.get(SibNet) is not e1
+
+
+async def test_pool_async_bound_to_loop():
+    async with ExtractorPool() as pool:
+        e1 = await pool.a_get(SibNet)
+        a_http = e1.a_http
+        assert (await pool.a_get(SibNet)) is e1
+        assert pool.get(SibNet) is not e1
+    assert a_http.is_closed
+
+
+@pytest.mark.parametrize("kwargs", [{"transport": None}, {"timeout": 5}, {"headers": {"a": "b"}, "http2": False}])
+def test_pool_kwargs_passed(kwargs):
+    with ExtractorPool() as pool:
+        assert pool.get(SibNet, **kwargs) is pool.get(SibNet, **kwargs)
+
+
+def test_pool_httpx_config_by_value():
+    with ExtractorPool() as pool:
+        for _ in range(5):
+            pool.get(SibNet, timeout=httpx.Timeout(5), limits=httpx.Limits(max_connections=10))
+        assert len(pool) == 1
+        assert pool.get(SibNet, timeout=httpx.Timeout(5, read=30)) is not pool.get(SibNet, timeout=httpx.Timeout(5))
+
+
+def test_pool_lru_eviction():
+    with ExtractorPool(maxsize=2) as pool:
+        first = pool.get(SibNet, transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+        http = first.http
+        for _ in range(3):
+            pool.get(SibNet, transport=httpx.MockTransport(lambda r: httpx.Response(200)))
+        assert len(pool) == 2
+        assert http.is_closed
+
+
+def test_pool_close_async_clients():
+    pool = ExtractorPool()
+    loop = asyncio.new_event_loop()
+    try:
+        extractor = loop.run_until_complete(pool.a_get(SibNet))
+        a_http = extractor.a_http
+        pool.close()
+        assert a_http.is_closed and len(pool) == 0
+    finally:
+        loop.close()
+
+    # extractors of closed (still referenced) loops are dropped
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(pool.a_get(SibNet))
+    loop.close()
+
+    async def pooled() -> int:
+        await pool.a_get(SibNet)
+        return len(pool)
+
+    assert asyncio.run(pooled()) == 1
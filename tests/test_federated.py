@@ -0,0 +1,103 @@
+import asyncio
+
+import pytest
+from attrs import define
+
+from anicli_api.base import BaseExtractor, BaseSearch
+from anicli_api.tools.federated import FederatedSearch, merge_results, normalize_title, SourceResults
+
+
+@define(kw_only=True)
+class FakeSearch(BaseSearch):
+    data: dict = {}
+
+    def get_anime(self):
+        raise NotImplementedError
+
+    async def a_get_anime(self):
+        raise NotImplementedError
+
+
+class FakeExtractor(BaseExtractor):
+    def __init__(self, delay: float, titles: list, fail: bool = False):
+        super().__init__()
+        self.delay = delay
+        self.titles = titles
+        self.fail = fail
+        self.cancelled = False
+
+    def search(self, query):
+        raise NotImplementedError
+
+    async def a_search(self, query):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise ValueError("fail")
+        return [FakeSearch(title=t, thumbnail="", url=f"https://example.org/{t}", data=d or {}) for t, d in self.titles]
+
+    def ongoing(self):
+        raise NotImplementedError
+
+    async def a_ongoing(self):
+        raise NotImplementedError
+
+
+def extractors():
+    return {
+        "fast": FakeExtractor(0.01, [("Lain", {"year": 1998}), ("Другое аниме", None)]),
+        "medium": FakeExtractor(0.05, [("lain!", None), ("Lain", {"year": 2020})]),
+        "failed": FakeExtractor(0.0, [], fail=True),
+        "slow": FakeExtractor(10, [("Lain", None)]),
+    }
+
+
+def test_normalize_title():
+    assert normalize_title("Serial Experiments: Lain (1998)") == normalize_title("serial experiments lain")
+    assert normalize_title("Ёжик в тумане") == "ежик в тумане"
+
+
+async def test_iter_search_deadline():
+    search = FederatedSearch(deadline=0.2, extractors=extractors())
+    results = [r async for r in search.a_iter_search("lain")]
+    assert [r.source for r in results] == ["failed", "fast", "medium", "slow"]
+    assert isinstance(results[0].error, ValueError)
+    assert isinstance(results[-1].error, asyncio.TimeoutError)
+    assert results[-1].elapsed < 1
+    assert search.extractors["slow"].cancelled
+
+
+async def test_search_merge():
+    hits = await FederatedSearch(deadline=0.2, extractors=extractors()).a_search("lain")
+    assert [(h.title, h.year, h.sources) for h in hits] == [
+        ("Lain", 1998, ["fast", "medium"]),
+        ("Другое аниме", None, ["fast"]),
+        ("Lain", 2020, ["medium"]),
+    ]
+
+
+async def test_close_early_cancels_searches():
+    search = FederatedSearch(["fast", "slow"], deadline=5, extractors=extractors())
+    results = search.a_iter_search("lain")
+    assert (await results.__anext__()).source == "fast"
+    await results.aclose()
+    assert search.extractors["slow"].cancelled
+
+
+def test_merge_unknown_year_first():
+    results = [
+        SourceResults("a", [FakeSearch(title="Lain", thumbnail="", url="")], 0.0),
+        SourceResults("b", [FakeSearch(title="Lain (1998)", thumbnail="", url="")], 0.0),
+    ]
+    (hit,) = merge_results(results)
+    assert (hit.title, hit.year, hit.sources) == ("Lain", 1998, ["a", "b"])
+
+
+@pytest.mark.parametrize("name", ["animego", "anilibria"])
+def test_default_extractors(name):
+    search = FederatedSearch()
+    assert name in search.sources
+    assert search._extractor(name) is search._extractor(name)
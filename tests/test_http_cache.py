@@ -0,0 +1,100 @@
+import gzip
+
+import httpx
+
+from anicli_api._http import HTTPAsync, HTTPSync
+from anicli_api._http_cache import CacheRule, HTTPCache, SQLiteCacheStorage
+
+
+class Server:
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        if request.url.path == "/gzip":
+            return httpx.Response(200, content=gzip.compress(b"hello"), headers={"content-encoding": "gzip"})
+        return httpx.Response(200, text=f"page {request.url.path}", headers={"etag": '"v1"'})
+
+
+def _cache(**kwargs):
+    return HTTPCache(rules=[CacheRule(r"example\.org/ongoing", 60), CacheRule(r"example\.org/search", 0)], **kwargs)
+
+
+def test_cache_hit_and_bypass():
+    server = Server()
+    cache = _cache(default_ttl=60)
+    client = HTTPSync(cache=cache, transport=httpx.MockTransport(server))
+
+    for _ in range(3):
+        assert client.get("https://example.org/ongoing").text == "page /ongoing"
+    assert len(server.requests) == 1
+    assert cache.hits == 2
+
+    # ttl=0 rule and per-request bypass
+    client.get("https://example.org/search")
+    client.get("https://example.org/search")
+    client.get("https://example.org/ongoing", extensions={"cache_bypass": True})
+    assert len(server.requests) == 4
+
+    cache.bypass = True
+    client.get("https://example.org/ongoing")
+    assert len(server.requests) == 5
+
+    # encoded body decoded by client
+    cache.bypass = False
+    assert client.get("https://example.org/gzip").text == "hello"
+    assert client.get("https://example.org/gzip").text == "hello"
+    assert len(server.requests) == 6
+
+
+def test_cache_rules():
+    server = Server()
+    client = HTTPSync(cache=_cache(), transport=httpx.MockTransport(server))
+    # not matched rule, default_ttl=0
+    client.get("https://example.org/anime")
+    client.get("https://example.org/anime")
+    # POST not cached
+    client.post("https://example.org/ongoing")
+    client.post("https://example.org/ongoing")
+    assert len(server.requests) == 4
+
+
+def test_cache_revalidate_304(tmp_path):
+    server = Server()
+    cache = HTTPCache(SQLiteCacheStorage(tmp_path / "http.sqlite"), default_ttl=60)
+    client = HTTPSync(cache=cache, transport=httpx.MockTransport(server))
+    client.get("https://example.org/anime")
+    # expire entry
+    key = "GET https://example.org/anime"
+    cache.storage.touch(key, 0)
+
+    resp = client.get("https://example.org/anime")
+    assert resp.status_code == 200
+    assert resp.text == "page /anime"
+    assert resp.extensions["from_cache"]
+    assert server.requests[-1].headers["if-none-match"] == '"v1"'
+    assert cache.revalidated == 1
+    # persisted between storage instances
+    assert SQLiteCacheStorage(tmp_path / "http.sqlite").get(key)
+
+
+def test_cache_lru_eviction():
+    storage = SQLiteCacheStorage(max_size=1)
+    server = Server()
+    client = HTTPSync(cache=HTTPCache(storage, default_ttl=60), transport=httpx.MockTransport(server))
+    client.get("https://example.org/1")
+    client.get("https://example.org/2")
+    assert len(storage) <= 1
+
+
+async def test_cache_async():
+    server = Server()
+    cache = _cache()
+    async with HTTPAsync(cache=cache, transport=httpx.MockTransport(server)) as client:
+        for _ in range(3):
+            assert (await client.get("https://example.org/ongoing")).text == "page /ongoing"
+    assert len(server.requests) == 1
+    assert cache.hits == 2
@@ -0,0 +1,111 @@
+import asyncio
+import threading
+import time
+
+from anicli_api.player.kodik_cache import JSONFileCacheBackend, KodikAPIPathCache
+
+
+def test_cache_ttl_and_invalidate():
+    cache = KodikAPIPathCache(ttl=60)
+    assert cache.get("kodik.info") is None
+    assert cache.refresh("kodik.info", lambda: "/ftor") == "/ftor"
+    # cached, fetch not called
+    assert cache.refresh("kodik.info", lambda: "/new") == "/ftor"
+    # known stale value - update
+    assert cache.refresh("kodik.info", lambda: "/new", stale="/ftor") == "/new"
+    assert cache.get("aniqit.com") is None
+
+    cache.ttl = 0
+    assert cache.get("kodik.info") is None
+    cache.ttl = 60
+    cache.invalidate("kodik.info")
+    assert cache.get("kodik.info") is None
+
+
+def test_cache_single_flight_threads():
+    cache = KodikAPIPathCache()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "/ftor"
+
+    threads = [threading.Thread(target=cache.refresh, args=("kodik.info", fetch)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+
+
+async def test_cache_single_flight_async():
+    cache = KodikAPIPathCache()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "/ftor"
+
+    results = await asyncio.gather(*[cache.a_refresh("kodik.info", fetch) for _ in range(8)])
+    assert results == ["/ftor"] * 8
+    assert len(calls) == 1
+
+    # concurrent refresh of the same stale value
+    async def fetch_new():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "/new"
+
+    results = await asyncio.gather(*[cache.a_refresh("kodik.info", fetch_new, stale="/ftor") for _ in range(8)])
+    assert results == ["/new"] * 8
+    assert len(calls) == 2
+
+
+def test_cache_single_flight_same_path():
+    # request failed not because of rotated path: downloaded path equals stale
+    cache = KodikAPIPathCache()
+    cache.set("kodik.info", "/ftor")
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return "/ftor"
+
+    threads = [
+        threading.Thread(target=cache.refresh, args=("kodik.info", fetch), kwargs={"stale": "/ftor"}) for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+
+
+async def test_cache_single_flight_same_path_async():
+    cache = KodikAPIPathCache()
+    cache.set("kodik.info", "/ftor")
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "/ftor"
+
+    results = await asyncio.gather(*[cache.a_refresh("kodik.info", fetch, stale="/ftor") for _ in range(8)])
+    assert results == ["/ftor"] * 8
+    assert len(calls) == 1
+
+
+def test_cache_json_backend(tmp_path):
+    path = tmp_path / "kodik.json"
+    cache = KodikAPIPathCache(backend=JSONFileCacheBackend(path))
+    cache.set("kodik.info", "/ftor")
+
+    cache2 = KodikAPIPathCache(backend=JSONFileCacheBackend(path))
+    assert cache2.get("kodik.info") == "/ftor"
+
+    path.write_text("{broken")
+    assert KodikAPIPathCache(backend=JSONFileCacheBackend(path)).get("kodik.info") is None
@@ -0,0 +1,78 @@
+from base64 import b64encode
+
+import pytest
+
+from anicli_api.player.kodik import Kodik
+from anicli_api.player.kodik_decoder import ROT_SHIFT, _rot_table, decode_links, decode_url, decrypt_url
+
+URL = "//cloud.kodik-storage.com/useruploads/0123456789abcdef/fedcba9876543210:2024010100/{}.mp4:hls:manifest.m3u8"
+
+
+def encode(url: str, strip_padding: bool = True) -> str:
+    value = b64encode(url.encode()).decode()
+    return (value.rstrip("=") if strip_padding else value).translate(_rot_table(26 - ROT_SHIFT))
+
+
+def legacy_decrypt(encoded_str: str) -> str:
+    string = ""
+    for char in encoded_str:
+        if char.isupper():
+            string += chr((ord(char) - 65 + 18) % 26 + 65)
+        elif char.islower():
+            string += chr((ord(char) - 97 + 18) % 26 + 97)
+        else:
+            string += char
+    return string
+
+
+def test_decrypt_equal_legacy():
+    value = "".join(map(chr, range(32, 127)))
+    assert decrypt_url(value) == legacy_decrypt(value)
+
+
+@pytest.mark.parametrize("strip_padding", [True, False])
+@pytest.mark.parametrize("quality", [360, 480, 720])
+def test_decode_url(quality, strip_padding):
+    url = URL.format(quality)
+    assert decode_url(encode(url, strip_padding)) == f"https:{url}"
+    assert decode_url(encode(f"https:{url}", strip_padding)) == f"https:{url}"
+
+
+def test_decode_plain_m3u8():
+    assert decode_url(URL.format(360)) == f"https:{URL.format(360)}"
+    assert decode_url(f"https:{URL.format(360)}") == f"https:{URL.format(360)}"
+
+
+def test_decode_links_all_items():
+    links = {
+        "720": [{"src": encode(URL.format(480))}],
+        "360": [{"src": encode(URL.format(360))}, {"src": URL.format("360_alt")}],
+        "480": [{"src": encode(URL.format(480))}],
+        "1080": [],
+    }
+    assert decode_links(links) == {
+        360: [f"https:{URL.format(360)}", f"https:{URL.format('360_alt')}"],
+        480: [f"https:{URL.format(480)}"],
+        720: [f"https:{URL.format(480)}"],
+    }
+
+
+@pytest.mark.parametrize("qualities", [(360,), (360, 480), (360, 480, 720)])
+def test_kodik_extract(qualities):
+    links = {str(q): [{"src": encode(URL.format(min(q, 480)))}] for q in qualities}
+    videos = Kodik()._extract(links)
+    assert [v.quality for v in videos] == list(qualities)
+    assert [v.url for v in videos] == [f"https:{URL.format(q)}" for q in qualities]
+
+
+def test_kodik_extract_alternative_links():
+    links = {
+        "360": [{"src": encode(URL.format(360))}, {"src": URL.format("360_alt")}, {"src": encode(URL.format(360))}],
+        "480": [{"src": encode(URL.format(480))}],
+    }
+    videos = Kodik()._extract(links)
+    assert [(v.quality, v.url) for v in videos] == [
+        (360, f"https:{URL.format(360)}"),
+        (360, f"https:{URL.format('360_alt')}"),
+        (480, f"https:{URL.format(480)}"),
+    ]
@@ -0,0 +1,34 @@
+from pathlib import Path
+
+from anicli_api.player.kodik_page import parse_page_min
+from anicli_api.player.parsers.kodik_parser import PageMainKodikMin
+
+PAGE = (Path(__file__).parent.parent / "dev" / "benchmarks" / "fixtures" / "kodik_seria.html").read_text(
+    encoding="utf-8"
+)
+
+
+def test_fast_path_equals_generated_parser():
+    page = parse_page_min(PAGE)
+    assert page == PageMainKodikMin(PAGE).parse()
+    assert page["api_payload"]["d"] == "example.org"
+    assert page["api_payload"]["type"] == "seria"
+    assert page["player_js_path"].startswith("/assets/js/")
+
+
+def test_fast_path_fallback(monkeypatch):
+    calls = []
+
+    class FakePage:
+        def __init__(self, document):
+            calls.append(document)
+
+        def parse(self):
+            return {}
+
+    monkeypatch.setattr("anicli_api.player.kodik_page.PageMainKodikMin", FakePage)
+    # variable not matched by fast scan - delegate to generated parser
+    page = PAGE.replace("vInfo.hash = ", "vInfo.hash=")
+    assert parse_page_min(page) == {}
+    assert calls == [page]
+    assert parse_page_min(PAGE) and len(calls) == 1
@@ -0,0 +1,191 @@
+import httpx
+import pytest
+
+from anicli_api.player.base import Video
+from anicli_api.player.cdnvideohub import CdnVideoHub
+from anicli_api.player.manifest import (
+    MANIFEST_CACHE,
+    ManifestCache,
+    a_expand_videos,
+    expand_videos,
+    parse_dash,
+    parse_hls,
+)
+from anicli_api.tools.helpers import get_video_by_quality
+
+MASTER = """#EXTM3U
+#EXT-X-VERSION:3
+#EXT-X-STREAM-INF:BANDWIDTH=800000,RESOLUTION=640x360,CODECS="avc1.4d401e,mp4a.40.2"
+360/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=1400000,RESOLUTION=854x480,CODECS="avc1.4d401f,mp4a.40.2"
+480/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2800000,RESOLUTION=1280x720,CODECS="avc1.4d401f,mp4a.40.2"
+https://cdn.example/720/index.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2000000,RESOLUTION=1280x720,CODECS="hvc1.1.6.L93.B0,mp4a.40.2"
+720-hevc/index.m3u8
+"""
+
+MASTER_AUDIO = """#EXTM3U
+#EXT-X-MEDIA:TYPE=AUDIO,GROUP-ID="aac",NAME="ru",URI="audio/ru.m3u8"
+#EXT-X-STREAM-INF:BANDWIDTH=5000000,RESOLUTION=1920x800,AUDIO="aac"
+1080/video.m3u8
+#EXT-X-STREAM-INF:BANDWIDTH=2500000,RESOLUTION=1280x720,AUDIO="aac"
+720/video.m3u8
+"""
+
+MEDIA = """#EXTM3U
+#EXT-X-TARGETDURATION:10
+#EXTINF:10.0,
+segment0.ts
+#EXT-X-ENDLIST
+"""
+
+MPD = """<?xml version="1.0"?>
+<MPD xmlns="urn:mpeg:dash:schema:mpd:2011">
+  <Period>
+    <AdaptationSet mimeType="video/mp4" codecs="avc1.64001f">
+      <Representation id="1" bandwidth="1000000" width="854" height="480"/>
+      <Representation id="2" bandwidth="3000000" width="1920" height="1080"/>
+    </AdaptationSet>
+    <AdaptationSet mimeType="audio/mp4">
+      <Representation id="3" bandwidth="128000"/>
+    </AdaptationSet>
+  </Period>
+</MPD>
+"""
+
+
+def test_parse_hls():
+    variants = parse_hls(MASTER, "https://example.org/hls/master.m3u8")
+    assert [(v.quality, v.url) for v in variants] == [
+        (360, "https://example.org/hls/360/index.m3u8"),
+        (480, "https://example.org/hls/480/index.m3u8"),
+        (720, "https://cdn.example/720/index.m3u8"),
+        (720, "https://example.org/hls/720-hevc/index.m3u8"),
+    ]
+    assert variants[0].resolution == (640, 360)
+    assert variants[0].bandwidth == 800000 and variants[0].codecs == "avc1.4d401e,mp4a.40.2"
+
+    # separate audio rendition: variant playlist is silent
+    variants = parse_hls(MASTER_AUDIO, "https://example.org/audio.m3u8")
+    assert [(v.quality, v.url) for v in variants] == [
+        (1080, "https://example.org/audio.m3u8"),
+        (720, "https://example.org/audio.m3u8"),
+    ]
+
+    assert parse_hls(MEDIA, "https://example.org/index.m3u8") == []
+
+
+def test_parse_dash():
+    variants = parse_dash(MPD, "https://example.org/manifest.mpd")
+    assert [(v.quality, v.url, v.codecs) for v in variants] == [
+        (480, "https://example.org/manifest.mpd", "avc1.64001f"),
+        (1080, "https://example.org/manifest.mpd", "avc1.64001f"),
+    ]
+    assert parse_dash("<MPD", "https://example.org/manifest.mpd") == []
+
+
+class Server:
+    def __init__(self):
+        self.requests = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append((request.url.path, request.headers.get("referer")))
+        content = {"/master.m3u8": MASTER, "/audio.m3u8": MASTER_AUDIO, "/media.m3u8": MEDIA, "/manifest.mpd": MPD}.get(
+            request.url.path
+        )
+        return httpx.Response(200, text=content) if content else httpx.Response(404)
+
+
+def _videos():
+    headers = {"referer": "https://player.example/"}
+    return [
+        # guessed quality
+        Video(type="m3u8", quality=1080, url="https://example.org/master.m3u8", headers=headers),
+        Video(type="mpd", quality=720, url="https://example.org/manifest.mpd", headers=headers),
+        Video(type="m3u8", quality=480, url="https://example.org/audio.m3u8"),
+        Video(type="m3u8", quality=480, url="https://example.org/media.m3u8"),
+        Video(type="m3u8", quality=720, url="https://example.org/missing.m3u8"),
+        Video(type="mp4", quality=360, url="https://example.org/360.mp4"),
+    ]
+
+
+def _check(videos):
+    assert [(v.type, v.quality, v.url.rpartition("example")[-1]) for v in videos] == [
+        ("m3u8", 360, ".org/360/index.m3u8"),
+        ("m3u8", 480, ".org/480/index.m3u8"),
+        # highest bandwidth variant of quality
+        ("m3u8", 720, "/720/index.m3u8"),
+        # adaptive streams: one video of max quality
+        ("mpd", 1080, ".org/manifest.mpd"),
+        ("m3u8", 1080, ".org/audio.m3u8"),
+        # media playlist and failed request: kept as is
+        ("m3u8", 480, ".org/media.m3u8"),
+        ("m3u8", 720, ".org/missing.m3u8"),
+        ("mp4", 360, ".org/360.mp4"),
+    ]
+    assert videos[0].headers == {"referer": "https://player.example/"}
+    # guessed 1080 of master playlist is replaced by real qualities
+    assert get_video_by_quality(videos[:3], 1080).quality == 720
+
+
+def test_expand_videos():
+    server = Server()
+    cache = ManifestCache()
+    with httpx.Client(transport=httpx.MockTransport(server)) as client:
+        _check(expand_videos(_videos(), client, cache=cache))
+        assert len(server.requests) == 5
+        assert ("/master.m3u8", "https://player.example/") in server.requests
+
+        # parsed manifests are cached, failed requests are not
+        server.requests.clear()
+        _check(expand_videos(_videos(), client, cache=cache))
+        assert server.requests == [("/missing.m3u8", None)]
+
+
+async def test_a_expand_videos():
+    server = Server()
+    cache = ManifestCache()
+    async with httpx.AsyncClient(transport=httpx.MockTransport(server)) as client:
+        _check(await a_expand_videos(_videos(), client, cache=cache))
+    assert len(server.requests) == 5 and len(cache) == 4
+
+
+@pytest.mark.parametrize("size, quality", [((1920, 800), 1080), ((1280, 718), 720), ((3840, 2160), 2160)])
+def test_quality_by_resolution(size, quality):
+    text = f"#EXTM3U\n#EXT-X-STREAM-INF:BANDWIDTH=1,RESOLUTION={size[0]}x{size[1]}\nv.m3u8\n"
+    assert parse_hls(text, "https://example.org/")[0].quality == quality
+
+
+IFRAME = (
+    '<div class="player-cvh"><video-player id="p" data-title-id="10" data-publisher-id="20" '
+    'data-aggregator="mali" episode="1"></video-player></div>'
+)
+
+
+def cdnvideohub_server(request: httpx.Request) -> httpx.Response:
+    if request.url.host == "animego.me":
+        return httpx.Response(200, text=IFRAME)
+    if request.url.path.endswith("/playlist"):
+        return httpx.Response(200, json={"items": [{"episode": 1, "season": 1, "voiceStudio": "Dub", "vkId": "1"}]})
+    if request.url.host == "cdn.example":
+        return httpx.Response(200, text={"/master.m3u8": MASTER, "/manifest.mpd": MPD}[request.url.path])
+    sources = {
+        "hlsUrl": "https://cdn.example/master.m3u8",
+        "dashUrl": "https://cdn.example/manifest.mpd",
+        "mpegFullHdUrl": "https://cdn.example/1080.mp4",
+    }
+    return httpx.Response(200, json={"sources": sources})
+
+
+async def test_player_expands_manifests(monkeypatch):
+    url = "https://animego.me/cdn-iframe/1/Dub/1/1"
+    MANIFEST_CACHE.clear()
+    player = CdnVideoHub(transport=httpx.MockTransport(cdnvideohub_server))
+    expected = [("mp4", 1080), ("m3u8", 360), ("m3u8", 480), ("m3u8", 720), ("mpd", 1080)]
+    assert [(v.type, v.quality) for v in player.parse(url)] == expected
+    assert [(v.type, v.quality) for v in await player.a_parse(url)] == expected
+
+    # opt-out: guessed qualities
+    monkeypatch.setattr(CdnVideoHub, "EXPAND_MANIFESTS", False)
+    assert [(v.type, v.quality) for v in player.parse(url)] == [("mp4", 1080), ("m3u8", 1080), ("mpd", 1080)]
@@ -0,0 +1,104 @@
+import httpx
+import pytest
+
+from anicli_api._document import HTMLDocument
+from anicli_api._http import (
+    DDOSServerDetectError,
+    HTTPRetryConnectSyncTransport,
+    HTTPSync,
+    RetryPolicies,
+    RetryPolicy,
+)
+from anicli_api._http_cache import HTTPCache
+from anicli_api._metrics import METRICS, MetricsRegistry, MetricsTracer
+from anicli_api._tracing import add_tracer, remove_tracer, start_span
+from anicli_api.source.parsers.sameband_parser import PagePlaylistURL
+
+NO_DELAY = RetryPolicy(attempts=2, base_delay=0, max_delay=0)
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    METRICS.reset()
+    yield
+    METRICS.reset()
+
+
+def _value(name: str, *labels: str):
+    return METRICS.get(name).value(*labels)  # type: ignore[union-attr]
+
+
+def test_exposition():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("host",))
+    counter.inc("a.org")
+    counter.inc('b"org', amount=2.5)
+    histogram = registry.histogram("latency_seconds", "Latency", ("host",), buckets=(0.1, 1))
+    for value in (0.05, 0.5, 5):
+        histogram.observe(value, "a.org")
+    assert registry.counter("requests_total", "Requests", ("host",)) is counter
+    with pytest.raises(ValueError):
+        registry.histogram("requests_total", "Requests")
+    assert registry.expose() == (
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{host="a.org"} 1\n'
+        'requests_total{host="b\\"org"} 2.5\n'
+        "# HELP latency_seconds Latency\n"
+        "# TYPE latency_seconds histogram\n"
+        'latency_seconds_bucket{host="a.org",le="0.1"} 1\n'
+        'latency_seconds_bucket{host="a.org",le="1"} 2\n'
+        'latency_seconds_bucket{host="a.org",le="+Inf"} 3\n'
+        'latency_seconds_sum{host="a.org"} 5.55\n'
+        'latency_seconds_count{host="a.org"} 3\n'
+    )
+
+
+def test_http_metrics(monkeypatch):
+    responses = [httpx.Response(503), httpx.Response(200, text="ok"), httpx.Response(403), httpx.Response(403)]
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request", lambda self, request: responses.pop(0))
+    transport = HTTPRetryConnectSyncTransport(
+        retry_policies=RetryPolicies(status=NO_DELAY, ddos=NO_DELAY), retry_budget=None
+    )
+    client = HTTPSync(transport=transport)
+    client.get("https://example.org/a")
+    with pytest.raises(DDOSServerDetectError):
+        client.get("https://example.org/b")
+
+    assert _value("anicli_http_requests_total", "example.org", "200") == 1
+    assert _value("anicli_http_requests_total", "example.org", "error") == 1
+    assert _value("anicli_http_retries_total", "example.org", "status") == 1
+    assert _value("anicli_http_retries_total", "example.org", "ddos") == 1
+    assert _value("anicli_ddos_detected_total", "example.org") == 1
+    assert _value("anicli_http_response_bytes_total", "example.org") == 2
+    assert _value("anicli_http_request_duration_seconds", "example.org").observations == 2
+    assert 'anicli_http_requests_total{host="example.org",status="200"} 1' in METRICS.expose()
+
+
+def test_cache_metrics():
+    client = HTTPSync(
+        cache=HTTPCache(default_ttl=60), transport=httpx.MockTransport(lambda request: httpx.Response(200))
+    )
+    for _ in range(3):
+        client.get("https://example.org/ongoing")
+    assert _value("anicli_http_cache_requests_total", "example.org", "miss") == 1
+    assert _value("anicli_http_cache_requests_total", "example.org", "hit") == 2
+
+
+def test_parse_cpu_metrics():
+    doc = HTMLDocument('<script>new Playerjs({id:"player",file:"/v/list/a.txt"});</script>')
+    doc.parse(PagePlaylistURL)
+    assert _value("anicli_parse_cpu_seconds", "sameband_parser.PagePlaylistURL").observations == 1
+
+
+def test_metrics_tracer():
+    tracer = add_tracer(MetricsTracer())
+    try:
+        with start_span("search", "animego"):
+            pass
+        with pytest.raises(ValueError), start_span("anime", "animego"):
+            raise ValueError
+    finally:
+        remove_tracer(tracer)
+    assert _value("anicli_stage_duration_seconds", "animego", "search").observations == 1
+    assert _value("anicli_stage_errors_total", "animego", "anime") == 1
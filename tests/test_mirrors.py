@@ -0,0 +1,138 @@
+import asyncio
+
+import httpx
+import pytest
+
+from anicli_api._http import DDOSServerDetectError, HTTPAsync, HTTPSync
+from anicli_api._metrics import METRICS, MIRROR_FAILOVERS, MIRROR_HEDGES
+from anicli_api._mirrors import MirrorAsyncTransport, MirrorPool, MirrorSyncTransport
+
+MIRRORS = {"site": ("a.example", "b.example", "c.example")}
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    yield
+    METRICS.reset()
+
+
+class Server:
+    """host: error or response delay"""
+
+    def __init__(self, hosts: dict):
+        self.hosts = hosts
+        self.requests = []
+
+    def _response(self, request: httpx.Request):
+        host = request.url.host
+        self.requests.append((host, request.headers["host"]))
+        behavior = self.hosts.get(host, 0.0)
+        if behavior == "connect":
+            raise httpx.ConnectError("connection refused", request=request)
+        if behavior == "ddos":
+            raise DDOSServerDetectError(f"'ddos-guard': {request.url} returns code 403")
+        return behavior
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self._response(request)
+        return httpx.Response(200, text=request.url.host)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        delay = self._response(request)
+        await asyncio.sleep(delay)
+        return httpx.Response(200, text=request.url.host)
+
+
+def test_not_mirror_host():
+    server = Server({})
+    pool = MirrorPool(MIRRORS)
+    with httpx.Client(transport=MirrorSyncTransport(pool, httpx.MockTransport(server))) as client:
+        assert client.get("https://other.example/").text == "other.example"
+    assert pool.ranked("other.example") == [] and pool.stats() == {}
+
+
+def test_failover():
+    server = Server({"a.example": "ddos", "b.example": "connect"})
+    pool = MirrorPool(MIRRORS, cooldown=60)
+    with httpx.Client(transport=MirrorSyncTransport(pool, httpx.MockTransport(server))) as client:
+        response = client.get("https://a.example/anime/1")
+        assert response.text == "c.example"
+        # response keeps requested url
+        assert response.url == "https://a.example/anime/1"
+        assert server.requests == [("a.example", "a.example"), ("b.example", "b.example"), ("c.example", "c.example")]
+
+        # down mirrors are skipped
+        server.requests.clear()
+        assert client.get("https://b.example/anime/2").text == "c.example"
+        assert server.requests == [("c.example", "c.example")]
+
+    stats = pool.stats()
+    assert stats["a.example"].ddos == 1 and stats["a.example"].down_for > 59
+    assert stats["b.example"].errors == 1 and stats["c.example"].latency is not None
+    assert pool.ranked("a.example")[0] == "c.example"
+    assert MIRROR_FAILOVERS.value("a.example") == MIRROR_FAILOVERS.value("b.example") == 1
+
+
+def test_all_mirrors_failed():
+    server = Server(dict.fromkeys(MIRRORS["site"], "connect"))
+    pool = MirrorPool(MIRRORS, cooldown=60)
+    with httpx.Client(transport=MirrorSyncTransport(pool, httpx.MockTransport(server))) as client:
+        with pytest.raises(httpx.ConnectError):
+            client.get("https://a.example/")
+        # all mirrors are down: try by recovery time, consecutive failures double cooldown
+        with pytest.raises(httpx.ConnectError):
+            client.get("https://a.example/")
+    assert [h for h, _ in server.requests] == [*MIRRORS["site"], *MIRRORS["site"]]
+    assert pool.stats()["a.example"].down_for > 119
+
+
+def test_ranking_by_health():
+    pool = MirrorPool(MIRRORS)
+    for _ in range(5):
+        pool.record_response("a.example", 200, 0.5)
+        pool.record_response("b.example", 200, 0.1)
+    # unknown mirror latency - 1s
+    assert pool.ranked("c.example") == ["b.example", "a.example", "c.example"]
+    # errors rate penalty
+    for _ in range(3):
+        pool.record_response("b.example", 503, 0.1)
+    assert pool.ranked("a.example")[0] == "a.example"
+    assert pool.hedge_delay("a.example") == 0.5
+    assert pool.hedge_delay("c.example") == pool.hedge_default_delay
+
+
+async def test_async_failover_and_client_kwargs():
+    server = Server({"a.example": "connect"})
+    pool = MirrorPool(MIRRORS)
+    async with HTTPAsync(transport=httpx.MockTransport(server.handle_async), mirrors=pool) as client:
+        assert isinstance(client._transport, MirrorAsyncTransport)
+        assert (await client.get("https://a.example/")).text == "b.example"
+    with HTTPSync(transport=httpx.MockTransport(server), mirrors=pool) as client:
+        assert client.get("https://a.example/").text == "b.example"
+
+
+async def test_hedged_request():
+    server = Server({"a.example": 1.0, "b.example": 0.01})
+    pool = MirrorPool(MIRRORS, hedge=True, hedge_default_delay=0.05)
+    # `a` is the best by health before slowdown
+    pool.record_response("a.example", 200, 0.01)
+    transport = MirrorAsyncTransport(pool, httpx.MockTransport(server.handle_async))
+    async with httpx.AsyncClient(transport=transport) as client:
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        response = await client.get("https://a.example/")
+        assert response.text == "b.example"
+        assert loop.time() - started < 0.5
+    assert [h for h, _ in server.requests] == ["a.example", "b.example"]
+    assert MIRROR_HEDGES.value("a.example") == 1
+    # hedge loser is cancelled: not recorded
+    assert pool.stats()["a.example"].requests == 1
+
+
+async def test_hedged_request_failover():
+    server = Server({"a.example": "ddos", "b.example": "connect", "c.example": 0.0})
+    pool = MirrorPool(MIRRORS, hedge=True)
+    transport = MirrorAsyncTransport(pool, httpx.MockTransport(server.handle_async))
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert (await client.get("https://a.example/")).text == "c.example"
+    assert [h for h, _ in server.requests] == ["a.example", "b.example", "c.example"]
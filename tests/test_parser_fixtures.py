@@ -0,0 +1,33 @@
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+BENCHMARKS = Path(__file__).parent.parent / "dev" / "benchmarks"
+
+_spec = importlib.util.spec_from_file_location("bench_parsers", BENCHMARKS / "bench_parsers.py")
+bench_parsers = importlib.util.module_from_spec(_spec)  # type: ignore[arg-type]
+_spec.loader.exec_module(bench_parsers)  # type: ignore[union-attr]
+
+
+@pytest.mark.filterwarnings("ignore::FutureWarning")
+@pytest.mark.parametrize("name", list(bench_parsers.CASES))
+def test_parser_fixture(name):
+    cls, text = bench_parsers.load_case(name)
+    result = cls(text).parse()
+    assert result
+    if isinstance(result, list):
+        assert all(result)
+
+
+def test_baseline_covers_cases():
+    baseline = json.loads((BENCHMARKS / "baseline_parsers.json").read_text(encoding="utf-8"))
+    assert set(baseline) == set(bench_parsers.CASES)
+
+
+def test_check_regression():
+    baseline = {"a": {"lxml_ratio": 2.0, "peak_kib": 100.0}}
+    assert bench_parsers.check({"a": {"lxml_ratio": 2.5, "peak_kib": 120.0}}, baseline, 0.3) == []
+    errors = bench_parsers.check({"a": {"lxml_ratio": 3.0, "peak_kib": 100.0}, "new": {}}, baseline, 0.3)
+    assert errors == ["a: lxml_ratio 2.0 -> 3.0 (+50%)"]
@@ -0,0 +1,116 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import pytest
+
+from anicli_api._http import HTTPAsync, HTTPSync
+from anicli_api._rate_limit import HostLimit, HostRateLimiter, install_rate_limiter
+from anicli_api.source.apis.aniliberty import AniLibertySync
+
+
+class Server:
+    def __init__(self, delay: float = 0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def exit(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def __call__(self, request):
+        self.enter()
+        time.sleep(self.delay)
+        self.exit()
+        return httpx.Response(200, json={})
+
+    async def a_handle(self, request):
+        self.enter()
+        await asyncio.sleep(self.delay)
+        self.exit()
+        return httpx.Response(200, json={})
+
+
+def test_limit_table():
+    limiter = HostRateLimiter({"kodik.info": HostLimit(rate=1)}, default=None)
+    assert limiter.limit_for("kodik.info").rate == 1
+    assert limiter.limit_for("v2.kodik.info").rate == 1
+    assert limiter.limit_for("example.org") is None
+    assert limiter.acquire("example.org") is None
+
+
+def test_token_bucket_rate():
+    limiter = HostRateLimiter({"example.org": HostLimit(rate=50, burst=2, max_in_flight=0)})
+    client = HTTPSync(rate_limiter=limiter, transport=httpx.MockTransport(Server()))
+    start = time.monotonic()
+    for _ in range(7):
+        client.get("https://example.org")
+    # 2 requests from burst, next 5 with 1/50s interval
+    assert time.monotonic() - start >= 0.09
+    stats = limiter.stats()["example.org"]
+    assert stats.requests == 7
+    assert stats.queued_max > 0
+    assert stats.in_flight == 0
+
+
+def test_max_in_flight_threads():
+    server = Server(delay=0.01)
+    limiter = HostRateLimiter({"example.org": HostLimit(rate=0, max_in_flight=2)})
+    client = HTTPSync(rate_limiter=limiter, transport=httpx.MockTransport(server))
+    threads = [threading.Thread(target=client.get, args=("https://example.org",)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert server.max_in_flight == 2
+
+
+async def test_max_in_flight_async():
+    server = Server(delay=0.01)
+    limiter = HostRateLimiter({"example.org": HostLimit(rate=0, max_in_flight=3)})
+    async with HTTPAsync(rate_limiter=limiter, transport=httpx.MockTransport(server.a_handle)) as client:
+        await asyncio.gather(*[client.get("https://example.org") for _ in range(10)])
+    assert server.max_in_flight == 3
+    assert limiter.stats()["example.org"].requests == 10
+
+
+async def test_cancelled_while_rate_limited():
+    limiter = HostRateLimiter({"example.org": HostLimit(rate=0.5, burst=1, max_in_flight=1)})
+    limiter.a_release(await limiter.a_acquire("example.org"))
+    # bucket is empty: waiter sleeps ~2s holding in-flight slot
+    task = asyncio.create_task(limiter.a_acquire("example.org"))
+    await asyncio.sleep(0.01)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    sem = limiter._state("example.org").async_sems[asyncio.get_running_loop()]
+    assert not sem.locked()
+
+
+def test_interrupted_while_rate_limited(monkeypatch):
+    def interrupt(delay):
+        raise KeyboardInterrupt
+
+    limiter = HostRateLimiter({"example.org": HostLimit(rate=0.5, burst=1, max_in_flight=1)})
+    limiter.release(limiter.acquire("example.org"))
+    monkeypatch.setattr("anicli_api._rate_limit.sleep", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        limiter.acquire("example.org")
+    assert limiter._state("example.org").sync_in_flight == 0
+
+
+def test_install_api_client():
+    server = Server()
+    limiter = HostRateLimiter()
+    api = AniLibertySync(client=httpx.Client(transport=httpx.MockTransport(server)))
+    install_rate_limiter(api, limiter)
+    api._client.get("https://aniliberty.top/api/v1/anime/releases/latest")
+    assert limiter.stats()["aniliberty.top"].requests == 1
@@ -0,0 +1,79 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+from anicli_api.player import PLAYERS
+from anicli_api.source import SOURCES, get_source, resolve_source
+
+# `python -X importtime -c "import anicli_api.base"` cumulative time, best of 3 runs.
+# Recorded ~120-180ms (httpx is ~100ms of it), budget with margin for slow CI machines
+IMPORT_TIME_BUDGET_MS = 400
+# modules allowed after `import anicli_api.base`: players, lxml parsers and API clients are imported lazily
+ALLOWED_MODULES = {
+    "anicli_api",
+    "anicli_api.typing",
+    "anicli_api._logger",
+    "anicli_api._http",
+    "anicli_api._metrics",
+    "anicli_api._tracing",
+    "anicli_api.base",
+    "anicli_api.player",
+    "anicli_api.player.base",
+    "anicli_api.player.registry",
+    "anicli_api.player.dispatch",
+    "anicli_api.player.pool",
+}
+
+
+def _run(code: str, *args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args, "-c", code], capture_output=True, text=True, check=True)
+
+
+def _imported_modules(code: str) -> set[str]:
+    return set(_run(f"import sys;{code};print('\\n'.join(sys.modules))").stdout.split())
+
+
+@pytest.mark.parametrize("spec", PLAYERS, ids=lambda s: s.name)
+def test_player_spec_equal_extractor(spec):
+    extractor = spec.load()
+    rule = extractor.URL_RULE
+    assert spec.url_rule == (rule.pattern if isinstance(rule, re.Pattern) else rule)
+    assert spec.hosts == extractor.URL_HOSTS
+
+
+@pytest.mark.parametrize("name", SOURCES)
+def test_source_spec_equal_extractor(name):
+    assert get_source(name).BASE_URL == SOURCES[name].base_url
+
+
+def test_source_registry():
+    assert resolve_source("https://animego.me/anime/lain-123").name == "animego"
+    assert resolve_source("https://example.org") is None
+    with pytest.raises(KeyError):
+        get_source("unknown")
+
+
+def test_import_base_modules():
+    modules = {m for m in _imported_modules("import anicli_api.base") if m.startswith("anicli_api")}
+    assert modules == ALLOWED_MODULES
+    assert "lxml" not in _imported_modules("import anicli_api.base")
+
+
+def test_resolve_imports_only_matched_player():
+    modules = _imported_modules(
+        "from anicli_api.player import resolve_extractor;resolve_extractor('https://video.sibnet.ru/shell.php?videoid=1')"
+    )
+    players = {m for m in modules if m.startswith("anicli_api.player.")}
+    assert players - ALLOWED_MODULES == {"anicli_api.player.sibnet"}
+
+
+def test_import_time_budget():
+    def import_time_ms() -> float:
+        stderr = _run("import anicli_api.base", "-X", "importtime").stderr
+        # import time: self [us] | cumulative | imported package
+        line = next(line for line in reversed(stderr.splitlines()) if line.endswith("| anicli_api.base"))
+        return int(line.split("|")[1]) / 1000
+
+    assert min(import_time_ms() for _ in range(3)) < IMPORT_TIME_BUDGET_MS
@@ -0,0 +1,95 @@
+import httpx
+import pytest
+
+from anicli_api._http import (
+    DDOSServerDetectError,
+    HTTPRetryConnectAsyncTransport,
+    HTTPRetryConnectSyncTransport,
+    RetryBudget,
+    RetryPolicies,
+    RetryPolicy,
+)
+
+FAST = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+POLICIES = RetryPolicies(connect=FAST, ddos=FAST, status=FAST)
+
+
+class Server:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        result = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(result, Exception):
+            raise result
+        return httpx.Response(result[0], headers=result[1], request=request)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    def install(*responses):
+        srv = Server(*responses)
+        monkeypatch.setattr(httpx.HTTPTransport, "handle_request", lambda self, request: srv(request))
+
+        async def handle_async(self, request):
+            return srv(request)
+
+        monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", handle_async)
+        return srv
+
+    return install
+
+
+def test_backoff():
+    policy = RetryPolicy(base_delay=1, max_delay=5, jitter=False)
+    assert [policy.backoff(i) for i in range(5)] == [1, 2, 4, 5, 5]
+    assert 0 <= RetryPolicy(base_delay=1).backoff(10) <= 8
+
+
+def test_retry_connect_and_status(server):
+    srv = server(httpx.ConnectError("boom"), (503, {"Retry-After": "0"}), (200, {}))
+    client = httpx.Client(transport=HTTPRetryConnectSyncTransport(retry_policies=POLICIES, retry_budget=None))
+    assert client.get("https://example.org").status_code == 200
+    assert srv.calls == 3
+
+    # exhausted: last response returned, kodik-like 500 not retried
+    srv = server((503, {}))
+    assert client.get("https://example.org").status_code == 503
+    assert srv.calls == 3
+    srv = server((500, {}))
+    assert client.get("https://example.org").status_code == 500
+    assert srv.calls == 1
+
+    srv = server(httpx.ConnectError("boom"))
+    with pytest.raises(httpx.ConnectError):
+        client.get("https://example.org")
+    assert srv.calls == 3
+
+
+def test_retry_after_exceeds_max_elapsed(server):
+    srv = server((429, {"Retry-After": "3600"}), (200, {}))
+    client = httpx.Client(transport=HTTPRetryConnectSyncTransport(retry_policies=POLICIES, retry_budget=None))
+    assert client.get("https://example.org").status_code == 429
+    assert srv.calls == 1
+
+
+def test_retry_budget(server):
+    srv = server((403, {}))
+    budget = RetryBudget(ratio=0, min_retries=2)
+    client = httpx.Client(transport=HTTPRetryConnectSyncTransport(retry_policies=POLICIES, retry_budget=budget))
+    for _ in range(3):
+        with pytest.raises(DDOSServerDetectError):
+            client.get("https://dead.example.org")
+    # 3 requests, 2 retries allowed
+    assert srv.calls == 5
+    assert budget.acquire("alive.example.org")
+
+
+async def test_retry_async(server):
+    srv = server(httpx.ReadTimeout("timeout"), (502, {}), (200, {}))
+    transport = HTTPRetryConnectAsyncTransport(retry_policies=POLICIES, retry_budget=None)
+    async with httpx.AsyncClient(transport=transport) as client:
+        assert (await client.get("https://example.org")).status_code == 200
+    assert srv.calls == 3
@@ -0,0 +1,27 @@
+from anicli_api._http import HTTPSession
+from anicli_api.source.animego import Extractor, Search
+from anicli_api.source.anilibria import Extractor as AnilibriaExtractor
+
+
+def test_extractor_clients_lazy():
+    ex = Extractor()
+    assert ex.session._http is None and ex.session._http_async is None
+
+    search = Search(title="t", thumbnail="", url="https://animego.me/anime/1", **ex._kwargs_http)
+    assert ex.session._http is None
+    assert search.http is ex.http
+    assert ex.session._http_async is None
+    # per extractor session
+    assert Extractor().http is not ex.http
+
+
+def test_explicit_session_and_clients():
+    session = HTTPSession()
+    ex1, ex2 = Extractor(session=session), AnilibriaExtractor(session=session)
+    assert ex1.http is ex2.http is ex2.sync_api._client
+    assert session._http_async is None
+
+    client = HTTPSession().http
+    ex3 = Extractor(http_client=client, session=session)
+    assert ex3.http is client
+    assert ex3.http_async is session.http_async
@@ -0,0 +1,139 @@
+import asyncio
+
+import pytest
+from attrs import define
+
+from anicli_api._tracing import add_tracer, remove_tracer
+from anicli_api.base import BaseExtractor, BaseSearch
+from anicli_api.source.anilibria_mirror import CatalogMirror
+from anicli_api.tools.federated import FederatedSearch
+from anicli_api.tools.title_index import IndexTracer, TitleIndex, normalize, phonetic_key, trigrams
+
+
+@define(kw_only=True)
+class Search(BaseSearch):
+    data: dict = {}
+
+    def get_anime(self):
+        raise NotImplementedError
+
+    async def a_get_anime(self):
+        raise NotImplementedError
+
+
+class Extractor(BaseExtractor):
+    def __init__(self, titles: list):
+        super().__init__()
+        self.titles = titles
+        self.calls = 0
+
+    def search(self, query):
+        self.calls += 1
+        return [Search(title=t, thumbnail="", url=f"https://example.org/{t}") for t in self.titles]
+
+    async def a_search(self, query):
+        await asyncio.sleep(0)
+        return self.search(query)
+
+    def ongoing(self):
+        raise NotImplementedError
+
+    async def a_ongoing(self):
+        raise NotImplementedError
+
+
+@pytest.mark.parametrize(
+    "cyrillic, latin",
+    [
+        ("Наруто", "Naruto"),
+        ("Сидзуку", "Shizuku"),
+        ("Дзюндзи Ито", "Junji Ito"),
+        ("Сёнэн", "Shounen"),
+        ("Хаяо Миядзаки", "Hayao Miyazaki"),
+        ("Цубаса", "Tsubasa"),
+    ],
+)
+def test_phonetic_key(cyrillic, latin):
+    assert phonetic_key(cyrillic) == phonetic_key(latin)
+
+
+def test_normalize_and_trigrams():
+    assert normalize("Ещё: Lain!") == normalize("еще lain")
+    assert trigrams("lain") == {"  l", " la", "lai", "ain", "in "}
+
+
+def test_search_ranking():
+    index = TitleIndex()
+    index.add("Наруто", "yummy_anime_org")
+    index.add("Наруто: Ураганные хроники", "yummy_anime_org")
+    index.add("Атака титанов", "animego", aliases=("Shingeki no Kyojin",))
+    index.add("Ван-Пис", "animego", aliases=("One Piece",))
+
+    assert [h.title for h in index.search("naruto")] == ["Наруто", "Наруто: Ураганные хроники"]
+    assert index.search("naruto")[0].score == 1.0
+    assert [h.title for h in index.search("наруто ураганные")] == ["Наруто: Ураганные хроники"]
+    assert [h.title for h in index.search("shingeki kyojin")] == ["Атака титанов"]
+    # typo
+    assert [h.title for h in index.search("one pice")] == ["Ван-Пис"]
+    assert index.search("zzz") == []
+
+
+def test_replace_and_evict():
+    index = TitleIndex(max_entries=2)
+    index.add("Lain", "a", item=1)
+    index.add("lain!", "a", item=2)
+    assert len(index) == 1 and index.search("lain")[0].item == 2
+
+    index.add("Lain", "b", item=3)
+    index.add("Frieren", "b", item=4)
+    assert len(index) == 2
+    assert [h.item for h in index.search("lain")] == [3]
+    assert not index._postings.keys() - {g for keys in index._keys.values() for grams in keys for g in grams}
+
+
+def test_catalog_and_item_aliases():
+    mirror = CatalogMirror()
+    mirror._upsert(
+        [
+            {"id": 1, "name": {"main": "Магическая битва", "english": "Jujutsu Kaisen"}, "fresh_at": "1"},
+            {"id": 2, "name": {"main": None}, "fresh_at": "2"},
+        ]
+    )
+    index = TitleIndex()
+    assert index.add_catalog(mirror) == 1
+    assert index.search("jujutsu")[0].item["id"] == 1
+
+    index.add_item(Search(title="Токийский гуль", thumbnail="", url="_", data={"name": {"english": "Tokyo Ghoul"}}))
+    hit = index.search("tokyo ghoul")[0]
+    assert hit.source == "test_title_index" and hit.title == "Токийский гуль"
+
+
+def test_index_tracer():
+    index = TitleIndex()
+    tracer = add_tracer(IndexTracer(index))
+    try:
+        Extractor(["Наруто", "Блич"]).search("naruto")
+    finally:
+        remove_tracer(tracer)
+    assert [h.title for h in index.search("bleach")] == []
+    assert [h.title for h in index.search("blich")] == ["Блич"]
+    assert index.search("naruto")[0].source == "test_title_index"
+
+
+async def test_federated_local_first():
+    index = TitleIndex()
+    extractors = {"a": Extractor(["Наруто"]), "b": Extractor(["Naruto"])}
+    search = FederatedSearch(extractors=extractors, index=index)
+
+    hits = await search.a_search("naruto")
+    assert [e.calls for e in extractors.values()] == [1, 1]
+    assert len(index) == 2 and hits[0].sources == ["a"] and hits[1].sources == ["b"]
+
+    # answered from index
+    hits = await search.a_search("Наруто")
+    assert [e.calls for e in extractors.values()] == [1, 1]
+    assert sorted(s for h in hits for s in h.sources) == ["a", "b"]
+
+    # miss: fan out
+    await search.a_search("lain")
+    assert [e.calls for e in extractors.values()] == [2, 2]
@@ -1,6 +1,14 @@
+import asyncio
+import io
+import threading
+
 import pytest
+from attrs import define
 
+from anicli_api.base import BaseSource
+from anicli_api.player.base import Video
 from anicli_api.tools import generate_asyncio_playlist, generate_playlist
+from anicli_api.tools.m3u import M3UPlaylistItem, a_iter_playlist_items, a_write_playlist
 
 RESULT = "#EXTM3U\n\n#EXTINF:0,Episode 1\n1.mp4\n\n#EXTINF:0,Episode 2\n2.mp4\n\n#EXTINF:0,Episode 3\n3.mp4"
 RESULT_WITH_NAMES = "#EXTM3U\n\n#EXTINF:0,v1\n1.mp4\n\n#EXTINF:0,v2\n2.mp4\n\n#EXTINF:0,v3\n3.mp4"
@@ -17,3 +25,60 @@ async def test_async_generate_m3u():
     assert (
         await generate_asyncio_playlist(target=["1.mp4", "2.mp4", "3.mp4"], names=["v1", "v2", "v3"])
     ) == RESULT_WITH_NAMES
+
+
+def test_m3u_item_vlc_options():
+    video = Video("m3u8", 720, "https://example.com/1.m3u8", headers={"User-Agent": "007", "Referer": "https://a.b"})
+    assert str(M3UPlaylistItem.from_video(video, "v1", duration=1420)) == (
+        "#EXTINF:1420,v1\n"
+        "#EXTVLCOPT:http-user-agent=007\n"
+        "#EXTVLCOPT:http-referrer=https://a.b\n"
+        "https://example.com/1.m3u8"
+    )
+
+
+@define(kw_only=True)
+class FakeSource(BaseSource):
+    def get_videos(self, **_):
+        return [Video("mp4", 480, f"{self.url}.480.mp4"), Video("mp4", 1080, f"{self.url}.mp4")]
+
+    async def a_get_videos(self, **_):
+        await asyncio.sleep(0.01 * (5 - int(self.url)))
+        return self.get_videos()
+
+
+SOURCES = [FakeSource(title="_", url=str(i)) for i in range(1, 4)]
+
+
+def test_generate_m3u_from_sources():
+    progress = []
+    result = generate_playlist(SOURCES, progress_cb=lambda done, total: progress.append((done, total)))
+    assert result == RESULT
+    assert progress == [(1, 3), (2, 3), (3, 3)]
+
+
+def test_progress_before_items_order():
+    released = threading.Event()
+
+    @define(kw_only=True)
+    class SlowSource(FakeSource):
+        def get_videos(self, **_):
+            # first source completes after the others
+            if self.url == "1":
+                assert released.wait(timeout=1)
+            return super().get_videos()
+
+    def progress_cb(done, total):
+        if done == total - 1:
+            released.set()
+
+    sources = [SlowSource(title="_", url=str(i)) for i in range(1, 4)]
+    assert generate_playlist(sources, concurrency=3, progress_cb=progress_cb) == RESULT
+
+
+async def test_async_write_m3u_from_sources():
+    stream = io.StringIO()
+    await a_write_playlist(stream, SOURCES, names=["v1", "v2", "v3"], concurrency=2)
+    assert stream.getvalue() == RESULT_WITH_NAMES
+    items = [i async for i in a_iter_playlist_items(SOURCES, quality=480)]
+    assert [i.url for i in items] == ["1.480.mp4", "2.480.mp4", "3.480.mp4"]
@@ -0,0 +1,130 @@
+import asyncio
+
+import httpx
+import pytest
+from attrs import define
+
+from anicli_api._http import HTTPAsync, HTTPRetryConnectSyncTransport, HTTPSync, RetryPolicies, RetryPolicy
+from anicli_api._tracing import InMemoryCollector, add_tracer, remove_tracer, start_span
+from anicli_api.base import BaseAnime, BaseExtractor, BaseSearch, BaseSource
+
+NO_DELAY = RetryPolicy(attempts=3, base_delay=0, max_delay=0)
+
+
+class Server:
+    def __init__(self, fails: int = 0):
+        self.fails = fails
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if self.fails:
+            self.fails -= 1
+            return httpx.Response(503)
+        return httpx.Response(200, text="ok" * 50)
+
+
+@define(kw_only=True)
+class Source(BaseSource):
+    def get_videos(self, **httpx_kwargs):
+        # nested call of the same stage is not traced
+        return super().get_videos(**httpx_kwargs)
+
+
+@define(kw_only=True)
+class Anime(BaseAnime):
+    def get_episodes(self):
+        self.http.get("https://example.org/anime")
+        return [1, 2, 3]
+
+    async def a_get_episodes(self):
+        await self.http_async.get("https://example.org/anime")
+        return [1, 2]
+
+
+@define(kw_only=True)
+class Search(BaseSearch):
+    def get_anime(self):
+        raise ValueError("broken page")
+
+    async def a_get_anime(self):
+        raise ValueError("broken page")
+
+
+class Extractor(BaseExtractor):
+    BASE_URL = "https://example.org"
+
+    def search(self, query):
+        return [Search(title=query, thumbnail="", url="https://example.org/1", **self._kwargs_http)]
+
+    async def a_search(self, query):
+        return self.search(query)
+
+    def ongoing(self):
+        return []
+
+    async def a_ongoing(self):
+        return []
+
+
+@pytest.fixture
+def collector():
+    collector = add_tracer(InMemoryCollector())
+    yield collector
+    remove_tracer(collector)
+
+
+def _anime(server: Server) -> Anime:
+    return Anime(
+        title="t",
+        thumbnail="",
+        description="",
+        http=HTTPSync(transport=httpx.MockTransport(server)),
+        http_async=HTTPAsync(transport=httpx.MockTransport(server)),
+    )
+
+
+def test_stage_spans(collector):
+    ex = Extractor()
+    search = ex.search("lain")[0]
+    with pytest.raises(ValueError):
+        search.get_anime()
+    assert _anime(Server()).get_episodes() == [1, 2, 3]
+    with pytest.warns(UserWarning):
+        assert Source(title="s", url="https://unknown.org/1").get_videos() == []
+
+    spans = {s.stage: s for s in collector.spans}
+    assert spans["search"].source == "test_tracing"
+    assert spans["search"].items == 1
+    assert spans["anime"].error == "ValueError: broken page"
+    assert spans["episodes"].items == 3
+    assert [s.stage for s in collector.spans].count("videos") == 1
+    stats = collector.stats()
+    assert stats[("test_tracing", "anime")].errors == 1
+    assert stats[("test_tracing", "episodes")].total == 1
+
+
+async def test_async_stage_spans(collector):
+    anime = _anime(Server())
+    assert await asyncio.gather(anime.a_get_episodes(), anime.a_get_episodes()) == [[1, 2], [1, 2]]
+    assert [s.stage for s in collector.spans] == ["episodes", "episodes"]
+
+
+def test_http_span(collector, monkeypatch):
+    server = Server(fails=1)
+    monkeypatch.setattr(httpx.HTTPTransport, "handle_request", lambda self, request: server(request))
+    transport = HTTPRetryConnectSyncTransport(retry_policies=RetryPolicies(status=NO_DELAY), retry_budget=None)
+    client = httpx.Client(transport=transport)
+    with start_span("anime", "test", "https://example.org/anime") as parent:
+        assert client.get("https://example.org/anime").status_code == 200
+    http_span, stage_span = collector.spans
+    assert stage_span is parent
+    assert http_span.parent is parent
+    assert (http_span.stage, http_span.status, http_span.retries, http_span.bytes) == ("http", 200, 1, 100)
+    assert parent.bytes == 100
+    assert parent.http_time == http_span.duration
+    assert collector.stats()[("test", "http")].total == 1
+
+
+def test_no_tracers():
+    with start_span("anime", "test") as span:
+        assert span is None
+    assert _anime(Server()).get_episodes() == [1, 2, 3]